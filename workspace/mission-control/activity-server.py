@@ -2,24 +2,41 @@
 Mission Control Activity Server
 Serves dashboard + live activity feed from Clawdbot logs
 """
+import concurrent.futures
+import collections
+import copy
+import functools
+import hashlib
 import http.server
 import http.cookies
 import ipaddress
 import json
 import os
+import queue
+import random
 import re
 import signal
 import shutil
+import socket
 import subprocess
 import sys
 import time
 import secrets
+import selectors
 import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from urllib.parse import urlparse, parse_qs
 
 import autoresearch_engine
+from log_tailer import LogTailer, create_watcher
+
+# Shared workspace helpers live in ../scripts.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from atomic_json import file_lock, write_json_atomic  # noqa: E402
+from task_repository import open_repository  # noqa: E402
+import metrics  # noqa: E402
 
 PORT = int(os.environ.get("MISSION_CONTROL_PORT", "8765"))
 LOG_ROOT = Path(os.environ.get("MISSION_CONTROL_LOG_ROOT", r"\tmp"))
@@ -37,6 +54,32 @@ if not DASHBOARD_KEY:
     _generated_dashboard_key = True
 MISSION_CONTROL_TRUST_LAN = os.environ.get("MISSION_CONTROL_TRUST_LAN", "1").strip().lower() in ("1", "true", "yes", "on")
 MISSION_CONTROL_DISABLE_AUTH = os.environ.get("MISSION_CONTROL_DISABLE_AUTH", "0").strip().lower() in ("1", "true", "yes", "on")
+# Concurrent serving: size of the request worker pool and the idle socket timeout that
+# keeps a stalled client from pinning a worker.
+MISSION_CONTROL_WORKERS = max(1, int(os.environ.get("MISSION_CONTROL_WORKERS", "16")))
+MISSION_CONTROL_SOCKET_TIMEOUT = float(os.environ.get("MISSION_CONTROL_SOCKET_TIMEOUT", "30"))
+# Log tailing: persisted per-file byte offsets, and an opt-out from inotify wakeups.
+LOG_TAIL_STATE_FILE = os.environ.get(
+    "MISSION_CONTROL_TAIL_STATE",
+    os.path.join(DASHBOARD_DIR, ".log-tail-state.json"),
+)
+# Live activity stream: cap on concurrently attached SSE clients, keep-alive interval, and
+# how many unsent bytes a slow client may fall behind by before it is dropped.
+MISSION_CONTROL_STREAM_CLIENTS = max(1, int(os.environ.get("MISSION_CONTROL_STREAM_CLIENTS", "64")))
+STREAM_HEARTBEAT_SECONDS = 15.0
+STREAM_CLIENT_BUFFER_BYTES = 256 * 1024
+# Activity event history: how many parsed events are kept for /api/activity/events, and how
+# many of the newest are embedded in /api/activity as recentEvents.
+MISSION_CONTROL_EVENT_HISTORY = max(1, int(os.environ.get("MISSION_CONTROL_EVENT_HISTORY", "1000")))
+RECENT_EVENTS_LIMIT = 50
+EVENTS_PAGE_LIMIT = 500
+# Backstop interval for the lane scheduler; tasks.json change events wake it sooner.
+LANE_SCHEDULER_INTERVAL = max(0.5, float(os.environ.get("MISSION_CONTROL_LANE_INTERVAL", "5")))
+MISSION_CONTROL_TAIL_POLL = os.environ.get("MISSION_CONTROL_TAIL_POLL", "0").strip().lower() in ("1", "true", "yes", "on")
+# Request instrumentation: requests slower than this are logged to stderr, and distinct
+# routes tracked are capped so stray paths cannot grow the table without bound.
+MISSION_CONTROL_SLOW_REQUEST_MS = float(os.environ.get("MISSION_CONTROL_SLOW_REQUEST_MS", "1000"))
+PERF_MAX_ROUTES = 256
 
 # Session tokens for wifi auth
 _valid_sessions = {}
@@ -56,7 +99,6 @@ activity_state = {
     "currentTask": None,
     "currentTool": None,
     "highLevelTask": None,
-    "recentEvents": [],
     "sessionInfo": {
         "model": "claude-opus-4-5",
         "sessionId": None,
@@ -71,6 +113,7 @@ activity_state = {
     },
     "lastUpdate": datetime.now(timezone.utc).isoformat()
 }
+log_tailer = None  # LogTailer, started by main()
 
 CURRENT_TASK_FILE = os.path.join(DASHBOARD_DIR, "current-task.json")
 WORKSPACE_DIR = os.path.dirname(DASHBOARD_DIR)  # Parent of mission-control
@@ -91,6 +134,88 @@ _models_state_cache = {"at": 0.0, "data": None, "error": None}
 _models_cache_lock = threading.Lock()
 _models_refreshing = False
 _log_source_cache = {"at": 0.0, "source": None}
+METRICS_CACHE_TTL = float(os.environ.get("MISSION_CONTROL_METRICS_TTL", "5"))
+_metrics_cache = {}
+_metrics_cache_lock = threading.Lock()
+
+# Deadlines (seconds) for routes that shell out or wait on the CLI. The blocking part of
+# these routes runs on a separate executor so the request worker can answer 504 on time.
+# Work that times out keeps its mc-route thread until it finishes, so at most
+# ROUTE_MAX_PENDING calls may be running or queued; further calls answer 503.
+DEFAULT_ROUTE_TIMEOUT = 30.0
+ROUTE_MAX_PENDING = MISSION_CONTROL_WORKERS * 2
+ROUTE_TIMEOUTS = {
+    "/api/metrics": 5.0,
+    "/metrics": 5.0,
+    "/api/model-select": 150.0,
+    "/api/autoresearch/start": 30.0,
+    "/api/autoresearch/stop": 15.0,
+    "/api/autoresearch/status": 10.0,
+}
+
+
+def _parse_route_timeouts(raw):
+    """Parse MISSION_CONTROL_ROUTE_TIMEOUTS ("/api/metrics=5,/api/model-select=90")."""
+    overrides = {}
+    for item in (raw or "").split(","):
+        route, sep, value = item.strip().partition("=")
+        if not sep or not route.strip():
+            continue
+        try:
+            seconds = float(value)
+        except ValueError:
+            continue
+        if seconds > 0:
+            overrides[route.strip()] = seconds
+    return overrides
+
+
+ROUTE_TIMEOUTS.update(_parse_route_timeouts(os.environ.get("MISSION_CONTROL_ROUTE_TIMEOUTS", "")))
+_route_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=MISSION_CONTROL_WORKERS, thread_name_prefix="mc-route"
+)
+_route_slots = threading.BoundedSemaphore(ROUTE_MAX_PENDING)
+
+
+class RouteTimeout(Exception):
+    """Raised when a route's blocking work exceeds its configured deadline."""
+
+    def __init__(self, route, timeout):
+        super().__init__(f"{route} timed out after {timeout:g}s")
+        self.route = route
+        self.timeout = timeout
+
+
+class RouteError(Exception):
+    """Raised by a route handler to answer with an HTTP error status and {"error": message}."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def run_with_route_timeout(route, func, *args, **kwargs):
+    """Run blocking route work under the route's deadline.
+
+    The work keeps running in the background after a timeout (CLI calls cannot be
+    interrupted safely); only the waiting request is released. While
+    ROUTE_MAX_PENDING calls are still running, new ones fail fast with 503
+    instead of queueing behind them.
+    """
+    timeout = ROUTE_TIMEOUTS.get(route, DEFAULT_ROUTE_TIMEOUT)
+    slots = _route_slots
+    if not slots.acquire(blocking=False):
+        raise RouteError(503, f"{route} is busy: too many route calls still running")
+    try:
+        future = _route_executor.submit(func, *args, **kwargs)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        raise RouteTimeout(route, timeout) from None
 
 
 def resolve_workspace_path(relative_path):
@@ -124,12 +249,8 @@ def load_json_file(path):
 
 
 def write_json_file(path, data):
-    """Write JSON with utf-8 encoding, creating parent directories when needed."""
-    path = Path(path)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as handle:
-        json.dump(data, handle, indent=2, ensure_ascii=False)
-        handle.write("\n")
+    """Atomically write JSON with utf-8 encoding, creating parent directories when needed."""
+    write_json_atomic(path, data, indent=2, trailing_newline=True)
 
 
 def load_gateway_info():
@@ -452,8 +573,7 @@ def sync_main_session_model_in_stores(model_key):
             if "authProfileOverrideCompactionCount" in entry:
                 del entry["authProfileOverrideCompactionCount"]
             store["agent:main:main"] = entry
-            with open(candidate, "w", encoding="utf-8") as f:
-                json.dump(store, f, indent=2, ensure_ascii=False)
+            write_json_atomic(candidate, store, indent=2)
             updated += 1
         except Exception as e:
             errors.append(f"{candidate}: {e}")
@@ -601,6 +721,23 @@ def snapshot_models_state():
     return {"data": cached, "ageMs": age_ms, "refreshing": refreshing, "error": error}
 
 
+def load_metrics_cached(kind, ttl_seconds=None):
+    """metrics.py status ("status") or Prometheus text ("prometheus"), computed in-process.
+
+    Results are reused for METRICS_CACHE_TTL seconds; the lock is held while
+    loading so concurrent misses share one query instead of racing.
+    """
+    loaders = {"status": metrics.get_status, "prometheus": metrics.get_prometheus_metrics}
+    ttl = METRICS_CACHE_TTL if ttl_seconds is None else ttl_seconds
+    with _metrics_cache_lock:
+        cached_at, data = _metrics_cache.get(kind, (0.0, None))
+        if data is not None and time.time() - cached_at < ttl:
+            return data
+        data = loaders[kind]()
+        _metrics_cache[kind] = (time.time(), data)
+        return data
+
+
 def prime_models_cache_default(model_key):
     """Immediately reflect default-model changes in cached /api/models payloads."""
     provider, model = _split_model_key(model_key)
@@ -641,6 +778,46 @@ def prime_models_cache_default(model_key):
         "source": "mission-control:model-select",
     }
 
+
+class ModelNotSelectable(Exception):
+    """The requested model is not one of the models the dashboard displays."""
+
+
+def select_default_model(normalized_model):
+    """Switch the default model via the CLI and sync runtime session stores."""
+    selector_state = load_models_state()
+    allowed_models = {
+        str(item.get("key") or "").strip()
+        for item in selector_state.get("models", [])
+        if isinstance(item, dict) and str(item.get("key") or "").strip()
+    }
+    if allowed_models and normalized_model not in allowed_models:
+        raise ModelNotSelectable(
+            f'Model "{normalized_model}" is not available in Mission Control. '
+            "Pick one of the displayed models."
+        )
+    # If switching to an LM Studio model, unload current model first
+    # and load the new one (LM Studio can only run one large model at a time)
+    if _is_lmstudio_model(normalized_model):
+        lms_model_id = normalized_model.split("/", 1)[1]
+        ctx = _resolve_lmstudio_context_length(lms_model_id)
+        lms_switch_model(lms_model_id, context_length=ctx)
+    run_models_cli(["set", normalized_model])
+    # Keep runtime session metadata in sync so switching from the UI is immediate.
+    sync_result = sync_main_session_model_in_stores(normalized_model)
+    prime_models_cache_default(normalized_model)
+    start_models_refresh_if_needed(force=True)
+    response = {
+        "ok": True,
+        "defaultModel": normalized_model,
+        "runtimeSyncedStores": sync_result.get("updated", 0),
+    }
+    sync_errors = sync_result.get("errors") or []
+    if sync_errors:
+        response["syncErrors"] = sync_errors
+    return response
+
+
 def check_memory_health():
     """Check memory system integrity"""
     checks = {}
@@ -995,6 +1172,341 @@ def summarize_task_for_dashboard(task_id, task):
 state_lock = threading.Lock()
 
 
+class TaskRequestError(RouteError):
+    """A task mutation was rejected; carries the HTTP status to answer with."""
+
+
+class TaskTransaction:
+    """Working copy of the board handed out by TaskStore.transaction()."""
+
+    def __init__(self, data):
+        self.data = data
+        self.committed = False
+
+    def commit(self):
+        self.committed = True
+
+
+class TaskStore:
+    """Shared in-memory view of memory/tasks.json.
+
+    read() returns the cached board and only re-parses when the file's mtime or size
+    changes, so board polls stop paying a full JSON parse. Documents returned by
+    read() are shared between requests and must be treated as read-only; mutations go
+    through transaction(), which serializes writers on one lock, hands out a private
+    copy and writes it back atomically when the caller commits. The transaction also
+    holds the cross-process lock the workspace scripts take (atomic_json.file_lock), so
+    its read-modify-write can't interleave with theirs; each commit bumps "version".
+    """
+
+    def __init__(self, path, indent=4):
+        self.path = Path(path)
+        self.indent = indent
+        self._lock = threading.RLock()
+        self._data = None
+        self._stamp = None
+        # Bumped on every reload/write. Seeded from the clock so revisions handed to
+        # clients keep increasing across server restarts.
+        self.generation = time.time_ns() // 1_000_000
+
+    def _stat_stamp(self):
+        st = os.stat(self.path)
+        # Atomic writers rename a new file into place, so the inode changes even when
+        # mtime and size happen to match.
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def exists(self):
+        return self.path.exists()
+
+    def read(self):
+        """Return the parsed board. Raises FileNotFoundError when tasks.json is missing."""
+        data = self._data
+        if data is not None and self._stat_stamp() == self._stamp:
+            return data
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self):
+        stamp = self._stat_stamp()
+        if self._data is None or stamp != self._stamp:
+            self._data = self._load()
+            self._stamp = stamp
+            self.generation += 1
+        return self._data
+
+    def _load(self):
+        return load_json_file(self.path)
+
+    def sync_export(self):
+        """Refresh derived copies of the board (nothing to do for tasks.json itself)."""
+        return False
+
+    @contextmanager
+    def transaction(self):
+        """Yield a TaskTransaction; its data is written back only if commit() was called."""
+        with self._lock, file_lock(self.path):
+            txn = TaskTransaction(copy.deepcopy(self._refresh_locked()))
+            yield txn
+            if txn.committed:
+                txn.data['version'] = (txn.data.get('version') or 0) + 1
+                self._write_locked(txn.data)
+
+    def _write_locked(self, data):
+        write_json_atomic(self.path, data, indent=self.indent)
+        self._data = data
+        self._stamp = self._stat_stamp()
+        self.generation += 1
+
+
+class RepositoryTaskStore(TaskStore):
+    """TaskStore backed by the SQLite task repository (TASKS_BACKEND=sqlite).
+
+    The board's version replaces the file stamp, and a committed transaction is
+    diffed so only the tasks, lanes and keys it changed are written. tasks.json
+    becomes an export that the lane scheduler refreshes in the background.
+    """
+
+    def __init__(self, repository):
+        super().__init__(repository.export_path)
+        self.repository = repository
+
+    def _stat_stamp(self):
+        return self.repository.version()
+
+    def exists(self):
+        return True
+
+    def _load(self):
+        return self.repository.load_board()
+
+    @contextmanager
+    def transaction(self):
+        with self._lock, self.repository.edit() as board_txn:
+            txn = TaskTransaction(board_txn.board())
+            yield txn
+            if not txn.committed:
+                board_txn.rollback()
+        with self._lock:
+            self._refresh_locked()
+
+    def sync_export(self):
+        return self.repository.sync_export()
+
+
+def _open_task_store():
+    repository = open_repository(json_path=TASKS_FILE)
+    if repository.backend == "json":
+        # The dashboard keeps its own cached, lock-holding reader for tasks.json.
+        return TaskStore(TASKS_FILE)
+    return RepositoryTaskStore(repository)
+
+
+TASKS_FILE = os.path.join(WORKSPACE_DIR, "memory", "tasks.json")
+TASK_STORE = _open_task_store()
+
+
+class TaskBoardCache:
+    """Serialized /api/tasks payload, rebuilt only when TASK_STORE's generation moves.
+
+    Task summaries are memoized per task and reused while the raw task is unchanged,
+    so a board change re-summarizes only the tasks that changed. The revision at
+    which each task last changed (or left the lanes) is tracked so clients can ask
+    for ?since_version=<revision> and receive only what changed.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._lock = threading.Lock()
+        self._revision = None
+        self._baseline = None  # first revision built by this process
+        self._body = None
+        self._etag = None
+        self._meta = None
+        self._summaries = {}   # task_id -> (raw task, summary)
+        self._changed_at = {}  # task_id -> revision the summary last changed
+        self._removed_at = {}  # task_id -> revision it left the lanes
+
+    def get(self):
+        """Return (body bytes, strong ETag) for the current board."""
+        with self._lock:
+            self._refresh_locked()
+            return self._body, self._etag
+
+    def delta(self, since):
+        """Payload with only tasks changed after revision `since`.
+
+        Returns None when `since` predates what this process has tracked; the caller
+        should send the full board instead.
+        """
+        with self._lock:
+            self._refresh_locked()
+            if since < self._baseline or since > self._revision:
+                return None
+            payload = dict(self._meta)
+            payload["tasks"] = {
+                task_id: self._summaries[task_id][1]
+                for task_id, changed in self._changed_at.items()
+                if changed > since
+            }
+            payload["removed"] = sorted(t for t, removed in self._removed_at.items() if removed > since)
+            payload["since_version"] = since
+            payload["delta"] = True
+            return payload
+
+    def _refresh_locked(self):
+        tasks_data = self.store.read()
+        revision = self.store.generation
+        if revision == self._revision:
+            return
+
+        lanes = tasks_data.get('lanes', {})
+        tasks_map = tasks_data.get('tasks', {})
+        lane_task_ids = collect_lane_task_ids(lanes)
+        compact_tasks = {}
+        summaries = {}
+        if isinstance(tasks_map, dict):
+            for task_id in lane_task_ids:
+                raw = tasks_map.get(task_id)
+                cached = self._summaries.get(task_id)
+                if cached is not None and cached[0] == raw:
+                    summary = cached[1]
+                else:
+                    summary = summarize_task_for_dashboard(task_id, raw)
+                    if cached is None or cached[1] != summary:
+                        self._changed_at[task_id] = revision
+                summaries[task_id] = (raw, summary)
+                compact_tasks[task_id] = summary
+                self._removed_at.pop(task_id, None)
+        for task_id in self._summaries.keys() - summaries.keys():
+            self._changed_at.pop(task_id, None)
+            self._removed_at[task_id] = revision
+        self._summaries = summaries
+
+        meta = {
+            "version": tasks_data.get("version"),
+            "revision": revision,
+            "updated_at": tasks_data.get("updated_at"),
+            "updated_by": tasks_data.get("updated_by"),
+            "lanes": lanes,
+            "tasks_in_lanes": len(compact_tasks),
+            "tasks_total": len(tasks_map) if isinstance(tasks_map, dict) else 0,
+        }
+        payload = dict(meta)
+        payload["tasks"] = compact_tasks
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self._meta = meta
+        self._body = body
+        self._etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self._baseline is None:
+            self._baseline = revision
+        self._revision = revision
+
+
+TASK_BOARD_CACHE = TaskBoardCache(TASK_STORE)
+
+
+def etag_matches(if_none_match, etag):
+    """True when an If-None-Match header value matches etag (weak comparison, per RFC 9110)."""
+    if not if_none_match or not etag:
+        return False
+    candidates = [c.strip().removeprefix('W/') for c in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates
+
+
+def promote_next_queued_task(tasks_data):
+    """Move the head of bot_queue into an empty bot_current. Returns the promoted id."""
+    lanes = tasks_data.setdefault('lanes', {})
+    bot_current = lanes.get('bot_current', [])
+    bot_queue = lanes.get('bot_queue', [])
+    if len(bot_current) != 0 or len(bot_queue) == 0:
+        return None
+
+    # Move first task from queue to current
+    next_task_id = bot_queue.pop(0)
+    bot_current.append(next_task_id)
+
+    # Update task status
+    if next_task_id in tasks_data.get('tasks', {}):
+        tasks_data['tasks'][next_task_id]['status'] = 'in_progress'
+        tasks_data['tasks'][next_task_id]['started_at'] = datetime.now(timezone.utc).isoformat()
+
+    lanes['bot_current'] = bot_current
+    lanes['bot_queue'] = bot_queue
+    tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+    return next_task_id
+
+
+class LaneScheduler:
+    """Background promotion of bot_queue into an empty bot_current.
+
+    Promotion used to happen inside GET /api/tasks, so reads wrote tasks.json and
+    promotion only happened while a browser was polling. The scheduler instead
+    wakes when tasks.json changes (inotify on the memory directory where
+    available) and on a fixed interval as a backstop, and keeps GETs read-only.
+    """
+
+    def __init__(self, store, interval=LANE_SCHEDULER_INTERVAL, watcher=None):
+        self.store = store
+        self.interval = interval
+        self.watcher = watcher
+        self._stop = threading.Event()
+        self._thread = None
+        self.promotions = 0
+        self.last_promoted = None
+
+    def run_once(self):
+        """Promote if needed. Returns the promoted task id, or None."""
+        if not self.store.exists():
+            return None
+        lanes = self.store.read().get('lanes', {})
+        if lanes.get('bot_current') or not lanes.get('bot_queue'):
+            return None
+        with self.store.transaction() as txn:
+            promoted = promote_next_queued_task(txn.data)
+            if promoted:
+                txn.commit()
+        if promoted:
+            self.promotions += 1
+            self.last_promoted = promoted
+            print(f"Lane scheduler: promoted {promoted} to bot_current")
+        return promoted
+
+    def start(self):
+        if self._thread is not None:
+            return
+        if self.watcher is None:
+            self.watcher = create_watcher(poll_interval=self.interval, force_poll=MISSION_CONTROL_TAIL_POLL)
+        self.watcher.watch([self.store.path.parent])
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="mc-lane-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        target = str(self.store.path)
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+                self.store.sync_export()
+            except Exception as e:
+                print(f"Lane scheduler error: {e}")
+            # Sleep until tasks.json changes or the backstop interval elapses;
+            # other files in the memory directory don't count.
+            deadline = time.monotonic() + self.interval
+            while not self._stop.is_set():
+                changed, structural = self.watcher.wait(max(0.0, deadline - time.monotonic()))
+                if changed is None or not changed or structural or target in changed:
+                    break
+                if time.monotonic() >= deadline:
+                    break
+        self.watcher.close()
+
+
+LANE_SCHEDULER = LaneScheduler(TASK_STORE)
+
+
 def _autoresearch_paths():
     return autoresearch_engine.autoresearch_paths(REPO_ROOT)
 
@@ -1394,2095 +1906,2058 @@ def get_log_file():
         return str(latest)
     return str(today_path)
 
+# ---- Log event classification ----
+# Tables and patterns are built once at import; the per-line path does one ANSI
+# check, one JSON decode, one scan for event markers and (only for events that
+# carry them) one scan for key=value fields.
+
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+_json_decode = json.JSONDecoder().decode
+
+# Human-readable tool descriptions
+TOOL_DESCRIPTIONS = {
+    "exec": ("💻", "Running a terminal command"),
+    "browser": ("🌐", "Working in the web browser"),
+    "Read": ("📖", "Reading a file"),
+    "Write": ("✏️", "Writing a file"),
+    "Edit": ("📝", "Editing a file"),
+    "web_search": ("🔍", "Searching the web"),
+    "web_fetch": ("📥", "Fetching a web page"),
+    "memory_search": ("🧠", "Searching memory"),
+    "memory_get": ("🧠", "Retrieving memory"),
+    "sessions_spawn": ("🤖", "Starting a sub-agent"),
+    "sessions_send": ("💬", "Messaging a sub-agent"),
+    "sessions_list": ("📋", "Checking active sessions"),
+    "sessions_history": ("📜", "Reading session history"),
+    "image": ("🖼️", "Analyzing an image"),
+    "cron": ("⏰", "Managing a scheduled task"),
+    "message": ("📨", "Sending a message"),
+    "gateway": ("⚙️", "Gateway operation"),
+    "tts": ("🔊", "Converting text to speech"),
+    "canvas": ("🎨", "Rendering a visual"),
+    "session_status": ("📊", "Checking session status"),
+}
+
+# Marker phrase -> (priority, event kind), in priority order. The first marker a
+# message contains wins, matching the order the checks were historically made in.
+# Plain substring tests: markers overlap ("run startool start"), so a single
+# alternation scan could consume a higher-priority marker with a lower one.
+_EVENT_MARKERS = {
+    "tool start": (0, "tool_start"),
+    "tool end": (1, "tool_end"),
+    "tool done": (1, "tool_end"),
+    "run start": (2, "run_start"),
+    "run end": (3, "run_end"),
+    "run done": (3, "run_end"),
+    "run complete": (3, "run_end"),
+    "session state": (4, "session_state"),
+    "prompt start": (5, "prompt_start"),
+    "agent start": (6, "agent_start"),
+    "Unhandled": (7, "error"),
+}
+# One pattern per key, searched independently: a single alternation scan would let
+# an earlier field swallow a later one ("model=gpttool=Read" must still yield tool=Read).
+_EVENT_FIELD_RES = {
+    key: re.compile(key + r'=(\S+)')
+    for key in ("tool", "model", "provider", "messageChannel", "new", "client")
+}
+_TOOLS_FAILED_RE = re.compile(r'\[tools\]\s*(\S+)\s*failed')
+
+_ERROR_FRIENDLY = (
+    ("fetch failed", "Network request failed — connection issue"),
+    ("timeout", "Operation timed out"),
+    ("ECONNREFUSED", "Connection refused — service may be down"),
+    ("tab not found", "Browser tab was closed — reopening"),
+    ("Unknown ref", "Browser page changed — refreshing view"),
+    ("browser failed", "Browser action failed — retrying"),
+)
+
+_SESSION_STATES = {
+    "processing": ("⚡", "Started working"),
+    "idle": ("💤", "Now idle — waiting for next task"),
+}
+
+
 def strip_ansi(text):
     """Remove ANSI escape codes from text"""
-    return re.sub(r'\x1b\[[0-9;]*m', '', text)
+    if '\x1b' not in text:
+        return text
+    return _ANSI_RE.sub('', text)
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_subsystem(raw):
+    """Subsystem name from the _meta.name field (a JSON object or a plain name)."""
+    if not raw.lstrip().startswith("{"):
+        return raw
+    try:
+        parsed = json.loads(raw)
+    except ValueError:
+        return raw
+    if not isinstance(parsed, dict):
+        return raw
+    return parsed.get("subsystem", "")
+
 
 def parse_log_entry(line):
     """Parse a JSON log line into a structured event"""
     try:
-        clean_line = strip_ansi(line.strip())
-        data = json.loads(clean_line)
+        data = _json_decode(strip_ansi(line.strip()))
         meta = data.get("_meta", {})
         timestamp = data.get("time", meta.get("date", ""))
         subsystem_raw = meta.get("name", "")
-        
-        # Extract subsystem name
-        subsystem = ""
-        try:
-            sub_parsed = json.loads(subsystem_raw)
-            subsystem = sub_parsed.get("subsystem", "")
-        except:
-            subsystem = subsystem_raw
-        
+        subsystem = _parse_subsystem(subsystem_raw) if isinstance(subsystem_raw, str) else subsystem_raw
+
         # Get the main message (key "1" or "0")
         msg = data.get("1", data.get("0", ""))
         if isinstance(msg, dict):
             msg = json.dumps(msg)
-        
+
         msg = strip_ansi(str(msg))
         level = meta.get("logLevelName", "INFO")
-        
+
         return {
             "time": timestamp,
             "subsystem": subsystem,
             "message": msg[:200],
             "level": level
         }
-    except:
+    except Exception:
         return None
 
+
+def _event_field(msg, key, default=""):
+    """First value of a key=value field in the message."""
+    match = _EVENT_FIELD_RES[key].search(msg)
+    return match.group(1) if match else default
+
+
+def _error_friendly(msg):
+    """Clean up error messages for humans"""
+    lowered = msg.lower()
+    for needle, friendly in _ERROR_FRIENDLY:
+        if needle in (lowered if needle == "timeout" else msg):
+            return friendly
+    if "[tools]" in msg:
+        # Extract just the tool name and simplify
+        tool_match = _TOOLS_FAILED_RE.search(msg)
+        if tool_match:
+            return f"{tool_match.group(1).title()} operation failed — retrying"
+        return "Tool operation failed — retrying"
+    return msg
+
+
 def categorize_event(entry):
     """Categorize a log entry into activity type with human-readable descriptions"""
     if not entry:
         return None
-    
+
     msg = entry.get("message", "")
     sub = entry.get("subsystem", "")
-    
-    # Human-readable tool descriptions
-    tool_descriptions = {
-        "exec": ("💻", "Running a terminal command"),
-        "browser": ("🌐", "Working in the web browser"),
-        "Read": ("📖", "Reading a file"),
-        "Write": ("✏️", "Writing a file"),
-        "Edit": ("📝", "Editing a file"),
-        "web_search": ("🔍", "Searching the web"),
-        "web_fetch": ("📥", "Fetching a web page"),
-        "memory_search": ("🧠", "Searching memory"),
-        "memory_get": ("🧠", "Retrieving memory"),
-        "sessions_spawn": ("🤖", "Starting a sub-agent"),
-        "sessions_send": ("💬", "Messaging a sub-agent"),
-        "sessions_list": ("📋", "Checking active sessions"),
-        "sessions_history": ("📜", "Reading session history"),
-        "image": ("🖼️", "Analyzing an image"),
-        "cron": ("⏰", "Managing a scheduled task"),
-        "message": ("📨", "Sending a message"),
-        "gateway": ("⚙️", "Gateway operation"),
-        "tts": ("🔊", "Converting text to speech"),
-        "canvas": ("🎨", "Rendering a visual"),
-        "session_status": ("📊", "Checking session status"),
-    }
-    
-    # Tool calls
-    if "tool start" in msg:
-        tool_match = re.search(r'tool=(\S+)', msg)
-        tool = tool_match.group(1) if tool_match else "unknown"
-        icon, desc = tool_descriptions.get(tool, ("🔧", f"Using {tool}"))
+
+    kind = None
+    best = len(_EVENT_MARKERS)
+    for marker, (priority, marker_kind) in _EVENT_MARKERS.items():
+        if marker in msg:
+            best, kind = priority, marker_kind
+            break
+    if entry.get("level") == "ERROR" and (kind is None or best > _EVENT_MARKERS["Unhandled"][0]):
+        kind = "error"
+
+    if kind == "tool_start":
+        tool = _event_field(msg, "tool", "unknown")
+        icon, desc = TOOL_DESCRIPTIONS.get(tool, ("🔧", f"Using {tool}"))
         return {"type": "tool_start", "tool": tool, "icon": icon, "friendly": desc}
-    
-    if "tool end" in msg or "tool done" in msg:
-        tool_match = re.search(r'tool=(\S+)', msg)
-        tool = tool_match.group(1) if tool_match else "unknown"
-        icon, desc = tool_descriptions.get(tool, ("✅", f"Finished {tool}"))
+
+    if kind == "tool_end":
+        tool = _event_field(msg, "tool", "unknown")
+        _icon, desc = TOOL_DESCRIPTIONS.get(tool, ("✅", f"Finished {tool}"))
         return {"type": "tool_end", "tool": tool, "icon": "✅", "friendly": f"Done: {desc.lower()}"}
-    
-    # Run lifecycle
-    if "run start" in msg:
-        model_match = re.search(r'model=(\S+)', msg)
-        model = model_match.group(1) if model_match else ""
-        provider_match = re.search(r'provider=(\S+)', msg)
-        provider = provider_match.group(1) if provider_match else ""
-        channel_match = re.search(r'messageChannel=(\S+)', msg)
-        channel = channel_match.group(1) if channel_match else ""
+
+    if kind == "run_start":
+        channel = _event_field(msg, "messageChannel")
         friendly = "Processing a new request"
         if channel:
             friendly += f" from {channel.title()}"
-        return {"type": "run_start", "model": model, "provider": provider, "icon": "🧠", "friendly": friendly}
-    
-    if "run end" in msg or "run done" in msg or "run complete" in msg:
+        return {"type": "run_start", "model": _event_field(msg, "model"),
+                "provider": _event_field(msg, "provider"),
+                "icon": "🧠", "friendly": friendly}
+
+    if kind == "run_end":
         return {"type": "run_end", "icon": "🏁", "friendly": "Finished processing request"}
-    
-    # Session state
-    if "session state" in msg:
-        state_match = re.search(r'new=(\S+)', msg)
-        state = state_match.group(1) if state_match else ""
-        if state == "processing":
-            return {"type": "session_state", "state": state, "icon": "⚡", "friendly": "Started working"}
-        elif state == "idle":
-            return {"type": "session_state", "state": state, "icon": "💤", "friendly": "Now idle — waiting for next task"}
-        return {"type": "session_state", "state": state, "icon": "📊", "friendly": f"Session state: {state}"}
-    
-    # Prompt
-    if "prompt start" in msg:
+
+    if kind == "session_state":
+        state = _event_field(msg, "new")
+        icon, friendly = _SESSION_STATES.get(state, ("📊", f"Session state: {state}"))
+        return {"type": "session_state", "state": state, "icon": icon, "friendly": friendly}
+
+    if kind == "prompt_start":
         return {"type": "prompt_start", "icon": "💭", "friendly": "Thinking about how to respond..."}
-    
-    if "agent start" in msg:
+
+    if kind == "agent_start":
         return {"type": "agent_start", "icon": "🤖", "friendly": "AI agent activated"}
-    
-    # Errors
-    if entry.get("level") == "ERROR" or "Unhandled" in msg:
-        # Clean up error messages for humans
-        friendly = msg
-        if "fetch failed" in msg:
-            friendly = "Network request failed — connection issue"
-        elif "timeout" in msg.lower():
-            friendly = "Operation timed out"
-        elif "ECONNREFUSED" in msg:
-            friendly = "Connection refused — service may be down"
-        elif "tab not found" in msg:
-            friendly = "Browser tab was closed — reopening"
-        elif "Unknown ref" in msg:
-            friendly = "Browser page changed — refreshing view"
-        elif "browser failed" in msg:
-            friendly = "Browser action failed — retrying"
-        elif "[tools]" in msg:
-            # Extract just the tool name and simplify
-            tool_match = re.search(r'\[tools\]\s*(\S+)\s*failed', msg)
-            if tool_match:
-                friendly = f"{tool_match.group(1).title()} operation failed — retrying"
-            else:
-                friendly = "Tool operation failed — retrying"
-        return {"type": "error", "icon": "⚠️", "friendly": friendly[:120]}
-    
+
+    if kind == "error":
+        return {"type": "error", "icon": "⚠️", "friendly": _error_friendly(msg)[:120]}
+
     # WebSocket / connections
     if "connected" in msg and "ws" in sub:
-        client_match = re.search(r'client=(\S+)', msg)
-        client = client_match.group(1) if client_match else "unknown"
+        client = _event_field(msg, "client", "unknown")
         return {"type": "connection", "icon": "🔌", "friendly": f"New connection: {client}"}
-    
+
     # Telegram
     if "telegram" in sub.lower():
-        if "message" in msg.lower() or "send" in msg.lower():
+        lowered = msg.lower()
+        if "message" in lowered or "send" in lowered:
             return {"type": "telegram", "icon": "📱", "friendly": "Telegram message activity"}
         return None  # Skip noisy telegram events
-    
+
     return None
 
-def tail_log():
-    """Background thread that tails the log file"""
-    global activity_state
-    
-    current_file = None
-    file_handle = None
-    file_pos = 0
-    
-    while True:
-        try:
-            log_file = get_log_file()
-            
-            # Handle log file rotation
-            if log_file != current_file:
-                if file_handle:
-                    file_handle.close()
-                current_file = log_file
-                if os.path.exists(log_file):
-                    file_handle = open(log_file, 'r', encoding='utf-8', errors='replace')
-                    # Start from near end for existing files
-                    file_handle.seek(0, 2)  # End of file
-                    size = file_handle.tell()
-                    # Read last 50KB for initial state
-                    start_pos = max(0, size - 50000)
-                    file_handle.seek(start_pos)
-                    if start_pos > 0:
-                        file_handle.readline()  # Skip partial line
-                    file_pos = file_handle.tell()
-                else:
-                    file_handle = None
-                    time.sleep(5)
-                    continue
-            
-            if not file_handle:
-                time.sleep(5)
-                continue
-            
-            # Read new lines
-            new_lines = file_handle.readlines()
-            
-            if new_lines:
-                with state_lock:
-                    for line in new_lines:
-                        entry = parse_log_entry(line)
-                        if not entry:
-                            continue
-                        
-                        cat = categorize_event(entry)
-                        if not cat:
-                            continue
-                        
-                        event = {
-                            "time": entry["time"],
-                            "type": cat["type"],
-                            "icon": cat["icon"],
-                            "message": cat.get("friendly", entry["message"][:150]),
-                            "subsystem": entry["subsystem"]
-                        }
-                        
-                        # Update state based on event type
-                        if cat["type"] == "tool_start":
-                            activity_state["status"] = "working"
-                            activity_state["currentTool"] = cat.get("tool", "unknown")
-                            activity_state["currentTask"] = cat.get("friendly", f"Using {cat.get('tool', 'tool')}")
-                            activity_state["stats"]["toolCalls"] += 1
-                        
-                        elif cat["type"] == "tool_end":
-                            activity_state["currentTool"] = None
-                        
-                        elif cat["type"] == "run_start":
-                            activity_state["status"] = "thinking"
-                            activity_state["statusSince"] = entry["time"]
-                            activity_state["currentTask"] = cat.get("friendly", "Processing request...")
-                            if cat.get("model"):
-                                activity_state["sessionInfo"]["model"] = cat["model"]
-                            if cat.get("provider"):
-                                activity_state["sessionInfo"]["provider"] = cat["provider"]
-                        
-                        elif cat["type"] == "run_end":
-                            activity_state["status"] = "idle"
-                            activity_state["statusSince"] = entry["time"]
-                            activity_state["currentTask"] = None
-                            activity_state["currentTool"] = None
-                            activity_state["stats"]["runsCompleted"] += 1
-                        
-                        elif cat["type"] == "session_state":
-                            state = cat.get("state", "")
-                            if state == "processing":
-                                activity_state["status"] = "working"
-                            elif state == "idle":
-                                activity_state["status"] = "idle"
-                                activity_state["currentTask"] = None
-                                activity_state["currentTool"] = None
-                        
-                        elif cat["type"] == "prompt_start":
-                            activity_state["status"] = "thinking"
-                            activity_state["currentTask"] = cat.get("friendly", "Thinking...")
-                        
-                        elif cat["type"] == "agent_start":
-                            activity_state["status"] = "working"
-                            activity_state["currentTask"] = cat.get("friendly", "Processing...")
-                        
-                        elif cat["type"] == "error":
-                            activity_state["stats"]["errorsToday"] += 1
-                            activity_state["stats"]["lastError"] = entry["message"][:100]
-                        
-                        # Add to recent events (keep last 50)
-                        activity_state["recentEvents"].insert(0, event)
-                        activity_state["recentEvents"] = activity_state["recentEvents"][:50]
-                    
-                    activity_state["lastUpdate"] = datetime.now(timezone.utc).isoformat()
-        
-        except Exception as e:
-            print(f"Log tail error: {e}")
-            if file_handle:
-                try:
-                    file_handle.close()
-                except:
-                    pass
-                file_handle = None
-                current_file = None
-        
-        time.sleep(2)  # Poll every 2 seconds
 
+class EventBuffer:
+    """Fixed-capacity ring buffer of activity events with monotonically increasing seq ids.
 
-class ActivityHandler(http.server.SimpleHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory=DASHBOARD_DIR, **kwargs)
+    Event n lives in slot n % capacity, so appends and cursor lookups are O(1)
+    and a page costs only the events it returns.
+    """
 
-    def _check_auth(self):
-        """Check ?key= param or session cookie. Returns True, False, or 'redirect'."""
-        if MISSION_CONTROL_DISABLE_AUTH:
-            return True
+    def __init__(self, capacity=MISSION_CONTROL_EVENT_HISTORY):
+        self.capacity = max(1, int(capacity))
+        self._slots = [None] * self.capacity
+        self._latest = 0  # seq of the newest event; 0 when empty
+        self._lock = threading.Lock()
 
-        # Localhost always allowed
-        client_ip = self.client_address[0]
-        if client_ip in ("127.0.0.1", "::1"):
-            return True
+    @property
+    def latest_seq(self):
+        return self._latest
 
-        # Allow trusted LAN clients without cookie/key to keep mobile access frictionless.
-        if MISSION_CONTROL_TRUST_LAN and _is_private_client_ip(client_ip):
-            return True
+    @property
+    def oldest_seq(self):
+        """Seq of the oldest event still held (latest + 1 when empty)."""
+        return max(1, self._latest - self.capacity + 1)
 
-        # Check query param for key
-        parsed = urlparse(self.path)
-        params = parse_qs(parsed.query)
-        if params.get("key", [None])[0] == DASHBOARD_KEY:
-            session_id = secrets.token_hex(16)
-            _valid_sessions[session_id] = time.time()
-            self.send_response(302)
-            self.send_header("Set-Cookie", f"mc_session={session_id}; Path=/; HttpOnly; SameSite=Strict; Max-Age=86400")
-            self.send_header("Location", parsed.path or "/")
-            self.end_headers()
-            return "redirect"
+    def __len__(self):
+        return min(self._latest, self.capacity)
 
-        # Check cookie
-        cookie_header = self.headers.get("Cookie", "")
-        if cookie_header:
-            cookies = http.cookies.SimpleCookie()
-            try:
-                cookies.load(cookie_header)
-                session = cookies.get("mc_session")
-                if session and session.value in _valid_sessions:
-                    if time.time() - _valid_sessions[session.value] < 86400:
-                        return True
-                    else:
-                        del _valid_sessions[session.value]
-            except Exception:
-                pass
+    def append(self, event):
+        """Stamp event with the next seq and store it, evicting the oldest when full."""
+        with self._lock:
+            self._latest += 1
+            event["seq"] = self._latest
+            self._slots[self._latest % self.capacity] = event
+        return event
 
-        return False
+    def recent(self, limit=RECENT_EVENTS_LIMIT):
+        """Newest events first, at most limit."""
+        with self._lock:
+            latest = self._latest
+            count = min(limit, latest, self.capacity)
+            return [self._slots[seq % self.capacity] for seq in range(latest, latest - count, -1)]
 
-    def do_POST(self):
-        auth = self._check_auth()
-        if auth == "redirect":
-            return
-        if not auth:
-            self.send_response(403)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(b'{"error": "Access denied"}')
-            return
+    def since(self, cursor=0, limit=EVENTS_PAGE_LIMIT):
+        """Events with seq > cursor, oldest first, at most limit.
 
-        path = self.path.split('?')[0]
+        Returns (events, truncated) where truncated is True when events after
+        the cursor were already evicted from the buffer.
+        """
+        with self._lock:
+            oldest = max(1, self._latest - self.capacity + 1)
+            start = max(cursor + 1, oldest)
+            end = min(self._latest, start + max(0, limit) - 1)
+            events = [self._slots[seq % self.capacity] for seq in range(start, end + 1)]
+            truncated = cursor + 1 < oldest and self._latest > 0
+        return events, truncated
 
-        if path == '/api/model-select':
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except Exception:
-                data = {}
 
-            model = data.get('model')
-            if not isinstance(model, str) or not model.strip():
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "model is required"}).encode('utf-8'))
-                return
+recent_events = EventBuffer()
 
-            try:
-                normalized_model = model.strip()
-                selector_state = load_models_state()
-                allowed_models = {
-                    str(item.get("key") or "").strip()
-                    for item in selector_state.get("models", [])
-                    if isinstance(item, dict) and str(item.get("key") or "").strip()
-                }
-                if allowed_models and normalized_model not in allowed_models:
-                    self.send_response(400)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({
-                        "error": (
-                            f'Model "{normalized_model}" is not available in Mission Control. '
-                            "Pick one of the displayed models."
-                        )
-                    }).encode('utf-8'))
-                    return
-                # If switching to an LM Studio model, unload current model first
-                # and load the new one (LM Studio can only run one large model at a time)
-                if _is_lmstudio_model(normalized_model):
-                    lms_model_id = normalized_model.split("/", 1)[1]
-                    ctx = _resolve_lmstudio_context_length(lms_model_id)
-                    lms_switch_model(lms_model_id, context_length=ctx)
-                run_models_cli(["set", normalized_model])
-                # Keep runtime session metadata in sync so switching from the UI is immediate.
-                sync_result = sync_main_session_model_in_stores(normalized_model)
-                prime_models_cache_default(normalized_model)
-                start_models_refresh_if_needed(force=True)
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                response = {
-                    "ok": True,
-                    "defaultModel": normalized_model,
-                    "runtimeSyncedStores": sync_result.get("updated", 0),
-                }
-                sync_errors = sync_result.get("errors") or []
-                if sync_errors:
-                    response["syncErrors"] = sync_errors
-                self.wfile.write(json.dumps(response).encode('utf-8'))
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
-            return
 
-        if path == '/api/autoresearch/start':
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except Exception:
-                data = {}
+# Fields of activity_state that are pushed as deltas on the live stream.
+_STREAM_STATE_FIELDS = ("status", "statusSince", "currentTask", "currentTool", "sessionInfo", "stats")
 
-            try:
-                config = _build_autoresearch_config(data)
-                status = _launch_autoresearch_run(config)
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"ok": True, "run": status}, ensure_ascii=False).encode('utf-8'))
-            except Exception as e:
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}, ensure_ascii=False).encode('utf-8'))
-            return
 
-        if path == '/api/autoresearch/stop':
-            try:
-                result = _stop_autoresearch_run()
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps(result, ensure_ascii=False).encode('utf-8'))
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}, ensure_ascii=False).encode('utf-8'))
-            return
+def _stream_state_snapshot():
+    """Copy of the streamed activity fields (call with state_lock held)."""
+    return {
+        field: dict(value) if isinstance(value, dict) else value
+        for field, value in ((f, activity_state[f]) for f in _STREAM_STATE_FIELDS)
+    }
 
-        if path == '/api/autoresearch/clear':
-            try:
-                result = _clear_autoresearch_history()
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps(result, ensure_ascii=False).encode('utf-8'))
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}, ensure_ascii=False).encode('utf-8'))
-            return
 
-        if path == '/api/research-queue':
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except Exception:
-                data = {}
-            action = data.get('action', 'toggle')
-            try:
-                result = _update_research_queue(data)
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps(result, ensure_ascii=False).encode('utf-8'))
-            except Exception as e:
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}, ensure_ascii=False).encode('utf-8'))
-            return
+def _format_sse(event, payload, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    lines.append(f"data: {data}")
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
 
-        if path == '/api/tasks':
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except Exception:
-                data = {}
 
-            action = data.get('action')
-            if action != 'update_project':
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "unsupported action for POST /api/tasks"}).encode('utf-8'))
-                return
+class _StreamClient:
+    """An attached stream socket and the bytes still waiting to be written to it."""
 
-            task_id = data.get('task_id')
-            project = data.get('project')
-            if not isinstance(task_id, str) or not task_id.strip():
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "task_id is required"}).encode('utf-8'))
-                return
-            if not isinstance(project, str) or not project.strip():
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "project is required"}).encode('utf-8'))
-                return
+    def __init__(self, sock):
+        self.sock = sock
+        self.pending = collections.deque()
+        self.buffered = 0
+        self.registered = False
 
-            tasks_file = os.path.join(WORKSPACE_DIR, "memory", "tasks.json")
-            try:
-                tasks_data = load_json_file(tasks_file)
-                tasks = tasks_data.get('tasks', {}) if isinstance(tasks_data, dict) else {}
-                task = tasks.get(task_id.strip()) if isinstance(tasks, dict) else None
-                if not isinstance(task, dict):
-                    self.send_response(404)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": f"task not found: {task_id}"}).encode('utf-8'))
-                    return
-
-                task['project'] = project.strip()
-                task['project_source'] = 'manual'
-                task['updated_at'] = datetime.now(timezone.utc).isoformat()
-                tasks_data['updated_at'] = task['updated_at']
-
-                with open(tasks_file, 'w', encoding='utf-8') as f:
-                    json.dump(tasks_data, f, indent=2, ensure_ascii=False)
-
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({
-                    "ok": True,
-                    "task_id": task_id.strip(),
-                    "project": project.strip()
-                }).encode('utf-8'))
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
-            return
-        
-        # Agent profile API - POST to save agent MD file
-        if path == '/api/agent-profile':
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except:
-                data = {}
-            
-            agent_type = data.get('agent')
-            content = data.get('content')
-            
-            agent_files = {
-                'research': 'agents/research-agent.md',
-                'content': 'agents/content-agent.md',
-                'audit': 'agents/audit-agent.md',
-                'analytics': 'agents/analytics-agent.md',
-                'code': 'agents/code-agent.md'
-            }
-            
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            
-            if not agent_type or agent_type not in agent_files:
-                self.wfile.write(json.dumps({"error": f"Invalid agent type: {agent_type}"}).encode())
-                return
-            
-            if not content:
-                self.wfile.write(json.dumps({"error": "Content required"}).encode())
-                return
-            
-            agent_path = os.path.join(WORKSPACE_DIR, agent_files[agent_type])
-            try:
-                with open(agent_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                self.wfile.write(json.dumps({"ok": True, "message": "Agent profile saved"}).encode())
-            except Exception as e:
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
+
+class ActivityStream:
+    """Fan-out of live activity to Server-Sent Events clients.
+
+    Attached sockets are owned by one broadcaster thread rather than by HTTP
+    workers, so open dashboards do not pin the request pool. Each message is
+    serialised once and queued on every client; sockets are non-blocking and
+    flushed as they become writable, so a stalled client never delays the
+    others. A client whose unsent bytes exceed buffer_bytes is dropped and
+    reconnects via EventSource.
+    """
+
+    def __init__(self, max_clients=MISSION_CONTROL_STREAM_CLIENTS, heartbeat=STREAM_HEARTBEAT_SECONDS,
+                 buffer_bytes=STREAM_CLIENT_BUFFER_BYTES):
+        self.max_clients = max_clients
+        self.heartbeat = heartbeat
+        self.buffer_bytes = buffer_bytes
+        self._queue = queue.Queue()
+        self._clients = {}  # socket -> _StreamClient, touched only by the broadcaster
+        self._slots = 0  # attached plus reserved clients
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._thread = None
+        self._wake = None
+        self._selector = None
+        self._high_level_task = None
+
+    @property
+    def client_count(self):
+        with self._lock:
+            return self._slots
+
+    def has_clients(self):
+        return self._slots > 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._wake = socket.socketpair()
+                for sock in self._wake:
+                    sock.setblocking(False)
+                self._thread = threading.Thread(target=self._run, name="mc-activity-stream", daemon=True)
+                self._thread.start()
+
+    def reserve(self):
+        """Claim a client slot before any response bytes are sent; False when full."""
+        with self._lock:
+            if self._slots >= self.max_clients:
+                return False
+            self._slots += 1
+            return True
+
+    def release(self):
+        """Give back a slot from reserve() that will not be attached."""
+        with self._lock:
+            self._slots -= 1
+
+    def attach(self, sock, snapshot, reserved=False):
+        """Queue a client for attachment; it is sent `snapshot` before any later delta.
+
+        Call with state_lock held so no ingest batch can slip between the
+        snapshot and the client joining the broadcast list. With reserved=True
+        the slot taken by reserve() is used and attaching cannot fail.
+        """
+        if not reserved and not self.reserve():
+            return False
+        self.start()
+        self._high_level_task = snapshot.get("highLevelTask")
+        self._put("attach", sock, _format_sse("snapshot", snapshot, self._take_id()))
+        return True
+
+    def publish(self, payload):
+        """Broadcast an activity delta. A no-op when nobody is listening."""
+        if not self.has_clients():
             return
-        
-        if path == '/api/delete-cron':
-            # Read request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except:
-                data = {}
-            
-            cron_id = data.get('cronId')
-            if not cron_id:
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "cronId required"}).encode())
-                return
-            
-            # Load cron-jobs.json (the actual source of cron jobs)
-            cron_file = os.path.join(DASHBOARD_DIR, "cron-jobs.json")
-            try:
-                if os.path.exists(cron_file):
-                    with open(cron_file, 'r', encoding='utf-8') as f:
-                        cron_data = json.load(f)
-                else:
-                    cron_data = {"jobs": [], "total": 0}
-                
-                jobs = cron_data.get('jobs', [])
-                
-                # Find and remove the job
-                job_found = False
-                new_jobs = []
-                for job in jobs:
-                    if job.get('id') == cron_id:
-                        job_found = True
+        self._put("message", None, _format_sse("activity", payload, self._take_id()))
+
+    def close(self):
+        with self._lock:
+            running = self._thread is not None
+        if running:
+            self._put("close", None, None)
+
+    def _take_id(self):
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    def _put(self, kind, sock, payload):
+        self._queue.put((kind, sock, payload))
+        wake = self._wake
+        if wake is None:
+            return  # not started yet; the broadcaster drains the queue when it is
+        try:
+            wake[1].send(b"\0")
+        except OSError:
+            pass  # the wake socket is already readable, or the stream is closing
+
+    def _run(self):
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._wake[0], selectors.EVENT_READ)
+        last_beat = time.monotonic()
+        try:
+            while True:
+                timeout = max(0.0, self.heartbeat - (time.monotonic() - last_beat))
+                for key, _events in self._selector.select(timeout):
+                    if key.data is None:
+                        try:
+                            self._wake[0].recv(4096)
+                        except BlockingIOError:
+                            pass
                     else:
-                        new_jobs.append(job)
-                
-                if not job_found:
-                    self.send_response(400)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": f"{cron_id} not found in cron jobs"}).encode())
-                    return
-                
-                # Update and save
-                cron_data['jobs'] = new_jobs
-                cron_data['total'] = len(new_jobs)
-                cron_data['updated'] = datetime.now(timezone.utc).isoformat()
-                
-                with open(cron_file, 'w', encoding='utf-8') as f:
-                    json.dump(cron_data, f, indent=2, ensure_ascii=False)
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({
-                    "success": True,
-                    "message": f"Deleted {cron_id}",
-                    "cronId": cron_id,
-                    "remaining": len(new_jobs)
-                }).encode())
-                return
-                
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
-                return
-        
-        if path == '/api/restore-task':
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except:
-                data = {}
-            
-            task_id = data.get('taskId')
-            if not task_id:
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "taskId required"}).encode())
-                return
-            
-            tasks_file = os.path.join(WORKSPACE_DIR, "memory", "tasks.json")
-            try:
-                tasks_data = load_json_file(tasks_file)
-                
-                trash = tasks_data.get('lanes', {}).get('trash', [])
-                if task_id not in trash:
-                    self.send_response(400)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": f"{task_id} not in trash"}).encode())
-                    return
-                
-                # Get original lane or default to bot_queue
-                task = tasks_data.get('tasks', {}).get(task_id, {})
-                restore_to = task.get('deleted_from', 'bot_queue')
-                if restore_to == 'done_today':
-                    restore_to = 'bot_queue'  # Don't restore to done
-                
-                # Remove from trash
-                trash.remove(task_id)
-                tasks_data['lanes']['trash'] = trash
-                
-                # Add to restore lane
-                if restore_to not in tasks_data['lanes']:
-                    tasks_data['lanes'][restore_to] = []
-                tasks_data['lanes'][restore_to].append(task_id)
-                
-                # Update task status
-                if task_id in tasks_data.get('tasks', {}):
-                    tasks_data['tasks'][task_id]['status'] = 'pending'
-                    del tasks_data['tasks'][task_id]['deleted_at']
-                    if 'deleted_from' in tasks_data['tasks'][task_id]:
-                        del tasks_data['tasks'][task_id]['deleted_from']
-                
-                tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-                
-                with open(tasks_file, 'w', encoding='utf-8') as f:
-                    json.dump(tasks_data, f, indent=4, ensure_ascii=False)
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({
-                    "success": True,
-                    "message": f"Restored {task_id}",
-                    "restoredTo": restore_to
-                }).encode())
-                return
-                
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
-                return
-        
-        if path == '/api/permanent-delete':
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except:
-                data = {}
-            
-            task_id = data.get('taskId')
-            if not task_id:
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "taskId required"}).encode())
-                return
-            
-            tasks_file = os.path.join(WORKSPACE_DIR, "memory", "tasks.json")
-            try:
-                tasks_data = load_json_file(tasks_file)
-                
-                trash = tasks_data.get('lanes', {}).get('trash', [])
-                if task_id not in trash:
-                    self.send_response(400)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": f"{task_id} not in trash"}).encode())
-                    return
-                
-                # Remove from trash
-                trash.remove(task_id)
-                tasks_data['lanes']['trash'] = trash
-                
-                # Remove task entirely
-                if task_id in tasks_data.get('tasks', {}):
-                    del tasks_data['tasks'][task_id]
-                
-                tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-                
-                with open(tasks_file, 'w', encoding='utf-8') as f:
-                    json.dump(tasks_data, f, indent=4, ensure_ascii=False)
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({
-                    "success": True,
-                    "message": f"Permanently deleted {task_id}"
-                }).encode())
-                return
-                
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
-                return
-        
-        if path == '/api/read-file':
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except:
-                data = {}
-            
-            file_path = data.get('path')
-            if not file_path:
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "path required"}).encode())
-                return
-            
-            # Security: only allow reading from workspace
-            resolved_path = resolve_workspace_path(file_path)
-            if resolved_path is None:
-                self.send_response(403)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "Access denied - path outside workspace"}).encode())
-                return
-            
-            try:
-                if resolved_path.exists():
-                    with resolved_path.open('r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    # Limit size for safety
-                    if len(content) > 50000:
-                        content = content[:50000] + '\n\n... [truncated - file too large]'
-                    
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({
-                        "success": True,
-                        "content": content,
-                        "path": file_path
-                    }).encode())
-                else:
-                    self.send_response(404)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": f"File not found: {file_path}"}).encode())
-                return
-                
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
-                return
-        
-        if path == '/api/update-cron':
-            # Read request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except:
-                data = {}
-            
-            cron_id = data.get('cronId')
-            if not cron_id:
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "cronId required"}).encode())
-                return
-            
-            # Load tasks.json
-            tasks_file = os.path.join(WORKSPACE_DIR, "memory", "tasks.json")
-            try:
-                tasks_data = load_json_file(tasks_file)
-                
-                if cron_id not in tasks_data.get('tasks', {}):
-                    self.send_response(400)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": f"{cron_id} not found"}).encode())
-                    return
-                
-                # Update cron fields
-                cron = tasks_data['tasks'][cron_id]
-                if 'schedule' in data:
-                    cron['schedule'] = data['schedule']
-                if 'plan' in data:
-                    cron['plan'] = data['plan']
-                if 'nextRun' in data:
-                    cron['nextRun'] = data['nextRun']
-                
-                tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-                
-                # Write back
-                with open(tasks_file, 'w', encoding='utf-8') as f:
-                    json.dump(tasks_data, f, indent=4, ensure_ascii=False)
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({
-                    "success": True,
-                    "message": f"Updated {cron_id}",
-                    "cronId": cron_id
-                }).encode())
-                return
-                
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
-                return
-        
-        if path == '/api/transfer-task':
-            # Read request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
+                        self._flush(key.data)
+                while True:
+                    try:
+                        kind, sock, payload = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if kind == "close":
+                        return
+                    if kind == "attach":
+                        sock.setblocking(False)
+                        client = self._clients[sock] = _StreamClient(sock)
+                        self._send(client, b"retry: 3000\n" + payload)
+                    else:
+                        self._send_all(payload)
+                if time.monotonic() - last_beat >= self.heartbeat:
+                    last_beat = time.monotonic()
+                    if self._clients:
+                        self._send_all(b": ping\n\n")
+                        self._check_high_level_task()
+        finally:
+            for client in list(self._clients.values()):
+                self._drop(client)
+            self._selector.close()
+            for sock in self._wake:
+                sock.close()
+            with self._lock:
+                self._thread = None
+
+    def _check_high_level_task(self):
+        # state.json is read once per heartbeat for all clients, not per client poll.
+        try:
+            task = load_current_task()
+        except Exception:
+            return
+        if task != self._high_level_task:
+            self._high_level_task = task
+            self._send_all(_format_sse("activity", {"state": {"highLevelTask": task}}, self._take_id()))
+
+    def _send_all(self, payload):
+        for client in list(self._clients.values()):
+            self._send(client, payload)
+
+    def _send(self, client, payload):
+        if client.buffered + len(payload) > self.buffer_bytes:
+            self._drop(client)
+            return
+        client.pending.append(memoryview(payload))
+        client.buffered += len(payload)
+        self._flush(client)
+
+    def _flush(self, client):
+        """Write as much pending data as the socket takes without blocking."""
+        while client.pending:
             try:
-                data = json.loads(body) if body else {}
-            except:
-                data = {}
-            
-            task_id = data.get('taskId')
-            from_lane = data.get('fromLane')
-            to_lane = data.get('toLane')
-            
-            if not task_id or not from_lane or not to_lane:
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "taskId, fromLane, and toLane required"}).encode())
+                sent = client.sock.send(client.pending[0])
+            except BlockingIOError:
+                break
+            except OSError:
+                self._drop(client)
                 return
+            client.buffered -= sent
+            if sent < len(client.pending[0]):
+                client.pending[0] = client.pending[0][sent:]
+                break
+            client.pending.popleft()
+        if client.pending and not client.registered:
+            self._selector.register(client.sock, selectors.EVENT_WRITE, client)
+            client.registered = True
+        elif not client.pending and client.registered:
+            self._selector.unregister(client.sock)
+            client.registered = False
+
+    def _drop(self, client):
+        if self._clients.pop(client.sock, None) is None:
+            return
+        if client.registered:
+            self._selector.unregister(client.sock)
+        with self._lock:
+            self._slots -= 1
+        _close_socket(client.sock)
+
+
+def _close_socket(sock):
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+    try:
+        sock.close()
+    except OSError:
+        pass
+
+
+activity_stream = ActivityStream()
+
+
+def ingest_log_lines(lines):
+    """Apply a batch of raw log lines to the shared activity state."""
+    if not lines:
+        return
+    with state_lock:
+        streaming = activity_stream.has_clients()
+        before = _stream_state_snapshot() if streaming else None
+        new_events = []
+        for line in lines:
+            entry = parse_log_entry(line)
+            if not entry:
+                continue
             
-            # Load tasks.json
-            tasks_file = os.path.join(WORKSPACE_DIR, "memory", "tasks.json")
-            try:
-                tasks_data = load_json_file(tasks_file)
-                
-                from_list = tasks_data.get('lanes', {}).get(from_lane, [])
-                to_list = tasks_data.get('lanes', {}).get(to_lane, [])
-                
-                if task_id not in from_list:
-                    self.send_response(400)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": f"{task_id} not in {from_lane}"}).encode())
-                    return
-                
-                # Move task
-                from_list.remove(task_id)
-                to_list.append(task_id)
-                
-                tasks_data['lanes'][from_lane] = from_list
-                tasks_data['lanes'][to_lane] = to_list
-                tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-                
-                # Write back
-                with open(tasks_file, 'w', encoding='utf-8') as f:
-                    json.dump(tasks_data, f, indent=4, ensure_ascii=False)
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({
-                    "success": True,
-                    "message": f"Moved {task_id} from {from_lane} to {to_lane}",
-                    "taskId": task_id
-                }).encode())
-                return
-                
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
-                return
-        
-        if path == '/api/delete-task':
-            # Read request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except:
-                data = {}
+            cat = categorize_event(entry)
+            if not cat:
+                continue
             
-            task_id = data.get('taskId')
-            if not task_id:
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "taskId required"}).encode())
-                return
+            event = {
+                "time": entry["time"],
+                "type": cat["type"],
+                "icon": cat["icon"],
+                "message": cat.get("friendly", entry["message"][:150]),
+                "subsystem": entry["subsystem"]
+            }
             
-            # Load tasks.json
-            tasks_file = os.path.join(WORKSPACE_DIR, "memory", "tasks.json")
-            try:
-                tasks_data = load_json_file(tasks_file)
-                
-                # Remove from all lanes
-                removed_from = None
-                for lane_name in ['bot_current', 'bot_queue', 'human', 'done_today']:
-                    lane = tasks_data.get('lanes', {}).get(lane_name, [])
-                    if task_id in lane:
-                        lane.remove(task_id)
-                        tasks_data['lanes'][lane_name] = lane
-                        removed_from = lane_name
-                        break
-                
-                if not removed_from:
-                    self.send_response(400)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": f"{task_id} not found in any lane"}).encode())
-                    return
-                
-                # Move to trash lane
-                if 'trash' not in tasks_data['lanes']:
-                    tasks_data['lanes']['trash'] = []
-                tasks_data['lanes']['trash'].append(task_id)
-                
-                # Mark task with deletion info
-                if task_id in tasks_data.get('tasks', {}):
-                    tasks_data['tasks'][task_id]['status'] = 'trashed'
-                    tasks_data['tasks'][task_id]['deleted_at'] = datetime.now(timezone.utc).isoformat()
-                    tasks_data['tasks'][task_id]['deleted_from'] = removed_from
-                
-                tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-                
-                # Write back
-                with open(tasks_file, 'w', encoding='utf-8') as f:
-                    json.dump(tasks_data, f, indent=4, ensure_ascii=False)
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({
-                    "success": True,
-                    "message": f"Moved {task_id} to trash",
-                    "taskId": task_id
-                }).encode())
-                return
-                
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
-                return
-        
-        if path == '/api/reorder-task':
-            # Read request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except:
-                data = {}
+            # Update state based on event type
+            if cat["type"] == "tool_start":
+                activity_state["status"] = "working"
+                activity_state["currentTool"] = cat.get("tool", "unknown")
+                activity_state["currentTask"] = cat.get("friendly", f"Using {cat.get('tool', 'tool')}")
+                activity_state["stats"]["toolCalls"] += 1
             
-            task_id = data.get('taskId')
-            direction = data.get('direction')  # 'up' or 'down'
+            elif cat["type"] == "tool_end":
+                activity_state["currentTool"] = None
             
-            if not task_id or direction not in ('up', 'down'):
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "taskId and direction (up/down) required"}).encode())
-                return
+            elif cat["type"] == "run_start":
+                activity_state["status"] = "thinking"
+                activity_state["statusSince"] = entry["time"]
+                activity_state["currentTask"] = cat.get("friendly", "Processing request...")
+                if cat.get("model"):
+                    activity_state["sessionInfo"]["model"] = cat["model"]
+                if cat.get("provider"):
+                    activity_state["sessionInfo"]["provider"] = cat["provider"]
             
-            # Load tasks.json
-            tasks_file = os.path.join(WORKSPACE_DIR, "memory", "tasks.json")
-            try:
-                tasks_data = load_json_file(tasks_file)
-                
-                bot_queue = tasks_data.get('lanes', {}).get('bot_queue', [])
-                
-                if task_id not in bot_queue:
-                    self.send_response(400)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": f"{task_id} not in bot_queue"}).encode())
-                    return
-                
-                idx = bot_queue.index(task_id)
-                
-                if direction == 'up' and idx > 0:
-                    # Swap with previous
-                    bot_queue[idx], bot_queue[idx-1] = bot_queue[idx-1], bot_queue[idx]
-                elif direction == 'down' and idx < len(bot_queue) - 1:
-                    # Swap with next
-                    bot_queue[idx], bot_queue[idx+1] = bot_queue[idx+1], bot_queue[idx]
-                else:
-                    self.send_response(400)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": f"Cannot move {direction} from position {idx}"}).encode())
-                    return
-                
-                tasks_data['lanes']['bot_queue'] = bot_queue
-                tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-                
-                # Write back
-                with open(tasks_file, 'w', encoding='utf-8') as f:
-                    json.dump(tasks_data, f, indent=4, ensure_ascii=False)
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({
-                    "success": True,
-                    "message": f"Moved {task_id} {direction}",
-                    "newOrder": bot_queue
-                }).encode())
-                return
-                
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
-                return
-        
-        if path == '/api/request-complete':
-            # Read request body
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except:
-                data = {}
+            elif cat["type"] == "run_end":
+                activity_state["status"] = "idle"
+                activity_state["statusSince"] = entry["time"]
+                activity_state["currentTask"] = None
+                activity_state["currentTool"] = None
+                activity_state["stats"]["runsCompleted"] += 1
             
-            task_id = data.get('taskId')
-            if not task_id:
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "taskId required"}).encode())
-                return
+            elif cat["type"] == "session_state":
+                state = cat.get("state", "")
+                if state == "processing":
+                    activity_state["status"] = "working"
+                elif state == "idle":
+                    activity_state["status"] = "idle"
+                    activity_state["currentTask"] = None
+                    activity_state["currentTool"] = None
             
-            # Load tasks.json
-            tasks_file = os.path.join(WORKSPACE_DIR, "memory", "tasks.json")
-            try:
-                tasks_data = load_json_file(tasks_file)
-                
-                human_lane = tasks_data.get('lanes', {}).get('human', [])
-                bot_current = tasks_data.get('lanes', {}).get('bot_current', [])
-                done_today = tasks_data.get('lanes', {}).get('done_today', [])
-                
-                # Check if this is a Council task (human verifies bot work → goes to done)
-                task_data = tasks_data.get('tasks', {}).get(task_id, {})
-                is_council = task_data.get('title', '').lower().startswith('council')
-                
-                # Council tasks: human clicked "Verify Bot Work" → move to done_today
-                if is_council and task_id in human_lane:
-                    human_lane.remove(task_id)
-                    done_today.insert(0, task_id)
-                    task_data['status'] = 'done'
-                    task_data['completed_at'] = datetime.now(timezone.utc).isoformat()
-                    task_data['verified_by'] = 'human'
-                    tasks_data['tasks'][task_id] = task_data
-                    tasks_data['lanes']['human'] = human_lane
-                    tasks_data['lanes']['done_today'] = done_today
-                    tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-                    
-                    with open(tasks_file, 'w', encoding='utf-8') as f:
-                        json.dump(tasks_data, f, indent=4, ensure_ascii=False)
-                    
-                    self.send_response(200)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({
-                        "success": True,
-                        "message": f"Council {task_id} verified and marked complete!",
-                        "taskId": task_id
-                    }).encode())
-                    return
-                
-                # ALL tasks: human verification is FINAL - move directly to done_today
-                if task_id not in human_lane:
-                    self.send_response(400)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": f"{task_id} not in human lane"}).encode())
-                    return
-                
-                # Remove from human, add to done_today
-                human_lane.remove(task_id)
-                done_today.insert(0, task_id)
-                
-                # Mark task as done (human verified)
-                if task_id in tasks_data.get('tasks', {}):
-                    tasks_data['tasks'][task_id]['status'] = 'done'
-                    tasks_data['tasks'][task_id]['completed_at'] = datetime.now(timezone.utc).isoformat()
-                    tasks_data['tasks'][task_id]['verified_by'] = 'human'
-                
-                tasks_data['lanes']['human'] = human_lane
-                tasks_data['lanes']['done_today'] = done_today
-                tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-                
-                # Write back
-                with open(tasks_file, 'w', encoding='utf-8') as f:
-                    json.dump(tasks_data, f, indent=4, ensure_ascii=False)
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({
-                    "success": True,
-                    "message": f"{task_id} marked complete!",
-                    "taskId": task_id
-                }).encode())
-                return
-                
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
-                return
-        
-        if path == '/api/task-comment':
-            # Add comment to task's discussion array
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except:
-                data = {}
+            elif cat["type"] == "prompt_start":
+                activity_state["status"] = "thinking"
+                activity_state["currentTask"] = cat.get("friendly", "Thinking...")
             
-            task_id = data.get('taskId')
-            message = data.get('message', '').strip()
+            elif cat["type"] == "agent_start":
+                activity_state["status"] = "working"
+                activity_state["currentTask"] = cat.get("friendly", "Processing...")
             
-            if not task_id or not message:
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "taskId and message required"}).encode())
-                return
+            elif cat["type"] == "error":
+                activity_state["stats"]["errorsToday"] += 1
+                activity_state["stats"]["lastError"] = entry["message"][:100]
             
-            tasks_file = os.path.join(WORKSPACE_DIR, "memory", "tasks.json")
-            try:
-                tasks_data = load_json_file(tasks_file)
-                
-                task_data = tasks_data.get('tasks', {}).get(task_id)
-                if not task_data:
-                    self.send_response(404)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": f"Task {task_id} not found"}).encode())
-                    return
-                
-                # Initialize discussion array if not exists
-                if 'discussion' not in task_data:
-                    task_data['discussion'] = []
-                
-                # Add the comment
-                comment = {
-                    "ts": datetime.now(timezone.utc).isoformat(),
-                    "author": "human",
-                    "message": message
-                }
-                task_data['discussion'].append(comment)
-                
-                # Update task and version
-                tasks_data['tasks'][task_id] = task_data
-                tasks_data['version'] = tasks_data.get('version', 0) + 1
-                tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-                
-                with open(tasks_file, 'w', encoding='utf-8') as f:
-                    json.dump(tasks_data, f, indent=4, ensure_ascii=False)
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({
-                    "success": True,
-                    "message": "Comment added",
-                    "taskId": task_id
-                }).encode())
-                return
-                
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
-                return
+            recent_events.append(event)
+            if streaming:
+                new_events.append(event)
         
-        if path == '/api/toggle-crossout':
-            # Toggle crossed_out status on a discussion comment
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
+        activity_state["lastUpdate"] = datetime.now(timezone.utc).isoformat()
+
+        if streaming and new_events:
+            after = _stream_state_snapshot()
+            changed = {field: value for field, value in after.items() if before[field] != value}
+            changed["lastUpdate"] = activity_state["lastUpdate"]
+            activity_stream.publish({"events": new_events, "state": changed})
+
+
+def tail_log():
+    """Background thread that tails the log file"""
+    global log_tailer
+    log_tailer = LogTailer(
+        get_log_file,
+        ingest_log_lines,
+        state_path=LOG_TAIL_STATE_FILE,
+        watch_dirs=[source["dir"] for source in LOG_SOURCES],
+        watcher=create_watcher(force_poll=MISSION_CONTROL_TAIL_POLL),
+    )
+    print(f"Log tailer mode: {log_tailer.watcher.mode}")
+    log_tailer.run()
+
+
+def perf_route(method, path):
+    """Route label for request stats: API paths as-is, everything else (static files) pooled."""
+    path = (path or "").split('?', 1)[0]
+    if not (path.startswith('/api/') or path == '/metrics'):
+        path = 'static'
+    return f"{method} {path}"
+
+
+class RequestStats:
+    """Per-route request counts, latency histograms and response bytes since startup.
+
+    Latency buckets reuse the metrics module's fixed log-scale bounds, so
+    percentiles and Prometheus output match the rest of the metrics export.
+    """
+
+    def __init__(self, slow_ms=MISSION_CONTROL_SLOW_REQUEST_MS, max_routes=PERF_MAX_ROUTES):
+        self.slow_ms = slow_ms
+        self.max_routes = max_routes
+        self.started_at = time.time()
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def record(self, route, status, duration_ms, nbytes):
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                if len(self._routes) >= self.max_routes:
+                    route = "other"
+                stats = self._routes.setdefault(route, {
+                    "count": 0, "errors": 0, "bytes": 0, "totalMs": 0.0, "maxMs": 0.0,
+                    "buckets": [0] * len(metrics.BUCKET_COLUMNS),
+                })
+            stats["count"] += 1
+            stats["errors"] += 1 if status >= 500 else 0
+            stats["bytes"] += nbytes
+            stats["totalMs"] += duration_ms
+            stats["maxMs"] = max(stats["maxMs"], duration_ms)
+            stats["buckets"][metrics.bucket_index(duration_ms)] += 1
+        if duration_ms >= self.slow_ms:
+            print(f"Slow request: {route} -> {status} in {duration_ms:.0f}ms ({nbytes} bytes)", file=sys.stderr)
+
+    def snapshot(self):
+        """Routes ordered by total time spent, heaviest first."""
+        with self._lock:
+            routes = {route: dict(stats, buckets=list(stats["buckets"])) for route, stats in self._routes.items()}
+        rows = []
+        for route, stats in routes.items():
+            rows.append({
+                "route": route,
+                "count": stats["count"],
+                "errors": stats["errors"],
+                "bytes": stats["bytes"],
+                "totalMs": round(stats["totalMs"], 2),
+                "avgMs": round(stats["totalMs"] / stats["count"], 2),
+                "maxMs": round(stats["maxMs"], 2),
+                "p50Ms": round(metrics.histogram_quantile(0.50, stats["buckets"]), 2),
+                "p95Ms": round(metrics.histogram_quantile(0.95, stats["buckets"]), 2),
+                "p99Ms": round(metrics.histogram_quantile(0.99, stats["buckets"]), 2),
+            })
+        rows.sort(key=lambda row: row["totalMs"], reverse=True)
+        return {
+            "since": datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+            "uptimeSeconds": round(time.time() - self.started_at, 1),
+            "slowRequestMs": self.slow_ms,
+            "routes": rows,
+        }
+
+    def prometheus(self):
+        """Request stats in Prometheus text format."""
+        with self._lock:
+            routes = {route: dict(stats, buckets=list(stats["buckets"])) for route, stats in self._routes.items()}
+        lines = [
+            "# HELP clawdbot_http_request_duration_ms Mission Control request latency by route",
+            "# TYPE clawdbot_http_request_duration_ms histogram",
+        ]
+        for route, stats in sorted(routes.items()):
+            label = metrics._prometheus_escape(route)
+            cumulative = 0
+            for bound, count in zip(metrics.HISTOGRAM_BOUNDS + ('+Inf',), stats["buckets"]):
+                cumulative += count
+                lines.append(f'clawdbot_http_request_duration_ms_bucket{{route="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'clawdbot_http_request_duration_ms_sum{{route="{label}"}} {stats["totalMs"]}')
+            lines.append(f'clawdbot_http_request_duration_ms_count{{route="{label}"}} {stats["count"]}')
+        lines.append("# HELP clawdbot_http_request_errors_total Mission Control 5xx responses by route")
+        lines.append("# TYPE clawdbot_http_request_errors_total counter")
+        lines.extend(f'clawdbot_http_request_errors_total{{route="{metrics._prometheus_escape(route)}"}} {stats["errors"]}'
+                     for route, stats in sorted(routes.items()))
+        lines.append("# HELP clawdbot_http_response_bytes_total Mission Control response bytes by route")
+        lines.append("# TYPE clawdbot_http_response_bytes_total counter")
+        lines.extend(f'clawdbot_http_response_bytes_total{{route="{metrics._prometheus_escape(route)}"}} {stats["bytes"]}'
+                     for route, stats in sorted(routes.items()))
+        return '\n'.join(lines) + '\n'
+
+
+REQUEST_STATS = RequestStats()
+
+
+class _CountingWriter:
+    """Wraps a handler's wfile to count response bytes (headers included)."""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self.bytes_written = 0
+
+    def write(self, data):
+        self.bytes_written += len(data)
+        return self._raw.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+
+JSON_CONTENT_TYPE = 'application/json; charset=utf-8'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+NO_CACHE = {'Cache-Control': 'no-cache'}
+CORS = {'Access-Control-Allow-Origin': '*'}
+CORS_NO_CACHE = {**CORS, **NO_CACHE}
+
+
+class RouteRequest:
+    """What a route handler sees: method, path, query parameters, request headers and raw body."""
+
+    def __init__(self, method, path, query="", body=b"", headers=None, handler=None):
+        self.method = method
+        self.path = path
+        if isinstance(query, str):
+            self.query = parse_qs(query)
+        else:
+            self.query = {name: value if isinstance(value, list) else [value] for name, value in (query or {}).items()}
+        self.body = body or b""
+        self.headers = headers if headers is not None else {}
+        self.handler = handler
+        self._json = None
+
+    def arg(self, name, default=None):
+        """First value of a query parameter."""
+        values = self.query.get(name)
+        return values[0] if values else default
+
+    @property
+    def json(self):
+        """The body as a JSON object; empty or malformed bodies read as {} and fail field validation."""
+        if self._json is None:
             try:
-                data = json.loads(body) if body else {}
-            except:
+                data = json.loads(self.body.decode('utf-8')) if self.body else {}
+            except (ValueError, UnicodeDecodeError):
                 data = {}
-            
-            task_id = data.get('taskId')
-            comment_idx = data.get('commentIdx')
-            
-            if not task_id or comment_idx is None:
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "taskId and commentIdx required"}).encode())
-                return
-            
-            tasks_file = os.path.join(WORKSPACE_DIR, "memory", "tasks.json")
-            try:
-                tasks_data = load_json_file(tasks_file)
-                
-                task_data = tasks_data.get('tasks', {}).get(task_id)
-                if not task_data:
-                    self.send_response(404)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": f"Task {task_id} not found"}).encode())
-                    return
-                
-                discussion = task_data.get('discussion', [])
-                if comment_idx < 0 or comment_idx >= len(discussion):
-                    self.send_response(400)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": "Invalid comment index"}).encode())
-                    return
-                
-                # Toggle crossed_out status
-                current = discussion[comment_idx].get('crossed_out', False)
-                discussion[comment_idx]['crossed_out'] = not current
-                
-                # Update task and version
-                task_data['discussion'] = discussion
-                tasks_data['tasks'][task_id] = task_data
-                tasks_data['version'] = tasks_data.get('version', 0) + 1
-                tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-                
-                with open(tasks_file, 'w', encoding='utf-8') as f:
-                    json.dump(tasks_data, f, indent=4, ensure_ascii=False)
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({
-                    "success": True,
-                    "crossed_out": not current,
-                    "taskId": task_id,
-                    "commentIdx": comment_idx
-                }).encode())
-                return
-                
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
-                return
-        
-        if path == '/api/generate-scenario':
-            # Generate a Know Me scenario
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except:
-                data = {}
-            
-            category = data.get('category', 'fun')
-            
-            # Scenario templates by category
-            scenarios = {
-                'general': [
-                    {"scenario": "You can have dinner with anyone alive. Who?", "prediction": "Elon Musk - you admire builders who think big and execute."},
-                    {"scenario": "What matters more: being respected or being liked?", "prediction": "Respected. You value competence and results over popularity."},
-                    {"scenario": "Morning person or night owl?", "prediction": "Morning person - you hit the gym, get things done early."},
-                ],
-                'decisions': [
-                    {"scenario": "You find a $100 bill on the ground at the gym. No one's around. What do you do?", "prediction": "You'd turn it in to the front desk - honesty matters to you."},
-                    {"scenario": "A client offers double your rate but wants you to work on something you find boring. Do you take it?", "prediction": "You'd take it - money is tight and practical needs come first."},
-                    {"scenario": "Giselle wants to skip tennis practice for a friend's party. Karina says no, Giselle asks you to override. What do you do?", "prediction": "You back Karina - you two stay united in front of the kids."},
-                ],
-                'values': [
-                    {"scenario": "What matters more: being respected or being liked?", "prediction": "Respected. You value competence and results over popularity."},
-                    {"scenario": "If you could only teach your daughters ONE life lesson, what would it be?", "prediction": "Work ethic and self-reliance - do things yourself, don't depend on others."},
-                    {"scenario": "Wealth vs Freedom vs Family time - rank them.", "prediction": "Family > Freedom > Wealth. But you see wealth as enabling the other two."},
-                ],
-                'reactions': [
-                    {"scenario": "Someone cuts you off in traffic. What's your reaction?", "prediction": "Brief frustration, maybe a comment, but you let it go quickly. Not worth the energy."},
-                    {"scenario": "I make the same mistake twice. How do you feel?", "prediction": "Disappointed but patient - as long as I show I'm learning and improving."},
-                    {"scenario": "A friend asks to borrow $500 and you know they might not pay it back. Your reaction?", "prediction": "You'd find a way to say no diplomatically, or only lend what you can afford to lose."},
-                ],
-                'preferences': [
-                    {"scenario": "Morning person or night owl?", "prediction": "Morning person - you hit the gym, get things done early."},
-                    {"scenario": "Beach vacation or mountain adventure?", "prediction": "Beach - you grew up in Venezuela near the coast, it's in your blood."},
-                    {"scenario": "Cook at home or eat out?", "prediction": "Eat out when possible - you'd rather spend time on business than cooking."},
-                ],
-                'family': [
-                    {"scenario": "Giselle comes home with a B+ when she usually gets A's. Your response?", "prediction": "You'd ask what happened, encourage her, but not make it a big deal. One grade doesn't define her."},
-                    {"scenario": "Amanda wants a pet. Karina says no. Amanda asks you. What do you say?", "prediction": "You side with Karina publicly, but might privately advocate for Amanda if you think it'd be good for her."},
-                    {"scenario": "It's your anniversary. Big fancy dinner or quiet night in?", "prediction": "Quiet night or simple dinner out - you're not flashy about romance."},
-                ],
-                'business': [
-                    {"scenario": "You can either make $1000 guaranteed or flip a coin for $3000 or nothing. Which do you pick?", "prediction": "The guaranteed $1000 - you've been burned before and prefer certainty now."},
-                    {"scenario": "An investor offers $50K for 30% of Ghost Broker. Do you take it?", "prediction": "No - you'd rather grow slow and own 100% than give up control."},
-                    {"scenario": "DLM gets a sudden spike in orders but you're deep in Ghost Broker work. What do you prioritize?", "prediction": "DLM - real revenue beats potential revenue. You handle what's paying first."},
-                ],
-                'fun': [
-                    {"scenario": "You can have dinner with anyone alive. Who?", "prediction": "Elon Musk - you admire builders who think big and execute."},
-                    {"scenario": "Superpower: flight or invisibility?", "prediction": "Invisibility - you value observing without being noticed."},
-                    {"scenario": "Last meal on Earth - what is it?", "prediction": "Something Venezuelan - arepas or pabellón criollo. Taste of home."},
-                ],
-                'past': [
-                    {"scenario": "What's a moment you're most proud of?", "prediction": "Building a business that hit $500K revenue on your own, with no employees."},
-                    {"scenario": "A decision you regret?", "prediction": "The crypto investment that cost you $150K. Still stings."},
-                    {"scenario": "Best advice you ever received?", "prediction": "Something your parents told you about self-reliance or working hard."},
-                ],
-                'future': [
-                    {"scenario": "Where do you see yourself in 5 years?", "prediction": "Multiple income streams running semi-automated, more time with family, financial stress gone."},
-                    {"scenario": "What's your biggest fear for your daughters?", "prediction": "That they won't develop the same work ethic and self-reliance you have."},
-                    {"scenario": "If Ghost Broker fails completely, what do you do next?", "prediction": "Dust off, learn the lesson, try something else. You don't stay down long."},
-                ],
-            }
-            
-            import random
-            cat_scenarios = scenarios.get(category, scenarios['fun'])
-            chosen = random.choice(cat_scenarios)
-            
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({
-                "category": category,
-                "scenario": chosen["scenario"],
-                "prediction": chosen["prediction"]
-            }).encode())
-            return
+            self._json = data if isinstance(data, dict) else {}
+        return self._json
+
+
+class RouteResponse:
+    """A complete response: status, body bytes, content type and extra headers."""
+
+    def __init__(self, body=b"", status=200, content_type=JSON_CONTENT_TYPE, headers=None):
+        self.status = status
+        self.body = body.encode('utf-8') if isinstance(body, str) else body
+        self.content_type = content_type
+        self.headers = dict(headers or {})
+
+    def json(self):
+        return json.loads(self.body.decode('utf-8'))
+
+
+def json_response(payload, status=200, headers=None, indent=None):
+    body = json.dumps(payload, indent=indent, ensure_ascii=False).encode('utf-8')
+    return RouteResponse(body, status, JSON_CONTENT_TYPE, headers)
+
+
+class Route:
+    """A registered handler plus the response defaults shared by all of its answers."""
+
+    def __init__(self, method, path, func, headers=None, indent=None, error_status=500, bench=None):
+        self.method = method
+        self.path = path
+        self.func = func
+        self.headers = dict(headers or {})
+        self.indent = indent
+        self.error_status = error_status
+        self.bench = method == 'GET' if bench is None else bench
+
+
+# (method, path) -> Route; ActivityHandler dispatches with a single dict lookup.
+ROUTES = {}
+
+
+def api_route(method, path, headers=None, indent=None, error_status=500, bench=None):
+    """Register the decorated function as the handler for method+path.
+
+    Handlers take a RouteRequest and return a JSON-serializable payload (sent
+    as 200), a RouteResponse, or None when they wrote the response themselves.
+    bench=False keeps a route out of bench_routes (streams, side effects).
+    """
+    def register(func):
+        key = (method, path)
+        if key in ROUTES:
+            raise ValueError(f"duplicate route: {method} {path}")
+        ROUTES[key] = Route(method, path, func, headers, indent, error_status, bench)
+        return func
+    return register
+
+
+def run_route(route, request):
+    """Call a route's handler and turn its result or error into a RouteResponse.
+
+    RouteError answers with its own status, RouteTimeout with 504 and any
+    other exception with the route's error_status, all as {"error": ...}.
+    """
+    try:
+        result = route.func(request)
+    except RouteError as e:
+        return json_response({"error": str(e)}, e.status, route.headers, route.indent)
+    except RouteTimeout as e:
+        return json_response({"error": str(e)}, 504, route.headers, route.indent)
+    except Exception as e:
+        return json_response({"error": str(e)}, route.error_status, route.headers, route.indent)
+    if result is None:
+        return None
+    if isinstance(result, RouteResponse):
+        result.headers = {**route.headers, **result.headers}
+        return result
+    return json_response(result, 200, route.headers, route.indent)
+
+
+def call_route(method, path, query="", body=b"", headers=None):
+    """Run a route in-process, without a socket; raises KeyError for unknown routes."""
+    if isinstance(body, (dict, list)):
+        body = json.dumps(body).encode('utf-8')
+    return run_route(ROUTES[(method, path)], RouteRequest(method, path, query, body, headers))
+
+
+def bench_routes(paths=None, iterations=20):
+    """Time routes in-process and return per-route timings, slowest first.
+
+    Without paths, every route registered with bench enabled (the read-only
+    GET routes) is exercised; named paths are run whatever their method.
+    """
+    rows = []
+    for (method, path), route in sorted(ROUTES.items()):
+        if paths is not None:
+            if path not in paths:
+                continue
+        elif not route.bench:
+            continue
+        timings = []
+        response = None
+        for _ in range(max(1, iterations)):
+            started = time.perf_counter()
+            response = call_route(method, path)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        rows.append({
+            "route": f"{method} {path}",
+            "status": response.status if response is not None else None,
+            "bytes": len(response.body) if response is not None else 0,
+            "meanMs": round(sum(timings) / len(timings), 3),
+            "p50Ms": round(timings[len(timings) // 2], 3),
+            "p95Ms": round(timings[min(len(timings) - 1, int(0.95 * len(timings)))], 3),
+            "maxMs": round(timings[-1], 3),
+        })
+    rows.sort(key=lambda row: row["meanMs"], reverse=True)
+    return rows
+
+
+AGENT_PROFILE_FILES = {
+    'research': 'agents/research-agent.md',
+    'content': 'agents/content-agent.md',
+    'audit': 'agents/audit-agent.md',
+    'analytics': 'agents/analytics-agent.md',
+    'code': 'agents/code-agent.md'
+}
+
+# Know Me scenario templates by category
+KNOW_ME_SCENARIOS = {
+    'general': [
+        {"scenario": "You can have dinner with anyone alive. Who?", "prediction": "Elon Musk - you admire builders who think big and execute."},
+        {"scenario": "What matters more: being respected or being liked?", "prediction": "Respected. You value competence and results over popularity."},
+        {"scenario": "Morning person or night owl?", "prediction": "Morning person - you hit the gym, get things done early."},
+    ],
+    'decisions': [
+        {"scenario": "You find a $100 bill on the ground at the gym. No one's around. What do you do?", "prediction": "You'd turn it in to the front desk - honesty matters to you."},
+        {"scenario": "A client offers double your rate but wants you to work on something you find boring. Do you take it?", "prediction": "You'd take it - money is tight and practical needs come first."},
+        {"scenario": "Giselle wants to skip tennis practice for a friend's party. Karina says no, Giselle asks you to override. What do you do?", "prediction": "You back Karina - you two stay united in front of the kids."},
+    ],
+    'values': [
+        {"scenario": "What matters more: being respected or being liked?", "prediction": "Respected. You value competence and results over popularity."},
+        {"scenario": "If you could only teach your daughters ONE life lesson, what would it be?", "prediction": "Work ethic and self-reliance - do things yourself, don't depend on others."},
+        {"scenario": "Wealth vs Freedom vs Family time - rank them.", "prediction": "Family > Freedom > Wealth. But you see wealth as enabling the other two."},
+    ],
+    'reactions': [
+        {"scenario": "Someone cuts you off in traffic. What's your reaction?", "prediction": "Brief frustration, maybe a comment, but you let it go quickly. Not worth the energy."},
+        {"scenario": "I make the same mistake twice. How do you feel?", "prediction": "Disappointed but patient - as long as I show I'm learning and improving."},
+        {"scenario": "A friend asks to borrow $500 and you know they might not pay it back. Your reaction?", "prediction": "You'd find a way to say no diplomatically, or only lend what you can afford to lose."},
+    ],
+    'preferences': [
+        {"scenario": "Morning person or night owl?", "prediction": "Morning person - you hit the gym, get things done early."},
+        {"scenario": "Beach vacation or mountain adventure?", "prediction": "Beach - you grew up in Venezuela near the coast, it's in your blood."},
+        {"scenario": "Cook at home or eat out?", "prediction": "Eat out when possible - you'd rather spend time on business than cooking."},
+    ],
+    'family': [
+        {"scenario": "Giselle comes home with a B+ when she usually gets A's. Your response?", "prediction": "You'd ask what happened, encourage her, but not make it a big deal. One grade doesn't define her."},
+        {"scenario": "Amanda wants a pet. Karina says no. Amanda asks you. What do you say?", "prediction": "You side with Karina publicly, but might privately advocate for Amanda if you think it'd be good for her."},
+        {"scenario": "It's your anniversary. Big fancy dinner or quiet night in?", "prediction": "Quiet night or simple dinner out - you're not flashy about romance."},
+    ],
+    'business': [
+        {"scenario": "You can either make $1000 guaranteed or flip a coin for $3000 or nothing. Which do you pick?", "prediction": "The guaranteed $1000 - you've been burned before and prefer certainty now."},
+        {"scenario": "An investor offers $50K for 30% of Ghost Broker. Do you take it?", "prediction": "No - you'd rather grow slow and own 100% than give up control."},
+        {"scenario": "DLM gets a sudden spike in orders but you're deep in Ghost Broker work. What do you prioritize?", "prediction": "DLM - real revenue beats potential revenue. You handle what's paying first."},
+    ],
+    'fun': [
+        {"scenario": "You can have dinner with anyone alive. Who?", "prediction": "Elon Musk - you admire builders who think big and execute."},
+        {"scenario": "Superpower: flight or invisibility?", "prediction": "Invisibility - you value observing without being noticed."},
+        {"scenario": "Last meal on Earth - what is it?", "prediction": "Something Venezuelan - arepas or pabellón criollo. Taste of home."},
+    ],
+    'past': [
+        {"scenario": "What's a moment you're most proud of?", "prediction": "Building a business that hit $500K revenue on your own, with no employees."},
+        {"scenario": "A decision you regret?", "prediction": "The crypto investment that cost you $150K. Still stings."},
+        {"scenario": "Best advice you ever received?", "prediction": "Something your parents told you about self-reliance or working hard."},
+    ],
+    'future': [
+        {"scenario": "Where do you see yourself in 5 years?", "prediction": "Multiple income streams running semi-automated, more time with family, financial stress gone."},
+        {"scenario": "What's your biggest fear for your daughters?", "prediction": "That they won't develop the same work ethic and self-reliance you have."},
+        {"scenario": "If Ghost Broker fails completely, what do you do next?", "prediction": "Dust off, learn the lesson, try something else. You don't stay down long."},
+    ],
+}
+
+
+# Serve dashboard HTML from the mission-control directory explicitly.
+# This avoids stale/incorrect pages when the server is launched from a different cwd.
+@api_route('GET', '/', headers={'Cache-Control': 'no-store, no-cache, must-revalidate',
+                                'Pragma': 'no-cache', 'Expires': '0'})
+@api_route('GET', '/index.html', headers={'Cache-Control': 'no-store, no-cache, must-revalidate',
+                                          'Pragma': 'no-cache', 'Expires': '0'})
+def get_dashboard(request):
+    with open(os.path.join(DASHBOARD_DIR, 'index.html'), 'rb') as f:
+        return RouteResponse(f.read(), content_type='text/html; charset=utf-8')
+
+
+@api_route('GET', '/api/qa-history', headers=NO_CACHE)
+def get_qa_history(request):
+    # Return Q&A game history
+    qa_file = os.path.join(WORKSPACE_DIR, "memory", "francisco-qa.jsonl")
+    entries = []
+    if os.path.exists(qa_file):
+        with open(qa_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entry = json.loads(line)
+                    if entry.get('type') != 'system':  # Skip system entries
+                        entries.append(entry)
+    entries.reverse()
+    return {"entries": entries}
+
+
+@api_route('GET', '/api/predictions-history', headers=NO_CACHE)
+def get_predictions_history(request):
+    # Return predictions scoring history
+    log_file = os.path.join(WORKSPACE_DIR, "memory", "predictions-log.jsonl")
+    entries = []
+    if os.path.exists(log_file):
+        with open(log_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entries.append(json.loads(line))
+    # Return most recent first
+    entries.reverse()
+    return {"entries": entries}
+
+
+@api_route('GET', '/api/predictions', headers=NO_CACHE)
+def get_predictions(request):
+    # Return predictions for reinforcement learning display
+    predictions_file = os.path.join(DASHBOARD_DIR, "predictions.json")
+    try:
+        with open(predictions_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise RouteError(404, "predictions.json not found") from None
+
+
+@api_route('GET', '/api/research-queue', headers=CORS_NO_CACHE, error_status=200)
+def get_research_queue(request):
+    return _read_research_queue()
+
+
+@api_route('GET', '/api/autoresearch/status', headers=CORS_NO_CACHE)
+def get_autoresearch_status(request):
+    try:
+        return run_with_route_timeout(request.path, _read_autoresearch_status, limit=8)
+    except Exception as e:
+        # The dashboard polls this; a timeout is reported in the body, not as a failed request.
+        return {"error": str(e)}
+
+
+@api_route('GET', '/api/activity/events', headers=CORS_NO_CACHE)
+def get_activity_events(request):
+    try:
+        cursor = max(0, int(request.arg('since', '0') or 0))
+        limit = min(EVENTS_PAGE_LIMIT, max(1, int(request.arg('limit', '100') or 100)))
+    except ValueError:
+        raise RouteError(400, "since and limit must be integers") from None
+    # A cursor ahead of the buffer means the server restarted and seq ids began again.
+    reset = cursor > recent_events.latest_seq
+    if reset:
+        cursor = 0
+    events, truncated = recent_events.since(cursor, limit)
+    return {
+        "events": events,
+        "next": events[-1]["seq"] if events else cursor,
+        "latest": recent_events.latest_seq,
+        "oldest": recent_events.oldest_seq,
+        "truncated": truncated,
+        "reset": reset,
+    }
+
+
+@api_route('GET', '/api/activity/stream', bench=False)
+def get_activity_stream(request):
+    request.handler._start_activity_stream()
+
+
+@api_route('GET', '/api/activity', headers=CORS_NO_CACHE, indent=2)
+def get_activity(request):
+    # Read state.json outside the lock so the log tailer is never blocked on disk I/O.
+    high_level_task = load_current_task()
+    with state_lock:
+        response = dict(activity_state)
+        response["recentEvents"] = recent_events.recent()
+    response["highLevelTask"] = high_level_task
+    response["ingest"] = log_tailer.stats() if log_tailer else None
+    return response
+
+
+@api_route('GET', '/api/health')
+def get_health(request):
+    return {"status": "ok", "time": datetime.now(timezone.utc).isoformat()}
+
+
+@api_route('GET', '/api/memory', headers=CORS_NO_CACHE, indent=2)
+def get_memory(request):
+    return check_memory_health()
+
+
+# Agent profile API - GET to read agent MD file
+@api_route('GET', '/api/agent-profile', headers=CORS, error_status=200)
+def get_agent_profile(request):
+    agent_type = request.arg('agent')
+    if not agent_type or agent_type not in AGENT_PROFILE_FILES:
+        return {"error": f"Invalid agent type: {agent_type}"}
+
+    agent_path = os.path.join(WORKSPACE_DIR, AGENT_PROFILE_FILES[agent_type])
+    if not os.path.exists(agent_path):
+        return {"error": f"Agent file not found: {AGENT_PROFILE_FILES[agent_type]}"}
+    with open(agent_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return {"ok": True, "content": content, "path": AGENT_PROFILE_FILES[agent_type]}
+
+
+@api_route('GET', '/api/backlog', headers=CORS_NO_CACHE, indent=2)
+def get_backlog(request):
+    backlog = []
+    state_file = os.path.join(WORKSPACE_DIR, "memory", "state.json")
+    try:
+        if os.path.exists(state_file):
+            with open(state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            backlog = state.get("backlog", [])
+    except Exception as e:
+        print(f"Error loading backlog: {e}")
+    return {"backlog": backlog}
+
+
+@api_route('GET', '/api/cron-jobs', headers=CORS_NO_CACHE, indent=2)
+def get_cron_jobs(request):
+    # Read cron jobs from cached file (updated periodically by bot)
+    try:
+        cron_file = os.path.join(DASHBOARD_DIR, "cron-jobs.json")
+        if not os.path.exists(cron_file):
+            return {"jobs": [], "error": "cron-jobs.json not found"}
+        with open(cron_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        return {"error": str(e), "jobs": []}
+
+
+@api_route('GET', '/api/task', headers=CORS_NO_CACHE, error_status=200)
+def get_task(request):
+    task_id = request.arg('id')
+    if not isinstance(task_id, str) or not task_id.strip():
+        return {"error": "task id is required"}
+    task_id = task_id.strip()
+    if not TASK_STORE.exists():
+        return {"error": "tasks.json not found"}
+
+    tasks_data = TASK_STORE.read()
+    tasks = tasks_data.get("tasks", {}) if isinstance(tasks_data, dict) else {}
+    task = tasks.get(task_id) if isinstance(tasks, dict) else None
+    if not isinstance(task, dict):
+        return {"error": f"task not found: {task_id}"}
+    return {"id": task_id, "task": _sanitize_task_for_detail(task_id, task)}
+
+
+@api_route('GET', '/api/tasks', headers=CORS_NO_CACHE)
+def get_tasks(request):
+    since = (request.arg('since_version') or '').strip()
+    if since and not since.isdigit():
+        raise RouteError(400, "since_version must be an integer")
+    try:
+        if not TASK_STORE.exists():
+            raise FileNotFoundError("tasks.json not found")
+        delta = TASK_BOARD_CACHE.delta(int(since)) if since else None
+        if delta is not None:
+            body, etag = json.dumps(delta, ensure_ascii=False).encode('utf-8'), None
+        else:
+            body, etag = TASK_BOARD_CACHE.get()
+    except Exception as e:
+        return {"error": "tasks.json not found" if isinstance(e, FileNotFoundError) else str(e)}
+
+    if etag and etag_matches(request.headers.get('If-None-Match'), etag):
+        return RouteResponse(b"", 304, headers={'ETag': etag})
+    return RouteResponse(body, headers={'ETag': etag} if etag else None)
+
+
+# Council A+ upgrade: Metrics dashboard endpoint and Prometheus scrape target
+@api_route('GET', '/api/metrics', headers=CORS_NO_CACHE, indent=2)
+def get_metrics(request):
+    return run_with_route_timeout(request.path, load_metrics_cached, 'status')
+
+
+@api_route('GET', '/metrics', headers=CORS_NO_CACHE, indent=2)
+def get_prometheus_metrics(request):
+    text = run_with_route_timeout(request.path, load_metrics_cached, 'prometheus')
+    return RouteResponse(text + REQUEST_STATS.prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@api_route('GET', '/api/_perf', headers=NO_CACHE, indent=2)
+def get_perf(request):
+    return REQUEST_STATS.snapshot()
+
+
+# Council A+ upgrade: Circuit breaker status
+@api_route('GET', '/api/circuits', headers=CORS_NO_CACHE, error_status=200)
+def get_circuits(request):
+    circuits_file = os.path.join(WORKSPACE_DIR, "memory", "circuits.json")
+    if not os.path.exists(circuits_file):
+        return {"error": "circuits.json not found"}
+    with open(circuits_file, 'r', encoding='utf-8') as f:
+        return RouteResponse(f.read())
+
+
+@api_route('GET', '/api/status', headers=CORS)
+def get_status(request):
+    # Return lightweight UI status + a direct gateway control URL.
+    up_since = activity_state.get("stats", {}).get("upSince", "")
+    uptime = 0
+    if up_since:
+        try:
+            up_dt = datetime.fromisoformat(up_since)
+            uptime = int((datetime.now(timezone.utc) - up_dt).total_seconds())
+        except:
+            pass
+    # Check if we've seen activity recently (within 5 min = online)
+    last_update = activity_state.get("lastUpdate", "")
+    online = False
+    if last_update:
+        try:
+            last_dt = datetime.fromisoformat(last_update)
+            online = (datetime.now(timezone.utc) - last_dt).total_seconds() < 300
+        except:
+            pass
+    gateway_info = load_gateway_info()
+    runtime_info = load_runtime_session_info()
+    session_info = dict(activity_state.get("sessionInfo", {}))
+    if isinstance(runtime_info, dict):
+        for key in ("model", "provider", "sessionId", "source"):
+            value = runtime_info.get(key)
+            if value is not None and value != "":
+                session_info[key] = value
+
+    return {
+        "online": online,
+        "uptime": uptime,
+        "status": activity_state.get("status", "unknown"),
+        "sessionInfo": session_info,
+        "gateway": gateway_info
+    }
+
+
+@api_route('GET', '/api/models', headers=CORS_NO_CACHE)
+def get_models(request):
+    start_models_refresh_if_needed()
+    snap = snapshot_models_state()
+    cached = snap.get("data")
+    if isinstance(cached, dict):
+        payload = dict(cached)
+        # Never block the selector when we already have cached model rows.
+        payload["loading"] = False
+        payload["refreshing"] = bool(snap.get("refreshing"))
+        payload["cacheAgeMs"] = snap.get("ageMs")
+        if snap.get("error"):
+            payload["warning"] = snap.get("error")
+        return payload
+    return {
+        "loading": True,
+        "cacheAgeMs": snap.get("ageMs"),
+        "error": snap.get("error"),
+        "models": [],
+        "defaultModel": None
+    }
+
+
+@api_route('POST', '/api/model-select')
+def post_model_select(request):
+    model = request.json.get('model')
+    if not isinstance(model, str) or not model.strip():
+        raise RouteError(400, "model is required")
+    try:
+        return run_with_route_timeout(request.path, select_default_model, model.strip())
+    except ModelNotSelectable as e:
+        raise RouteError(400, str(e)) from None
+
+
+@api_route('POST', '/api/autoresearch/start', error_status=400)
+def post_autoresearch_start(request):
+    config = _build_autoresearch_config(request.json)
+    status = run_with_route_timeout(request.path, _launch_autoresearch_run, config)
+    return {"ok": True, "run": status}
+
+
+@api_route('POST', '/api/autoresearch/stop')
+def post_autoresearch_stop(request):
+    return run_with_route_timeout(request.path, _stop_autoresearch_run)
+
+
+@api_route('POST', '/api/autoresearch/clear')
+def post_autoresearch_clear(request):
+    return _clear_autoresearch_history()
+
+
+@api_route('POST', '/api/research-queue', error_status=400)
+def post_research_queue(request):
+    return _update_research_queue(request.json)
+
+
+@api_route('POST', '/api/tasks')
+def post_tasks(request):
+    data = request.json
+    if data.get('action') != 'update_project':
+        raise RouteError(400, "unsupported action for POST /api/tasks")
+
+    task_id = data.get('task_id')
+    project = data.get('project')
+    if not isinstance(task_id, str) or not task_id.strip():
+        raise RouteError(400, "task_id is required")
+    if not isinstance(project, str) or not project.strip():
+        raise RouteError(400, "project is required")
+
+    with TASK_STORE.transaction() as txn:
+        tasks_data = txn.data
+        tasks = tasks_data.get('tasks', {}) if isinstance(tasks_data, dict) else {}
+        task = tasks.get(task_id.strip()) if isinstance(tasks, dict) else None
+        if not isinstance(task, dict):
+            raise TaskRequestError(404, f"task not found: {task_id}")
+
+        task['project'] = project.strip()
+        task['project_source'] = 'manual'
+        task['updated_at'] = datetime.now(timezone.utc).isoformat()
+        tasks_data['updated_at'] = task['updated_at']
+        txn.commit()
+
+    return {
+        "ok": True,
+        "task_id": task_id.strip(),
+        "project": project.strip()
+    }
+
+
+# Agent profile API - POST to save agent MD file
+@api_route('POST', '/api/agent-profile', headers=CORS, error_status=200)
+def post_agent_profile(request):
+    agent_type = request.json.get('agent')
+    content = request.json.get('content')
+
+    if not agent_type or agent_type not in AGENT_PROFILE_FILES:
+        return {"error": f"Invalid agent type: {agent_type}"}
+    if not content:
+        return {"error": "Content required"}
+
+    agent_path = os.path.join(WORKSPACE_DIR, AGENT_PROFILE_FILES[agent_type])
+    with open(agent_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return {"ok": True, "message": "Agent profile saved"}
+
+
+@api_route('POST', '/api/delete-cron')
+def post_delete_cron(request):
+    cron_id = request.json.get('cronId')
+    if not cron_id:
+        raise RouteError(400, "cronId required")
+
+    # Load cron-jobs.json (the actual source of cron jobs)
+    cron_file = os.path.join(DASHBOARD_DIR, "cron-jobs.json")
+    if os.path.exists(cron_file):
+        with open(cron_file, 'r', encoding='utf-8') as f:
+            cron_data = json.load(f)
+    else:
+        cron_data = {"jobs": [], "total": 0}
+
+    jobs = cron_data.get('jobs', [])
+
+    # Find and remove the job
+    new_jobs = [job for job in jobs if job.get('id') != cron_id]
+    if len(new_jobs) == len(jobs):
+        raise RouteError(400, f"{cron_id} not found in cron jobs")
+
+    # Update and save
+    cron_data['jobs'] = new_jobs
+    cron_data['total'] = len(new_jobs)
+    cron_data['updated'] = datetime.now(timezone.utc).isoformat()
+
+    write_json_atomic(cron_file, cron_data, indent=2)
+
+    return {
+        "success": True,
+        "message": f"Deleted {cron_id}",
+        "cronId": cron_id,
+        "remaining": len(new_jobs)
+    }
+
+
+@api_route('POST', '/api/restore-task')
+def post_restore_task(request):
+    task_id = request.json.get('taskId')
+    if not task_id:
+        raise RouteError(400, "taskId required")
+
+    with TASK_STORE.transaction() as txn:
+        tasks_data = txn.data
+
+        trash = tasks_data.get('lanes', {}).get('trash', [])
+        if task_id not in trash:
+            raise TaskRequestError(400, f"{task_id} not in trash")
+
+        # Get original lane or default to bot_queue
+        task = tasks_data.get('tasks', {}).get(task_id, {})
+        restore_to = task.get('deleted_from', 'bot_queue')
+        if restore_to == 'done_today':
+            restore_to = 'bot_queue'  # Don't restore to done
+
+        # Remove from trash
+        trash.remove(task_id)
+        tasks_data['lanes']['trash'] = trash
+
+        # Add to restore lane
+        if restore_to not in tasks_data['lanes']:
+            tasks_data['lanes'][restore_to] = []
+        tasks_data['lanes'][restore_to].append(task_id)
+
+        # Update task status
+        if task_id in tasks_data.get('tasks', {}):
+            tasks_data['tasks'][task_id]['status'] = 'pending'
+            del tasks_data['tasks'][task_id]['deleted_at']
+            if 'deleted_from' in tasks_data['tasks'][task_id]:
+                del tasks_data['tasks'][task_id]['deleted_from']
+
+        tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+        txn.commit()
+
+    return {
+        "success": True,
+        "message": f"Restored {task_id}",
+        "restoredTo": restore_to
+    }
+
+
+@api_route('POST', '/api/permanent-delete')
+def post_permanent_delete(request):
+    task_id = request.json.get('taskId')
+    if not task_id:
+        raise RouteError(400, "taskId required")
+
+    with TASK_STORE.transaction() as txn:
+        tasks_data = txn.data
+
+        trash = tasks_data.get('lanes', {}).get('trash', [])
+        if task_id not in trash:
+            raise TaskRequestError(400, f"{task_id} not in trash")
+
+        # Remove from trash
+        trash.remove(task_id)
+        tasks_data['lanes']['trash'] = trash
+
+        # Remove task entirely
+        if task_id in tasks_data.get('tasks', {}):
+            del tasks_data['tasks'][task_id]
+
+        tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+        txn.commit()
+
+    return {
+        "success": True,
+        "message": f"Permanently deleted {task_id}"
+    }
+
+
+@api_route('POST', '/api/read-file')
+def post_read_file(request):
+    file_path = request.json.get('path')
+    if not file_path:
+        raise RouteError(400, "path required")
+
+    # Security: only allow reading from workspace
+    resolved_path = resolve_workspace_path(file_path)
+    if resolved_path is None:
+        raise RouteError(403, "Access denied - path outside workspace")
+    if not resolved_path.exists():
+        raise RouteError(404, f"File not found: {file_path}")
+
+    with resolved_path.open('r', encoding='utf-8') as f:
+        content = f.read()
+
+    # Limit size for safety
+    if len(content) > 50000:
+        content = content[:50000] + '\n\n... [truncated - file too large]'
+
+    return {
+        "success": True,
+        "content": content,
+        "path": file_path
+    }
+
+
+@api_route('POST', '/api/update-cron')
+def post_update_cron(request):
+    data = request.json
+    cron_id = data.get('cronId')
+    if not cron_id:
+        raise RouteError(400, "cronId required")
+
+    with TASK_STORE.transaction() as txn:
+        tasks_data = txn.data
+
+        if cron_id not in tasks_data.get('tasks', {}):
+            raise TaskRequestError(400, f"{cron_id} not found")
+
+        # Update cron fields
+        cron = tasks_data['tasks'][cron_id]
+        if 'schedule' in data:
+            cron['schedule'] = data['schedule']
+        if 'plan' in data:
+            cron['plan'] = data['plan']
+        if 'nextRun' in data:
+            cron['nextRun'] = data['nextRun']
+
+        tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+        txn.commit()
+
+    return {
+        "success": True,
+        "message": f"Updated {cron_id}",
+        "cronId": cron_id
+    }
+
+
+@api_route('POST', '/api/transfer-task')
+def post_transfer_task(request):
+    task_id = request.json.get('taskId')
+    from_lane = request.json.get('fromLane')
+    to_lane = request.json.get('toLane')
+
+    if not task_id or not from_lane or not to_lane:
+        raise RouteError(400, "taskId, fromLane, and toLane required")
+
+    with TASK_STORE.transaction() as txn:
+        tasks_data = txn.data
+
+        from_list = tasks_data.get('lanes', {}).get(from_lane, [])
+        to_list = tasks_data.get('lanes', {}).get(to_lane, [])
+
+        if task_id not in from_list:
+            raise TaskRequestError(400, f"{task_id} not in {from_lane}")
+
+        # Move task
+        from_list.remove(task_id)
+        to_list.append(task_id)
+
+        tasks_data['lanes'][from_lane] = from_list
+        tasks_data['lanes'][to_lane] = to_list
+        tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+        txn.commit()
+
+    return {
+        "success": True,
+        "message": f"Moved {task_id} from {from_lane} to {to_lane}",
+        "taskId": task_id
+    }
+
+
+@api_route('POST', '/api/delete-task')
+def post_delete_task(request):
+    task_id = request.json.get('taskId')
+    if not task_id:
+        raise RouteError(400, "taskId required")
+
+    with TASK_STORE.transaction() as txn:
+        tasks_data = txn.data
+
+        # Remove from all lanes
+        removed_from = None
+        for lane_name in ['bot_current', 'bot_queue', 'human', 'done_today']:
+            lane = tasks_data.get('lanes', {}).get(lane_name, [])
+            if task_id in lane:
+                lane.remove(task_id)
+                tasks_data['lanes'][lane_name] = lane
+                removed_from = lane_name
+                break
+
+        if not removed_from:
+            raise TaskRequestError(400, f"{task_id} not found in any lane")
+
+        # Move to trash lane
+        if 'trash' not in tasks_data['lanes']:
+            tasks_data['lanes']['trash'] = []
+        tasks_data['lanes']['trash'].append(task_id)
+
+        # Mark task with deletion info
+        if task_id in tasks_data.get('tasks', {}):
+            tasks_data['tasks'][task_id]['status'] = 'trashed'
+            tasks_data['tasks'][task_id]['deleted_at'] = datetime.now(timezone.utc).isoformat()
+            tasks_data['tasks'][task_id]['deleted_from'] = removed_from
+
+        tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+        txn.commit()
+
+    return {
+        "success": True,
+        "message": f"Moved {task_id} to trash",
+        "taskId": task_id
+    }
+
+
+@api_route('POST', '/api/reorder-task')
+def post_reorder_task(request):
+    task_id = request.json.get('taskId')
+    direction = request.json.get('direction')  # 'up' or 'down'
+
+    if not task_id or direction not in ('up', 'down'):
+        raise RouteError(400, "taskId and direction (up/down) required")
+
+    with TASK_STORE.transaction() as txn:
+        tasks_data = txn.data
+
+        bot_queue = tasks_data.get('lanes', {}).get('bot_queue', [])
+
+        if task_id not in bot_queue:
+            raise TaskRequestError(400, f"{task_id} not in bot_queue")
+
+        idx = bot_queue.index(task_id)
+
+        if direction == 'up' and idx > 0:
+            # Swap with previous
+            bot_queue[idx], bot_queue[idx-1] = bot_queue[idx-1], bot_queue[idx]
+        elif direction == 'down' and idx < len(bot_queue) - 1:
+            # Swap with next
+            bot_queue[idx], bot_queue[idx+1] = bot_queue[idx+1], bot_queue[idx]
+        else:
+            raise TaskRequestError(400, f"Cannot move {direction} from position {idx}")
+
+        tasks_data['lanes']['bot_queue'] = bot_queue
+        tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+        txn.commit()
+
+    return {
+        "success": True,
+        "message": f"Moved {task_id} {direction}",
+        "newOrder": bot_queue
+    }
+
+
+@api_route('POST', '/api/request-complete')
+def post_request_complete(request):
+    task_id = request.json.get('taskId')
+    if not task_id:
+        raise RouteError(400, "taskId required")
+
+    with TASK_STORE.transaction() as txn:
+        tasks_data = txn.data
+
+        human_lane = tasks_data.get('lanes', {}).get('human', [])
+        done_today = tasks_data.get('lanes', {}).get('done_today', [])
+
+        # Check if this is a Council task (human verifies bot work → goes to done)
+        task_data = tasks_data.get('tasks', {}).get(task_id, {})
+        is_council = task_data.get('title', '').lower().startswith('council')
+
+        # ALL tasks: human verification is FINAL - move directly to done_today
+        if task_id not in human_lane:
+            raise TaskRequestError(400, f"{task_id} not in human lane")
+
+        # Remove from human, add to done_today
+        human_lane.remove(task_id)
+        done_today.insert(0, task_id)
+
+        # Mark task as done (human verified)
+        if task_id in tasks_data.get('tasks', {}):
+            tasks_data['tasks'][task_id]['status'] = 'done'
+            tasks_data['tasks'][task_id]['completed_at'] = datetime.now(timezone.utc).isoformat()
+            tasks_data['tasks'][task_id]['verified_by'] = 'human'
+
+        tasks_data['lanes']['human'] = human_lane
+        tasks_data['lanes']['done_today'] = done_today
+        tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+        txn.commit()
+
+    # Council tasks: human clicked "Verify Bot Work" → same move, council wording
+    if is_council:
+        message = f"Council {task_id} verified and marked complete!"
+    else:
+        message = f"{task_id} marked complete!"
+    return {
+        "success": True,
+        "message": message,
+        "taskId": task_id
+    }
+
+
+@api_route('POST', '/api/task-comment')
+def post_task_comment(request):
+    # Add comment to task's discussion array
+    task_id = request.json.get('taskId')
+    message = request.json.get('message', '').strip()
+
+    if not task_id or not message:
+        raise RouteError(400, "taskId and message required")
+
+    with TASK_STORE.transaction() as txn:
+        tasks_data = txn.data
+
+        task_data = tasks_data.get('tasks', {}).get(task_id)
+        if not task_data:
+            raise TaskRequestError(404, f"Task {task_id} not found")
+
+        # Initialize discussion array if not exists
+        if 'discussion' not in task_data:
+            task_data['discussion'] = []
+
+        # Add the comment
+        comment = {
+            "ts": datetime.now(timezone.utc).isoformat(),
+            "author": "human",
+            "message": message
+        }
+        task_data['discussion'].append(comment)
+
+        # Update task (the store bumps the version on commit)
+        tasks_data['tasks'][task_id] = task_data
+        tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+        txn.commit()
+
+    return {
+        "success": True,
+        "message": "Comment added",
+        "taskId": task_id
+    }
+
+
+@api_route('POST', '/api/toggle-crossout')
+def post_toggle_crossout(request):
+    # Toggle crossed_out status on a discussion comment
+    task_id = request.json.get('taskId')
+    comment_idx = request.json.get('commentIdx')
+
+    if not task_id or comment_idx is None:
+        raise RouteError(400, "taskId and commentIdx required")
+
+    with TASK_STORE.transaction() as txn:
+        tasks_data = txn.data
+
+        task_data = tasks_data.get('tasks', {}).get(task_id)
+        if not task_data:
+            raise TaskRequestError(404, f"Task {task_id} not found")
+
+        discussion = task_data.get('discussion', [])
+        if comment_idx < 0 or comment_idx >= len(discussion):
+            raise TaskRequestError(400, "Invalid comment index")
+
+        # Toggle crossed_out status
+        current = discussion[comment_idx].get('crossed_out', False)
+        discussion[comment_idx]['crossed_out'] = not current
+
+        # Update task (the store bumps the version on commit)
+        task_data['discussion'] = discussion
+        tasks_data['tasks'][task_id] = task_data
+        tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+        txn.commit()
+
+    return {
+        "success": True,
+        "crossed_out": not current,
+        "taskId": task_id,
+        "commentIdx": comment_idx
+    }
+
+
+@api_route('POST', '/api/generate-scenario')
+def post_generate_scenario(request):
+    # Generate a Know Me scenario
+    category = request.json.get('category', 'fun')
+    chosen = random.choice(KNOW_ME_SCENARIOS.get(category, KNOW_ME_SCENARIOS['fun']))
+    return {
+        "category": category,
+        "scenario": chosen["scenario"],
+        "prediction": chosen["prediction"]
+    }
+
+
+@api_route('POST', '/api/submit-qa')
+def post_submit_qa(request):
+    # Save Q&A response
+    data = request.json
+    qa_file = os.path.join(WORKSPACE_DIR, "memory", "francisco-qa.jsonl")
+    entry = {
+        "date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+        "time": datetime.now(timezone.utc).strftime("%H:%M:%S"),
+        "category": data.get('category'),
+        "scenario": data.get('scenario'),
+        "prediction": data.get('prediction'),
+        "answer": data.get('answer'),
+        "score": data.get('score')
+    }
+
+    with open(qa_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + '\n')
+
+    return {"ok": True}
+
+
+@api_route('POST', '/api/prediction-feedback')
+def post_prediction_feedback(request):
+    # Save written feedback for a prediction
+    pred_id = request.json.get('id')
+    feedback = request.json.get('feedback', '').strip()
+
+    if not pred_id or not feedback:
+        raise RouteError(400, "Missing id or feedback")
+
+    predictions_file = os.path.join(DASHBOARD_DIR, "predictions.json")
+    with open(predictions_file, 'r', encoding='utf-8') as f:
+        preds = json.load(f)
+
+    # Find and update the prediction
+    for p in preds.get('predictions', []):
+        if p.get('id') == pred_id:
+            p['feedback'] = feedback
+            p['feedback_at'] = datetime.now(timezone.utc).isoformat()
+            break
+
+    preds['version'] += 1
+    write_json_atomic(predictions_file, preds, indent=4, ensure_ascii=True)
+
+    # Log to predictions log
+    log_file = os.path.join(WORKSPACE_DIR, "memory", "predictions-log.jsonl")
+    log_entry = {
+        "date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+        "time": datetime.now(timezone.utc).strftime("%H:%M:%S"),
+        "event": "feedback",
+        "prediction_id": pred_id,
+        "feedback": feedback
+    }
+    with open(log_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(log_entry) + '\n')
+
+    return {"ok": True}
+
+
+@api_route('POST', '/api/score-prediction')
+def post_score_prediction(request):
+    # Score a prediction as correct (✓) or wrong (✗)
+    pred_id = request.json.get('id')
+    score = request.json.get('score')  # 1-5 numeric rating
+
+    # Convert to int if needed
+    try:
+        score = int(score)
+    except:
+        pass
+
+    if not pred_id or score not in [1, 2, 3, 4, 5]:
+        raise RouteError(400, "Missing id or invalid score")
+
+    predictions_file = os.path.join(DASHBOARD_DIR, "predictions.json")
+    with open(predictions_file, 'r', encoding='utf-8') as f:
+        preds = json.load(f)
+
+    # Find and update the prediction
+    found = False
+    for p in preds.get('predictions', []):
+        if p.get('id') == pred_id:
+            old_score = p.get('score')
+            p['score'] = score
+            p['scored_at'] = datetime.now(timezone.utc).isoformat()
+            found = True
+
+            # Update stats
+            if old_score is None:
+                preds['stats']['pending'] -= 1
+            elif old_score >= 4:
+                preds['stats']['correct'] -= 1
+            else:
+                preds['stats']['wrong'] -= 1
+
+            if score >= 4:  # 4-5 = correct
+                preds['stats']['correct'] += 1
+            else:  # 1-3 = needs improvement
+                preds['stats']['wrong'] += 1
+            break
+
+    if not found:
+        raise RouteError(404, f"Prediction {pred_id} not found")
+
+    preds['version'] += 1
+    write_json_atomic(predictions_file, preds, indent=4, ensure_ascii=True)
+
+    # Update game stats
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    game = preds.get('game', {"streak": 0, "best_streak": 0, "today_scored": 0, "total_scored": 0, "accuracy": 0, "last_play_date": None, "level": 1, "xp": 0})
+
+    if game.get('last_play_date') != today:
+        # New day - check streak
+        if game.get('last_play_date'):
+            last = datetime.strptime(game['last_play_date'], "%Y-%m-%d")
+            if (datetime.strptime(today, "%Y-%m-%d") - last).days == 1:
+                game['streak'] += 1
+            else:
+                game['streak'] = 1
+        else:
+            game['streak'] = 1
+        game['today_scored'] = 0
+        game['last_play_date'] = today
+
+    game['today_scored'] += 1
+    game['total_scored'] += 1
+    game['xp'] += score * 2  # XP based on score: 2-10 points
+
+    # Track battle scores
+    game['total_rating_sum'] = game.get('total_rating_sum', 0) + score
+    game['bot_score'] = round(game['total_rating_sum'] / game['total_scored'], 1)
+
+    if score <= 2:  # Human found a blind spot!
+        game['blind_spots_found'] = game.get('blind_spots_found', 0) + 1
+    game['human_score'] = game.get('blind_spots_found', 0)
+    game['best_streak'] = max(game['streak'], game.get('best_streak', 0))
+
+    # Calculate accuracy
+    total = preds['stats']['correct'] + preds['stats']['wrong']
+    game['accuracy'] = round(preds['stats']['correct'] / total * 100) if total > 0 else 0
+
+    # Level up every 100 XP
+    game['level'] = 1 + game['xp'] // 100
+
+    preds['game'] = game
+
+    # Log to daily predictions log
+    log_file = os.path.join(WORKSPACE_DIR, "memory", "predictions-log.jsonl")
+    log_entry = {
+        "date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+        "time": datetime.now(timezone.utc).strftime("%H:%M:%S"),
+        "event": "score",
+        "prediction_id": pred_id,
+        "score": score,
+        "stats": preds['stats'],
+        "game": game
+    }
+    with open(log_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(log_entry) + '\n')
+
+    return {"ok": True, "id": pred_id, "score": score, "stats": preds['stats']}
+
+
+
+class ActivityHandler(http.server.SimpleHTTPRequestHandler):
+    # Socket timeout so idle or stalled clients release their pool worker.
+    timeout = MISSION_CONTROL_SOCKET_TIMEOUT
 
-        if path == '/api/submit-qa':
-            # Save Q&A response
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except:
-                data = {}
-            
-            qa_file = os.path.join(WORKSPACE_DIR, "memory", "francisco-qa.jsonl")
-            entry = {
-                "date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
-                "time": datetime.now(timezone.utc).strftime("%H:%M:%S"),
-                "category": data.get('category'),
-                "scenario": data.get('scenario'),
-                "prediction": data.get('prediction'),
-                "answer": data.get('answer'),
-                "score": data.get('score')
-            }
-            
-            with open(qa_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(entry) + '\n')
-            
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps({"ok": True}).encode())
-            return
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=DASHBOARD_DIR, **kwargs)
 
-        if path == '/api/prediction-feedback':
-            # Save written feedback for a prediction
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except:
-                data = {}
-            
-            pred_id = data.get('id')
-            feedback = data.get('feedback', '').strip()
-            
-            if not pred_id or not feedback:
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "Missing id or feedback"}).encode())
-                return
-            
-            predictions_file = os.path.join(DASHBOARD_DIR, "predictions.json")
-            try:
-                with open(predictions_file, 'r', encoding='utf-8') as f:
-                    preds = json.load(f)
-                
-                # Find and update the prediction
-                for p in preds.get('predictions', []):
-                    if p.get('id') == pred_id:
-                        p['feedback'] = feedback
-                        p['feedback_at'] = datetime.now(timezone.utc).isoformat()
-                        break
-                
-                preds['version'] += 1
-                with open(predictions_file, 'w', encoding='utf-8') as f:
-                    json.dump(preds, f, indent=4)
-                
-                # Log to predictions log
-                log_file = os.path.join(WORKSPACE_DIR, "memory", "predictions-log.jsonl")
-                log_entry = {
-                    "date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
-                    "time": datetime.now(timezone.utc).strftime("%H:%M:%S"),
-                    "event": "feedback",
-                    "prediction_id": pred_id,
-                    "feedback": feedback
-                }
-                with open(log_file, 'a', encoding='utf-8') as f:
-                    f.write(json.dumps(log_entry) + '\n')
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"ok": True}).encode())
-                return
-                
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
-                return
+    def setup(self):
+        super().setup()
+        self.wfile = _CountingWriter(self.wfile)
+
+    def parse_request(self):
+        # Timing starts once the request line is in, so keep-alive idle time is not counted.
+        self._perf_started = time.perf_counter()
+        self._perf_status = None
+        self.wfile.bytes_written = 0
+        return super().parse_request()
+
+    def send_response(self, code, message=None):
+        self._perf_status = code
+        super().send_response(code, message)
+
+    def handle_one_request(self):
+        self._perf_started = None
+        super().handle_one_request()
+        if self._perf_started is not None and self._perf_status is not None:
+            REQUEST_STATS.record(
+                perf_route(self.command, self.path),
+                self._perf_status,
+                (time.perf_counter() - self._perf_started) * 1000,
+                self.wfile.bytes_written,
+            )
 
-        if path == '/api/score-prediction':
-            # Score a prediction as correct (✓) or wrong (✗)
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length).decode('utf-8')
-            try:
-                data = json.loads(body) if body else {}
-            except:
-                data = {}
-            
-            pred_id = data.get('id')
-            score = data.get('score')  # 1-5 numeric rating
-            
-            # Convert to int if needed
-            try:
-                score = int(score)
-            except:
-                pass
-            
-            if not pred_id or score not in [1, 2, 3, 4, 5]:
-                self.send_response(400)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "Missing id or invalid score"}).encode())
-                return
-            
-            predictions_file = os.path.join(DASHBOARD_DIR, "predictions.json")
+    def _check_auth(self):
+        """Check ?key= param or session cookie. Returns True, False, or 'redirect'."""
+        if MISSION_CONTROL_DISABLE_AUTH:
+            return True
+
+        # Localhost always allowed
+        client_ip = self.client_address[0]
+        if client_ip in ("127.0.0.1", "::1"):
+            return True
+
+        # Allow trusted LAN clients without cookie/key to keep mobile access frictionless.
+        if MISSION_CONTROL_TRUST_LAN and _is_private_client_ip(client_ip):
+            return True
+
+        # Check query param for key
+        parsed = urlparse(self.path)
+        params = parse_qs(parsed.query)
+        if params.get("key", [None])[0] == DASHBOARD_KEY:
+            session_id = secrets.token_hex(16)
+            _valid_sessions[session_id] = time.time()
+            self.send_response(302)
+            self.send_header("Set-Cookie", f"mc_session={session_id}; Path=/; HttpOnly; SameSite=Strict; Max-Age=86400")
+            self.send_header("Location", parsed.path or "/")
+            self.end_headers()
+            return "redirect"
+
+        # Check cookie
+        cookie_header = self.headers.get("Cookie", "")
+        if cookie_header:
+            cookies = http.cookies.SimpleCookie()
             try:
-                with open(predictions_file, 'r', encoding='utf-8') as f:
-                    preds = json.load(f)
-                
-                # Find and update the prediction
-                found = False
-                for p in preds.get('predictions', []):
-                    if p.get('id') == pred_id:
-                        old_score = p.get('score')
-                        p['score'] = score
-                        p['scored_at'] = datetime.now(timezone.utc).isoformat()
-                        found = True
-                        
-                        # Update stats
-                        if old_score is None:
-                            preds['stats']['pending'] -= 1
-                        elif old_score >= 4:
-                            preds['stats']['correct'] -= 1
-                        else:
-                            preds['stats']['wrong'] -= 1
-                        
-                        if score >= 4:  # 4-5 = correct
-                            preds['stats']['correct'] += 1
-                        else:  # 1-3 = needs improvement
-                            preds['stats']['wrong'] += 1
-                        break
-                
-                if not found:
-                    self.send_response(404)
-                    self.send_header('Content-Type', 'application/json')
-                    self.end_headers()
-                    self.wfile.write(json.dumps({"error": f"Prediction {pred_id} not found"}).encode())
-                    return
-                
-                preds['version'] += 1
-                with open(predictions_file, 'w', encoding='utf-8') as f:
-                    json.dump(preds, f, indent=4)
-                
-                # Update game stats
-                today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-                game = preds.get('game', {"streak": 0, "best_streak": 0, "today_scored": 0, "total_scored": 0, "accuracy": 0, "last_play_date": None, "level": 1, "xp": 0})
-                
-                if game.get('last_play_date') != today:
-                    # New day - check streak
-                    if game.get('last_play_date'):
-                        from datetime import timedelta
-                        last = datetime.strptime(game['last_play_date'], "%Y-%m-%d")
-                        if (datetime.strptime(today, "%Y-%m-%d") - last).days == 1:
-                            game['streak'] += 1
-                        else:
-                            game['streak'] = 1
+                cookies.load(cookie_header)
+                session = cookies.get("mc_session")
+                if session and session.value in _valid_sessions:
+                    if time.time() - _valid_sessions[session.value] < 86400:
+                        return True
                     else:
-                        game['streak'] = 1
-                    game['today_scored'] = 0
-                    game['last_play_date'] = today
-                
-                game['today_scored'] += 1
-                game['total_scored'] += 1
-                game['xp'] += score * 2  # XP based on score: 2-10 points
-                
-                # Track battle scores
-                game['total_rating_sum'] = game.get('total_rating_sum', 0) + score
-                game['bot_score'] = round(game['total_rating_sum'] / game['total_scored'], 1)
-                
-                if score <= 2:  # Human found a blind spot!
-                    game['blind_spots_found'] = game.get('blind_spots_found', 0) + 1
-                game['human_score'] = game.get('blind_spots_found', 0)
-                game['best_streak'] = max(game['streak'], game.get('best_streak', 0))
-                
-                # Calculate accuracy
-                total = preds['stats']['correct'] + preds['stats']['wrong']
-                game['accuracy'] = round(preds['stats']['correct'] / total * 100) if total > 0 else 0
-                
-                # Level up every 100 XP
-                game['level'] = 1 + game['xp'] // 100
-                
-                preds['game'] = game
-                
-                # Log to daily predictions log
-                log_file = os.path.join(WORKSPACE_DIR, "memory", "predictions-log.jsonl")
-                log_entry = {
-                    "date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
-                    "time": datetime.now(timezone.utc).strftime("%H:%M:%S"),
-                    "event": "score",
-                    "prediction_id": pred_id,
-                    "score": score,
-                    "stats": preds['stats'],
-                    "game": game
-                }
-                with open(log_file, 'a', encoding='utf-8') as f:
-                    f.write(json.dumps(log_entry) + '\n')
-                
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"ok": True, "id": pred_id, "score": score, "stats": preds['stats']}).encode())
-                return
-                
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
-                return
+                        del _valid_sessions[session.value]
+            except Exception:
+                pass
 
-        self.send_response(404)
-        self.send_header('Content-Type', 'application/json')
+        return False
+
+    def _dispatch(self, method):
+        """Serve the request from ROUTES; returns False when no route matches the path."""
+        path, _, query = self.path.partition('?')
+        route = ROUTES.get((method, path))
+        if route is None:
+            return False
+        body = b''
+        if method == 'POST':
+            content_length = int(self.headers.get('Content-Length', 0) or 0)
+            body = self.rfile.read(content_length) if content_length > 0 else b''
+        response = run_route(route, RouteRequest(method, path, query, body, self.headers, handler=self))
+        if response is not None:
+            self._send_route_response(response)
+        return True
+
+    def _send_route_response(self, response):
+        self.send_response(response.status)
+        if response.status != 304:
+            self.send_header('Content-Type', response.content_type)
+            self.send_header('Content-Length', str(len(response.body)))
+        for name, value in response.headers.items():
+            self.send_header(name, value)
         self.end_headers()
-        self.wfile.write(b'{"error": "Not found"}')
+        if response.body:
+            self.wfile.write(response.body)
 
-    def do_GET(self):
+    def do_POST(self):
         auth = self._check_auth()
         if auth == "redirect":
             return
         if not auth:
             self.send_response(403)
-            self.send_header("Content-Type", "text/html")
-            self.end_headers()
-            self.wfile.write(b"<h1>403 Forbidden</h1><p>Access denied.</p>")
-            return
-
-        # Strip query string for path matching
-        path = self.path.split('?')[0]
-
-        # Serve dashboard HTML from the mission-control directory explicitly.
-        # This avoids stale/incorrect pages when the server is launched from a different cwd.
-        if path in ('/', '/index.html'):
-            dashboard_path = os.path.join(DASHBOARD_DIR, 'index.html')
-            try:
-                with open(dashboard_path, 'rb') as f:
-                    payload = f.read()
-                self.send_response(200)
-                self.send_header('Content-Type', 'text/html; charset=utf-8')
-                self.send_header('Cache-Control', 'no-store, no-cache, must-revalidate')
-                self.send_header('Pragma', 'no-cache')
-                self.send_header('Expires', '0')
-                self.end_headers()
-                self.wfile.write(payload)
-                return
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
-                return
-        
-        if path == '/api/qa-history':
-            # Return Q&A game history
-            qa_file = os.path.join(WORKSPACE_DIR, "memory", "francisco-qa.jsonl")
-            try:
-                entries = []
-                if os.path.exists(qa_file):
-                    with open(qa_file, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            line = line.strip()
-                            if line:
-                                entry = json.loads(line)
-                                if entry.get('type') != 'system':  # Skip system entries
-                                    entries.append(entry)
-                entries.reverse()
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json; charset=utf-8')
-                self.send_header('Cache-Control', 'no-cache')
-                self.end_headers()
-                self.wfile.write(json.dumps({"entries": entries}).encode())
-                return
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
-                return
-
-        if path == '/api/predictions-history':
-            # Return predictions scoring history
-            log_file = os.path.join(WORKSPACE_DIR, "memory", "predictions-log.jsonl")
-            try:
-                entries = []
-                if os.path.exists(log_file):
-                    with open(log_file, 'r', encoding='utf-8') as f:
-                        for line in f:
-                            line = line.strip()
-                            if line:
-                                entries.append(json.loads(line))
-                # Return most recent first
-                entries.reverse()
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json; charset=utf-8')
-                self.send_header('Cache-Control', 'no-cache')
-                self.end_headers()
-                self.wfile.write(json.dumps({"entries": entries}).encode())
-                return
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
-                return
-
-        if path == '/api/predictions':
-            # Return predictions for reinforcement learning display
-            predictions_file = os.path.join(DASHBOARD_DIR, "predictions.json")
-            try:
-                with open(predictions_file, 'r', encoding='utf-8') as f:
-                    preds = json.load(f)
-                self.send_response(200)
-                self.send_header('Content-Type', 'application/json; charset=utf-8')
-                self.send_header('Cache-Control', 'no-cache')
-                self.end_headers()
-                self.wfile.write(json.dumps(preds).encode())
-                return
-            except FileNotFoundError:
-                self.send_response(404)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(b'{"error": "predictions.json not found"}')
-                return
-            except Exception as e:
-                self.send_response(500)
-                self.send_header('Content-Type', 'application/json')
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
-                return
-
-        if path == '/api/research-queue':
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-cache')
-            self.end_headers()
-            try:
-                payload = _read_research_queue()
-                self.wfile.write(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
-            except Exception as e:
-                self.wfile.write(json.dumps({"error": str(e)}, ensure_ascii=False).encode('utf-8'))
-            return
-
-        if path == '/api/autoresearch/status':
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-cache')
+            self.send_header("Content-Type", "application/json")
             self.end_headers()
-            try:
-                payload = _read_autoresearch_status(limit=8)
-                self.wfile.write(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
-            except Exception as e:
-                self.wfile.write(json.dumps({"error": str(e)}, ensure_ascii=False).encode('utf-8'))
+            self.wfile.write(b'{"error": "Access denied"}')
             return
 
-        if path == '/api/activity':
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-cache')
-            self.end_headers()
-            with state_lock:
-                response = dict(activity_state)
-                response["highLevelTask"] = load_current_task()
-                self.wfile.write(json.dumps(response, indent=2, ensure_ascii=False).encode('utf-8'))
-            return
-        
-        if path == '/api/health':
-            self.send_response(200)
+        if not self._dispatch('POST'):
+            self.send_response(404)
             self.send_header('Content-Type', 'application/json')
             self.end_headers()
-            self.wfile.write(json.dumps({"status": "ok", "time": datetime.now(timezone.utc).isoformat()}).encode())
-            return
-        
-        if path == '/api/memory':
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-cache')
-            self.end_headers()
-            memory_health = check_memory_health()
-            self.wfile.write(json.dumps(memory_health, indent=2, ensure_ascii=False).encode('utf-8'))
-            return
-        
-        # Agent profile API - GET to read agent MD file
-        if path.startswith('/api/agent-profile'):
-            query = parse_qs(urlparse(self.path).query)
-            agent_type = query.get('agent', [None])[0]
-            
-            agent_files = {
-                'research': 'agents/research-agent.md',
-                'content': 'agents/content-agent.md',
-                'audit': 'agents/audit-agent.md',
-                'analytics': 'agents/analytics-agent.md',
-                'code': 'agents/code-agent.md'
-            }
-            
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
-            self.send_header('Access-Control-Allow-Origin', '*')
+            self.wfile.write(b'{"error": "Not found"}')
+
+    def _start_activity_stream(self):
+        """Hand this connection to the activity stream broadcaster (Server-Sent Events)."""
+        # The slot is taken before any bytes go out, so a full stream answers 503
+        # rather than a 200 that is then never attached.
+        if not activity_stream.reserve():
+            self.send_response(503)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Retry-After', '10')
             self.end_headers()
-            
-            if not agent_type or agent_type not in agent_files:
-                self.wfile.write(json.dumps({"error": f"Invalid agent type: {agent_type}"}).encode())
-                return
-            
-            agent_path = os.path.join(WORKSPACE_DIR, agent_files[agent_type])
-            try:
-                if os.path.exists(agent_path):
-                    with open(agent_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    self.wfile.write(json.dumps({"ok": True, "content": content, "path": agent_files[agent_type]}).encode())
-                else:
-                    self.wfile.write(json.dumps({"error": f"Agent file not found: {agent_files[agent_type]}"}).encode())
-            except Exception as e:
-                self.wfile.write(json.dumps({"error": str(e)}).encode())
+            self.wfile.write(json.dumps({"error": "Too many activity stream clients"}).encode('utf-8'))
             return
-        
-        if path == '/api/backlog':
+        try:
+            high_level_task = load_current_task()
             self.send_response(200)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
-            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
             self.send_header('Cache-Control', 'no-cache')
-            self.end_headers()
-            backlog = []
-            state_file = os.path.join(WORKSPACE_DIR, "memory", "state.json")
-            try:
-                if os.path.exists(state_file):
-                    with open(state_file, 'r', encoding='utf-8') as f:
-                        state = json.load(f)
-                    backlog = state.get("backlog", [])
-            except Exception as e:
-                print(f"Error loading backlog: {e}")
-            self.wfile.write(json.dumps({"backlog": backlog}, indent=2, ensure_ascii=False).encode('utf-8'))
-            return
-        
-        if path == '/api/cron-jobs':
-            # Read cron jobs from cached file (updated periodically by bot)
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
             self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('X-Accel-Buffering', 'no')
             self.end_headers()
-            
-            try:
-                cron_file = os.path.join(DASHBOARD_DIR, "cron-jobs.json")
-                if os.path.exists(cron_file):
-                    with open(cron_file, 'r', encoding='utf-8') as f:
-                        cron_data = json.load(f)
-                    self.wfile.write(json.dumps(cron_data, indent=2, ensure_ascii=False).encode('utf-8'))
-                else:
-                    self.wfile.write(json.dumps({"jobs": [], "error": "cron-jobs.json not found"}).encode('utf-8'))
-            except Exception as e:
-                self.wfile.write(json.dumps({"error": str(e), "jobs": []}).encode('utf-8'))
-            return
+            self.wfile.flush()
+        except BaseException:
+            activity_stream.release()
+            raise
+        with state_lock:
+            snapshot = dict(activity_state)
+            snapshot["recentEvents"] = recent_events.recent()
+            snapshot["highLevelTask"] = high_level_task
+            activity_stream.attach(self.request, snapshot, reserved=True)
+        # The broadcaster owns the socket from here; don't let the worker close it.
+        self.server.detach_request(self.request)
+        self.close_connection = True
 
-        if path == '/api/task':
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-cache')
-            self.end_headers()
-            try:
-                query = parse_qs(urlparse(self.path).query)
-                task_id = query.get('id', [None])[0]
-                if not isinstance(task_id, str) or not task_id.strip():
-                    self.wfile.write(json.dumps({"error": "task id is required"}).encode('utf-8'))
-                    return
-                task_id = task_id.strip()
-                tasks_file = os.path.join(WORKSPACE_DIR, "memory", "tasks.json")
-                if not os.path.exists(tasks_file):
-                    self.wfile.write(json.dumps({"error": "tasks.json not found"}).encode('utf-8'))
-                    return
-
-                tasks_data = load_json_file(tasks_file)
-                tasks = tasks_data.get("tasks", {}) if isinstance(tasks_data, dict) else {}
-                task = tasks.get(task_id) if isinstance(tasks, dict) else None
-                if not isinstance(task, dict):
-                    self.wfile.write(json.dumps({"error": f"task not found: {task_id}"}).encode('utf-8'))
-                    return
-                sanitized = _sanitize_task_for_detail(task_id, task)
-                self.wfile.write(json.dumps({"id": task_id, "task": sanitized}, ensure_ascii=False).encode('utf-8'))
-            except Exception as e:
-                self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
-            return
-        
-        if path == '/api/tasks':
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-cache')
-            self.end_headers()
-            tasks_file = os.path.join(WORKSPACE_DIR, "memory", "tasks.json")
-            try:
-                if os.path.exists(tasks_file):
-                    tasks_data = load_json_file(tasks_file)
-                    
-                    # AUTO-PROMOTE: If bot_current is empty, pull from bot_queue
-                    lanes = tasks_data.get('lanes', {})
-                    bot_current = lanes.get('bot_current', [])
-                    bot_queue = lanes.get('bot_queue', [])
-                    
-                    if len(bot_current) == 0 and len(bot_queue) > 0:
-                        # Move first task from queue to current
-                        next_task_id = bot_queue.pop(0)
-                        bot_current.append(next_task_id)
-                        
-                        # Update task status
-                        if next_task_id in tasks_data.get('tasks', {}):
-                            tasks_data['tasks'][next_task_id]['status'] = 'in_progress'
-                            tasks_data['tasks'][next_task_id]['started_at'] = datetime.now(timezone.utc).isoformat()
-                        
-                        # Save back to file
-                        lanes['bot_current'] = bot_current
-                        lanes['bot_queue'] = bot_queue
-                        tasks_data['lanes'] = lanes
-                        tasks_data['updated_at'] = datetime.now(timezone.utc).isoformat()
-                        
-                        with open(tasks_file, 'w', encoding='utf-8') as f:
-                            json.dump(tasks_data, f, indent=4, ensure_ascii=False)
-                    
-                    tasks_map = tasks_data.get('tasks', {})
-                    lane_task_ids = collect_lane_task_ids(lanes)
-                    compact_tasks = {}
-                    if isinstance(tasks_map, dict):
-                        for task_id in lane_task_ids:
-                            compact_tasks[task_id] = summarize_task_for_dashboard(
-                                task_id,
-                                tasks_map.get(task_id),
-                            )
-
-                    payload = {
-                        "version": tasks_data.get("version"),
-                        "updated_at": tasks_data.get("updated_at"),
-                        "updated_by": tasks_data.get("updated_by"),
-                        "lanes": lanes,
-                        "tasks": compact_tasks,
-                        "tasks_in_lanes": len(compact_tasks),
-                        "tasks_total": len(tasks_map) if isinstance(tasks_map, dict) else 0,
-                    }
-                    self.wfile.write(json.dumps(payload, ensure_ascii=False).encode('utf-8'))
-                else:
-                    self.wfile.write(json.dumps({"error": "tasks.json not found"}).encode('utf-8'))
-            except Exception as e:
-                self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
-            return
-        
-        if path == '/api/metrics':
-            # Council A+ upgrade: Metrics dashboard endpoint
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-cache')
-            self.end_headers()
-            try:
-                import subprocess
-                result = subprocess.run(
-                    ['python', os.path.join(WORKSPACE_DIR, 'scripts', 'metrics.py'), 'status'],
-                    capture_output=True, text=True, timeout=5
-                )
-                if result.returncode == 0:
-                    self.wfile.write(result.stdout.encode('utf-8'))
-                else:
-                    self.wfile.write(json.dumps({"error": result.stderr or "metrics.py failed"}).encode('utf-8'))
-            except Exception as e:
-                self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
-            return
-        
-        if path == '/api/circuits':
-            # Council A+ upgrade: Circuit breaker status
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json; charset=utf-8')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-cache')
-            self.end_headers()
-            circuits_file = os.path.join(WORKSPACE_DIR, "memory", "circuits.json")
-            try:
-                if os.path.exists(circuits_file):
-                    with open(circuits_file, 'r', encoding='utf-8') as f:
-                        self.wfile.write(f.read().encode('utf-8'))
-                else:
-                    self.wfile.write(json.dumps({"error": "circuits.json not found"}).encode('utf-8'))
-            except Exception as e:
-                self.wfile.write(json.dumps({"error": str(e)}).encode('utf-8'))
+    def do_GET(self):
+        auth = self._check_auth()
+        if auth == "redirect":
             return
-        
-        if path == '/api/status':
-            # Return lightweight UI status + a direct gateway control URL.
-            up_since = activity_state.get("stats", {}).get("upSince", "")
-            uptime = 0
-            if up_since:
-                try:
-                    up_dt = datetime.fromisoformat(up_since)
-                    uptime = int((datetime.now(timezone.utc) - up_dt).total_seconds())
-                except:
-                    pass
-            # Check if we've seen activity recently (within 5 min = online)
-            last_update = activity_state.get("lastUpdate", "")
-            online = False
-            if last_update:
-                try:
-                    last_dt = datetime.fromisoformat(last_update)
-                    online = (datetime.now(timezone.utc) - last_dt).total_seconds() < 300
-                except:
-                    pass
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
+        if not auth:
+            self.send_response(403)
+            self.send_header("Content-Type", "text/html")
             self.end_headers()
-            gateway_info = load_gateway_info()
-            runtime_info = load_runtime_session_info()
-            session_info = dict(activity_state.get("sessionInfo", {}))
-            if isinstance(runtime_info, dict):
-                for key in ("model", "provider", "sessionId", "source"):
-                    value = runtime_info.get(key)
-                    if value is not None and value != "":
-                        session_info[key] = value
-
-            self.wfile.write(json.dumps({
-                "online": online,
-                "uptime": uptime,
-                "status": activity_state.get("status", "unknown"),
-                "sessionInfo": session_info,
-                "gateway": gateway_info
-            }).encode())
+            self.wfile.write(b"<h1>403 Forbidden</h1><p>Access denied.</p>")
             return
 
-        if path == '/api/models':
-            self.send_response(200)
-            self.send_header('Content-Type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.send_header('Cache-Control', 'no-cache')
-            self.end_headers()
-            start_models_refresh_if_needed()
-            snap = snapshot_models_state()
-            cached = snap.get("data")
-            if isinstance(cached, dict):
-                payload = dict(cached)
-                # Never block the selector when we already have cached model rows.
-                payload["loading"] = False
-                payload["refreshing"] = bool(snap.get("refreshing"))
-                payload["cacheAgeMs"] = snap.get("ageMs")
-                if snap.get("error"):
-                    payload["warning"] = snap.get("error")
-                self.wfile.write(json.dumps(payload).encode('utf-8'))
-                return
-            self.wfile.write(json.dumps({
-                "loading": True,
-                "cacheAgeMs": snap.get("ageMs"),
-                "error": snap.get("error"),
-                "models": [],
-                "defaultModel": None
-            }).encode('utf-8'))
+        if self._dispatch('GET'):
             return
-        
+
         # Serve static files
         return super().do_GET()
     
@@ -3490,6 +3965,50 @@ class ActivityHandler(http.server.SimpleHTTPRequestHandler):
         pass  # Suppress request logging
 
 
+class PooledHTTPServer(http.server.HTTPServer):
+    """HTTPServer that hands each connection to a bounded worker pool.
+
+    One slow endpoint only occupies one worker, so dashboard polls from other
+    browsers keep being served while it is in flight.
+    """
+
+    allow_reuse_address = True
+
+    def __init__(self, server_address, handler_class, workers=MISSION_CONTROL_WORKERS):
+        super().__init__(server_address, handler_class)
+        self.workers = workers
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="mc-http"
+        )
+        self._detached = set()
+        self._detached_lock = threading.Lock()
+
+    def detach_request(self, request):
+        """Keep request's socket open after its handler returns (used by long-lived streams)."""
+        with self._detached_lock:
+            self._detached.add(request)
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            with self._detached_lock:
+                detached = request in self._detached
+                self._detached.discard(request)
+            if not detached:
+                self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        activity_stream.close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
 def main():
     import sys
     sys.stdout.reconfigure(line_buffering=True)
@@ -3498,6 +4017,8 @@ def main():
     # Start log tailer thread
     tailer = threading.Thread(target=tail_log, daemon=True)
     tailer.start()
+    # Promote queued bot tasks in the background so GET /api/tasks stays read-only.
+    LANE_SCHEDULER.start()
     # Warm model cache eagerly so first dashboard paint has model options.
     try:
         load_models_state_cached(force=True, ttl_seconds=0)
@@ -3511,14 +4032,14 @@ def main():
         print(f"Log source: {log_source.get('name')} ({log_source.get('dir')})")
     print(f"Dashboard: http://{dashboard_host}:{PORT}")
     print(f"Activity API: http://{dashboard_host}:{PORT}/api/activity")
+    print(f"Activity stream (SSE): http://{dashboard_host}:{PORT}/api/activity/stream")
     if _generated_dashboard_key:
         print("DASHBOARD_KEY not set; generated an ephemeral key for this process.")
     if BIND_HOST in ("0.0.0.0", "::"):
         print(f"LAN access URL: http://<host-ip>:{PORT}/?key={DASHBOARD_KEY}")
     
-    http.server.HTTPServer.allow_reuse_address = True
-    server = http.server.HTTPServer((BIND_HOST, PORT), ActivityHandler)
-    print("Server bound and listening...")
+    server = PooledHTTPServer((BIND_HOST, PORT), ActivityHandler, workers=MISSION_CONTROL_WORKERS)
+    print(f"Server bound and listening ({MISSION_CONTROL_WORKERS} workers)...")
     try:
         server.serve_forever()
     except KeyboardInterrupt:
@@ -3527,4 +4048,12 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    if sys.argv[1:2] == ['--bench-routes']:
+        # Time each read-only route in-process: --bench-routes [iterations] [path ...]
+        args = sys.argv[2:]
+        iterations = int(args.pop(0)) if args and args[0].isdigit() else 20
+        for row in bench_routes(args or None, iterations):
+            print(f"{row['route']:<36} {row['status']}  mean {row['meanMs']:>9.3f}ms  "
+                  f"p95 {row['p95Ms']:>9.3f}ms  {row['bytes']} bytes")
+    else:
+        main()
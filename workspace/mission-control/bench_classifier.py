@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Mission Control log event classifier.
+
+Runs parse_log_entry() + categorize_event() from activity-server.py over a
+recorded gateway log and reports lines/second. Without a log path a synthetic
+log with a realistic event mix is generated.
+
+Usage:
+    python bench_classifier.py /tmp/openclaw/openclaw-2026-01-29.log
+    python bench_classifier.py --lines 200000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+DASHBOARD_DIR = Path(__file__).resolve().parent
+
+# (weight, message, subsystem) — roughly the mix seen in a busy gateway log,
+# where most lines are noise that classifies to nothing.
+SYNTHETIC_MIX = [
+    (30, "embedded run tool start: runId={run} tool={tool}", "agent/embedded"),
+    (30, "embedded run tool end: runId={run} tool={tool}", "agent/embedded"),
+    (4, "embedded run start: runId={run} model=claude-opus-4-5 provider=anthropic messageChannel=telegram", "agent/embedded"),
+    (4, "embedded run done: runId={run} durationMs=1834", "agent/embedded"),
+    (6, "session state: prev=idle new=processing", "diagnostic"),
+    (6, "session state: prev=processing new=idle", "diagnostic"),
+    (4, "embedded run prompt start: runId={run}", "agent/embedded"),
+    (2, "\x1b[31m[tools] browser failed: tab not found\x1b[39m", "agent/embedded"),
+    (2, "webchat connected client=webchat-ui conn={run}", "gateway/ws"),
+    (6, "telegram sendMessage ok chat=123", "telegram"),
+    (40, "lane enqueue: lane=session:agent:main queueSize=1", "diagnostic"),
+    (60, "\x1b[36mws\x1b[39m \x1b[2m⇄\x1b[22m res \x1b[32m✓\x1b[39m chat.history 12ms conn={run}", "gateway/ws"),
+]
+TOOLS = ["exec", "browser", "Read", "Write", "Edit", "web_search", "memory_search", "custom_tool"]
+
+
+def load_server():
+    sys.path.insert(0, str(DASHBOARD_DIR))
+    spec = importlib.util.spec_from_file_location("activity_server", DASHBOARD_DIR / "activity-server.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def synthesize(count: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    weights = [w for w, _, _ in SYNTHETIC_MIX]
+    lines = []
+    for i in range(count):
+        _, template, subsystem = rng.choices(SYNTHETIC_MIX, weights)[0]
+        level = "ERROR" if "failed" in template else "INFO"
+        record = {
+            "0": json.dumps({"subsystem": subsystem}),
+            "1": template.format(run=f"{i:08x}", tool=rng.choice(TOOLS)),
+            "_meta": {
+                "runtime": "node",
+                "name": json.dumps({"subsystem": subsystem}),
+                "date": "2026-01-29T17:00:00.000Z",
+                "logLevelId": 5 if level == "ERROR" else 3,
+                "logLevelName": level,
+            },
+            "time": "2026-01-29T17:00:00.000Z",
+        }
+        lines.append(json.dumps(record, ensure_ascii=False))
+    return lines
+
+
+def run(server, lines: list[str], repeat: int) -> dict:
+    parse = server.parse_log_entry
+    categorize = server.categorize_event
+    best = float("inf")
+    events = 0
+    for _ in range(repeat):
+        events = 0
+        started = time.perf_counter()
+        for line in lines:
+            if categorize(parse(line)):
+                events += 1
+        best = min(best, time.perf_counter() - started)
+    return {
+        "lines": len(lines),
+        "events": events,
+        "bestSeconds": round(best, 4),
+        "linesPerSecond": int(len(lines) / best) if best else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("log", nargs="?", help="Recorded gateway log (JSON lines)")
+    parser.add_argument("--lines", type=int, default=100_000, help="Synthetic line count when no log is given")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs to take the best of")
+    args = parser.parse_args()
+
+    if args.log:
+        with open(args.log, "r", encoding="utf-8", errors="replace") as f:
+            lines = f.read().splitlines()
+        source = args.log
+    else:
+        lines = synthesize(args.lines)
+        source = f"synthetic ({args.lines} lines)"
+
+    result = run(load_server(), lines, max(1, args.repeat))
+    result["source"] = source
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+Incremental log tailer for Mission Control.
+
+Follows the active gateway log by byte offset instead of re-polling it. On Linux
+the tailer sleeps on inotify watches for the log directories and only wakes when
+a file is appended, created, moved or deleted; elsewhere (or if inotify is not
+available) it falls back to a cheap stat-based poll. The offset of the last
+complete line is persisted per file so a restart resumes where it left off
+instead of re-ingesting the tail of the log.
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+
+# Shared workspace helpers live in ../scripts.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from atomic_json import write_json_atomic  # noqa: E402
+
+DEFAULT_POLL_INTERVAL = 2.0
+DEFAULT_RESCAN_INTERVAL = 60.0
+POLL_RESCAN_INTERVAL = 10.0
+DEFAULT_SAVE_INTERVAL = 5.0
+DEFAULT_BACKFILL_BYTES = 50_000
+MAX_READ_BYTES = 1_048_576
+MAX_TRACKED_FILES = 8
+FINGERPRINT_BYTES = 256
+
+# inotify(7) event masks.
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+
+_WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+)
+_STRUCTURAL_MASK = (
+    IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    | IN_DELETE_SELF | IN_MOVE_SELF | IN_Q_OVERFLOW | IN_IGNORED
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class PollWatcher:
+    """Fallback watcher: wakes on a fixed interval and reports nothing specific."""
+
+    mode = "poll"
+
+    def __init__(self, interval=DEFAULT_POLL_INTERVAL):
+        self.interval = interval
+
+    def watch(self, directories):
+        pass
+
+    def wait(self, timeout):
+        """Sleep and return (None, False): the caller must stat to find out what changed."""
+        time.sleep(max(0.0, min(timeout, self.interval)))
+        return None, False
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Directory watcher backed by inotify(7) through ctypes."""
+
+    mode = "inotify"
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._libc.inotify_init1.argtypes = [ctypes.c_int]
+        self._libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._fd = fd
+        self._watches = {}
+
+    @classmethod
+    def available(cls):
+        return sys.platform.startswith("linux")
+
+    def watch(self, directories):
+        """Add watches for any directory not already watched (missing ones are skipped)."""
+        watched = set(self._watches.values())
+        for directory in directories:
+            directory = Path(directory)
+            if directory in watched or not directory.is_dir():
+                continue
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd >= 0:
+                self._watches[wd] = directory
+                watched.add(directory)
+
+    def wait(self, timeout):
+        """Block until events arrive or timeout. Returns (changed paths, structural change)."""
+        try:
+            ready, _, _ = select.select([self._fd], [], [], max(0.0, timeout))
+        except InterruptedError:
+            return set(), False
+        if not ready:
+            return set(), False
+
+        changed = set()
+        structural = False
+        while True:
+            try:
+                buf = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            if not buf:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(buf):
+                wd, mask, _cookie, name_len = _EVENT_HEADER.unpack_from(buf, offset)
+                offset += _EVENT_HEADER.size
+                name = buf[offset:offset + name_len].rstrip(b"\0")
+                offset += name_len
+                if mask & _STRUCTURAL_MASK:
+                    structural = True
+                if mask & IN_IGNORED:
+                    self._watches.pop(wd, None)
+                    continue
+                directory = self._watches.get(wd)
+                if directory is not None and name:
+                    changed.add(str(directory / os.fsdecode(name)))
+        return changed, structural
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+            self._watches.clear()
+
+
+def create_watcher(poll_interval=DEFAULT_POLL_INTERVAL, force_poll=False):
+    """Return an inotify watcher where supported, otherwise a polling watcher."""
+    if not force_poll and InotifyWatcher.available():
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):
+            pass
+    return PollWatcher(poll_interval)
+
+
+class LogTailer:
+    """Follow the active log file and hand complete lines to a callback.
+
+    resolve_path() returns the current log file path and is only called on
+    directory events (create/move/delete) or every rescan_interval seconds.
+    on_lines(lines) receives decoded, newline-stripped lines in file order.
+    """
+
+    def __init__(self, resolve_path, on_lines, state_path=None, watch_dirs=(), watcher=None,
+                 poll_interval=DEFAULT_POLL_INTERVAL, rescan_interval=DEFAULT_RESCAN_INTERVAL,
+                 save_interval=DEFAULT_SAVE_INTERVAL, backfill_bytes=DEFAULT_BACKFILL_BYTES):
+        self.resolve_path = resolve_path
+        self.on_lines = on_lines
+        self.state_path = Path(state_path) if state_path else None
+        self.watch_dirs = [Path(d) for d in watch_dirs]
+        self.watcher = watcher if watcher is not None else create_watcher(poll_interval)
+        self.rescan_interval = rescan_interval
+        if self.watcher.mode == "poll":
+            # Without directory events, new/rotated files are only found by rescanning.
+            self.rescan_interval = min(rescan_interval, POLL_RESCAN_INTERVAL)
+        self.save_interval = save_interval
+        self.backfill_bytes = backfill_bytes
+
+        self._stop = threading.Event()
+        self._lock = threading.RLock()
+        self._path = None
+        self._handle = None
+        self._identity = None
+        self._fingerprint = (0, 0)
+        self._offset = 0
+        self._partial = b""
+        self._last_resolve = 0.0
+        self._last_save = 0.0
+        self._dirty = False
+        self._saved = self._load_state()
+        self._stats = {
+            "linesIngested": 0,
+            "bytesIngested": 0,
+            "wakeups": 0,
+            "rotations": 0,
+            "lastIngestAt": None,
+            "lastLagMs": 0,
+            "maxLagMs": 0,
+            "errors": 0,
+        }
+
+    # ---- persisted offsets ----
+
+    def _load_state(self):
+        if not self.state_path or not self.state_path.exists():
+            return {}
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+            files = data.get("files", {})
+            return files if isinstance(files, dict) else {}
+        except Exception:
+            return {}
+
+    def save_state(self, force=False):
+        """Persist the committed offset of the current file (throttled unless forced)."""
+        if not self.state_path:
+            return
+        now = time.monotonic()
+        if not force and (not self._dirty or now - self._last_save < self.save_interval):
+            return
+        with self._lock:
+            if self._handle is not None and self._fingerprint[0] < FINGERPRINT_BYTES:
+                # The file was shorter than the fingerprint window when opened.
+                position = self._handle.tell()
+                self._fingerprint = self._read_fingerprint(self._handle, FINGERPRINT_BYTES)
+                self._handle.seek(position)
+            if self._path and self._identity:
+                # Re-insert so the current file sorts last (most recently touched).
+                self._saved.pop(self._path, None)
+                self._saved[self._path] = {
+                    "dev": self._identity[0],
+                    "inode": self._identity[1],
+                    "offset": self._offset - len(self._partial),
+                    "headBytes": self._fingerprint[0],
+                    "headCrc": self._fingerprint[1],
+                }
+            files = dict(list(self._saved.items())[-MAX_TRACKED_FILES:])
+        try:
+            write_json_atomic(self.state_path, {"files": files})
+            self._saved = files
+            self._last_save = now
+            self._dirty = False
+        except OSError:
+            self._stats["errors"] += 1
+
+    # ---- file handling ----
+
+    def _close_file(self):
+        if self._handle is not None:
+            try:
+                self._handle.close()
+            except OSError:
+                pass
+        self._handle = None
+        self._identity = None
+        self._partial = b""
+
+    @staticmethod
+    def _read_fingerprint(handle, length):
+        """CRC of the first bytes, so a new file that reuses an inode is not mistaken for the old one."""
+        handle.seek(0)
+        head = handle.read(length)
+        return len(head), zlib.crc32(head)
+
+    def _open_file(self, path, from_start=False):
+        """Open path, resuming from a saved offset or backfilling the recent tail.
+
+        from_start is used for files that appear while tailing (rotation), which
+        are read in full rather than from the backfill window.
+        """
+        self._close_file()
+        self._path = path
+        try:
+            handle = open(path, "rb")
+        except OSError:
+            return
+        st = os.fstat(handle.fileno())
+        identity = (st.st_dev, st.st_ino)
+        saved = self._saved.get(path)
+        if (
+            saved
+            and (saved.get("dev"), saved.get("inode")) == identity
+            and 0 <= saved.get("offset", -1) <= st.st_size
+            and self._read_fingerprint(handle, saved.get("headBytes", 0))[1] == saved.get("headCrc", 0)
+        ):
+            offset = int(saved["offset"])
+        elif from_start:
+            offset = 0
+        else:
+            offset = max(0, st.st_size - self.backfill_bytes)
+            if offset > 0:
+                handle.seek(offset)
+                handle.readline()  # Skip partial line
+                offset = handle.tell()
+        self._fingerprint = self._read_fingerprint(handle, FINGERPRINT_BYTES)
+        handle.seek(offset)
+        self._handle = handle
+        self._identity = identity
+        self._offset = offset
+        self._dirty = True
+
+    def _switch_to(self, path):
+        if path == self._path and self._handle is not None:
+            return
+        rotated = self._handle is not None
+        if rotated:
+            self._drain()
+            self._stats["rotations"] += 1
+            self.save_state(force=True)
+        if path and os.path.exists(path):
+            self._open_file(path, from_start=rotated)
+        else:
+            self._close_file()
+            self._path = path
+
+    def _check_current(self):
+        """Detect truncation or replacement of the current path."""
+        if self._path is None:
+            return
+        try:
+            st = os.stat(self._path)
+        except OSError:
+            return
+        if self._handle is None:
+            # The file did not exist when resolved and has since been created.
+            self._open_file(self._path, from_start=True)
+            return
+        if (st.st_dev, st.st_ino) != self._identity:
+            self._drain()
+            self._stats["rotations"] += 1
+            self._saved.pop(self._path, None)
+            self._open_file(self._path, from_start=True)
+        elif st.st_size < self._offset - len(self._partial):
+            self._handle.seek(0)
+            self._offset = 0
+            self._partial = b""
+            self._dirty = True
+
+    def _drain(self):
+        """Read every complete line appended since the last call. Returns lines ingested."""
+        if self._handle is None:
+            return 0
+        total = 0
+        while True:
+            chunk = self._handle.read(MAX_READ_BYTES)
+            if not chunk:
+                break
+            self._offset += len(chunk)
+            data = self._partial + chunk
+            cut = data.rfind(b"\n")
+            if cut < 0:
+                self._partial = data
+                continue
+            self._partial = data[cut + 1:]
+            lines = data[:cut].decode("utf-8", errors="replace").splitlines()
+            self._stats["bytesIngested"] += cut + 1
+            if lines:
+                total += len(lines)
+                self.on_lines(lines)
+            if len(chunk) < MAX_READ_BYTES:
+                break
+        if total:
+            self._dirty = True
+            self._record_lag()
+            self._stats["linesIngested"] += total
+        return total
+
+    def _record_lag(self):
+        now = time.time()
+        self._stats["lastIngestAt"] = now
+        try:
+            mtime = os.fstat(self._handle.fileno()).st_mtime
+        except (OSError, AttributeError):
+            return
+        lag_ms = max(0, int((now - mtime) * 1000))
+        self._stats["lastLagMs"] = lag_ms
+        self._stats["maxLagMs"] = max(self._stats["maxLagMs"], lag_ms)
+
+    # ---- main loop ----
+
+    def _resolve(self):
+        self._last_resolve = time.monotonic()
+        path = self.resolve_path()
+        path = str(path) if path else None
+        dirs = list(self.watch_dirs)
+        if path:
+            dirs.append(Path(path).parent)
+        self.watcher.watch(dirs)
+        self._switch_to(path)
+
+    def poll_once(self, timeout=0.0):
+        """Run a single wait/ingest cycle. Returns the number of lines ingested."""
+        if self._last_resolve == 0.0:
+            # First cycle: pick the file and ingest the backfill without waiting.
+            with self._lock:
+                self._resolve()
+                ingested = self._drain()
+            self.save_state()
+            if ingested:
+                return ingested
+        changed, structural = self.watcher.wait(timeout)
+        with self._lock:
+            self._stats["wakeups"] += 1
+            if structural or time.monotonic() - self._last_resolve >= self.rescan_interval:
+                self._resolve()
+            if changed is None or not changed or self._path in changed or structural:
+                # Poll mode (None) and timeouts get a cheap stat; events for the
+                # current file read directly.
+                self._check_current()
+            ingested = self._drain()
+        self.save_state()
+        return ingested
+
+    def run(self):
+        """Tail until stop() is called. Exceptions are counted and the loop keeps going."""
+        while not self._stop.is_set():
+            try:
+                self.poll_once(timeout=self.rescan_interval)
+            except Exception as e:
+                self._stats["errors"] += 1
+                print(f"Log tail error: {e}")
+                with self._lock:
+                    self._close_file()
+                    self._path = None
+                    self._last_resolve = 0.0
+                time.sleep(DEFAULT_POLL_INTERVAL)
+        self.save_state(force=True)
+
+    def stop(self):
+        self._stop.set()
+
+    def close(self):
+        self.stop()
+        with self._lock:
+            self.save_state(force=True)
+            self._close_file()
+        self.watcher.close()
+
+    def stats(self):
+        """Ingest metrics: mode, current file, committed offset, bytes still unread and lag."""
+        with self._lock:
+            committed = self._offset - len(self._partial)
+            result = dict(self._stats)
+            result["mode"] = self.watcher.mode
+            result["file"] = self._path
+            result["offset"] = committed
+        size = None
+        if result["file"]:
+            try:
+                size = os.stat(result["file"]).st_size
+            except OSError:
+                size = None
+        result["bytesBehind"] = max(0, size - committed) if size is not None else 0
+        return result
@@ -15,6 +15,9 @@ import os
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
+from atomic_json import write_json_atomic
+from task_repository import open_repository
+
 SCRIPT_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = SCRIPT_DIR.parent.parent
 TASKS_FILE = PROJECT_ROOT / "workspace" / "memory" / "tasks.json"
@@ -47,9 +50,16 @@ def main():
         print(f"ERROR: {TASKS_FILE} not found")
         sys.exit(1)
 
-    with open(TASKS_FILE) as f:
-        data = json.load(f)
+    repo = open_repository(json_path=TASKS_FILE)
+    # The transaction holds the board for the whole run, so nothing lands in
+    # between reading the lanes and writing them back.
+    with repo.edit(updated_by="archive-tasks.py") as txn:
+        archive_board(txn)
+    repo.sync_export()
+
 
+def archive_board(txn):
+    data = txn.board()
     now = datetime.now(timezone.utc)
     cutoff = now - timedelta(days=ARCHIVE_AFTER_DAYS)
 
@@ -119,9 +129,6 @@ def main():
     for tid in trash_ids:
         data["tasks"].pop(tid, None)
 
-    data["updated_at"] = now.isoformat()
-    data["updated_by"] = "archive-tasks.py"
-    data["version"] = data.get("version", 0) + 1
 
     # --- Print summary ---
     mode = "[DRY RUN] " if DRY_RUN else ""
@@ -149,13 +156,13 @@ def main():
 
     # --- Write files ---
     if not DRY_RUN:
-        with open(archive_path, "w") as f:
-            json.dump(archive_data, f, indent=2)
-        with open(TASKS_FILE, "w") as f:
-            json.dump(data, f, indent=2)
+        # Archive first: the board is written when the transaction commits, so if we die
+        # in between the tasks are still on the board (and the archive merge is idempotent).
+        write_json_atomic(archive_path, archive_data, indent=2, ensure_ascii=True)
         print(f"\n  Written: {archive_path}")
         print(f"  Written: {TASKS_FILE}")
     else:
+        txn.rollback()
         print("\n  [DRY RUN] No files modified.")
 
 
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Atomic JSON writer shared by the workspace state writers.
+
+A plain open(path, 'w') + json.dump truncates the target first, so a crash or
+kill mid-write leaves a half-written board behind. write_json_atomic() encodes
+the document in memory, writes it to a temp file in the same directory,
+fsyncs it and renames it over the target, so readers only ever see the old or
+the new file.
+
+Shared documents edited by several processes (tasks.json) are read, changed
+and written back while holding file_lock(), a cross-process lock on a sibling
+lock file; the task repository builds its edit() on it.
+
+Usage:
+    python atomic_json.py bench [--tasks 500] [--iterations 50] [--dir /tmp]
+"""
+
+import argparse
+import copy
+import json
+import os
+import secrets
+import stat
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+DEFAULT_LOCK_TIMEOUT = 10.0
+
+
+def dumps(data, indent=2, compact=False, ensure_ascii=False, default=None, trailing_newline=False):
+    """Encode data as JSON text. compact=True drops indentation and separator spaces."""
+    if compact:
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=ensure_ascii, default=default)
+    else:
+        text = json.dumps(data, indent=indent, ensure_ascii=ensure_ascii, default=default)
+    return text + "\n" if trailing_newline else text
+
+
+def write_text_atomic(path, text, fsync=True, encoding="utf-8"):
+    """Replace path with text via temp file + fsync + rename."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = text.encode(encoding)
+    tmp_name = path.with_name(f".{path.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+    # 0o666 lets the umask apply as for a normal open(); an existing file keeps its mode.
+    fd = os.open(tmp_name, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        try:
+            os.chmod(tmp_name, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(payload)
+            handle.flush()
+            if fsync:
+                os.fsync(handle.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    if fsync:
+        _fsync_directory(path.parent)
+
+
+def write_json_atomic(path, data, indent=2, compact=False, ensure_ascii=False, default=None,
+                      trailing_newline=False, fsync=True):
+    """Atomically write data as JSON to path.
+
+    The document is encoded before anything touches the disk, so an encoding
+    error leaves the existing file untouched.
+    """
+    text = dumps(data, indent=indent, compact=compact, ensure_ascii=ensure_ascii,
+                 default=default, trailing_newline=trailing_newline)
+    write_text_atomic(path, text, fsync=fsync)
+
+
+def _fsync_directory(directory):
+    """Persist the rename itself (POSIX only; a no-op where directories can't be opened)."""
+    if os.name != "posix":
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# ============== LOCKING & COMPARE-AND-SWAP ==============
+
+def lock_path_for(path):
+    """Lock file guarding path (a hidden sibling, so it is never renamed over)."""
+    path = Path(path)
+    return path.with_name(f".{path.name}.lock")
+
+
+@contextmanager
+def file_lock(path, timeout=DEFAULT_LOCK_TIMEOUT):
+    """Hold an exclusive cross-process lock for path.
+
+    Uses flock(2) on a sibling lock file (msvcrt on Windows). flock locks belong
+    to the open file, so threads of one process exclude each other too. Raises
+    TimeoutError if the lock isn't acquired within timeout seconds.
+    """
+    lock_file = lock_path_for(path)
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o666)
+    deadline = time.monotonic() + timeout
+    delay = 0.001
+    try:
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                elif msvcrt is not None:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Timed out waiting for lock on {path}")
+                time.sleep(delay)
+                delay = min(delay * 2, 0.05)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
+
+def read_json(path, default=None):
+    """Load JSON from path; returns default (or raises) when the file is missing."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        if default is None:
+            raise
+        return copy.deepcopy(default)
+
+
+# ============== BENCHMARK ==============
+
+def _sample_board(task_count):
+    tasks = {}
+    for i in range(task_count):
+        tasks[f"T{i:04d}"] = {
+            "title": f"Sample task {i} — écrire le rapport",
+            "status": "pending",
+            "created_at": "2026-01-29T17:00:00+00:00",
+            "steps": [{"step": f"Step {n}", "status": "pending"} for n in range(5)],
+            "context": {"summary": "x" * 200, "links": ["https://example.com"] * 3},
+        }
+    return {
+        "version": 1,
+        "lanes": {"bot_current": [], "bot_queue": list(tasks)[:50], "done_today": list(tasks)[50:]},
+        "tasks": tasks,
+    }
+
+
+def _in_place_write(path, data):
+    # The pre-existing pattern: truncate and pretty-print straight into the target.
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def bench(task_count=500, iterations=50, directory=None):
+    data = _sample_board(task_count)
+    variants = [
+        ("in_place_pretty", lambda p: _in_place_write(p, data)),
+        ("atomic_pretty", lambda p: write_json_atomic(p, data)),
+        ("atomic_compact", lambda p: write_json_atomic(p, data, compact=True)),
+        ("atomic_compact_nofsync", lambda p: write_json_atomic(p, data, compact=True, fsync=False)),
+    ]
+    results = {}
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        for name, write in variants:
+            target = Path(tmp) / f"{name}.json"
+            write(target)  # warm up
+            samples = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                write(target)
+                samples.append((time.perf_counter() - started) * 1000)
+            samples.sort()
+            results[name] = {
+                "bytes": target.stat().st_size,
+                "p50_ms": round(statistics.median(samples), 3),
+                "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+            }
+    return {"tasks": task_count, "iterations": iterations, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Atomic JSON writer utilities")
+    sub = parser.add_subparsers(dest="command")
+    bench_parser = sub.add_parser("bench", help="Compare write latency against in-place dumps")
+    bench_parser.add_argument("--tasks", type=int, default=500)
+    bench_parser.add_argument("--iterations", type=int, default=50)
+    bench_parser.add_argument("--dir", default=None, help="Directory to write in (defaults to system temp)")
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        print(json.dumps(bench(args.tasks, args.iterations, args.dir), indent=2))
+        return 0
+    parser.print_help()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,7 @@ Usage:
 Sources: website_audit, competitor, content_gap, error_pattern, seasonal, analytics
 """
 
+import copy
 import json
 import os
 import sys
@@ -21,6 +22,9 @@ from pathlib import Path
 import hashlib
 import re
 
+from atomic_json import write_json_atomic
+from task_repository import open_repository
+
 # Paths
 WORKSPACE = Path(__file__).parent.parent
 TASKS_FILE = WORKSPACE / "memory" / "tasks.json"
@@ -56,10 +60,8 @@ def load_json(path: Path, default=None):
 
 
 def save_json(path: Path, data: dict):
-    """Save JSON file."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    """Save JSON file atomically (temp file + fsync + rename)."""
+    write_json_atomic(path, data, indent=2)
 
 
 def append_jsonl(path: Path, record: dict):
@@ -176,11 +178,75 @@ def create_task(tasks_data: dict, opportunity: dict, dry_run: bool = False) -> s
         # Update metadata
         tasks_data['updated_at'] = now
         tasks_data['updated_by'] = 'backlog-generator'
-        tasks_data['version'] = tasks_data.get('version', 0) + 1
     
     return task_id
 
 
+def select_and_create(tasks_data: dict, opportunities: list, dry_run: bool) -> dict:
+    """Apply limits, thresholds and duplicate checks, creating tasks in tasks_data.
+
+    Returns the counts, dedup records and output lines; nothing is printed or
+    saved here, so it can run inside a board transaction.
+    """
+    tasks_created = []
+    dedup = []
+    log = []
+    duplicates_skipped = 0
+    below_threshold = 0
+    
+    for opp in opportunities:
+        if len(tasks_created) >= MAX_TASKS_PER_RUN:
+            log.append(f"LIMIT: Max {MAX_TASKS_PER_RUN} tasks per run reached")
+            break
+        
+        # Check score threshold
+        if opp['score'] < SCORE_THRESHOLD_LOW:
+            below_threshold += 1
+            continue
+        
+        # Check confidence floor
+        if opp.get('confidence', 1.0) < CONFIDENCE_FLOOR:
+            log.append(f"SKIP: {opp['title'][:50]} (confidence {opp.get('confidence')} < {CONFIDENCE_FLOOR})")
+            continue
+        
+        # Check title similarity
+        if check_title_similarity(tasks_data.get('tasks', {}), opp['title']):
+            duplicates_skipped += 1
+            log.append(f"SKIP: Similar task exists: {opp['title'][:50]}")
+            continue
+        
+        # Create the task
+        task_id = create_task(tasks_data, opp, dry_run)
+        tasks_created.append({
+            'id': task_id,
+            'title': opp['title'],
+            'score': opp['score'],
+            'source': opp['source'],
+            'agent_type': opp.get('agent_type', 'operations')
+        })
+        
+        # Record in dedup
+        if not dry_run:
+            dedup.append({
+                'dedup_key': compute_dedup_key(opp['source'], opp['source_key']),
+                'created_at': datetime.now(timezone.utc).isoformat(),
+                'task_id': task_id,
+                'source': opp['source'],
+                'key': opp['source_key']
+            })
+        
+        status = "WOULD CREATE" if dry_run else "CREATED"
+        log.append(f"{status}: [{task_id}] {opp['title'][:60]} (score: {opp['score']}, agent: {opp.get('agent_type')})")
+    
+    return {
+        'tasks_created': tasks_created,
+        'duplicates_skipped': duplicates_skipped,
+        'below_threshold': below_threshold,
+        'dedup': dedup,
+        'log': log,
+    }
+
+
 # ============ SOURCE SCANNERS ============
 
 def scan_website_audit(tasks_data: dict, dedup_data: dict, force: bool = False) -> list:
@@ -530,7 +596,8 @@ def run_backlog_generator(sources: list = None, dry_run: bool = False, force: bo
     print()
     
     # Load existing data
-    tasks_data = load_json(TASKS_FILE, {'tasks': {}, 'lanes': {'bot_queue': []}})
+    repo = open_repository(json_path=TASKS_FILE)
+    tasks_data = repo.load_board()
     dedup_data = load_json(DEDUP_FILE, {})
     
     # Determine which sources to scan
@@ -560,54 +627,31 @@ def run_backlog_generator(sources: list = None, dry_run: bool = False, force: bo
     # Sort by score (highest first)
     all_opportunities.sort(key=lambda x: x['score'], reverse=True)
     
-    # Filter and create tasks
-    tasks_created = []
-    duplicates_skipped = 0
-    below_threshold = 0
-    
-    for opp in all_opportunities:
-        if len(tasks_created) >= MAX_TASKS_PER_RUN:
-            print(f"LIMIT: Max {MAX_TASKS_PER_RUN} tasks per run reached")
-            break
-        
-        # Check score threshold
-        if opp['score'] < SCORE_THRESHOLD_LOW:
-            below_threshold += 1
-            continue
-        
-        # Check confidence floor
-        if opp.get('confidence', 1.0) < CONFIDENCE_FLOOR:
-            print(f"SKIP: {opp['title'][:50]} (confidence {opp.get('confidence')} < {CONFIDENCE_FLOOR})")
-            continue
-        
-        # Check title similarity
-        if check_title_similarity(tasks_data.get('tasks', {}), opp['title']):
-            duplicates_skipped += 1
-            print(f"SKIP: Similar task exists: {opp['title'][:50]}")
-            continue
-        
-        # Create the task
-        task_id = create_task(tasks_data, opp, dry_run)
-        tasks_created.append({
-            'id': task_id,
-            'title': opp['title'],
-            'score': opp['score'],
-            'source': opp['source'],
-            'agent_type': opp.get('agent_type', 'operations')
-        })
-        
-        # Record in dedup
-        if not dry_run:
-            dedup_key = compute_dedup_key(opp['source'], opp['source_key'])
-            dedup_data[dedup_key] = {
-                'created_at': datetime.now(timezone.utc).isoformat(),
-                'task_id': task_id,
-                'source': opp['source'],
-                'key': opp['source_key']
-            }
-        
-        status = "WOULD CREATE" if dry_run else "CREATED"
-        print(f"{status}: [{task_id}] {opp['title'][:60]} (score: {opp['score']}, agent: {opp.get('agent_type')})")
+    # Filter and create tasks. Live runs do this inside a board transaction, so task
+    # ids and duplicate checks see the latest board even if it moved since the scan.
+    outcome = {}
+
+    def apply(data):
+        data.setdefault('tasks', {})
+        data.setdefault('lanes', {}).setdefault('bot_queue', [])
+        outcome.update(select_and_create(data, all_opportunities, dry_run))
+        return bool(outcome['tasks_created'])
+
+    if dry_run:
+        apply(copy.deepcopy(tasks_data))
+    else:
+        with repo.edit(updated_by='backlog-generator') as txn:
+            if not apply(txn.board()):
+                txn.rollback()
+        repo.sync_export()
+
+    for line in outcome['log']:
+        print(line)
+    tasks_created = outcome['tasks_created']
+    duplicates_skipped = outcome['duplicates_skipped']
+    below_threshold = outcome['below_threshold']
+    for record in outcome['dedup']:
+        dedup_data[record.pop('dedup_key')] = record
     
     print()
     print(f"=== Summary ===")
@@ -617,7 +661,6 @@ def run_backlog_generator(sources: list = None, dry_run: bool = False, force: bo
     
     # Save updated data
     if not dry_run and tasks_created:
-        save_json(TASKS_FILE, tasks_data)
         save_json(DEDUP_FILE, dedup_data)
         print(f"Saved: tasks.json, backlog-dedup.json")
         
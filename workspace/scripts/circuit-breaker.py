@@ -12,6 +12,8 @@ from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any
 from enum import Enum
 
+from atomic_json import write_json_atomic
+
 WORKSPACE = Path(__file__).resolve().parent.parent
 CIRCUITS_FILE = WORKSPACE / "memory" / "circuits.json"
 
@@ -59,9 +61,8 @@ def load_circuits() -> Dict:
         return {}
 
 def save_circuits(circuits: Dict) -> None:
-    """Save circuit states to file."""
-    CIRCUITS_FILE.parent.mkdir(parents=True, exist_ok=True)
-    CIRCUITS_FILE.write_text(json.dumps(circuits, indent=2, default=str), encoding='utf-8')
+    """Save circuit states to file (atomically, so a crash can't truncate it)."""
+    write_json_atomic(CIRCUITS_FILE, circuits, indent=2, ensure_ascii=True, default=str)
 
 def get_circuit(api_name: str) -> Dict:
     """Get circuit state for an API."""
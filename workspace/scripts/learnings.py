@@ -5,43 +5,404 @@ Manage learnings in SQLite database
 Council A+ requirement #4
 
 Usage:
-  python learnings.py add --kind fact --statement "..." [--tags "a,b,c"] [--entity "..."] [--pinned]
+  python learnings.py add --kind fact --statement "..." [--tags "a,b,c"] [--entity "..."] [--pinned] [--merge-near]
+  python learnings.py import file.jsonl [--source "..."]
+  python learnings.py tag "a,b" --ids 1,2,3 [--remove]
+  python learnings.py pin --ids 1,2,3 [--unpin]
   python learnings.py list [--kind fact] [--active-only] [--limit 50]
-  python learnings.py search "query"
-  python learnings.py prune [--dry-run]
+  python learnings.py top [--kind fact] [--limit 20]
+  python learnings.py search "query" [--semantic] [--kind fact] [--tag a] [--entity "..."] [--limit 20]
+  python learnings.py reindex
+  python learnings.py rescore
+  python learnings.py prune [--ids 1,2,3] [--dry-run]
+  python learnings.py merge-access
   python learnings.py export [--format json|md]
   python learnings.py stats
+  python learnings.py bench [rows]
 """
 
 import sqlite3
+import functools
 import hashlib
+import heapq
+import itertools
 import json
+import math
+import os
+import random
 import re
 import sys
+import tempfile
+import time
+import zlib
+from array import array
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    import numpy
+except ImportError:  # vectors are scored in pure Python
+    numpy = None
+try:
+    import fcntl
+except ImportError:  # Windows: access log appends and merges are not locked
+    fcntl = None
+
 WORKSPACE = Path(__file__).resolve().parent.parent
 DB_PATH = WORKSPACE / "memory" / "learnings.db"
 
+# Council-approved schema (2026-01-29) with the T123 pin + recency view ordering.
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS learning (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        statement TEXT NOT NULL,
+        kind TEXT NOT NULL CHECK (kind IN ('fact', 'decision', 'preference', 'constraint', 'procedure', 'insight')),
+        canonical_hash TEXT UNIQUE NOT NULL,
+        tags TEXT DEFAULT '[]',
+        source TEXT,
+        entity TEXT,
+        confidence REAL DEFAULT 0.8 CHECK (confidence >= 0 AND confidence <= 1),
+        is_pinned INTEGER DEFAULT 0,
+        is_active INTEGER DEFAULT 1,
+        epistemic_status TEXT DEFAULT 'claimed' CHECK (epistemic_status IN ('claimed', 'evidence_provided', 'human_verified', 'automated_verified')),
+        evidence_path TEXT,
+        reasoning TEXT,
+        created_at TEXT DEFAULT (datetime('now')),
+        updated_at TEXT DEFAULT (datetime('now')),
+        expires_at TEXT,
+        last_accessed_at TEXT,
+        access_count INTEGER DEFAULT 0,
+        relevance REAL,
+        created_by TEXT DEFAULT 'system',
+        supersedes_id INTEGER REFERENCES learning(id),
+        embedding BLOB,
+        embedding_partition INTEGER
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_learning_kind ON learning(kind);
+    CREATE INDEX IF NOT EXISTS idx_learning_active ON learning(is_active);
+    CREATE INDEX IF NOT EXISTS idx_learning_pinned ON learning(is_pinned);
+    CREATE INDEX IF NOT EXISTS idx_learning_confidence ON learning(confidence);
+    CREATE INDEX IF NOT EXISTS idx_learning_hash ON learning(canonical_hash);
+    CREATE INDEX IF NOT EXISTS idx_learning_entity ON learning(entity);
+    CREATE INDEX IF NOT EXISTS idx_learning_last_accessed ON learning(last_accessed_at);
+
+    CREATE VIEW IF NOT EXISTS active_learnings AS
+    SELECT * FROM learning
+    WHERE is_active = 1
+      AND (expires_at IS NULL OR expires_at > datetime('now'))
+    ORDER BY is_pinned DESC, last_accessed_at DESC NULLS LAST, updated_at DESC;
+"""
+
+# Full-text index over statement, tags and entity. External content: the text
+# lives only in `learning`; triggers keep the index in step with every write
+# that touches an indexed column (confidence/access updates skip it).
+FTS_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS learning_fts USING fts5(
+        statement, tags, entity,
+        content='learning', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS learning_fts_insert AFTER INSERT ON learning BEGIN
+        INSERT INTO learning_fts (rowid, statement, tags, entity)
+        VALUES (new.id, new.statement, new.tags, new.entity);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS learning_fts_delete AFTER DELETE ON learning BEGIN
+        INSERT INTO learning_fts (learning_fts, rowid, statement, tags, entity)
+        VALUES ('delete', old.id, old.statement, old.tags, old.entity);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS learning_fts_update AFTER UPDATE OF statement, tags, entity ON learning BEGIN
+        INSERT INTO learning_fts (learning_fts, rowid, statement, tags, entity)
+        VALUES ('delete', old.id, old.statement, old.tags, old.entity);
+        INSERT INTO learning_fts (rowid, statement, tags, entity)
+        VALUES (new.id, new.statement, new.tags, new.entity);
+    END
+    """,
+)
+
+# Statement vectors (see embed()). Changing the dimension or partition count
+# requires `learnings.py reindex` to recompute stored vectors.
+EMBEDDING_DIM = 256               # float32 components per learning (a 1 KiB blob)
+PARTITION_BITS = 6                # 64 hyperplane partitions; a query probes its own and the 6 adjacent ones
+PARTITION_MIN_ROWS = 20000        # below this, semantic search scans every vector
+NEAR_DUPLICATE_SIMILARITY = 0.9   # cosine at which add_learning() reports a statement as a near duplicate
+
+KINDS = ('fact', 'decision', 'preference', 'constraint', 'procedure', 'insight')
+CHUNK_SIZE = 500                  # rows per IN (...) lookup / executemany batch in bulk operations
+
+# Reads append to an access log beside the database instead of writing to it;
+# the log is merged into last_accessed_at/access_count once it is this big or old.
+ACCESS_LOG_FLUSH_BYTES = 64 * 1024
+ACCESS_LOG_FLUSH_SECONDS = 3600
+ACCESS_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'   # matches SQLite datetime('now') (UTC)
+
+# Relevance decays exponentially from the last update or retrieval:
+#   score = confidence * (1 + ACCESS_WEIGHT * ln(1 + access_count)) * 0.5 ** (days idle / HALF_LIFE_DAYS)
+# The `relevance` column stores log2(score) + touched_day / HALF_LIFE_DAYS, which
+# does not change as time passes, so ranking by score at any moment is ranking by
+# the column and "score below x now" is a range on it. Pinned learnings never decay
+# (they rank first and are never pruned). Changing these requires `learnings.py rescore`.
+HALF_LIFE_DAYS = 30.0
+ACCESS_WEIGHT = 0.5
+PRUNE_SCORE = 0.1                 # prune_learnings() drops unpinned learnings scoring below this...
+PRUNE_MIN_IDLE_DAYS = 7           # ...once untouched (not updated or retrieved) for this long...
+PRUNE_KEEP_CONFIDENCE = 0.9       # ...unless their confidence is at least this
+MIN_CONFIDENCE = 1e-6             # keeps log2() finite for zero-confidence learnings
+
+RELEVANCE_SCHEMA = (
+    "CREATE INDEX IF NOT EXISTS idx_learning_relevance ON learning(is_active, is_pinned, relevance)",
+    "CREATE INDEX IF NOT EXISTS idx_learning_expires ON learning(expires_at)",
+    # Lets update_relevance() find rows still missing a score without a table scan.
+    "CREATE INDEX IF NOT EXISTS idx_learning_unscored ON learning(id) WHERE relevance IS NULL",
+    # Scores are computed in Python (see relevance_score()), so a trigger can only mark them stale.
+    """
+    CREATE TRIGGER IF NOT EXISTS learning_relevance_stale
+    AFTER UPDATE OF confidence, access_count, updated_at, last_accessed_at ON learning BEGIN
+        UPDATE learning SET relevance = NULL WHERE id = new.id;
+    END
+    """,
+)
+
+VECTOR_SCHEMA = (
+    "CREATE INDEX IF NOT EXISTS idx_learning_partition ON learning(embedding_partition)",
+    # Lets update_embeddings() find rows still missing a vector without a table scan.
+    "CREATE INDEX IF NOT EXISTS idx_learning_unembedded ON learning(id) WHERE embedding IS NULL",
+    """
+    CREATE TRIGGER IF NOT EXISTS learning_embedding_stale AFTER UPDATE OF statement ON learning
+    WHEN new.statement IS NOT old.statement BEGIN
+        UPDATE learning SET embedding = NULL, embedding_partition = NULL WHERE id = new.id;
+    END
+    """,
+)
+
+# BM25 column weights (statement, tags, entity) and snippet highlight markers.
+BM25_WEIGHTS = (10.0, 4.0, 4.0)
+SNIPPET_MARKERS = ('[', ']')
+
+# Everything init_schema() creates, so a complete database is recognized by reading
+# sqlite_master instead of taking the write lock.
+SCHEMA_OBJECTS = frozenset(re.findall(
+    r'CREATE (?:VIRTUAL )?(?:TABLE|INDEX|VIEW|TRIGGER) IF NOT EXISTS (\w+)',
+    SCHEMA + ''.join(FTS_SCHEMA + VECTOR_SCHEMA + RELEVANCE_SCHEMA)))
+SCHEMA_COLUMNS = frozenset(('embedding', 'embedding_partition', 'access_count', 'relevance'))
+
+_schema_ready = set()
+
+def chunked(items, size: int = CHUNK_SIZE):
+    """Successive lists of up to `size` items from any iterable."""
+    iterator = iter(items)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+def init_schema(conn: sqlite3.Connection):
+    """
+    Create the learning table, views and full-text index on an open connection.
+
+    The index is backfilled from existing rows the first time it is created;
+    the check and backfill share one write transaction so two processes
+    starting together cannot both rebuild it. Databases created before
+    statement vectors get the embedding columns added (vectors are filled
+    in lazily by update_embeddings()), and ones created before access
+    tracking or scoring get access_count and relevance (scored lazily by
+    update_relevance()). A database that already has all of it is only read.
+    """
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(learning)")}
+    if SCHEMA_OBJECTS <= names and SCHEMA_COLUMNS <= columns:
+        return
+    conn.executescript(SCHEMA)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'learning_fts'").fetchone()
+        for statement in FTS_SCHEMA:
+            conn.execute(statement)
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(learning)")}
+        if 'embedding' not in columns:
+            conn.execute("ALTER TABLE learning ADD COLUMN embedding BLOB")
+            conn.execute("ALTER TABLE learning ADD COLUMN embedding_partition INTEGER")
+        if 'access_count' not in columns:
+            conn.execute("ALTER TABLE learning ADD COLUMN access_count INTEGER DEFAULT 0")
+        if 'relevance' not in columns:
+            conn.execute("ALTER TABLE learning ADD COLUMN relevance REAL")
+        for statement in VECTOR_SCHEMA + RELEVANCE_SCHEMA:
+            conn.execute(statement)
+        if not exists:
+            conn.execute("INSERT INTO learning_fts (learning_fts) VALUES ('rebuild')")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+def relevance_score(confidence: float, access_count: int, touched_day: float) -> float:
+    """The stored, time-independent relevance of a learning last touched on Julian day `touched_day`."""
+    weight = max(confidence or 0.0, MIN_CONFIDENCE) * (1 + ACCESS_WEIGHT * math.log1p(access_count or 0))
+    return math.log2(weight) + touched_day / HALF_LIFE_DAYS
+
+def decayed_score(relevance: float, now_day: float) -> float:
+    """A stored relevance as the decayed score on Julian day `now_day`."""
+    return 2 ** (relevance - now_day / HALF_LIFE_DAYS)
+
+def update_relevance(conn: sqlite3.Connection) -> int:
+    """Score learnings that are new or whose inputs changed since they were last scored."""
+    # Checked first so read paths with nothing to score never take the write lock.
+    unscored = "SELECT 1 FROM learning INDEXED BY idx_learning_unscored WHERE relevance IS NULL LIMIT 1"
+    if not conn.execute(unscored).fetchone():
+        return 0
+    return conn.execute("""
+        UPDATE learning
+        SET relevance = relevance_score(
+            confidence, access_count,
+            COALESCE(julianday(MAX(updated_at, COALESCE(last_accessed_at, updated_at))), julianday('now')))
+        WHERE relevance IS NULL
+    """).rowcount
+
 def get_db():
-    return sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES)
+    conn = sqlite3.connect(DB_PATH, detect_types=sqlite3.PARSE_DECLTYPES)
+    conn.create_function("relevance_score", 3, relevance_score, deterministic=True)
+    if str(DB_PATH) not in _schema_ready:
+        init_schema(conn)
+        _schema_ready.add(str(DB_PATH))
+    return conn
 
-def canonicalize(statement: str) -> str:
-    """Normalize statement for deduplication hash."""
+def fts_query(text: str) -> str:
+    """Free text as an FTS5 query: every word must match (after stemming); operators are not interpreted."""
+    return ' '.join(f'"{term}"' for term in re.findall(r'\w+', text.lower()))
+
+def normalize_statement(statement: str) -> str:
+    """Lowercased statement with whitespace collapsed and filler words removed."""
     # Lowercase, strip, remove extra whitespace
     s = statement.lower().strip()
     s = re.sub(r'\s+', ' ', s)
     # Remove common filler words that don't change meaning
     s = re.sub(r'\b(the|a|an|is|are|was|were|be|been|being)\b', '', s)
-    s = re.sub(r'\s+', ' ', s).strip()
-    return hashlib.sha256(s.encode()).hexdigest()
+    return re.sub(r'\s+', ' ', s).strip()
+
+def canonicalize(statement: str) -> str:
+    """Normalize statement for deduplication hash."""
+    return hashlib.sha256(normalize_statement(statement).encode()).hexdigest()
+
+def embed(statement: str) -> array:
+    """
+    L2-normalized float32 vector of a statement's hashed features.
+
+    Features are the normalized words plus the character trigrams of each
+    space-padded word, so inflections and typos still overlap. Each feature is
+    hashed with crc32 (stable across processes) onto a signed component.
+    """
+    vector = [0.0] * EMBEDDING_DIM
+    for word in re.findall(r'\w+', normalize_statement(statement)):
+        padded = f" {word} "
+        for feature in [word] + [padded[i:i + 3] for i in range(len(padded) - 2)]:
+            h = zlib.crc32(feature.encode())
+            vector[h % EMBEDDING_DIM] += 1.0 if h & 0x80000000 else -1.0
+    norm = math.sqrt(sum(v * v for v in vector))
+    return array('f', [v / norm for v in vector] if norm else vector)
+
+NEGATION_RE = re.compile(r"\b(?:not|no|never|none|nor|neither|nothing|nobody|without|cannot)\b|n't\b")
+NUMBER_RE = re.compile(r'\d+(?:[.,]\d+)*')
+
+def distinguishing_terms(statement: str) -> tuple:
+    """Numbers and negations in a statement; near duplicates that differ in these are distinct facts."""
+    s = statement.lower()
+    negations = sorted('not' if m in ("n't", 'cannot') else m for m in NEGATION_RE.findall(s))
+    return sorted(NUMBER_RE.findall(s)), negations
+
+@functools.lru_cache(maxsize=1)
+def _hyperplanes() -> tuple:
+    rng = random.Random(20260129)
+    return tuple(tuple(rng.gauss(0.0, 1.0) for _ in range(EMBEDDING_DIM)) for _ in range(PARTITION_BITS))
+
+def partition_of(vector) -> int:
+    """Partition id: which side of each fixed random hyperplane the vector lies on."""
+    bucket = 0
+    for bit, plane in enumerate(_hyperplanes()):
+        if sum(p * v for p, v in zip(plane, vector)) >= 0:
+            bucket |= 1 << bit
+    return bucket
+
+def probe_partitions(partition: int) -> list:
+    """A partition plus its neighbours one hyperplane flip away."""
+    return [partition] + [partition ^ (1 << bit) for bit in range(PARTITION_BITS)]
+
+def embedding_columns(statement: str) -> tuple:
+    """(embedding blob, partition) values for a statement."""
+    vector = embed(statement)
+    return vector.tobytes(), partition_of(vector)
+
+def update_embeddings(conn: sqlite3.Connection) -> int:
+    """Compute vectors for rows without one (older rows, edited statements); returns how many.
+
+    Only writes (and takes the write lock) when some row needs a vector.
+    """
+    rows = conn.execute("SELECT id, statement FROM learning WHERE embedding IS NULL").fetchall()
+    if rows:
+        conn.executemany("UPDATE learning SET embedding = ?, embedding_partition = ? WHERE id = ?",
+                         [(*embedding_columns(statement), learning_id) for learning_id, statement in rows])
+        conn.commit()
+    return len(rows)
+
+def nearest_learnings(conn: sqlite3.Connection, vector, limit: int = 20, kind: str = None,
+                      partitions: list = None) -> list:
+    """
+    Top-k active learnings by cosine similarity to `vector`, as (similarity, id), best first.
+
+    Scores every stored vector, or only those in `partitions`. Uses NumPy when
+    it is installed and a sparse pure-Python dot product otherwise.
+    """
+    # Without statistics the planner prefers idx_learning_active, which visits every active row.
+    sql = f"""
+        SELECT id, embedding FROM learning {'INDEXED BY idx_learning_partition' if partitions is not None else ''}
+        WHERE is_active = 1
+          AND embedding IS NOT NULL
+          AND (expires_at IS NULL OR expires_at > datetime('now'))
+    """
+    params = []
+    if kind:
+        sql += " AND kind = ?"
+        params.append(kind)
+    if partitions is not None:
+        sql += f" AND embedding_partition IN ({','.join('?' * len(partitions))})"
+        params.extend(partitions)
+    rows = conn.execute(sql, params).fetchall()
+    if not rows:
+        return []
+
+    if numpy is not None:
+        matrix = numpy.frombuffer(b''.join(row[1] for row in rows), dtype=numpy.float32)
+        scores = matrix.reshape(len(rows), EMBEDDING_DIM) @ numpy.asarray(vector, dtype=numpy.float32)
+        top = numpy.argpartition(-scores, limit - 1)[:limit] if len(rows) > limit else range(len(rows))
+        return sorted(((float(scores[i]), rows[i][0]) for i in top), reverse=True)
+
+    nonzero = [(i, w) for i, w in enumerate(vector) if w]
+    scored = []
+    for learning_id, blob in rows:
+        stored = array('f')
+        stored.frombytes(blob)
+        scored.append((sum(stored[i] * w for i, w in nonzero), learning_id))
+    return heapq.nlargest(limit, scored)
 
 def add_learning(statement: str, kind: str, tags: list = None, entity: str = None, 
                  source: str = None, pinned: bool = False, confidence: float = 0.8,
-                 expires_days: int = None):
-    """Add a learning with deduplication."""
+                 expires_days: int = None, near_duplicate: float = NEAR_DUPLICATE_SIMILARITY,
+                 merge_near: bool = False):
+    """
+    Add a learning with deduplication.
+
+    Exact duplicates (same canonical hash) boost the existing learning
+    instead of inserting. Near duplicates (an active learning with cosine
+    similarity >= near_duplicate; None disables) are reported and inserted
+    anyway; with merge_near they boost the match instead, unless the two
+    statements differ in their numbers or negations.
+    """
     canonical_hash = canonicalize(statement)
+    embedding, partition = embedding_columns(statement)
     
     conn = get_db()
     cur = conn.cursor()
@@ -50,6 +411,20 @@ def add_learning(statement: str, kind: str, tags: list = None, entity: str = Non
     cur.execute("SELECT id, statement FROM learning WHERE canonical_hash = ?", (canonical_hash,))
     existing = cur.fetchone()
     
+    if not existing and near_duplicate is not None:
+        update_embeddings(conn)
+        vector = array('f')
+        vector.frombytes(embedding)
+        nearest = nearest_learnings(conn, vector, 1, partitions=probe_partitions(partition))
+        if nearest and nearest[0][0] >= near_duplicate:
+            similarity, match_id = nearest[0]
+            match = cur.execute("SELECT id, statement FROM learning WHERE id = ?", (match_id,)).fetchone()
+            if merge_near and distinguishing_terms(statement) == distinguishing_terms(match[1]):
+                existing = match
+                print(f"[NEAR-DUPLICATE] Matches id={match_id} (similarity {similarity:.2f})")
+            else:
+                print(f"[NEAR-DUPLICATE] Similar to id={match_id} (similarity {similarity:.2f}), adding anyway")
+    
     if existing:
         # Update timestamp and confidence boost
         cur.execute("""
@@ -59,6 +434,7 @@ def add_learning(statement: str, kind: str, tags: list = None, entity: str = Non
                 last_accessed_at = datetime('now')
             WHERE id = ?
         """, (existing[0],))
+        update_relevance(conn)
         conn.commit()
         conn.close()
         print(f"[DUPLICATE] Learning already exists (id={existing[0]}), boosted confidence")
@@ -72,20 +448,249 @@ def add_learning(statement: str, kind: str, tags: list = None, entity: str = Non
     
     cur.execute("""
         INSERT INTO learning (statement, kind, canonical_hash, tags, entity, source, 
-                             is_pinned, confidence, expires_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                             is_pinned, confidence, expires_at, embedding, embedding_partition)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """, (statement, kind, canonical_hash, tags_json, entity, source, 
-          1 if pinned else 0, confidence, expires_at))
+          1 if pinned else 0, confidence, expires_at, embedding, partition))
     
     learning_id = cur.lastrowid
+    update_relevance(conn)
     conn.commit()
     conn.close()
     
     print(f"[ADDED] Learning id={learning_id}, kind={kind}")
     return learning_id
 
+def invalid_record(record) -> str:
+    """Why an import record cannot be added, or None when it is valid."""
+    if not isinstance(record, dict):
+        return "not a JSON object"
+    statement = record.get('statement')
+    if not isinstance(statement, str) or not statement.strip():
+        return "statement is required"
+    if record.get('kind') not in KINDS:
+        return f"kind must be one of {', '.join(KINDS)}"
+    confidence = record.get('confidence', 0.8)
+    if isinstance(confidence, bool) or not isinstance(confidence, (int, float)) or not 0 <= confidence <= 1:
+        return "confidence must be a number between 0 and 1"
+    if not isinstance(record.get('expires_days') or 0, int):
+        return "expires_days must be an integer"
+    return None
+
+def import_learnings(records, source: str = None) -> dict:
+    """
+    Bulk-add learnings in a single transaction.
+
+    `records` are dicts with add_learning()'s fields (statement, kind, tags,
+    entity, source, pinned, confidence, expires_days). Statements are
+    canonicalized per chunk and resolved against stored hashes with one
+    IN (...) query; a duplicate boosts confidence as add_learning() would,
+    whether it repeats a stored learning or an earlier record. Near-duplicate
+    detection is left to add_learning(). Invalid records are skipped.
+    Returns counts of added, boosted and skipped records.
+    """
+    counts = {"added": 0, "boosted": 0, "skipped": 0}
+    pending = {}  # canonical hash -> insert row, for records new to the database
+    conn = get_db()
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for number, chunk in enumerate(chunked(records)):
+            prepared = []
+            for offset, record in enumerate(chunk, number * CHUNK_SIZE + 1):
+                problem = invalid_record(record)
+                if problem:
+                    print(f"[SKIPPED] record {offset}: {problem}")
+                    counts["skipped"] += 1
+                    continue
+                prepared.append((canonicalize(record['statement']), record))
+
+            hashes = list({canonical_hash for canonical_hash, _ in prepared})
+            placeholders = ','.join('?' * len(hashes))
+            stored = dict(conn.execute(
+                f"SELECT canonical_hash, id FROM learning WHERE canonical_hash IN ({placeholders})", hashes))
+
+            boosts = {}
+            for canonical_hash, record in prepared:
+                if canonical_hash in stored:
+                    boosts[stored[canonical_hash]] = boosts.get(stored[canonical_hash], 0) + 1
+                    counts["boosted"] += 1
+                elif canonical_hash in pending:
+                    row = pending[canonical_hash]
+                    row[7] = min(1.0, row[7] + 0.1)
+                    counts["boosted"] += 1
+                else:
+                    expires_days = record.get('expires_days')
+                    pending[canonical_hash] = [
+                        record['statement'], record['kind'], canonical_hash, json.dumps(record.get('tags') or []),
+                        record.get('entity'), record.get('source') or source, 1 if record.get('pinned') else 0,
+                        float(record.get('confidence', 0.8)),
+                        (datetime.now() + timedelta(days=expires_days)).isoformat() if expires_days else None,
+                        *embedding_columns(record['statement']),
+                    ]
+            conn.executemany("""
+                UPDATE learning
+                SET updated_at = datetime('now'),
+                    confidence = MIN(1.0, confidence + 0.1 * ?),
+                    last_accessed_at = datetime('now')
+                WHERE id = ?
+            """, [(repeats, learning_id) for learning_id, repeats in boosts.items()])
+
+        for rows in chunked(pending.values()):
+            conn.executemany("""
+                INSERT INTO learning (statement, kind, canonical_hash, tags, entity, source,
+                                     is_pinned, confidence, expires_at, embedding, embedding_partition)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+        counts["added"] = len(pending)
+        update_relevance(conn)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    print(f"[IMPORTED] added={counts['added']} boosted={counts['boosted']} skipped={counts['skipped']}")
+    return counts
+
+def tag_learnings(ids: list, add: list = (), remove: list = ()) -> int:
+    """Add and/or remove tags on many learnings in one transaction; returns how many changed."""
+    conn = get_db()
+    changed = []
+    for chunk in chunked(ids):
+        placeholders = ','.join('?' * len(chunk))
+        for learning_id, tags_json in conn.execute(
+                f"SELECT id, tags FROM learning WHERE id IN ({placeholders})", chunk).fetchall():
+            try:
+                tags = json.loads(tags_json or '[]')
+            except ValueError:
+                tags = []
+            tags = tags if isinstance(tags, list) else []
+            updated = [t for t in tags if t not in remove]
+            updated += [t for t in add if t not in updated and t not in remove]
+            if updated != tags:
+                changed.append((json.dumps(updated), learning_id))
+    conn.executemany("UPDATE learning SET tags = ?, updated_at = datetime('now') WHERE id = ?", changed)
+    conn.commit()
+    conn.close()
+    print(f"[TAGGED] {len(changed)} learnings updated")
+    return len(changed)
+
+def pin_learnings(ids: list, pinned: bool = True) -> int:
+    """Pin (or unpin) many learnings in one transaction; returns how many changed."""
+    conn = get_db()
+    changed = 0
+    for chunk in chunked(ids):
+        placeholders = ','.join('?' * len(chunk))
+        changed += conn.execute(
+            f"UPDATE learning SET is_pinned = ?, updated_at = datetime('now') WHERE is_pinned != ? AND id IN ({placeholders})",
+            [int(pinned), int(pinned), *chunk]).rowcount
+    conn.commit()
+    conn.close()
+    print(f"[{'PINNED' if pinned else 'UNPINNED'}] {changed} learnings")
+    return changed
+
+def access_log_path() -> Path:
+    """Append-only log of read accesses, kept beside the database."""
+    return DB_PATH.with_suffix('.access.log')
+
+def access_log_due(path: Path) -> bool:
+    """Whether the access log has grown past ACCESS_LOG_FLUSH_BYTES or its oldest entry past ACCESS_LOG_FLUSH_SECONDS."""
+    try:
+        if path.stat().st_size >= ACCESS_LOG_FLUSH_BYTES:
+            return True
+        with open(path, 'r', encoding='utf-8') as f:
+            oldest = f.readline().partition('\t')[0]
+    except OSError:
+        return False
+    return oldest < time.strftime(ACCESS_TIME_FORMAT, time.gmtime(time.time() - ACCESS_LOG_FLUSH_SECONDS))
+
+def record_access(ids: list):
+    """
+    Note that learnings were just retrieved (Council T123 verdict).
+
+    Appends one line to the access log rather than writing to the database,
+    so recall stays read-only; merge_access_log() folds the log into
+    `learning` once it is due. Appends share a flock on the log that a
+    merge takes exclusively while it renames the log aside.
+    """
+    if not ids:
+        return
+    path = access_log_path()
+    line = time.strftime(ACCESS_TIME_FORMAT, time.gmtime()) + '\t' + ' '.join(map(str, ids)) + '\n'
+    while True:
+        with open(path, 'a', encoding='utf-8') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_SH)
+                # A merge may have renamed this file aside while we waited; append to the live log.
+                try:
+                    if os.stat(path).st_ino != os.fstat(f.fileno()).st_ino:
+                        continue
+                except FileNotFoundError:
+                    continue
+            f.write(line)
+        break
+    if access_log_due(path):
+        merge_access_log()
+
+def merge_access_log() -> int:
+    """
+    Fold the access log into last_accessed_at and access_count; returns the learnings touched.
+
+    The log is renamed aside, under an exclusive flock so no append lands in
+    it afterwards, and applied in one write transaction. A merge that is
+    interrupted leaves the renamed log in place and the next merge applies
+    it before taking the live one.
+    """
+    path = access_log_path()
+    merging = path.with_name(path.name + '.merging')
+    if not path.exists() and not merging.exists():
+        return 0
+    conn = get_db()
+    # Taking the write lock first serializes concurrent mergers.
+    conn.execute("BEGIN IMMEDIATE")
+    log = None
+    try:
+        if not merging.exists():
+            try:
+                log = open(path, 'r', encoding='utf-8')
+            except FileNotFoundError:
+                conn.rollback()
+                return 0
+            if fcntl is not None:
+                # Waits for in-flight appends; later ones see the rename and reopen.
+                fcntl.flock(log, fcntl.LOCK_EX)
+            os.replace(path, merging)
+        accessed = {}
+        with open(merging, 'r', encoding='utf-8') as f:
+            for line in f:
+                at, _, ids = line.rstrip('\n').partition('\t')
+                for learning_id in ids.split():
+                    if not learning_id.isdigit():
+                        continue
+                    last, count = accessed.get(int(learning_id), ('', 0))
+                    accessed[int(learning_id)] = (max(last, at), count + 1)
+        conn.executemany("""
+            UPDATE learning
+            SET last_accessed_at = MAX(COALESCE(last_accessed_at, ''), ?),
+                access_count = COALESCE(access_count, 0) + ?
+            WHERE id = ?
+        """, ((at, count, learning_id) for learning_id, (at, count) in accessed.items()))
+        update_relevance(conn)
+        # Dropped before the commit: a crash in between loses these accesses rather than counting them twice.
+        merging.unlink()
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        if log is not None:
+            log.close()
+        conn.close()
+    return len(accessed)
+
 def list_learnings(kind: str = None, active_only: bool = True, limit: int = 50):
-    """List learnings with optional filters. Updates last_accessed_at for retrieved items."""
+    """List learnings with optional filters. Records an access for retrieved items."""
     conn = get_db()
     cur = conn.cursor()
     
@@ -101,15 +706,8 @@ def list_learnings(kind: str = None, active_only: bool = True, limit: int = 50):
     
     cur.execute(query, params)
     rows = cur.fetchall()
-    
-    # Update last_accessed_at for retrieved items (Council T123 verdict)
-    if rows:
-        ids = [row[0] for row in rows]
-        placeholders = ','.join('?' * len(ids))
-        cur.execute(f"UPDATE learning SET last_accessed_at = datetime('now') WHERE id IN ({placeholders})", ids)
-        conn.commit()
-    
     conn.close()
+    record_access([row[0] for row in rows])
     
     print(f"=== Learnings ({len(rows)} results) ===")
     for row in rows:
@@ -118,54 +716,197 @@ def list_learnings(kind: str = None, active_only: bool = True, limit: int = 50):
     
     return rows
 
-def search_learnings(query: str, limit: int = 20):
-    """Simple search in statements. Updates last_accessed_at for retrieved items."""
+def search_learnings(query: str, limit: int = 20, kind: str = None, tags: list = None,
+                     entity: str = None):
+    """
+    Full-text search over active learnings, best BM25 match first.
+
+    Rows are (id, statement, kind, confidence, is_pinned, snippet, score); the
+    snippet marks matched terms with SNIPPET_MARKERS. Every tag in `tags` must
+    be present. Records an access for retrieved items.
+    """
+    match = fts_query(query)
+    if not match:
+        print(f"=== Search results for '{query}' (0 matches) ===")
+        return []
+
     conn = get_db()
     cur = conn.cursor()
-    
-    cur.execute("""
-        SELECT id, statement, kind, confidence, is_pinned 
-        FROM active_learnings 
-        WHERE statement LIKE ?
-        LIMIT ?
-    """, (f"%{query}%", limit))
-    
+
+    sql = f"""
+        SELECT l.id, l.statement, l.kind, l.confidence, l.is_pinned,
+               snippet(learning_fts, 0, ?, ?, '...', 16),
+               bm25(learning_fts, {', '.join(str(w) for w in BM25_WEIGHTS)}) AS score
+        FROM learning_fts
+        JOIN learning l ON l.id = learning_fts.rowid
+        WHERE learning_fts MATCH ?
+          AND l.is_active = 1
+          AND (l.expires_at IS NULL OR l.expires_at > datetime('now'))
+    """
+    params = [*SNIPPET_MARKERS, match]
+    if kind:
+        sql += " AND l.kind = ?"
+        params.append(kind)
+    if entity:
+        sql += " AND l.entity = ?"
+        params.append(entity)
+    for tag in tags or []:
+        sql += " AND json_valid(l.tags) AND EXISTS (SELECT 1 FROM json_each(l.tags) WHERE json_each.value = ?)"
+        params.append(tag)
+    sql += " ORDER BY score LIMIT ?"
+    params.append(limit)
+
+    cur.execute(sql, params)
     rows = cur.fetchall()
-    
-    # Update last_accessed_at for retrieved items (Council T123 verdict)
-    if rows:
-        ids = [row[0] for row in rows]
-        placeholders = ','.join('?' * len(ids))
-        cur.execute(f"UPDATE learning SET last_accessed_at = datetime('now') WHERE id IN ({placeholders})", ids)
-        conn.commit()
-    
     conn.close()
-    
+    record_access([row[0] for row in rows])
+
     print(f"=== Search results for '{query}' ({len(rows)} matches) ===")
     for row in rows:
         pinned = "[P]" if row[4] else "   "
-        print(f"{pinned} [{row[0]:4d}] ({row[2]:12s}) {row[1][:60]}...")
-    
+        print(f"{pinned} [{row[0]:4d}] ({row[2]:12s}) {row[5]}")
+
     return rows
 
-def prune_learnings(dry_run: bool = True):
-    """Remove expired and low-confidence learnings."""
+def semantic_search(query: str, limit: int = 20, kind: str = None, exhaustive: bool = None):
+    """
+    Active learnings most similar to the query, as (id, statement, kind, confidence, is_pinned, similarity).
+
+    Scans every vector up to PARTITION_MIN_ROWS active learnings, and only the
+    query's probe partitions beyond that (exhaustive=True/False forces either).
+    Records an access for retrieved items.
+    """
     conn = get_db()
     cur = conn.cursor()
-    
-    # Find prunable learnings (not pinned, expired or low confidence)
-    cur.execute("""
-        SELECT id, statement, kind, confidence, expires_at
+    update_embeddings(conn)
+
+    vector = embed(query)
+    if exhaustive is None:
+        exhaustive = cur.execute("SELECT COUNT(*) FROM learning WHERE is_active = 1").fetchone()[0] <= PARTITION_MIN_ROWS
+    partitions = None if exhaustive else probe_partitions(partition_of(vector))
+    nearest = nearest_learnings(conn, vector, limit, kind=kind, partitions=partitions)
+
+    rows = []
+    if nearest:
+        similarity = {learning_id: score for score, learning_id in nearest}
+        placeholders = ','.join('?' * len(similarity))
+        cur.execute(f"SELECT id, statement, kind, confidence, is_pinned FROM learning WHERE id IN ({placeholders})",
+                    list(similarity))
+        rows = sorted((row + (similarity[row[0]],) for row in cur.fetchall()), key=lambda row: -row[5])
+
+    conn.close()
+    record_access([row[0] for row in rows])
+
+    print(f"=== Semantic results for '{query}' ({len(rows)} matches) ===")
+    for row in rows:
+        pinned = "[P]" if row[4] else "   "
+        print(f"{pinned} [{row[0]:4d}] ({row[2]:12s}, {row[5]:.2f}) {row[1][:60]}...")
+
+    return rows
+
+def rebuild_search_index():
+    """Rebuild the full-text index and statement vectors from the learning table (backfill or repair)."""
+    conn = get_db()
+    conn.execute("INSERT INTO learning_fts (learning_fts) VALUES ('rebuild')")
+    conn.execute("INSERT INTO learning_fts (learning_fts) VALUES ('optimize')")
+    conn.execute("UPDATE learning SET embedding = NULL, embedding_partition = NULL")
+    update_embeddings(conn)
+    conn.commit()
+    count = conn.execute("SELECT COUNT(*) FROM learning").fetchone()[0]
+    conn.close()
+    print(f"[REINDEXED] {count} learnings")
+    return count
+
+def top_learnings(limit: int = 20, kind: str = None):
+    """
+    The most relevant active learnings right now, for context injection:
+    pinned first, then by decayed score. Rows are (id, statement, kind,
+    confidence, is_pinned, score).
+
+    Reads idx_learning_relevance in order instead of scoring every row. Not
+    recorded as an access, which would keep whatever is on top there.
+    """
+    conn = get_db()
+    cur = conn.cursor()
+    if update_relevance(conn):
+        conn.commit()
+
+    sql = """
+        SELECT id, statement, kind, confidence, is_pinned, relevance, julianday('now')
         FROM learning
         WHERE is_active = 1
-          AND is_pinned = 0
-          AND (
-              (expires_at IS NOT NULL AND expires_at < datetime('now'))
-              OR (confidence < 0.3 AND updated_at < datetime('now', '-7 days'))
-          )
-    """)
+          AND (expires_at IS NULL OR expires_at > datetime('now'))
+    """
+    params = []
+    if kind:
+        sql += " AND kind = ?"
+        params.append(kind)
+    sql += " ORDER BY is_pinned DESC, relevance DESC LIMIT ?"
+    params.append(limit)
+    rows = [row[:5] + (decayed_score(row[5], row[6]),) for row in cur.execute(sql, params)]
+    conn.close()
+
+    print(f"=== Top learnings ({len(rows)} results) ===")
+    for row in rows:
+        pinned = "[P]" if row[4] else "   "
+        print(f"{pinned} [{row[0]:4d}] ({row[2]:12s}, {row[5]:.2f}) {row[1][:60]}...")
+
+    return rows
+
+def rescore_learnings():
+    """Recompute every relevance score (after changing HALF_LIFE_DAYS or ACCESS_WEIGHT)."""
+    conn = get_db()
+    conn.execute("UPDATE learning SET relevance = NULL")
+    count = update_relevance(conn)
+    conn.commit()
+    conn.close()
+    print(f"[RESCORED] {count} learnings")
+    return count
+
+def prune_learnings(dry_run: bool = True, ids: list = None):
+    """
+    Remove expired learnings and ones whose decayed score is below PRUNE_SCORE,
+    or exactly `ids`. Pinned learnings are never pruned; neither are ones
+    touched in the last PRUNE_MIN_IDLE_DAYS or with confidence of at least
+    PRUNE_KEEP_CONFIDENCE, unless they expire.
+
+    Pending accesses are merged first so recent recalls count. Both rules
+    are range scans; the indexes are forced because the planner otherwise
+    favours idx_learning_pinned, which matches nearly every row.
+    """
+    merge_access_log()
+    conn = get_db()
+    cur = conn.cursor()
+    if update_relevance(conn):
+        conn.commit()
     
-    to_prune = cur.fetchall()
+    if ids is None:
+        # Find prunable learnings (not pinned, expired or decayed)
+        cur.execute("""
+            SELECT id, statement, kind, confidence, expires_at
+            FROM learning INDEXED BY idx_learning_relevance
+            WHERE is_active = 1 AND is_pinned = 0
+              AND relevance < ? + julianday('now') / ?
+              AND MAX(updated_at, COALESCE(last_accessed_at, updated_at)) < datetime('now', ?)
+              AND confidence < ?
+            UNION
+            SELECT id, statement, kind, confidence, expires_at
+            FROM learning INDEXED BY idx_learning_expires
+            WHERE expires_at < datetime('now')
+              AND is_active = 1 AND is_pinned = 0
+            ORDER BY id
+        """, (math.log2(PRUNE_SCORE), HALF_LIFE_DAYS, f'-{PRUNE_MIN_IDLE_DAYS} days', PRUNE_KEEP_CONFIDENCE))
+        to_prune = cur.fetchall()
+    else:
+        to_prune = []
+        for chunk in chunked(ids):
+            placeholders = ','.join('?' * len(chunk))
+            cur.execute(f"""
+                SELECT id, statement, kind, confidence, expires_at
+                FROM learning
+                WHERE is_active = 1 AND is_pinned = 0 AND id IN ({placeholders})
+            """, chunk)
+            to_prune += cur.fetchall()
     
     print(f"=== Pruning {'(DRY RUN)' if dry_run else ''} ===")
     print(f"Found {len(to_prune)} learnings to prune")
@@ -174,9 +915,9 @@ def prune_learnings(dry_run: bool = True):
         print(f"  [{row[0]}] ({row[2]}, conf={row[3]:.1f}) {row[1][:50]}...")
     
     if not dry_run and to_prune:
-        ids = [r[0] for r in to_prune]
-        placeholders = ','.join('?' * len(ids))
-        cur.execute(f"UPDATE learning SET is_active = 0 WHERE id IN ({placeholders})", ids)
+        for chunk in chunked(r[0] for r in to_prune):
+            placeholders = ','.join('?' * len(chunk))
+            cur.execute(f"UPDATE learning SET is_active = 0 WHERE id IN ({placeholders})", chunk)
         conn.commit()
         print(f"Pruned {len(to_prune)} learnings (soft delete)")
     
@@ -250,6 +991,111 @@ def stats():
     
     conn.close()
 
+def benchmark(rows: int = 10000, queries: int = 50, semantic_queries: int = 10) -> dict:
+    """
+    Mean query time (ms) on a scratch database: substring LIKE versus the FTS5
+    index, semantic top-20 over all vectors versus probed partitions, and
+    prune candidates / top-20 by score computed per row versus read from
+    idx_learning_relevance.
+    """
+    global DB_PATH
+    rng = random.Random(42)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 9)))
+             for _ in range(5000)]
+    saved = DB_PATH
+    with tempfile.TemporaryDirectory() as tmp:
+        DB_PATH = Path(tmp) / "learnings.db"
+        try:
+            conn = get_db()
+            conn.executemany(
+                "INSERT INTO learning (statement, kind, canonical_hash) VALUES (?, 'fact', ?)",
+                ((' '.join(rng.choice(words) for _ in range(12)) + f" ref{i:06d}", f"bench-{i}")
+                 for i in range(rows)))
+            conn.commit()
+            # A selective lookup: LIKE must scan every row to fill its LIMIT, FTS5 reads one posting list.
+            terms = [f"ref{rng.randrange(rows):06d}" for _ in range(queries)]
+            started = time.perf_counter()
+            for term in terms:
+                conn.execute("SELECT id FROM active_learnings WHERE statement LIKE ? LIMIT 20",
+                             (f"%{term}%",)).fetchall()
+            like_ms = (time.perf_counter() - started) * 1000 / queries
+            started = time.perf_counter()
+            for term in terms:
+                conn.execute("""
+                    SELECT rowid FROM learning_fts WHERE learning_fts MATCH ?
+                    ORDER BY bm25(learning_fts) LIMIT 20
+                """, (fts_query(term),)).fetchall()
+            fts_ms = (time.perf_counter() - started) * 1000 / queries
+            update_embeddings(conn)
+            vectors = [embed(' '.join(rng.choice(words) for _ in range(4))) for _ in range(semantic_queries)]
+            started = time.perf_counter()
+            for vector in vectors:
+                nearest_learnings(conn, vector, 20)
+            semantic_ms = (time.perf_counter() - started) * 1000 / semantic_queries
+            started = time.perf_counter()
+            for vector in vectors:
+                nearest_learnings(conn, vector, 20, partitions=probe_partitions(partition_of(vector)))
+            partitioned_ms = (time.perf_counter() - started) * 1000 / semantic_queries
+            # Spread confidence and age so a realistic share of rows is prunable.
+            conn.execute("""
+                UPDATE learning SET confidence = (id * 37 % 100) / 100.0,
+                                    updated_at = datetime('now', '-' || (id % 180) || ' days')
+            """)
+            update_relevance(conn)
+            conn.commit()
+            floor = (math.log2(PRUNE_SCORE), HALF_LIFE_DAYS, f'-{PRUNE_MIN_IDLE_DAYS} days', PRUNE_KEEP_CONFIDENCE)
+            started = time.perf_counter()
+            for _ in range(queries):
+                conn.execute("""
+                    SELECT id FROM learning
+                    WHERE is_active = 1 AND is_pinned = 0
+                      AND relevance_score(confidence, access_count,
+                              julianday(MAX(updated_at, COALESCE(last_accessed_at, updated_at)))) < ? + julianday('now') / ?
+                      AND MAX(updated_at, COALESCE(last_accessed_at, updated_at)) < datetime('now', ?)
+                      AND confidence < ?
+                """, floor).fetchall()
+            prune_scan_ms = (time.perf_counter() - started) * 1000 / queries
+            started = time.perf_counter()
+            for _ in range(queries):
+                conn.execute("""
+                    SELECT id FROM learning INDEXED BY idx_learning_relevance
+                    WHERE is_active = 1 AND is_pinned = 0 AND relevance < ? + julianday('now') / ?
+                      AND MAX(updated_at, COALESCE(last_accessed_at, updated_at)) < datetime('now', ?)
+                      AND confidence < ?
+                """, floor).fetchall()
+            prune_index_ms = (time.perf_counter() - started) * 1000 / queries
+            started = time.perf_counter()
+            for _ in range(queries):
+                conn.execute("""
+                    SELECT id FROM learning WHERE is_active = 1
+                    ORDER BY is_pinned DESC, relevance_score(confidence, access_count,
+                             julianday(MAX(updated_at, COALESCE(last_accessed_at, updated_at)))) DESC
+                    LIMIT 20
+                """).fetchall()
+            top_scan_ms = (time.perf_counter() - started) * 1000 / queries
+            started = time.perf_counter()
+            for _ in range(queries):
+                conn.execute("""
+                    SELECT id FROM learning WHERE is_active = 1
+                    ORDER BY is_pinned DESC, relevance DESC LIMIT 20
+                """).fetchall()
+            top_index_ms = (time.perf_counter() - started) * 1000 / queries
+            conn.close()
+        finally:
+            DB_PATH = saved
+            _schema_ready.discard(str(Path(tmp) / "learnings.db"))
+    return {'rows': rows, 'like_ms': like_ms, 'fts_ms': fts_ms, 'speedup': like_ms / fts_ms,
+            'semantic_ms': semantic_ms, 'partitioned_ms': partitioned_ms,
+            'scorer': 'numpy' if numpy is not None else 'python',
+            'prune_scan_ms': prune_scan_ms, 'prune_index_ms': prune_index_ms,
+            'top_scan_ms': top_scan_ms, 'top_index_ms': top_index_ms}
+
+def parse_ids(argv: list) -> list:
+    """Learning ids from `--ids 1,2,3`, or None when the flag is absent."""
+    if "--ids" not in argv or argv.index("--ids") + 1 >= len(argv):
+        return None
+    return [int(i) for i in argv[argv.index("--ids") + 1].split(",") if i.strip()]
+
 def main():
     if len(sys.argv) < 2:
         print(__doc__)
@@ -265,6 +1111,7 @@ def main():
         entity = None
         source = None
         pinned = False
+        merge_near = False
         
         i = 2
         while i < len(sys.argv):
@@ -286,6 +1133,9 @@ def main():
             elif sys.argv[i] == "--pinned":
                 pinned = True
                 i += 1
+            elif sys.argv[i] == "--merge-near":
+                merge_near = True
+                i += 1
             else:
                 i += 1
         
@@ -293,7 +1143,7 @@ def main():
             print("Usage: python learnings.py add --kind <kind> --statement \"...\"")
             return
         
-        add_learning(statement, kind, tags, entity, source, pinned)
+        add_learning(statement, kind, tags, entity, source, pinned, merge_near=merge_near)
     
     elif cmd == "list":
         kind = None
@@ -306,11 +1156,73 @@ def main():
         list_learnings(kind=kind, limit=limit)
     
     elif cmd == "search" and len(sys.argv) > 2:
-        search_learnings(sys.argv[2])
+        kind = None
+        tags = []
+        entity = None
+        limit = 20
+        semantic = "--semantic" in sys.argv
+        for i, arg in enumerate(sys.argv[3:], 3):
+            if arg == "--kind" and i+1 < len(sys.argv):
+                kind = sys.argv[i+1]
+            elif arg == "--tag" and i+1 < len(sys.argv):
+                tags.append(sys.argv[i+1])
+            elif arg == "--entity" and i+1 < len(sys.argv):
+                entity = sys.argv[i+1]
+            elif arg == "--limit" and i+1 < len(sys.argv):
+                limit = int(sys.argv[i+1])
+        if semantic:
+            semantic_search(sys.argv[2], limit=limit, kind=kind)
+        else:
+            search_learnings(sys.argv[2], limit=limit, kind=kind, tags=tags, entity=entity)
+    
+    elif cmd == "top":
+        kind = None
+        limit = 20
+        for i, arg in enumerate(sys.argv[2:], 2):
+            if arg == "--kind" and i+1 < len(sys.argv):
+                kind = sys.argv[i+1]
+            elif arg == "--limit" and i+1 < len(sys.argv):
+                limit = int(sys.argv[i+1])
+        top_learnings(limit=limit, kind=kind)
+    
+    elif cmd == "reindex":
+        rebuild_search_index()
+    
+    elif cmd == "rescore":
+        rescore_learnings()
+    
+    elif cmd == "import" and len(sys.argv) > 2:
+        source = None
+        if "--source" in sys.argv:
+            idx = sys.argv.index("--source")
+            if idx + 1 < len(sys.argv):
+                source = sys.argv[idx + 1]
+        records = []
+        with open(sys.argv[2], 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        records.append(None)  # reported (and counted) as skipped by import_learnings
+        import_learnings(records, source=source)
+    
+    elif cmd == "tag" and len(sys.argv) > 2 and parse_ids(sys.argv):
+        tags = [t for t in sys.argv[2].split(",") if t]
+        if "--remove" in sys.argv:
+            tag_learnings(parse_ids(sys.argv), remove=tags)
+        else:
+            tag_learnings(parse_ids(sys.argv), add=tags)
+    
+    elif cmd == "pin" and parse_ids(sys.argv):
+        pin_learnings(parse_ids(sys.argv), pinned="--unpin" not in sys.argv)
     
     elif cmd == "prune":
         dry_run = "--dry-run" in sys.argv
-        prune_learnings(dry_run=dry_run)
+        prune_learnings(dry_run=dry_run, ids=parse_ids(sys.argv))
+    
+    elif cmd == "merge-access":
+        print(f"[MERGED] access log for {merge_access_log()} learnings")
     
     elif cmd == "export":
         fmt = "json"
@@ -323,6 +1235,18 @@ def main():
     elif cmd == "stats":
         stats()
     
+    elif cmd == "bench":
+        rows = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+        result = benchmark(rows)
+        print(f"{result['rows']} learnings: LIKE {result['like_ms']:.2f}ms/query, "
+              f"FTS5 {result['fts_ms']:.2f}ms/query ({result['speedup']:.0f}x)")
+        print(f"semantic ({result['scorer']}): all vectors {result['semantic_ms']:.1f}ms/query, "
+              f"probed partitions {result['partitioned_ms']:.1f}ms/query")
+        print(f"prune candidates: scored per row {result['prune_scan_ms']:.2f}ms, "
+              f"relevance index {result['prune_index_ms']:.2f}ms")
+        print(f"top 20: scored per row {result['top_scan_ms']:.2f}ms, "
+              f"relevance index {result['top_index_ms']:.2f}ms")
+    
     else:
         print(__doc__)
 
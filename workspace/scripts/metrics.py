@@ -4,59 +4,369 @@ metrics.py — Record metrics for observability dashboard
 Council-designed: Grade A- (Aggregated Observability)
 """
 
+import atexit
+import bisect
 import sqlite3
 import json
 import sys
-from datetime import datetime
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 
 WORKSPACE = Path(__file__).resolve().parent.parent
 DB_PATH = WORKSPACE / "memory" / "learnings.db"
 
-def ensure_metrics_table():
-    """Create metrics table if not exists. Uses WAL mode for crash safety."""
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    
+BATCH_SIZE = 100          # Events buffered before a group commit
+FLUSH_INTERVAL = 1.0      # Seconds an event may wait in the buffer
+RAW_RETENTION_DAYS = 30   # Raw metric rows older than this are pruned
+HOURLY_RETENTION_DAYS = 14  # Hourly rollups older than this are pruned; daily rollups are kept
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS metrics (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        metric_name TEXT NOT NULL,
+        metric_value REAL DEFAULT 1.0,
+        session_id TEXT,
+        task_id TEXT,
+        details TEXT,
+        recorded_at TEXT DEFAULT (datetime('now')),
+        recorded_date TEXT DEFAULT (date('now'))
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_metrics_name ON metrics(metric_name);
+    CREATE INDEX IF NOT EXISTS idx_metrics_date ON metrics(recorded_date);
+"""
+
+ROLLUP_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS metrics_hourly (
+        metric_name TEXT NOT NULL,
+        hour TEXT NOT NULL,
+        total_count INTEGER NOT NULL,
+        value_sum REAL NOT NULL,
+        PRIMARY KEY (metric_name, hour)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS metrics_daily (
+        metric_name TEXT NOT NULL,
+        day TEXT NOT NULL,
+        total_count INTEGER NOT NULL,
+        value_sum REAL NOT NULL,
+        PRIMARY KEY (metric_name, day)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_metrics_hourly_hour ON metrics_hourly(hour)",
+    "CREATE INDEX IF NOT EXISTS idx_metrics_daily_day ON metrics_daily(day)",
+)
+
+# Rollups built from raw rows when the rollup tables are first created.
+BACKFILL_ROLLUPS = (
+    """
+    INSERT INTO metrics_hourly (metric_name, hour, total_count, value_sum)
+    SELECT metric_name, strftime('%Y-%m-%d %H:00:00', recorded_at), COUNT(*), TOTAL(metric_value)
+    FROM metrics GROUP BY 1, 2
+    """,
+    """
+    INSERT INTO metrics_daily (metric_name, day, total_count, value_sum)
+    SELECT metric_name, recorded_date, COUNT(*), TOTAL(metric_value)
+    FROM metrics GROUP BY 1, 2
+    """,
+)
+
+# Histogram bucket upper bounds (fixed, log scale: 1-2.5-5 per decade). A value
+# lands in the first bucket whose bound is >= the value; the last column is +Inf.
+# Changing these invalidates stored histograms.
+HISTOGRAM_BOUNDS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000)
+BUCKET_COLUMNS = tuple(f"b{i}" for i in range(len(HISTOGRAM_BOUNDS) + 1))
+
+# Prometheus label name per histogram (the stored column is always `label`).
+HISTOGRAM_LABEL_NAMES = {'api_latency_ms': 'api'}
+
+HISTOGRAM_SCHEMA = (
+    f"""
+    CREATE TABLE IF NOT EXISTS metrics_histogram (
+        metric_name TEXT NOT NULL,
+        label TEXT NOT NULL DEFAULT '',
+        hour TEXT NOT NULL,
+        total_count INTEGER NOT NULL,
+        value_sum REAL NOT NULL,
+        {", ".join(f"{col} INTEGER NOT NULL DEFAULT 0" for col in BUCKET_COLUMNS)},
+        PRIMARY KEY (metric_name, label, hour)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_metrics_histogram_hour ON metrics_histogram(hour)",
+)
+
+UPSERT_HISTOGRAM = f"""
+    INSERT INTO metrics_histogram (metric_name, label, hour, total_count, value_sum, {", ".join(BUCKET_COLUMNS)})
+    VALUES (?, ?, ?, ?, ?, {", ".join("?" for _ in BUCKET_COLUMNS)})
+    ON CONFLICT (metric_name, label, hour) DO UPDATE SET
+        total_count = total_count + excluded.total_count,
+        value_sum = value_sum + excluded.value_sum,
+        {", ".join(f"{col} = {col} + excluded.{col}" for col in BUCKET_COLUMNS)}
+"""
+
+# Latencies already sitting in api_call details, histogrammed when the table is first created.
+BACKFILL_LATENCY = """
+    SELECT json_extract(details, '$.api'), json_extract(details, '$.latency_ms'), recorded_at
+    FROM metrics
+    WHERE metric_name = 'api_call' AND json_valid(details) AND json_extract(details, '$.latency_ms') IS NOT NULL
+"""
+
+UPSERT_HOURLY = """
+    INSERT INTO metrics_hourly (metric_name, hour, total_count, value_sum) VALUES (?, ?, ?, ?)
+    ON CONFLICT (metric_name, hour) DO UPDATE SET
+        total_count = total_count + excluded.total_count,
+        value_sum = value_sum + excluded.value_sum
+"""
+
+UPSERT_DAILY = """
+    INSERT INTO metrics_daily (metric_name, day, total_count, value_sum) VALUES (?, ?, ?, ?)
+    ON CONFLICT (metric_name, day) DO UPDATE SET
+        total_count = total_count + excluded.total_count,
+        value_sum = value_sum + excluded.value_sum
+"""
+
+INSERT_METRIC = """
+    INSERT INTO metrics (metric_name, metric_value, session_id, task_id, details, recorded_at, recorded_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+def init_schema(conn: sqlite3.Connection):
+    """
+    Create the metrics and rollup tables on an open connection. Uses WAL mode for crash safety.
+
+    Rollups and latency histograms are backfilled from raw rows the first time
+    they are created; the check and backfill share one write transaction so
+    two processes starting together cannot both backfill.
+    """
     # Council A+ fix: Enable WAL mode for crash safety
-    cur.execute("PRAGMA journal_mode=WAL;")
-    
-    cur.executescript("""
-        CREATE TABLE IF NOT EXISTS metrics (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            metric_name TEXT NOT NULL,
-            metric_value REAL DEFAULT 1.0,
-            session_id TEXT,
-            task_id TEXT,
-            details TEXT,
-            recorded_at TEXT DEFAULT (datetime('now')),
-            recorded_date TEXT DEFAULT (date('now'))
-        );
-        
-        CREATE INDEX IF NOT EXISTS idx_metrics_name ON metrics(metric_name);
-        CREATE INDEX IF NOT EXISTS idx_metrics_date ON metrics(recorded_date);
-    """)
-    
-    conn.commit()
-    conn.close()
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.executescript(SCHEMA)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        for statement in ROLLUP_SCHEMA + HISTOGRAM_SCHEMA:
+            conn.execute(statement)
+        if 'metrics_daily' not in tables:
+            for statement in BACKFILL_ROLLUPS:
+                conn.execute(statement)
+        if 'metrics_histogram' not in tables:
+            histograms = {}
+            for api, latency, recorded_at in conn.execute(BACKFILL_LATENCY).fetchall():
+                if isinstance(latency, (int, float)):
+                    add_observation(histograms, 'api_latency_ms', api, recorded_at[:13] + ':00:00', latency)
+            conn.executemany(UPSERT_HISTOGRAM, histogram_rows(histograms))
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+def rollup_rows(rows: list) -> tuple:
+    """Aggregate buffered metric rows into (hourly, daily) rollup increments."""
+    hourly, daily = {}, {}
+    for name, value, _session, _task, _details, recorded_at, recorded_date in rows:
+        value = float(value or 0.0)  # NULL values count as 0, like SUM() over raw rows
+        for buckets, key in ((hourly, (name, recorded_at[:13] + ':00:00')), (daily, (name, recorded_date))):
+            count, total = buckets.get(key, (0, 0.0))
+            buckets[key] = (count + 1, total + value)
+    return ([(*key, count, total) for key, (count, total) in hourly.items()],
+            [(*key, count, total) for key, (count, total) in daily.items()])
+
+def bucket_index(value: float) -> int:
+    """Histogram column for a value (len(HISTOGRAM_BOUNDS) is the +Inf bucket)."""
+    return bisect.bisect_left(HISTOGRAM_BOUNDS, value)
+
+def add_observation(histograms: dict, metric_name: str, label: str, hour: str, value: float, count: int = 1):
+    """Fold observations into an in-memory {(name, label, hour): [count, sum, buckets]} map."""
+    entry = histograms.get((metric_name, label or '', hour))
+    if entry is None:
+        entry = histograms[(metric_name, label or '', hour)] = [0, 0.0, [0] * len(BUCKET_COLUMNS)]
+    entry[0] += count
+    entry[1] += value * count
+    entry[2][bucket_index(value)] += count
+
+def histogram_rows(histograms: dict) -> list:
+    """UPSERT_HISTOGRAM parameters for an in-memory histogram map."""
+    return [(*key, count, total, *buckets) for key, (count, total, buckets) in histograms.items()]
+
+def histogram_quantile(q: float, buckets: list) -> float:
+    """
+    Estimate a quantile from per-bucket counts, interpolating linearly inside
+    the bucket like Prometheus' histogram_quantile(). Values in the +Inf
+    bucket are reported as the largest finite bound.
+    """
+    total = sum(buckets)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for i, count in enumerate(buckets):
+        if count and seen + count >= rank:
+            if i == len(HISTOGRAM_BOUNDS):
+                return float(HISTOGRAM_BOUNDS[-1])
+            lower = HISTOGRAM_BOUNDS[i - 1] if i else 0.0
+            return lower + (HISTOGRAM_BOUNDS[i] - lower) * (rank - seen) / count
+        seen += count
+    return float(HISTOGRAM_BOUNDS[-1])
+
+def prune_metrics(conn: sqlite3.Connection, raw_days: int = RAW_RETENTION_DAYS,
+                  hourly_days: int = HOURLY_RETENTION_DAYS) -> dict:
+    """Delete raw rows, hourly rollups and histograms past retention. Daily rollups are kept."""
+    with conn:
+        raw = conn.execute("DELETE FROM metrics WHERE recorded_date < date('now', ?)",
+                           (f'-{int(raw_days)} days',)).rowcount
+        hourly = conn.execute("DELETE FROM metrics_hourly WHERE hour < datetime('now', ?)",
+                              (f'-{int(hourly_days)} days',)).rowcount
+        hourly += conn.execute("DELETE FROM metrics_histogram WHERE hour < datetime('now', ?)",
+                               (f'-{int(hourly_days)} days',)).rowcount
+    return {'raw_deleted': raw, 'hourly_deleted': hourly}
+
+def ensure_metrics_table():
+    """Create metrics table if not exists."""
+    get_recorder().connection()
+
+class MetricsRecorder:
+    """
+    Records metric events over one connection per process.
+
+    The schema is initialized once when the connection opens. Events are
+    buffered and written in a single transaction when batch_size events are
+    waiting, flush_interval seconds after the first buffered event, on any
+    read through this recorder, and at interpreter exit. The same transaction
+    adds each batch to the hourly and daily rollups, and once a day the
+    recorder prunes rows past retention.
+
+    Histogram observations are folded into per-hour bucket counts in memory
+    and added to metrics_histogram with the same flush; they are never stored
+    as raw rows.
+    """
+
+    def __init__(self, db_path: Path = None, batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self.db_path = Path(db_path or DB_PATH)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pending = []
+        self.observations = {}
+        self.observed = 0
+        self.commits = 0
+        self.pruned_on = None
+        self._conn = None
+        self._timer = None
+        self._lock = threading.RLock()
+
+    def connection(self) -> sqlite3.Connection:
+        """The recorder's connection, opened (and the schema created) on first use."""
+        with self._lock:
+            if self._conn is None:
+                self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                init_schema(self._conn)
+            return self._conn
+
+    def record(self, metric_name: str, value: float = 1.0,
+               session_id: str = None, task_id: str = None,
+               details: dict = None):
+        """Buffer one event; it is timestamped now, not when the batch is written."""
+        now = datetime.now(timezone.utc)
+        row = (metric_name, value, session_id, task_id,
+               json.dumps(details) if details else None,
+               now.strftime('%Y-%m-%d %H:%M:%S'), now.strftime('%Y-%m-%d'))
+        with self._lock:
+            self.pending.append(row)
+            self._buffered()
+
+    def observe(self, metric_name: str, value: float, label: str = None):
+        """Buffer one histogram observation (e.g. a latency in ms) for metric_name/label."""
+        hour = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:00:00')
+        with self._lock:
+            add_observation(self.observations, metric_name, label, hour, float(value))
+            self.observed += 1
+            self._buffered()
+
+    def _buffered(self):
+        if len(self.pending) + self.observed >= self.batch_size or self.flush_interval <= 0:
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> int:
+        """Write buffered events and observations in one transaction. Returns the number written."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self.pending and not self.observations:
+                return 0
+            rows, self.pending = self.pending, []
+            histograms, observed = self.observations, self.observed
+            self.observations, self.observed = {}, 0
+            conn = self.connection()
+            hourly, daily = rollup_rows(rows)
+            try:
+                with conn:
+                    conn.executemany(INSERT_METRIC, rows)
+                    conn.executemany(UPSERT_HOURLY, hourly)
+                    conn.executemany(UPSERT_DAILY, daily)
+                    conn.executemany(UPSERT_HISTOGRAM, histogram_rows(histograms))
+            except sqlite3.Error:
+                self.pending[:0] = rows
+                for (name, label, hour), (count, total, buckets) in histograms.items():
+                    entry = self.observations.setdefault((name, label, hour), [0, 0.0, [0] * len(BUCKET_COLUMNS)])
+                    entry[0] += count
+                    entry[1] += total
+                    entry[2] = [a + b for a, b in zip(entry[2], buckets)]
+                self.observed += observed
+                raise
+            self.commits += 1
+            today = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+            if self.pruned_on != today:
+                self.pruned_on = today
+                prune_metrics(conn)
+            return len(rows) + observed
+
+    def query(self, sql: str, params=()) -> list:
+        """Run a read on the recorder's connection after flushing buffered events."""
+        with self._lock:
+            self.flush()
+            return self.connection().execute(sql, params).fetchall()
+
+    def close(self):
+        """Flush and close the connection; the recorder reopens it if used again."""
+        with self._lock:
+            try:
+                self.flush()
+            finally:
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+def get_recorder() -> MetricsRecorder:
+    """Process-wide recorder for DB_PATH, flushed at exit."""
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = MetricsRecorder(DB_PATH)
+            atexit.register(_recorder.close)
+        return _recorder
 
 def record_metric(metric_name: str, value: float = 1.0, 
                   session_id: str = None, task_id: str = None, 
                   details: dict = None):
     """Record a single metric event."""
-    ensure_metrics_table()
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    
-    details_json = json.dumps(details) if details else None
-    
-    cur.execute("""
-        INSERT INTO metrics (metric_name, metric_value, session_id, task_id, details)
-        VALUES (?, ?, ?, ?, ?)
-    """, (metric_name, value, session_id, task_id, details_json))
-    
-    conn.commit()
-    conn.close()
+    get_recorder().record(metric_name, value, session_id, task_id, details)
+
+def record_histogram(metric_name: str, value: float, label: str = None):
+    """Record one observation of a histogram metric (bucketed, see HISTOGRAM_BOUNDS)."""
+    get_recorder().observe(metric_name, value, label)
 
 def record_preflight(passed: bool, digest: dict = None, errors: list = None):
     """Record preflight check result."""
@@ -96,51 +406,38 @@ def record_api_call(api: str, success: bool, latency_ms: int = None):
         value=1.0 if success else 0.0,
         details={'api': api, 'latency_ms': latency_ms}
     )
+    if latency_ms is not None:
+        record_histogram('api_latency_ms', latency_ms, label=api)
 
 def get_today_summary() -> dict:
-    """Get today's metrics summary."""
-    ensure_metrics_table()
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    
-    cur.execute("""
+    """Get today's metrics summary from the daily rollup."""
+    rows = get_recorder().query("""
         SELECT 
             metric_name,
-            COUNT(*) as total_count,
-            SUM(metric_value) as success_count,
-            ROUND(SUM(metric_value) * 100.0 / COUNT(*), 1) as success_rate
-        FROM metrics
-        WHERE recorded_date = date('now')
-        GROUP BY metric_name
+            total_count,
+            value_sum as success_count,
+            ROUND(value_sum * 100.0 / total_count, 1) as success_rate
+        FROM metrics_daily
+        WHERE day = date('now')
+        ORDER BY metric_name
     """)
     
-    rows = cur.fetchall()
-    conn.close()
-    
     return {row[0]: {'total_count': row[1], 'success_count': row[2], 'success_rate': row[3]} for row in rows}
 
 def get_7day_trends() -> dict:
-    """Get 7-day trends by metric."""
-    ensure_metrics_table()
-    conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    
-    cur.execute("""
+    """Get 7-day trends by metric from the daily rollup."""
+    rows = get_recorder().query("""
         SELECT 
             metric_name,
-            recorded_date,
-            COUNT(*) as total_count,
-            SUM(metric_value) as success_count,
-            ROUND(SUM(metric_value) * 100.0 / COUNT(*), 1) as success_rate
-        FROM metrics
-        WHERE recorded_date >= date('now', '-7 days')
-        GROUP BY metric_name, recorded_date
-        ORDER BY metric_name, recorded_date
+            day,
+            total_count,
+            value_sum as success_count,
+            ROUND(value_sum * 100.0 / total_count, 1) as success_rate
+        FROM metrics_daily
+        WHERE day >= date('now', '-7 days')
+        ORDER BY metric_name, day
     """)
     
-    rows = cur.fetchall()
-    conn.close()
-    
     trends = {}
     for row in rows:
         metric_name, date, total, success, rate = row
@@ -152,10 +449,64 @@ def get_7day_trends() -> dict:
     
     return trends
 
-def check_alerts() -> list:
+def get_hourly_trends(hours: int = 24) -> dict:
+    """Get per-hour counts and rates for the last `hours` hours from the hourly rollup."""
+    rows = get_recorder().query("""
+        SELECT 
+            metric_name,
+            hour,
+            total_count,
+            ROUND(value_sum * 100.0 / total_count, 1) as success_rate
+        FROM metrics_hourly
+        WHERE hour >= strftime('%Y-%m-%d %H:00:00', 'now', ?)
+        ORDER BY metric_name, hour
+    """, (f'-{int(hours) - 1} hours',))
+
+    trends = {}
+    for metric_name, hour, total, rate in rows:
+        series = trends.setdefault(metric_name, {'hours': [], 'rates': [], 'counts': []})
+        series['hours'].append(hour)
+        series['rates'].append(rate)
+        series['counts'].append(total)
+
+    return trends
+
+def get_histograms(metric_name: str = None, hours: int = 24) -> dict:
+    """Bucket counts summed over the last `hours` hours: {metric: {label: {'count', 'sum', 'buckets'}}}."""
+    sql = f"""
+        SELECT metric_name, label, SUM(total_count), SUM(value_sum), {", ".join(f"SUM({col})" for col in BUCKET_COLUMNS)}
+        FROM metrics_histogram
+        WHERE hour >= strftime('%Y-%m-%d %H:00:00', 'now', ?)
+    """
+    params = [f'-{int(hours) - 1} hours']
+    if metric_name:
+        sql += " AND metric_name = ?"
+        params.append(metric_name)
+    sql += " GROUP BY metric_name, label ORDER BY metric_name, label"
+
+    histograms = {}
+    for name, label, count, total, *buckets in get_recorder().query(sql, params):
+        histograms.setdefault(name, {})[label] = {'count': count, 'sum': total, 'buckets': buckets}
+    return histograms
+
+def get_latency_percentiles(metric_name: str = 'api_latency_ms', hours: int = 24) -> dict:
+    """p50/p95/p99 per label (API) over the last `hours` hours, estimated from histogram buckets."""
+    percentiles = {}
+    for label, data in get_histograms(metric_name, hours).get(metric_name, {}).items():
+        percentiles[label] = {
+            'count': data['count'],
+            'avg': round(data['sum'] / data['count'], 1) if data['count'] else None,
+            'p50': round(histogram_quantile(0.50, data['buckets']), 1),
+            'p95': round(histogram_quantile(0.95, data['buckets']), 1),
+            'p99': round(histogram_quantile(0.99, data['buckets']), 1),
+        }
+    return percentiles
+
+def check_alerts(summary: dict = None) -> list:
     """Check for alert conditions including circuit breaker status."""
     alerts = []
-    summary = get_today_summary()
+    if summary is None:
+        summary = get_today_summary()
     
     if 'preflight_pass' in summary:
         rate = summary['preflight_pass'].get('success_rate', 100)
@@ -187,13 +538,19 @@ def check_alerts() -> list:
 
 def get_status() -> dict:
     """Get full metrics status for API."""
+    summary = get_today_summary()
     return {
-        'today': get_today_summary(),
+        'today': summary,
         'trends': get_7day_trends(),
-        'alerts': check_alerts(),
+        'alerts': check_alerts(summary),
+        'latency': get_latency_percentiles(),
         'generatedAt': datetime.now().isoformat()
     }
 
+def _prometheus_escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
 def get_prometheus_metrics() -> str:
     """
     Council A+ requirement: Export metrics in Prometheus text format.
@@ -222,8 +579,25 @@ def get_prometheus_metrics() -> str:
         lines.append(f"# TYPE clawdbot_{safe_name}_success_rate gauge")
         lines.append(f"clawdbot_{safe_name}_success_rate {data.get('success_rate', 100)}")
     
+    # Histograms over today's hours, cumulative buckets as Prometheus expects
+    hours_today = datetime.now(timezone.utc).hour + 1
+    for metric_name, series in get_histograms(hours=hours_today).items():
+        safe_name = metric_name.replace('-', '_').replace('.', '_')
+        label_name = HISTOGRAM_LABEL_NAMES.get(metric_name, 'label')
+        lines.append(f"# HELP clawdbot_{safe_name} Histogram of {metric_name}")
+        lines.append(f"# TYPE clawdbot_{safe_name} histogram")
+        for label, data in series.items():
+            selector = f'{label_name}="{_prometheus_escape(label)}",' if label else ''
+            cumulative = 0
+            for bound, count in zip(HISTOGRAM_BOUNDS + ('+Inf',), data['buckets']):
+                cumulative += count
+                lines.append(f'clawdbot_{safe_name}_bucket{{{selector}le="{bound}"}} {cumulative}')
+            selector = '{' + selector.rstrip(',') + '}' if selector else ''
+            lines.append(f"clawdbot_{safe_name}_sum{selector} {data['sum']}")
+            lines.append(f"clawdbot_{safe_name}_count{selector} {data['count']}")
+    
     # Add system health metrics
-    alerts = check_alerts()
+    alerts = check_alerts(summary)
     lines.append("# HELP clawdbot_alerts_active Number of active alerts")
     lines.append("# TYPE clawdbot_alerts_active gauge")
     lines.append(f"clawdbot_alerts_active {len(alerts)}")
@@ -235,9 +609,42 @@ def get_prometheus_metrics() -> str:
     
     return '\n'.join(lines) + '\n'
 
+def _record_per_event(db_path: Path, row: tuple):
+    """The original write path: schema check and a fresh connection per event."""
+    conn = sqlite3.connect(db_path)
+    init_schema(conn)
+    conn.close()
+    conn = sqlite3.connect(db_path)
+    conn.execute(INSERT_METRIC, row)
+    conn.commit()
+    conn.close()
+
+def benchmark(events: int = 2000) -> dict:
+    """Events/second for the per-event write path versus MetricsRecorder, on a scratch database."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        before_path = Path(tmp) / "before.db"
+        started = time.perf_counter()
+        for i in range(events):
+            now = datetime.now(timezone.utc)
+            _record_per_event(before_path, ('bench', 1.0, None, f'T{i}', None,
+                                            now.strftime('%Y-%m-%d %H:%M:%S'), now.strftime('%Y-%m-%d')))
+        results['per_event'] = events / (time.perf_counter() - started)
+
+        recorder = MetricsRecorder(Path(tmp) / "after.db")
+        started = time.perf_counter()
+        for i in range(events):
+            recorder.record('bench', 1.0, task_id=f'T{i}')
+        recorder.close()
+        results['batched'] = events / (time.perf_counter() - started)
+        results['commits'] = recorder.commits
+    results['events'] = events
+    results['speedup'] = results['batched'] / results['per_event']
+    return results
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python metrics.py [today|trends|alerts|record <name> <value>]")
+        print("Usage: python metrics.py [today|trends|hourly|latency [hours]|alerts|record <name> <value>|prune [days]|bench [events]]")
         sys.exit(1)
     
     cmd = sys.argv[1]
@@ -256,6 +663,24 @@ if __name__ == "__main__":
             for i, date in enumerate(data['dates']):
                 print(f"  {date}: {data['rates'][i]}% ({data['counts'][i]} events)")
     
+    elif cmd == "hourly":
+        trends = get_hourly_trends()
+        print("=== Last 24 Hours ===")
+        for metric, data in trends.items():
+            print(f"\n{metric}:")
+            for i, hour in enumerate(data['hours']):
+                print(f"  {hour}: {data['rates'][i]}% ({data['counts'][i]} events)")
+    
+    elif cmd == "latency":
+        hours = int(sys.argv[2]) if len(sys.argv) >= 3 else 24
+        percentiles = get_latency_percentiles(hours=hours)
+        print(f"=== API Latency (last {hours}h, ms) ===")
+        for api, data in percentiles.items():
+            print(f"  {api or '(none)'}: p50={data['p50']} p95={data['p95']} p99={data['p99']} "
+                  f"avg={data['avg']} ({data['count']} calls)")
+        if not percentiles:
+            print("  No latency samples")
+    
     elif cmd == "alerts":
         alerts = check_alerts()
         if alerts:
@@ -275,6 +700,21 @@ if __name__ == "__main__":
     elif cmd == "status":
         print(json.dumps(get_status(), indent=2))
     
+    elif cmd == "prune":
+        days = int(sys.argv[2]) if len(sys.argv) >= 3 else RAW_RETENTION_DAYS
+        recorder = get_recorder()
+        recorder.flush()
+        result = prune_metrics(recorder.connection(), raw_days=days)
+        print(f"Pruned {result['raw_deleted']} raw rows older than {days} days, "
+              f"{result['hourly_deleted']} hourly rollups")
+    
+    elif cmd == "bench":
+        result = benchmark(int(sys.argv[2]) if len(sys.argv) >= 3 else 2000)
+        print(f"=== Metrics write benchmark ({result['events']} events) ===")
+        print(f"  per-event connection: {result['per_event']:,.0f} events/s")
+        print(f"  batched recorder:     {result['batched']:,.0f} events/s ({result['commits']} commits)")
+        print(f"  speedup: {result['speedup']:.1f}x")
+    
     else:
         print("Unknown command")
         sys.exit(1)
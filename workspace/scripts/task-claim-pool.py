@@ -8,49 +8,108 @@ Usage:
     python task-claim-pool.py available --specialty research
     python task-claim-pool.py calculate-priorities
     python task-claim-pool.py claim --task-id T123 --agent-id subagent:abc --agent-name "Research Agent" --specialty research
+    python task-claim-pool.py claim-next --agent-id subagent:abc --agent-name "Research Agent" --specialty research
     python task-claim-pool.py release --task-id T123 --agent-id subagent:abc
     python task-claim-pool.py heartbeat --agent-id subagent:abc
+    python task-claim-pool.py serve [--socket memory/.claim-pool.sock] [--flush-interval 5]
+
+While `serve` is running, available/claim/claim-next/release/heartbeat are sent
+to the daemon over its Unix socket (pass --no-daemon to bypass it).
 """
 import argparse
+import hashlib
+import heapq
 import json
-from datetime import datetime, timezone
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from task_repository import ExportConflict, open_repository
+
 WORKSPACE = Path(__file__).parent.parent
 TASKS_PATH = WORKSPACE / 'memory' / 'tasks.json'
 PARALLEL_LOG = WORKSPACE / 'memory' / 'parallel-execution.jsonl'
+CLAIM_TIMEOUT_MINUTES = 30
+SOCKET_PATH = Path(os.environ.get('TASK_CLAIM_POOL_SOCKET', WORKSPACE / 'memory' / '.claim-pool.sock'))
+FLUSH_INTERVAL = 5.0
+
+_repository = None
 
-def load_tasks():
-    with open(TASKS_PATH, 'r', encoding='utf-8') as f:
-        return json.load(f)
+def get_repository():
+    """Task board in the configured engine (TASKS_BACKEND=json|sqlite)."""
+    global _repository
+    if _repository is None:
+        _repository = open_repository(json_path=TASKS_PATH)
+    return _repository
 
-def save_tasks(data):
-    data['version'] = data.get('version', 0) + 1
-    data['updated_at'] = datetime.now(timezone.utc).isoformat()
-    data['updated_by'] = 'task-claim-pool'
-    with open(TASKS_PATH, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+@contextmanager
+def edit_tasks():
+    """Board transaction; only the tasks and keys touched are written back.
+
+    Edits are serialized across processes, so parallel agents never overwrite
+    each other's claims. The edit is committed before the tasks.json export is
+    refreshed, so an export conflict is reported without failing the edit.
+    """
+    repo = get_repository()
+    with repo.edit(updated_by='task-claim-pool') as txn:
+        yield txn
+    try:
+        repo.sync_export()
+    except ExportConflict as e:
+        print(f"tasks.json export not refreshed: {e}", file=sys.stderr)
 
 def log_event(event):
     event['timestamp'] = datetime.now(timezone.utc).isoformat()
+    log_events([event])
+
+def log_events(events):
     with open(PARALLEL_LOG, 'a', encoding='utf-8') as f:
-        f.write(json.dumps(event) + '\n')
+        f.write(''.join(json.dumps(event) + '\n' for event in events))
 
-def get_urgency_score(due_date):
+def parse_due_date(due_date):
+    """Aware datetime for a task's due_date, or None if missing/unparseable."""
     if not due_date:
-        return 0
+        return None
     try:
         due = datetime.fromisoformat(due_date.replace('Z', '+00:00'))
-        now = datetime.now(timezone.utc)
-        days_until = (due - now).days
-        
-        if days_until < 0: return 40   # Past due
-        if days_until < 1: return 30   # Within 24h
-        if days_until < 3: return 20   # Within 3 days
-        if days_until < 7: return 10   # Within 7 days
-        return 0
-    except:
+    except (ValueError, TypeError, AttributeError):
+        return None
+    return due if due.tzinfo is not None else None
+
+def get_urgency_score(due_date, now=None):
+    due = parse_due_date(due_date)
+    if due is None:
         return 0
+    now = now or datetime.now(timezone.utc)
+    days_until = (due - now).days
+
+    if days_until < 0: return 40   # Past due
+    if days_until < 1: return 30   # Within 24h
+    if days_until < 3: return 20   # Within 3 days
+    if days_until < 7: return 10   # Within 7 days
+    return 0
+
+URGENCY_WINDOWS = (timedelta(days=7), timedelta(days=3), timedelta(days=1), timedelta(0))
+
+def next_urgency_boundary(due_date, now):
+    """Latest instant at which the urgency score is still what it is at `now`.
+
+    Urgency only changes just after due-7d, due-3d, due-1d and the due date
+    itself, so a score computed at `now` stays valid until the first of those
+    not yet passed. None when the score can no longer change.
+    """
+    due = parse_due_date(due_date)
+    if due is None:
+        return None
+    upcoming = [due - window for window in URGENCY_WINDOWS if due - window >= now]
+    return min(upcoming) if upcoming else None
 
 def get_impact_score(impact):
     scores = {'critical': 40, 'high': 30, 'medium': 20, 'low': 10, 'none': 0}
@@ -71,106 +130,314 @@ def get_priority_level(score):
     if score >= 20: return 'P3'
     return 'P4'
 
-def calculate_priorities():
-    """Calculate priority scores for all tasks"""
-    data = load_tasks()
-    updated = 0
-    
-    for task_id, task in data.get('tasks', {}).items():
-        status = task.get('status', 'pending')
-        if status not in ['pending', 'in_progress', None]:
-            continue
-        
-        # Get scores
-        urgency = get_urgency_score(task.get('due_date'))
-        impact_level = task.get('priority', {}).get('impact', 'medium')
-        impact_score = get_impact_score(impact_level)
-        dependency_boost = get_dependency_boost(task.get('blocks'))
-        
-        total_score = urgency + impact_score + dependency_boost
-        priority_level = get_priority_level(total_score)
-        
-        # Update task
-        if 'priority' not in task:
-            task['priority'] = {}
-        task['priority'].update({
-            'urgency': urgency,
-            'impact': impact_level,
-            'impact_score': impact_score,
-            'dependency_boost': dependency_boost,
-            'total_score': total_score,
-            'priority_level': priority_level,
-            'calculated_at': datetime.now(timezone.utc).isoformat()
-        })
-        updated += 1
-    
-    save_tasks(data)
-    print(f"Updated priorities for {updated} tasks")
+def priority_info(task):
+    """(total_score, priority_level) for a task; legacy string priorities score 0."""
+    priority = task.get('priority')
+    if not isinstance(priority, dict):
+        return 0, 'P4'
+    return priority.get('total_score', 0) or 0, priority.get('priority_level', 'P4')
 
-def get_available_tasks(specialty):
-    """Get available tasks for a specialty"""
-    data = load_tasks()
+def parse_timestamp(value):
+    """ISO timestamp -> epoch seconds, or None if missing/unparseable."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+class TimerWheel:
+    """Hashed timer wheel for claim expiry.
+
+    Deadlines are bucketed into tick-sized slots; advance(now) only visits the
+    slots between the last tick and now instead of scanning every claim.
+    Deadlines further out than one rotation stay in their slot until due.
+    """
+
+    def __init__(self, tick=60.0, slots=64, now=None):
+        self.tick = tick
+        self._slots = [{} for _ in range(slots)]
+        self._where = {}  # key -> slot index
+        self._current = int((time.time() if now is None else now) // tick)
+
+    def __len__(self):
+        return len(self._where)
+
+    def schedule(self, key, deadline):
+        self.cancel(key)
+        slot = max(int(deadline // self.tick), self._current) % len(self._slots)
+        self._slots[slot][key] = deadline
+        self._where[key] = slot
+
+    def cancel(self, key):
+        slot = self._where.pop(key, None)
+        if slot is not None:
+            del self._slots[slot][key]
+
+    def advance(self, now):
+        """Remove and return the keys whose deadline is <= now."""
+        target = int(now // self.tick)
+        due = []
+        steps = min(max(target - self._current, 0), len(self._slots) - 1)
+        for t in range(self._current, self._current + steps + 1):
+            slot = self._slots[t % len(self._slots)]
+            for key, deadline in list(slot.items()):
+                if deadline <= now:
+                    del slot[key]
+                    del self._where[key]
+                    due.append(key)
+        self._current = max(self._current, target)
+        return due
+
+class ClaimIndex:
+    """Claimable bot_queue tasks, kept in one priority heap per required specialty.
+
+    Heap entries are (-score, queue position, task_id) and are dropped lazily
+    when a task is claimed or removed. Live claims sit in a TimerWheel keyed by
+    heartbeat expiry and return to their heap when it fires, so "next claimable
+    task for specialty X" is a heap peek instead of a scan with timestamp parses.
+    Claims that lapse stay named on the board, so a late heartbeat from their
+    agent holds them again, as the board write for that heartbeat will.
+    """
+
+    def __init__(self, timeout_minutes=CLAIM_TIMEOUT_MINUTES, now=None):
+        self.timeout = timeout_minutes * 60
+        self._heaps = {}    # required specialty -> heap
+        self._tasks = {}    # task_id -> (specialty, score, position)
+        self._queued = set()
+        self._claims = {}   # task_id -> agent_id
+        self._agents = {}   # agent_id -> set of task_ids
+        self._lapsed = {}   # task_id -> agent_id still named by a claim that expired
+        self._wheel = TimerWheel(now=now)
+        self._position = 0
+
+    @classmethod
+    def build(cls, queue, timeout_minutes=CLAIM_TIMEOUT_MINUTES, now=None):
+        """Index (task_id, task) pairs in bot_queue order."""
+        now = time.time() if now is None else now
+        index = cls(timeout_minutes, now=now)
+        for task_id, task in queue:
+            index.add(task_id, task, now)
+        return index
+
+    def add(self, task_id, task, now=None):
+        now = time.time() if now is None else now
+        self.remove(task_id)
+        score, _ = priority_info(task)
+        self._tasks[task_id] = (task.get('required_agent', 'general'), score, self._position)
+        self._position += 1
+        claimed = task.get('claimed_by') or {}
+        heartbeat = parse_timestamp(claimed.get('last_heartbeat'))
+        # A claim without a readable heartbeat has never counted as held.
+        if claimed.get('agent_id') and heartbeat is not None and heartbeat + self.timeout > now:
+            self._hold(task_id, claimed['agent_id'], heartbeat + self.timeout)
+        else:
+            self._push(task_id)
+            if claimed.get('agent_id'):
+                self._lapsed[task_id] = claimed['agent_id']
+
+    def remove(self, task_id):
+        if task_id not in self._tasks:
+            return
+        self._drop_claim(task_id)
+        self._lapsed.pop(task_id, None)
+        self._queued.discard(task_id)
+        del self._tasks[task_id]
+
+    def _push(self, task_id):
+        specialty, score, position = self._tasks[task_id]
+        self._queued.add(task_id)
+        heapq.heappush(self._heaps.setdefault(specialty, []), (-score, position, task_id))
+
+    def _hold(self, task_id, agent_id, deadline):
+        self._lapsed.pop(task_id, None)
+        self._queued.discard(task_id)
+        self._claims[task_id] = agent_id
+        self._agents.setdefault(agent_id, set()).add(task_id)
+        self._wheel.schedule(task_id, deadline)
+
+    def _drop_claim(self, task_id):
+        agent_id = self._claims.pop(task_id, None)
+        if agent_id is not None:
+            self._agents[agent_id].discard(task_id)
+            if not self._agents[agent_id]:
+                del self._agents[agent_id]
+            self._wheel.cancel(task_id)
+
+    def expire(self, now=None):
+        """Return claims whose heartbeat lapsed to the pool; returns their task ids."""
+        expired = self._wheel.advance(time.time() if now is None else now)
+        for task_id in expired:
+            self._lapsed[task_id] = self._claims.get(task_id)
+            self._drop_claim(task_id)
+            self._push(task_id)
+        return expired
+
+    def claim(self, task_id, agent_id, now=None):
+        if task_id not in self._tasks:
+            return  # not in bot_queue; nothing to index
+        now = time.time() if now is None else now
+        self._drop_claim(task_id)
+        self._hold(task_id, agent_id, now + self.timeout)
+
+    def release(self, task_id):
+        self._lapsed.pop(task_id, None)
+        if task_id in self._claims:
+            self._drop_claim(task_id)
+            self._push(task_id)
+
+    def heartbeat(self, agent_id, now=None):
+        """Extend every claim held by agent_id, and hold again its lapsed ones; returns the task ids touched."""
+        now = time.time() if now is None else now
+        task_ids = list(self._agents.get(agent_id, ()))
+        for task_id in task_ids:
+            self._wheel.schedule(task_id, now + self.timeout)
+        lapsed = [task_id for task_id, owner in self._lapsed.items() if owner == agent_id]
+        for task_id in lapsed:
+            self._hold(task_id, agent_id, now + self.timeout)
+        return task_ids + lapsed
+
+    def _candidate_heaps(self, specialty):
+        if specialty == 'general':
+            return list(self._heaps.values())
+        return [self._heaps[s] for s in (specialty, 'general') if s in self._heaps]
+
+    def _top(self, heap):
+        while heap:
+            _, position, task_id = heap[0]
+            entry = self._tasks.get(task_id)
+            if task_id in self._queued and entry is not None and entry[2] == position:
+                return heap[0]
+            heapq.heappop(heap)  # stale: claimed, removed or re-added since
+        return None
+
+    def next_claimable(self, specialty='general', now=None):
+        """Highest-priority claimable task for specialty (ties keep queue order)."""
+        self.expire(now)
+        tops = [top for top in map(self._top, self._candidate_heaps(specialty)) if top]
+        return min(tops)[2] if tops else None
+
+    def available(self, specialty='general', now=None):
+        """All claimable task ids for specialty, best first."""
+        self.expire(now)
+        entries = set()  # a task released and pushed back can sit in its heap twice
+        for heap in self._candidate_heaps(specialty):
+            entries.update(e for e in heap if e[2] in self._queued and self._tasks[e[2]][2] == e[1])
+        return [task_id for _, _, task_id in sorted(entries)]
+
+PRIORITY_FIELDS = ('urgency', 'impact', 'impact_score', 'dependency_boost', 'total_score',
+                   'priority_level', 'inputs', 'next_boundary')
+
+def build_dependents(tasks):
+    """task_id -> sorted ids of the tasks waiting on it.
+
+    Edges are read from both sides: a task's own `blocks` and every task listing
+    it in `blocked_by`. Editing either side changes the blocker's dependents,
+    so its boost is rescored in the same pass as the edited task.
+    """
+    dependents = {}
+    for task_id, task in tasks:
+        for other in task.get('blocks') or ():
+            dependents.setdefault(task_id, set()).add(other)
+        for blocker in task.get('blocked_by') or ():
+            dependents.setdefault(blocker, set()).add(task_id)
+    return {task_id: sorted(ids - {task_id}) for task_id, ids in dependents.items()}
+
+def priority_inputs(task, dependents):
+    """Fingerprint of everything a task's score depends on apart from the clock."""
+    priority = task.get('priority') if isinstance(task.get('priority'), dict) else {}
+    key = json.dumps([task.get('due_date'), priority.get('impact', 'medium'), dependents])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+def priority_is_current(priority, inputs, now):
+    """True if a stored score was computed from these inputs and no urgency boundary has passed."""
+    if not isinstance(priority, dict) or 'total_score' not in priority:
+        return False
+    if priority.get('inputs') != inputs:
+        return False
+    boundary = parse_timestamp(priority.get('next_boundary'))
+    return boundary is None or now.timestamp() <= boundary
+
+def score_task(task, dependents, now):
+    """Priority fields for a task, including the inputs fingerprint and next boundary."""
+    priority = task.get('priority') if isinstance(task.get('priority'), dict) else {}
+    urgency = get_urgency_score(task.get('due_date'), now)
+    impact_level = priority.get('impact', 'medium')
+    impact_score = get_impact_score(impact_level)
+    dependency_boost = get_dependency_boost(dependents)
+    total_score = urgency + impact_score + dependency_boost
+    boundary = next_urgency_boundary(task.get('due_date'), now)
+    return {
+        'urgency': urgency,
+        'impact': impact_level,
+        'impact_score': impact_score,
+        'dependency_boost': dependency_boost,
+        'total_score': total_score,
+        'priority_level': get_priority_level(total_score),
+        'inputs': priority_inputs(task, dependents),
+        'next_boundary': boundary.isoformat() if boundary else None,
+    }
+
+def calculate_priorities(now=None, quiet=False):
+    """Rescore tasks whose inputs changed or whose urgency boundary has passed.
+
+    A task is rescored only when its due_date, impact or dependents differ from
+    the fingerprint stored with its score, or when its next_boundary is behind
+    us. It is only written back when a field actually moved, so a run where
+    nothing changed leaves the board (and its version) untouched. Returns
+    {'scored', 'rescored', 'updated', 'next_boundary'}, where next_boundary is
+    the earliest upcoming urgency change across the board.
+    """
+    now = now or datetime.now(timezone.utc)
+    scored = rescored = updated = 0
+    next_boundary = None
+
+    with edit_tasks() as txn:
+        tasks = txn.find()
+        dependents = build_dependents(tasks)
+        for task_id, task in tasks:
+            if task.get('status') not in ('pending', 'in_progress', None):
+                continue
+            scored += 1
+            deps = dependents.get(task_id, [])
+            priority = task.get('priority')
+            if not priority_is_current(priority, priority_inputs(task, deps), now):
+                rescored += 1
+                fields = score_task(task, deps, now)
+                current = priority if isinstance(priority, dict) else {}
+                if any(current.get(key) != fields[key] for key in PRIORITY_FIELDS):
+                    task['priority'] = {**current, **fields, 'calculated_at': now.isoformat()}
+                    updated += 1
+            boundary = task['priority'].get('next_boundary')
+            if boundary and (next_boundary is None or parse_timestamp(boundary) < parse_timestamp(next_boundary)):
+                next_boundary = boundary
+
+    if not quiet:
+        print(f"Updated priorities for {updated} tasks ({rescored} of {scored} rescored)")
+        if next_boundary:
+            print(f"Next urgency change: {next_boundary}")
+    return {'scored': scored, 'rescored': rescored, 'updated': updated,
+            'next_boundary': next_boundary, 'version': txn.version}
+
+def describe_available(task_ids, tasks):
+    """Summaries printed by `available`, in the order given."""
     available = []
-    
-    for task_id in data.get('lanes', {}).get('bot_queue', []):
-        task = data.get('tasks', {}).get(task_id)
-        if not task:
-            continue
-        
-        # Check if claimed
-        claimed = task.get('claimed_by', {})
-        if claimed.get('agent_id'):
-            last_hb = claimed.get('last_heartbeat')
-            if last_hb:
-                try:
-                    hb_time = datetime.fromisoformat(last_hb.replace('Z', '+00:00'))
-                    mins_ago = (datetime.now(timezone.utc) - hb_time).total_seconds() / 60
-                    if mins_ago < 30:
-                        continue  # Still claimed
-                except:
-                    pass
-        
-        # Check specialty match
-        required_agent = task.get('required_agent', 'general')
-        if specialty != 'general' and required_agent != 'general' and required_agent != specialty:
-            continue
-        
-        priority = task.get('priority', {}).get('total_score', 0)
+    for task_id in task_ids:
+        task = tasks[task_id]
+        priority, level = priority_info(task)
         available.append({
             'task_id': task_id,
             'title': task.get('title', 'Unknown'),
-            'required_agent': required_agent,
+            'required_agent': task.get('required_agent', 'general'),
             'priority_score': priority,
-            'priority_level': task.get('priority', {}).get('priority_level', 'P4')
+            'priority_level': level
         })
-    
-    # Sort by priority descending
-    available.sort(key=lambda x: x['priority_score'], reverse=True)
     return available
 
-def claim_task(task_id, agent_id, agent_name, specialty):
-    """Claim a task"""
-    data = load_tasks()
-    
-    if task_id not in data.get('tasks', {}):
-        raise ValueError(f"Task {task_id} not found")
-    
-    task = data['tasks'][task_id]
+def record_claim(txn, task_id, task, agent_id, agent_name, specialty):
+    """Mark task as claimed by agent_id and register the agent as active."""
     now = datetime.now(timezone.utc).isoformat()
-    
-    # Check if claimed
-    claimed = task.get('claimed_by', {})
-    if claimed.get('agent_id'):
-        last_hb = claimed.get('last_heartbeat')
-        if last_hb:
-            try:
-                hb_time = datetime.fromisoformat(last_hb.replace('Z', '+00:00'))
-                mins_ago = (datetime.now(timezone.utc) - hb_time).total_seconds() / 60
-                if mins_ago < 30:
-                    raise ValueError(f"Task {task_id} already claimed by {claimed.get('agent_name')}")
-            except ValueError:
-                raise
-    
+
     # Claim it
     task['claimed_by'] = {
         'agent_id': agent_id,
@@ -180,18 +447,17 @@ def claim_task(task_id, agent_id, agent_name, specialty):
         'last_heartbeat': now
     }
     task['status'] = 'in_progress'
-    
+
     # Update parallel execution
-    if 'parallel_execution' not in data:
-        data['parallel_execution'] = {
-            'enabled': True,
-            'max_concurrent': 5,
-            'active_agents': [],
-            'claim_timeout_minutes': 30
-        }
-    
+    parallel = txn.meta('parallel_execution', {
+        'enabled': True,
+        'max_concurrent': 5,
+        'active_agents': [],
+        'claim_timeout_minutes': 30
+    })
+
     # Add to active agents
-    agents = data['parallel_execution'].get('active_agents', [])
+    agents = parallel.get('active_agents', [])
     existing = [a for a in agents if a.get('agent_id') == agent_id]
     if not existing:
         agents.append({
@@ -205,100 +471,405 @@ def claim_task(task_id, agent_id, agent_name, specialty):
     else:
         existing[0]['current_task'] = task_id
         existing[0]['last_heartbeat'] = now
-    data['parallel_execution']['active_agents'] = agents
-    
-    save_tasks(data)
-    log_event({
-        'event': 'claim',
-        'task_id': task_id,
-        'agent_id': agent_id,
-        'agent_name': agent_name,
-        'specialty': specialty
-    })
-    
+    parallel['active_agents'] = agents
+
+def apply_heartbeats(txn, beats):
+    """Write {agent_id: iso timestamp} heartbeats to claimed tasks and active agents."""
+    for agent_id, now in beats.items():
+        # Update tasks
+        for task_id, task in txn.find(claimed_by=agent_id):
+            task['claimed_by']['last_heartbeat'] = now
+
+    # Update active agents
+    parallel = txn.meta('parallel_execution')
+    if parallel is not None:
+        for agent in parallel.get('active_agents', []):
+            if agent.get('agent_id') in beats:
+                agent['last_heartbeat'] = beats[agent['agent_id']]
+
+class ClaimPool:
+    """Claim, release and heartbeat operations over the task board.
+
+    Each CLI run uses a fresh pool. The daemon (`serve`) keeps one alive: its
+    ClaimIndex is only rebuilt when the board's version moves under it, and with
+    batch_heartbeats heartbeats and event-log lines are held in memory and written
+    by flush() on a cadence instead of one board write per heartbeat.
+    """
+
+    def __init__(self, batch_heartbeats=False):
+        self.batch_heartbeats = batch_heartbeats
+        self.index = None
+        self.tasks = {}
+        self.version = None
+        self.pending_heartbeats = {}  # agent_id -> (epoch seconds, iso timestamp)
+        self.pending_events = []
+        self.flushes = 0
+        self.scored_version = None
+        self.next_boundary = None
+        self._lock = threading.RLock()
+
+    def _log(self, event):
+        if not self.batch_heartbeats:
+            log_event(event)
+            return
+        event['timestamp'] = datetime.now(timezone.utc).isoformat()
+        self.pending_events.append(event)
+
+    def _refresh(self, txn=None):
+        """Rebuild the index if the board changed since this pool last saw it."""
+        version = txn.version if txn is not None else get_repository().version()
+        if self.index is not None and version == self.version:
+            return
+        if txn is not None:
+            queue = txn.find(lane='bot_queue')
+        else:
+            queue = get_repository().find_tasks(lane='bot_queue')
+        self.index = ClaimIndex.build(queue)
+        self.tasks = dict(queue)
+        for agent_id, (beat, _) in self.pending_heartbeats.items():
+            self.index.heartbeat(agent_id, now=beat)
+        self.version = version
+
+    def available(self, specialty='general'):
+        with self._lock:
+            self._refresh()
+            return describe_available(self.index.available(specialty), self.tasks)
+
+    def claim(self, task_id, agent_id, agent_name, specialty='general'):
+        with self._lock:
+            with edit_tasks() as txn:
+                self._refresh(txn)
+                task = txn.task(task_id)
+                if task is None:
+                    raise ValueError(f"Task {task_id} not found")
+
+                # Check if claimed
+                claimed = task.get('claimed_by') or {}
+                if claimed.get('agent_id'):
+                    last_hb = claimed.get('last_heartbeat')
+                    if last_hb:
+                        try:
+                            hb_time = datetime.fromisoformat(last_hb.replace('Z', '+00:00'))
+                            mins_ago = (datetime.now(timezone.utc) - hb_time).total_seconds() / 60
+                            if mins_ago < 30:
+                                raise ValueError(f"Task {task_id} already claimed by {claimed.get('agent_name')}")
+                        except ValueError:
+                            raise
+
+                record_claim(txn, task_id, task, agent_id, agent_name, specialty)
+            self.index.claim(task_id, agent_id)
+            self.version = txn.version
+            self._log({
+                'event': 'claim',
+                'task_id': task_id,
+                'agent_id': agent_id,
+                'agent_name': agent_name,
+                'specialty': specialty
+            })
+        return task_id
+
+    def claim_next(self, agent_id, agent_name, specialty='general'):
+        """Pick and claim the best claimable task in one transaction.
+
+        Choosing and claiming under the same board lock means two agents can never
+        both pick the same task between `available` and `claim`. Returns the task
+        id, or None if nothing is claimable.
+        """
+        with self._lock:
+            with edit_tasks() as txn:
+                self._refresh(txn)
+                task_id = self.index.next_claimable(specialty)
+                if task_id is None:
+                    return None
+                record_claim(txn, task_id, txn.task(task_id), agent_id, agent_name, specialty)
+            self.index.claim(task_id, agent_id)
+            self.version = txn.version
+            self._log({
+                'event': 'claim',
+                'task_id': task_id,
+                'agent_id': agent_id,
+                'agent_name': agent_name,
+                'specialty': specialty,
+                'mode': 'claim-next'
+            })
+        return task_id
+
+    def release(self, task_id, agent_id, reason=''):
+        with self._lock:
+            with edit_tasks() as txn:
+                self._refresh(txn)
+                task = txn.task(task_id)
+                if task is None:
+                    raise ValueError(f"Task {task_id} not found")
+
+                claimed = task.get('claimed_by') or {}
+
+                if claimed.get('agent_id') != agent_id:
+                    raise ValueError(f"Task {task_id} not owned by agent {agent_id}")
+
+                agent_name = claimed.get('agent_name', 'Unknown')
+
+                # Release
+                task['claimed_by'] = None
+                task['status'] = 'pending'
+
+                if reason:
+                    notes = task.get('notes', '')
+                    task['notes'] = f"{notes}\n[Released by {agent_name}]: {reason}".strip()
+
+                # Remove from active agents
+                parallel = txn.meta('parallel_execution')
+                if parallel is not None:
+                    agents = parallel.get('active_agents', [])
+                    parallel['active_agents'] = [
+                        a for a in agents if a.get('agent_id') != agent_id
+                    ]
+            self.index.release(task_id)
+            self.version = txn.version
+            self._log({
+                'event': 'release',
+                'task_id': task_id,
+                'agent_id': agent_id,
+                'reason': reason
+            })
+        return task_id
+
+    def heartbeat(self, agent_id):
+        now = time.time()
+        stamp = datetime.fromtimestamp(now, timezone.utc).isoformat()
+        with self._lock:
+            if not self.batch_heartbeats:
+                with edit_tasks() as txn:
+                    apply_heartbeats(txn, {agent_id: stamp})
+                return agent_id
+            self.pending_heartbeats[agent_id] = (now, stamp)
+            if self.index is not None:
+                self.index.heartbeat(agent_id, now=now)
+        return agent_id
+
+    def flush(self):
+        """Persist batched heartbeats in one board write and append buffered events."""
+        with self._lock:
+            beats, events = self.pending_heartbeats, self.pending_events
+            if not beats and not events:
+                return False
+            self.pending_heartbeats, self.pending_events = {}, []
+            try:
+                if beats:
+                    with edit_tasks() as txn:
+                        current = txn.version == self.version
+                        apply_heartbeats(txn, {agent_id: stamp for agent_id, (_, stamp) in beats.items()})
+                    if current:
+                        # The index already holds these heartbeats; don't rebuild for our own write.
+                        self.version = txn.version
+                if events:
+                    log_events(events)
+            except Exception:
+                for agent_id, beat in beats.items():
+                    self.pending_heartbeats.setdefault(agent_id, beat)
+                self.pending_events[:0] = events
+                raise
+            self.flushes += 1
+            return True
+
+    def reprioritize(self, now=None):
+        """Rescore priorities if the board changed since the last scoring or an urgency boundary passed."""
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            boundary = parse_timestamp(self.next_boundary)
+            due = boundary is not None and now.timestamp() > boundary
+            if not due and self.scored_version is not None and self.scored_version == get_repository().version():
+                return None
+            result = calculate_priorities(now=now, quiet=True)
+            self.scored_version, self.next_boundary = result['version'], result['next_boundary']
+            return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'version': self.version,
+                'next_boundary': self.next_boundary,
+                'indexed_tasks': len(self.tasks),
+                'pending_heartbeats': len(self.pending_heartbeats),
+                'pending_events': len(self.pending_events),
+                'flushes': self.flushes,
+            }
+
+def get_available_tasks(specialty, pool=None):
+    """Get available tasks for a specialty"""
+    return (pool or ClaimPool()).available(specialty)
+
+def claim_task(task_id, agent_id, agent_name, specialty, pool=None):
+    """Claim a task"""
+    (pool or ClaimPool()).claim(task_id, agent_id, agent_name, specialty)
     print(f"Task {task_id} claimed by {agent_name} ({specialty})")
 
-def release_task(task_id, agent_id, reason=''):
+def claim_next_task(agent_id, agent_name, specialty, pool=None):
+    """Claim the best claimable task; returns its id or None."""
+    task_id = (pool or ClaimPool()).claim_next(agent_id, agent_name, specialty)
+    if task_id is not None:
+        print(f"Task {task_id} claimed by {agent_name} ({specialty})")
+    return task_id
+
+def release_task(task_id, agent_id, reason='', pool=None):
     """Release a task back to pool"""
-    data = load_tasks()
-    
-    if task_id not in data.get('tasks', {}):
-        raise ValueError(f"Task {task_id} not found")
-    
-    task = data['tasks'][task_id]
-    claimed = task.get('claimed_by', {})
-    
-    if claimed.get('agent_id') != agent_id:
-        raise ValueError(f"Task {task_id} not owned by agent {agent_id}")
-    
-    agent_name = claimed.get('agent_name', 'Unknown')
-    
-    # Release
-    task['claimed_by'] = None
-    task['status'] = 'pending'
-    
-    if reason:
-        notes = task.get('notes', '')
-        task['notes'] = f"{notes}\n[Released by {agent_name}]: {reason}".strip()
-    
-    # Remove from active agents
-    if 'parallel_execution' in data:
-        agents = data['parallel_execution'].get('active_agents', [])
-        data['parallel_execution']['active_agents'] = [
-            a for a in agents if a.get('agent_id') != agent_id
-        ]
-    
-    save_tasks(data)
-    log_event({
-        'event': 'release',
-        'task_id': task_id,
-        'agent_id': agent_id,
-        'reason': reason
-    })
-    
+    (pool or ClaimPool()).release(task_id, agent_id, reason)
     print(f"Task {task_id} released back to pool")
 
-def send_heartbeat(agent_id):
+def send_heartbeat(agent_id, pool=None):
     """Send heartbeat to keep claim alive"""
-    data = load_tasks()
-    now = datetime.now(timezone.utc).isoformat()
-    
-    # Update tasks
-    for task_id, task in data.get('tasks', {}).items():
-        claimed = task.get('claimed_by', {})
-        if claimed.get('agent_id') == agent_id:
-            claimed['last_heartbeat'] = now
-    
-    # Update active agents
-    if 'parallel_execution' in data:
-        for agent in data['parallel_execution'].get('active_agents', []):
-            if agent.get('agent_id') == agent_id:
-                agent['last_heartbeat'] = now
-    
-    save_tasks(data)
+    (pool or ClaimPool()).heartbeat(agent_id)
     print(f"Heartbeat sent for agent {agent_id}")
 
+# ============ DAEMON ============
+
+class ClaimPoolClient:
+    """Thin client for a running `serve` daemon; same methods as ClaimPool."""
+
+    def __init__(self, sock):
+        self._sock = sock
+        self._file = sock.makefile('rwb')
+
+    def call(self, op, **params):
+        self._file.write(json.dumps({'op': op, 'params': params}).encode('utf-8') + b'\n')
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("claim pool daemon closed the connection")
+        reply = json.loads(line)
+        if not reply.get('ok'):
+            raise ValueError(reply.get('error', 'claim pool daemon error'))
+        return reply.get('result')
+
+    def available(self, specialty='general'):
+        return self.call('available', specialty=specialty)
+
+    def claim(self, task_id, agent_id, agent_name, specialty='general'):
+        return self.call('claim', task_id=task_id, agent_id=agent_id, agent_name=agent_name, specialty=specialty)
+
+    def claim_next(self, agent_id, agent_name, specialty='general'):
+        return self.call('claim_next', agent_id=agent_id, agent_name=agent_name, specialty=specialty)
+
+    def release(self, task_id, agent_id, reason=''):
+        return self.call('release', task_id=task_id, agent_id=agent_id, reason=reason)
+
+    def heartbeat(self, agent_id):
+        return self.call('heartbeat', agent_id=agent_id)
+
+    def stats(self):
+        return self.call('stats')
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+DAEMON_OPS = ('available', 'claim', 'claim_next', 'release', 'heartbeat', 'flush', 'stats')
+
+def connect_daemon(socket_path=None, timeout=5.0):
+    """ClaimPoolClient for a running daemon, or None if there isn't one."""
+    socket_path = Path(socket_path or SOCKET_PATH)
+    if not hasattr(socket, 'AF_UNIX') or not socket_path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None
+    return ClaimPoolClient(sock)
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    """One JSON request per line: {"op": ..., "params": {...}} -> {"ok": ..., "result"|"error": ...}."""
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                op = request.get('op')
+                if op not in DAEMON_OPS:
+                    raise ValueError(f"Unknown op: {op}")
+                reply = {'ok': True, 'result': getattr(self.server.pool, op)(**request.get('params', {}))}
+            except Exception as e:
+                reply = {'ok': False, 'error': str(e)}
+            self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+class ClaimPoolServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path, pool):
+        self.pool = pool
+        super().__init__(str(socket_path), _DaemonHandler)
+
+def serve(socket_path=None, flush_interval=FLUSH_INTERVAL):
+    """Run the claim pool daemon until SIGINT/SIGTERM.
+
+    Every flush_interval seconds batched heartbeats are flushed and priorities
+    are rescored if the board changed or the next urgency boundary has passed.
+    """
+    socket_path = Path(socket_path or SOCKET_PATH)
+    existing = connect_daemon(socket_path)
+    if existing is not None:
+        existing.close()
+        raise SystemExit(f"A claim pool daemon is already listening on {socket_path}")
+    if socket_path.exists():
+        socket_path.unlink()  # stale socket from a daemon that died
+
+    pool = ClaimPool(batch_heartbeats=True)
+    server = ClaimPoolServer(socket_path, pool)
+    stop = threading.Event()
+
+    def flush_loop():
+        while not stop.wait(flush_interval):
+            try:
+                pool.flush()
+                pool.reprioritize()
+            except Exception as e:
+                print(f"Claim pool flush failed (will retry): {e}", file=sys.stderr)
+
+    def shutdown(signum, frame):
+        stop.set()
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    flusher = threading.Thread(target=flush_loop, name='claim-pool-flush', daemon=True)
+    flusher.start()
+    print(f"Claim pool daemon listening on {socket_path} (flush every {flush_interval}s)")
+    try:
+        server.serve_forever()
+    finally:
+        stop.set()
+        server.server_close()
+        try:
+            socket_path.unlink()
+        except FileNotFoundError:
+            pass
+        pool.flush()
+        print(f"Claim pool daemon stopped: {pool.stats()}")
+
 def show_status():
     """Show current status"""
-    data = load_tasks()
-    
+    data = get_repository().load_board()
+
     print("\n=== Task Claim Pool Status ===")
-    
+
     # Active agents
     pe = data.get('parallel_execution', {})
     agents = pe.get('active_agents', [])
     max_concurrent = pe.get('max_concurrent', 5)
-    
+
     print(f"\nActive Agents: {len(agents)} / {max_concurrent}")
-    
+
     for agent in agents:
         task = data.get('tasks', {}).get(agent.get('current_task', ''), {})
         task_title = task.get('title', 'Unknown')[:40]
         print(f"  - {agent.get('agent_name')} [{agent.get('specialty')}]: {agent.get('current_task')} - {task_title}")
-    
+
     if not agents:
         print("  (no active agents)")
-    
+
     # Queue by specialty
     print("\nQueue by Specialty:")
     by_specialty = {}
@@ -308,13 +879,13 @@ def show_status():
             continue
         spec = task.get('required_agent', 'general')
         by_specialty[spec] = by_specialty.get(spec, 0) + 1
-    
+
     for spec in sorted(by_specialty.keys()):
         print(f"  - {spec}: {by_specialty[spec]} tasks")
-    
+
     if not by_specialty:
         print("  (queue empty)")
-    
+
     # Priority distribution
     print("\nPriority Distribution:")
     by_priority = {'P0': 0, 'P1': 0, 'P2': 0, 'P3': 0, 'P4': 0}
@@ -322,28 +893,40 @@ def show_status():
         task = data.get('tasks', {}).get(task_id)
         if not task:
             continue
-        level = task.get('priority', {}).get('priority_level', 'P4')
+        level = priority_info(task)[1]
         by_priority[level] = by_priority.get(level, 0) + 1
-    
+
     for p in ['P0', 'P1', 'P2', 'P3', 'P4']:
         print(f"  - {p}: {by_priority[p]} tasks")
 
 def main():
     parser = argparse.ArgumentParser(description='Task Claim Pool System')
-    parser.add_argument('action', choices=['status', 'available', 'calculate-priorities', 'claim', 'release', 'heartbeat'])
+    parser.add_argument('action', choices=['status', 'available', 'calculate-priorities', 'claim', 'claim-next', 'release', 'heartbeat', 'serve'])
     parser.add_argument('--task-id', help='Task ID')
     parser.add_argument('--agent-id', help='Agent ID')
     parser.add_argument('--agent-name', help='Agent name')
     parser.add_argument('--specialty', default='general', 
                         choices=['research', 'content', 'audit', 'analytics', 'code', 'general'])
     parser.add_argument('--reason', default='', help='Release reason')
-    
+    parser.add_argument('--socket', default=None, help=f'Daemon socket (default: {SOCKET_PATH})')
+    parser.add_argument('--flush-interval', type=float, default=FLUSH_INTERVAL, help='Daemon heartbeat flush cadence in seconds')
+    parser.add_argument('--no-daemon', action='store_true', help='Work on the board directly even if a daemon is running')
+
     args = parser.parse_args()
-    
+
+    if args.action == 'serve':
+        get_repository()
+        serve(args.socket, args.flush_interval)
+        return
+
+    pool = None
+    if args.action in ('available', 'claim', 'claim-next', 'release', 'heartbeat') and not args.no_daemon:
+        pool = connect_daemon(args.socket)
+
     if args.action == 'status':
         show_status()
     elif args.action == 'available':
-        available = get_available_tasks(args.specialty)
+        available = get_available_tasks(args.specialty, pool)
         print(f"\n=== Available Tasks for '{args.specialty}' ===")
         for t in available:
             print(f"[{t['priority_level']}] {t['task_id']}: {t['title']} (Score: {t['priority_score']}, Requires: {t['required_agent']})")
@@ -354,15 +937,21 @@ def main():
     elif args.action == 'claim':
         if not args.task_id or not args.agent_id or not args.agent_name:
             parser.error("claim requires --task-id, --agent-id, --agent-name")
-        claim_task(args.task_id, args.agent_id, args.agent_name, args.specialty)
+        claim_task(args.task_id, args.agent_id, args.agent_name, args.specialty, pool)
+    elif args.action == 'claim-next':
+        if not args.agent_id or not args.agent_name:
+            parser.error("claim-next requires --agent-id, --agent-name")
+        if claim_next_task(args.agent_id, args.agent_name, args.specialty, pool) is None:
+            print(f"No tasks available for specialty: {args.specialty}")
+            sys.exit(1)
     elif args.action == 'release':
         if not args.task_id or not args.agent_id:
             parser.error("release requires --task-id, --agent-id")
-        release_task(args.task_id, args.agent_id, args.reason)
+        release_task(args.task_id, args.agent_id, args.reason, pool)
     elif args.action == 'heartbeat':
         if not args.agent_id:
             parser.error("heartbeat requires --agent-id")
-        send_heartbeat(args.agent_id)
+        send_heartbeat(args.agent_id, pool)
 
 if __name__ == '__main__':
     main()
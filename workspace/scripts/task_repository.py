@@ -0,0 +1,849 @@
+#!/usr/bin/env python3
+"""
+Task board storage behind a small repository API.
+
+The board has always lived in memory/tasks.json, and every consumer loads and
+rewrites the whole file even to touch one field. This module puts the board
+behind a repository with two engines:
+
+- JsonTaskRepository  — the existing tasks.json file (default). Edits hold the
+  shared lock from atomic_json for the whole read-modify-write.
+- SqliteTaskRepository — memory/tasks.db. Tasks are rows with indexed status,
+  lane, claimed_by and priority columns, lanes are ordered entry rows, and the
+  remaining top-level keys (notes, parallel_execution, ...) are meta rows, so an
+  edit writes only the rows it changed. tasks.json is kept as an export for
+  readers that still open the file; call sync_export() to refresh it. If
+  something else rewrites the export, the next edit or sync imports it
+  (or raises ExportConflict when the database changed too).
+
+Select the engine with TASKS_BACKEND=json|sqlite (TASKS_DB_PATH overrides the
+database location). The first SQLite open imports tasks.json.
+
+All edits go through a transaction:
+
+    repo = open_repository()
+    with repo.edit(updated_by="task-claim-pool") as txn:
+        task = txn.task("T123")
+        task["status"] = "in_progress"
+
+Objects handed out by a transaction are tracked and saved on exit if they
+changed; txn.board() returns the whole board in the legacy tasks.json shape for
+callers that edit across tasks and lanes. Each commit bumps "version".
+Documents returned outside a transaction (load_board, get_task, find_tasks)
+are shared caches and must be treated as read-only.
+
+Usage:
+    python task_repository.py migrate [--db memory/tasks.db] [--json memory/tasks.json]
+    python task_repository.py export [--db ...] [--json ...]
+    python task_repository.py stats [--backend sqlite]
+    python task_repository.py bench [--tasks 10000] [--iterations 200]
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from atomic_json import file_lock, read_json, write_json_atomic
+
+WORKSPACE = Path(__file__).resolve().parent.parent
+TASKS_JSON_PATH = WORKSPACE / "memory" / "tasks.json"
+TASKS_DB_PATH = WORKSPACE / "memory" / "tasks.db"
+
+EMPTY_BOARD = {"version": 0, "lanes": {}, "tasks": {}}
+
+_BOARD_KEYS = ("tasks", "lanes")
+
+
+class ExportConflict(Exception):
+    """tasks.json was edited outside the repository while the database changed too."""
+
+    def __init__(self, path, exported, version):
+        super().__init__(f"{path} was edited since export (version {exported}) and the database "
+                         f"is now at version {version}; not overwriting")
+        self.path = path
+        self.exported = exported
+        self.version = version
+
+
+def index_columns(task):
+    """(status, claimed_by, priority) values the SQLite engine indexes for a task."""
+    claimed = task.get("claimed_by")
+    claimed_by = claimed.get("agent_id") if isinstance(claimed, dict) else None
+    priority = task.get("priority")
+    if isinstance(priority, dict):
+        priority = priority.get("total_score")
+    if isinstance(priority, bool) or not isinstance(priority, (int, float)):
+        priority = None
+    status = task.get("status")
+    return (status if isinstance(status, str) else None), claimed_by, priority
+
+
+def _matches(task, status, claimed_by):
+    task_status, task_claimed_by, _ = index_columns(task)
+    if status is not None:
+        wanted = status if isinstance(status, (list, tuple, set)) else (status,)
+        if task_status not in wanted:
+            return False
+    if claimed_by is not None and task_claimed_by != claimed_by:
+        return False
+    return True
+
+
+def _scan(board, lane, status, claimed_by):
+    """Filter a legacy-shaped board the way the SQLite engine's indexed queries do."""
+    tasks = board.get("tasks", {})
+    ids = board.get("lanes", {}).get(lane, []) if lane is not None else list(tasks)
+    return [(tid, tasks[tid]) for tid in ids
+            if tid in tasks and _matches(tasks[tid], status, claimed_by)]
+
+
+def _priority_key(item):
+    priority = index_columns(item[1])[2]
+    return (priority is None, -(priority or 0))
+
+
+def _stamp(board, updated_by):
+    board["version"] = (board.get("version") or 0) + 1
+    if updated_by:
+        board["updated_at"] = datetime.now(timezone.utc).isoformat()
+        board["updated_by"] = updated_by
+
+
+# ============== JSON ENGINE ==============
+
+class JsonTransaction:
+    """Edits against an in-memory copy of tasks.json."""
+
+    def __init__(self, board):
+        self._original = board
+        self._board = copy.deepcopy(board)
+        self._board.setdefault("tasks", {})
+        self._board.setdefault("lanes", {})
+        self.rolled_back = False
+
+    def task(self, task_id):
+        return self._board["tasks"].get(task_id)
+
+    def put_task(self, task_id, task):
+        self._board["tasks"][task_id] = task
+
+    def delete_task(self, task_id):
+        self._board["tasks"].pop(task_id, None)
+
+    def find(self, lane=None, status=None, claimed_by=None):
+        return _scan(self._board, lane, status, claimed_by)
+
+    def lane(self, name):
+        return self._board["lanes"].setdefault(name, [])
+
+    def meta(self, key, default=None):
+        """Top-level board value; like dict.setdefault, a missing key is stored as default."""
+        if key in _BOARD_KEYS:
+            raise KeyError(key)
+        if key not in self._board and default is not None:
+            self._board[key] = default
+        return self._board.get(key)
+
+    def set_meta(self, key, value):
+        if key in _BOARD_KEYS:
+            raise KeyError(key)
+        self._board[key] = value
+
+    def board(self):
+        return self._board
+
+    def rollback(self):
+        self.rolled_back = True
+
+    @property
+    def version(self):
+        """Board version; after the edit exits, the version it committed (if any)."""
+        return self._board.get("version")
+
+    @property
+    def changed(self):
+        return not self.rolled_back and self._board != self._original
+
+
+class JsonTaskRepository:
+    """Board stored as one JSON document (the legacy tasks.json layout)."""
+
+    backend = "json"
+
+    def __init__(self, path=TASKS_JSON_PATH, indent=2, ensure_ascii=True):
+        self.path = Path(path)
+        self.indent = indent
+        self.ensure_ascii = ensure_ascii
+        self._cache_lock = threading.Lock()
+        self._cache = (None, None)  # (stat stamp, board)
+
+    def _stat_stamp(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def load_board(self):
+        stamp = self._stat_stamp()
+        cached_stamp, board = self._cache
+        if board is not None and stamp == cached_stamp:
+            return board
+        with self._cache_lock:
+            board = read_json(self.path, EMPTY_BOARD) if stamp else copy.deepcopy(EMPTY_BOARD)
+            self._cache = (stamp, board)
+            return board
+
+    def version(self):
+        return self.load_board().get("version")
+
+    def get_task(self, task_id):
+        return self.load_board().get("tasks", {}).get(task_id)
+
+    def lane(self, name):
+        return list(self.load_board().get("lanes", {}).get(name, []))
+
+    def find_tasks(self, lane=None, status=None, claimed_by=None, order_by_priority=False, limit=None):
+        rows = _scan(self.load_board(), lane, status, claimed_by)
+        if order_by_priority:
+            rows.sort(key=_priority_key)
+        return rows[:limit] if limit is not None else rows
+
+    @contextmanager
+    def edit(self, updated_by=None):
+        with file_lock(self.path):
+            stamp = self._stat_stamp()
+            board = read_json(self.path, EMPTY_BOARD) if stamp else copy.deepcopy(EMPTY_BOARD)
+            txn = JsonTransaction(board)
+            yield txn
+            if txn.changed:
+                _stamp(txn._board, updated_by)
+                write_json_atomic(self.path, txn._board, indent=self.indent, ensure_ascii=self.ensure_ascii)
+
+    def export_json(self, path=None):
+        if path is None or Path(path) == self.path:
+            return
+        write_json_atomic(path, self.load_board(), indent=self.indent, ensure_ascii=self.ensure_ascii)
+
+    def sync_export(self):
+        """tasks.json is the store itself; nothing to refresh."""
+        return False
+
+    def close(self):
+        pass
+
+
+# ============== SQLITE ENGINE ==============
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS board_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    status TEXT,
+    lane TEXT,
+    claimed_by TEXT,
+    priority REAL,
+    data TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+CREATE INDEX IF NOT EXISTS idx_tasks_lane ON tasks(lane);
+CREATE INDEX IF NOT EXISTS idx_tasks_claimed_by ON tasks(claimed_by);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
+
+CREATE TABLE IF NOT EXISTS lanes (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS lane_entries (
+    lane TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    task_id TEXT NOT NULL,
+    PRIMARY KEY (lane, position)
+);
+
+CREATE INDEX IF NOT EXISTS idx_lane_entries_task ON lane_entries(task_id);
+"""
+
+# Internal meta rows that are not part of the exported board.
+_PRIVATE_META = ("exported_version", "exported_file")
+
+_LANE_OF_TASK = """
+UPDATE tasks SET lane = (
+    SELECT e.lane FROM lane_entries e JOIN lanes l ON l.name = e.lane
+    WHERE e.task_id = tasks.id ORDER BY l.position, e.position LIMIT 1
+) WHERE id = ?
+"""
+
+
+# Upserts keep the row's rowid, so exported key and task order stay stable.
+_UPSERT_META = "INSERT INTO board_meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+
+
+def _encode(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _file_identity(path):
+    """Stat stamp and content hash of path, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+    return {"stat": [st.st_mtime_ns, st.st_size, st.st_ino], "sha256": digest}
+
+
+class SqliteTransaction:
+    """Edits tracked per task, lane and meta key; only changed rows are written.
+
+    Every object handed out is compared against the value it was loaded with
+    when the transaction commits.
+    """
+
+    def __init__(self, repo, conn):
+        self._repo = repo
+        self._conn = conn
+        self._tasks = {}  # task_id -> [original or None, working or None]
+        self._lanes = {}  # lane -> [original list or None, working list or None]
+        self._meta = {}   # key -> [original or None, working]
+        self._board = None
+        self._all_lanes_loaded = False
+        self.rolled_back = False
+        # Board version; after the edit exits, the version it committed (if any).
+        self.version = repo._read_meta(conn, "version")
+
+    # --- tasks ---
+
+    def _track_task(self, task_id, raw):
+        if task_id not in self._tasks:
+            original = json.loads(raw) if raw is not None else None
+            working = json.loads(raw) if raw is not None else None
+            self._tasks[task_id] = [original, working]
+        return self._tasks[task_id][1]
+
+    def task(self, task_id):
+        if task_id in self._tasks:
+            return self._tasks[task_id][1]
+        row = self._conn.execute("SELECT data FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return self._track_task(task_id, row[0] if row else None)
+
+    def put_task(self, task_id, task):
+        self.task(task_id)
+        self._tasks[task_id][1] = task
+        if self._board is not None:
+            self._board["tasks"][task_id] = task
+
+    def delete_task(self, task_id):
+        self.task(task_id)
+        self._tasks[task_id][1] = None
+        if self._board is not None:
+            self._board["tasks"].pop(task_id, None)
+
+    def find(self, lane=None, status=None, claimed_by=None):
+        if self._board is not None:
+            return _scan(self._board, lane, status, claimed_by)
+        sql, params = self._repo._find_sql(lane, status, claimed_by)
+        return [(tid, self._track_task(tid, raw)) for tid, raw in self._conn.execute(sql, params)]
+
+    # --- lanes ---
+
+    def lane(self, name):
+        if name not in self._lanes:
+            ids = [r[0] for r in self._conn.execute(
+                "SELECT task_id FROM lane_entries WHERE lane = ? ORDER BY position", (name,))]
+            exists = ids or self._conn.execute("SELECT 1 FROM lanes WHERE name = ?", (name,)).fetchone()
+            self._lanes[name] = [ids if exists else None, list(ids)]
+        if self._lanes[name][1] is None:
+            self._lanes[name][1] = []
+        return self._lanes[name][1]
+
+    # --- meta ---
+
+    def meta(self, key, default=None):
+        """Top-level board value; like dict.setdefault, a missing key is stored as default."""
+        if key in _BOARD_KEYS or key in _PRIVATE_META:
+            raise KeyError(key)
+        if key not in self._meta:
+            row = self._conn.execute("SELECT value FROM board_meta WHERE key = ?", (key,)).fetchone()
+            original = json.loads(row[0]) if row else None
+            working = json.loads(row[0]) if row else default
+            self._meta[key] = [original, working]
+        return self._meta[key][1]
+
+    def set_meta(self, key, value):
+        self.meta(key)
+        self._meta[key][1] = value
+
+    # --- whole board ---
+
+    def board(self):
+        """Load everything into one legacy-shaped dict; edits to it are diffed on commit."""
+        if self._board is not None:
+            return self._board
+        for tid, raw in self._conn.execute("SELECT id, data FROM tasks"):
+            self._track_task(tid, raw)
+        for (name,) in self._conn.execute("SELECT name FROM lanes ORDER BY position"):
+            self.lane(name)
+        for key, _ in self._conn.execute("SELECT key, value FROM board_meta"):
+            if key not in _PRIVATE_META:
+                self.meta(key)
+        self._all_lanes_loaded = True
+        board = {key: working for key, (_, working) in self._meta.items() if working is not None}
+        board["lanes"] = {name: working for name, (_, working) in self._lanes.items() if working is not None}
+        board["tasks"] = {tid: working for tid, (_, working) in self._tasks.items() if working is not None}
+        self._board = board
+        return board
+
+    def _absorb_board(self):
+        # dict.fromkeys keeps the board's order, so new rows land in document order.
+        board = self._board
+        tasks, lanes = board.get("tasks", {}), board.get("lanes", {})
+        for tid in dict.fromkeys([*self._tasks, *tasks]):
+            self._tasks.setdefault(tid, [None, None])[1] = tasks.get(tid)
+        for name in dict.fromkeys([*self._lanes, *lanes]):
+            self._lanes.setdefault(name, [None, None])[1] = lanes.get(name)
+        meta_keys = [k for k in board if k not in _BOARD_KEYS and k not in _PRIVATE_META]
+        for key in dict.fromkeys([*self._meta, *meta_keys]):
+            self._meta.setdefault(key, [None, None])[1] = board.get(key)
+
+    def rollback(self):
+        self.rolled_back = True
+
+    # --- commit ---
+
+    def _commit(self, updated_by):
+        """Write changed rows. Returns True if anything was written."""
+        if self.rolled_back:
+            return False
+        if self._board is not None:
+            self._absorb_board()
+        conn = self._conn
+        changed = False
+        touched = set()
+
+        for tid, (original, working) in self._tasks.items():
+            if working == original:
+                continue
+            changed = True
+            if original is None:
+                touched.add(tid)  # new row: fill in its lane column below
+            if working is None:
+                conn.execute("DELETE FROM tasks WHERE id = ?", (tid,))
+            else:
+                status, claimed_by, priority = index_columns(working)
+                conn.execute(
+                    "INSERT INTO tasks (id, status, claimed_by, priority, data) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET status = excluded.status, "
+                    "claimed_by = excluded.claimed_by, priority = excluded.priority, data = excluded.data",
+                    (tid, status, claimed_by, priority, _encode(working)))
+
+        lane_order = None
+        for name, (original, working) in self._lanes.items():
+            if working == original:
+                continue
+            changed = True
+            touched.update(original or ())
+            touched.update(working or ())
+            conn.execute("DELETE FROM lane_entries WHERE lane = ?", (name,))
+            if working is None:
+                conn.execute("DELETE FROM lanes WHERE name = ?", (name,))
+                continue
+            if original is None:
+                lane_order = lane_order if lane_order is not None else self._repo._next_lane_position(conn)
+                conn.execute("INSERT OR IGNORE INTO lanes (name, position) VALUES (?, ?)", (name, lane_order))
+                lane_order += 1
+            conn.executemany(
+                "INSERT INTO lane_entries (lane, position, task_id) VALUES (?, ?, ?)",
+                [(name, pos, tid) for pos, tid in enumerate(working)])
+        if self._all_lanes_loaded and self._board is not None:
+            # Keep lane order as the board dict lists it.
+            for pos, name in enumerate(self._board.get("lanes", {})):
+                conn.execute("UPDATE lanes SET position = ? WHERE name = ?", (pos, name))
+
+        for key, (original, working) in self._meta.items():
+            if key == "version" or working == original:
+                continue
+            changed = True
+            if working is None:
+                conn.execute("DELETE FROM board_meta WHERE key = ?", (key,))
+            else:
+                conn.execute(_UPSERT_META,
+                             (key, _encode(working)))
+
+        if not changed:
+            return False
+        conn.executemany(_LANE_OF_TASK, [(tid,) for tid in touched])
+        stamp = {"version": self._repo._read_meta(conn, "version") or 0}
+        _stamp(stamp, updated_by)
+        conn.executemany(_UPSERT_META,
+                         [(k, _encode(v)) for k, v in stamp.items()])
+        if self._board is not None:
+            self._board.update(stamp)
+        self.version = stamp["version"]
+        return True
+
+
+class SqliteTaskRepository:
+    """Board stored in SQLite with one row per task; tasks.json becomes an export."""
+
+    backend = "sqlite"
+
+    def __init__(self, db_path=TASKS_DB_PATH, export_path=TASKS_JSON_PATH, indent=2, timeout=10.0):
+        self.db_path = Path(db_path)
+        self.export_path = Path(export_path) if export_path else None
+        self.indent = indent
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the process; the lock serializes its use across threads.
+        self._conn = sqlite3.connect(self.db_path, timeout=timeout, isolation_level=None,
+                                     check_same_thread=False)
+        self._lock = threading.RLock()
+        self._cache = (None, None)  # (version, board)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        if self.export_path and self.export_path.exists() and self._is_empty():
+            self.import_json(self.export_path)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # --- internals ---
+
+    def _is_empty(self):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM board_meta LIMIT 1").fetchone() is None
+
+    @staticmethod
+    def _read_meta(conn, key):
+        row = conn.execute("SELECT value FROM board_meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _next_lane_position(conn):
+        return conn.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM lanes").fetchone()[0]
+
+    @staticmethod
+    def _find_sql(lane, status, claimed_by):
+        where, params = [], []
+        if lane is not None:
+            sql = "SELECT t.id, t.data FROM lane_entries e JOIN tasks t ON t.id = e.task_id"
+            where.append("e.lane = ?")
+            params.append(lane)
+            order = " ORDER BY e.position"
+        else:
+            sql = "SELECT t.id, t.data FROM tasks t"
+            order = " ORDER BY t.rowid"
+        if status is not None:
+            wanted = list(status) if isinstance(status, (list, tuple, set)) else [status]
+            clauses = []
+            named = [s for s in wanted if s is not None]
+            if named:
+                clauses.append(f"t.status IN ({','.join('?' * len(named))})")
+                params.extend(named)
+            if None in wanted:
+                clauses.append("t.status IS NULL")
+            where.append("(" + " OR ".join(clauses) + ")")
+        if claimed_by is not None:
+            where.append("t.claimed_by = ?")
+            params.append(claimed_by)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return sql + order, params
+
+    # --- reads ---
+
+    def version(self):
+        with self._lock:
+            return self._read_meta(self._conn, "version")
+
+    def load_board(self):
+        """Whole board in the legacy shape, cached until the version moves."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                version = self._read_meta(self._conn, "version")
+                cached_version, board = self._cache
+                if board is not None and version == cached_version:
+                    return board
+                board = self._read_board(self._conn)
+            finally:
+                self._conn.execute("COMMIT")
+            self._cache = (version, board)
+            return board
+
+    def _read_board(self, conn):
+        board = {}
+        for key, value in conn.execute("SELECT key, value FROM board_meta ORDER BY rowid"):
+            if key not in _PRIVATE_META:
+                board[key] = json.loads(value)
+        lanes = {name: [] for (name,) in conn.execute("SELECT name FROM lanes ORDER BY position")}
+        for lane, tid in conn.execute("SELECT lane, task_id FROM lane_entries ORDER BY lane, position"):
+            lanes.setdefault(lane, []).append(tid)
+        board["lanes"] = lanes
+        board["tasks"] = {tid: json.loads(raw) for tid, raw in conn.execute("SELECT id, data FROM tasks ORDER BY rowid")}
+        return board
+
+    def get_task(self, task_id):
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def lane(self, name):
+        with self._lock:
+            return [r[0] for r in self._conn.execute(
+                "SELECT task_id FROM lane_entries WHERE lane = ? ORDER BY position", (name,))]
+
+    def find_tasks(self, lane=None, status=None, claimed_by=None, order_by_priority=False, limit=None):
+        sql, params = self._find_sql(lane, status, claimed_by)
+        if order_by_priority:
+            sql = sql.rsplit(" ORDER BY ", 1)[0] + " ORDER BY t.priority IS NULL, t.priority DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            return [(tid, json.loads(raw)) for tid, raw in self._conn.execute(sql, params)]
+
+    # --- writes ---
+
+    @contextmanager
+    def edit(self, updated_by=None):
+        # Pick up a hand-edited export first so this edit lands on top of it;
+        # if the database moved too, sync_export reports the conflict.
+        if self._export_edited() and self._export_current():
+            self._import_edited_export()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                txn = SqliteTransaction(self, self._conn)
+                yield txn
+                txn._commit(updated_by)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def import_json(self, path):
+        """Replace the database contents with a tasks.json document."""
+        board = read_json(path)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for table in ("tasks", "lanes", "lane_entries", "board_meta"):
+                    self._conn.execute(f"DELETE FROM {table}")
+                # Version goes in first so it leads the exported document, as in tasks.json.
+                version = board.get("version") or 0
+                self._conn.execute(_UPSERT_META, ("version", _encode(version)))
+                txn = SqliteTransaction(self, self._conn)
+                txn._board = {"lanes": {}, "tasks": {}}
+                txn._all_lanes_loaded = True
+                txn._board.update(board)
+                txn._commit(None)
+                # Keep the document's own version rather than the bumped one.
+                self._conn.executemany(
+                    _UPSERT_META,
+                    [("version", _encode(version)), ("exported_version", _encode(version))])
+                if self.export_path and Path(path) == self.export_path:
+                    self._conn.execute(_UPSERT_META, ("exported_file", _encode(_file_identity(path))))
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        self._cache = (None, None)
+
+    def export_json(self, path=None):
+        """Write the board to path (default: the export path) as tasks.json."""
+        path = Path(path) if path else self.export_path
+        with file_lock(path):
+            return self._write_export(path)
+
+    def _write_export(self, path):
+        board = self.load_board()
+        write_json_atomic(path, board, indent=self.indent, ensure_ascii=True)
+        if path == self.export_path:
+            with self._lock:
+                self._conn.executemany(_UPSERT_META, [
+                    ("exported_version", _encode(board.get("version"))),
+                    ("exported_file", _encode(_file_identity(path))),
+                ])
+        return board.get("version")
+
+    def _export_edited(self):
+        """Whether the export file differs from the one this repository last wrote or imported."""
+        if not self.export_path:
+            return False
+        with self._lock:
+            recorded = self._read_meta(self._conn, "exported_file")
+        if recorded is None:
+            return False  # exported before identities were recorded
+        try:
+            st = os.stat(self.export_path)
+        except FileNotFoundError:
+            return False  # nothing to lose; the next export recreates it
+        if [st.st_mtime_ns, st.st_size, st.st_ino] == recorded["stat"]:
+            return False
+        current = _file_identity(self.export_path)
+        return current is not None and current["sha256"] != recorded["sha256"]
+
+    def _export_versions(self):
+        with self._lock:
+            return (self._read_meta(self._conn, "version"),
+                    self._read_meta(self._conn, "exported_version"))
+
+    def _export_current(self):
+        """Whether the database has not changed since the last export or import."""
+        version, exported = self._export_versions()
+        return version == exported
+
+    def _import_edited_export(self):
+        before = self.version() or 0
+        self.import_json(self.export_path)
+        if (self.version() or 0) <= before:
+            # Hand edits rarely bump "version"; move past it so boards cached by
+            # version elsewhere are dropped. The next sync rewrites the export.
+            with self._lock:
+                self._conn.execute(_UPSERT_META, ("version", _encode(before + 1)))
+
+    def sync_export(self):
+        """Bring tasks.json and the database back in step. Returns True if either was written.
+
+        The export is rewritten when the database moved past it. An export
+        edited outside the repository is imported first when the database has
+        not moved; when both changed, ExportConflict is raised and the file is
+        left as it is.
+        """
+        if not self.export_path:
+            return False
+        with file_lock(self.export_path):
+            imported = False
+            if self._export_edited():
+                version, exported = self._export_versions()
+                if version != exported:
+                    raise ExportConflict(str(self.export_path), exported, version)
+                self._import_edited_export()
+                imported = True
+            version, exported = self._export_versions()
+            if version == exported:
+                return imported
+            self._write_export(self.export_path)
+        return True
+
+
+def open_repository(backend=None, json_path=TASKS_JSON_PATH, db_path=None):
+    """Open the task board with the configured engine (TASKS_BACKEND, default json)."""
+    backend = (backend or os.environ.get("TASKS_BACKEND", "json")).strip().lower()
+    if backend == "sqlite":
+        db_path = db_path or os.environ.get("TASKS_DB_PATH") or Path(json_path).with_name("tasks.db")
+        return SqliteTaskRepository(db_path, export_path=json_path)
+    if backend == "json":
+        return JsonTaskRepository(json_path)
+    raise ValueError(f"Unknown TASKS_BACKEND: {backend}")
+
+
+# ============== BENCHMARK ==============
+
+def _sample_board(task_count):
+    tasks = {}
+    for i in range(task_count):
+        tasks[f"T{i:05d}"] = {
+            "title": f"Sample task {i}",
+            "status": "pending",
+            "created_at": "2026-01-29T17:00:00+00:00",
+            "steps": [{"step": f"Step {n}", "status": "pending"} for n in range(5)],
+            "context": {"summary": "x" * 200},
+        }
+    ids = list(tasks)
+    return {"version": 1, "lanes": {"bot_current": [], "bot_queue": ids[:100], "done_today": ids[100:]},
+            "tasks": tasks}
+
+
+def bench(task_count=10000, iterations=200, directory=None):
+    """Median/p95 latency of a single-task edit and a full board read per engine."""
+    results = {}
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        json_path = Path(tmp) / "tasks.json"
+        write_json_atomic(json_path, _sample_board(task_count), indent=2)
+        engines = [
+            ("json", JsonTaskRepository(json_path)),
+            ("sqlite", SqliteTaskRepository(Path(tmp) / "tasks.db", export_path=json_path)),
+        ]
+        for name, repo in engines:
+            edits, reads = [], []
+            for n in range(iterations):
+                started = time.perf_counter()
+                with repo.edit(updated_by="bench") as txn:
+                    txn.task(f"T{n % task_count:05d}")["status"] = "in_progress"
+                edits.append((time.perf_counter() - started) * 1000)
+                started = time.perf_counter()
+                repo.find_tasks(lane="bot_queue", order_by_priority=True)
+                reads.append((time.perf_counter() - started) * 1000)
+            results[name] = {
+                "edit_p50_ms": round(statistics.median(edits), 3),
+                "edit_p95_ms": round(sorted(edits)[int(len(edits) * 0.95) - 1], 3),
+                "lane_query_p50_ms": round(statistics.median(reads), 3),
+            }
+            repo.close()
+    return {"tasks": task_count, "iterations": iterations, "results": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Task board repository")
+    sub = parser.add_subparsers(dest="command")
+    for name, help_text in (("migrate", "Import tasks.json into the SQLite database"),
+                            ("export", "Write the SQLite board out as tasks.json"),
+                            ("stats", "Show board version and counts")):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("--json", default=str(TASKS_JSON_PATH))
+        cmd.add_argument("--db", default=None)
+        cmd.add_argument("--backend", default=None)
+    bench_parser = sub.add_parser("bench", help="Compare single-task edit latency per engine")
+    bench_parser.add_argument("--tasks", type=int, default=10000)
+    bench_parser.add_argument("--iterations", type=int, default=200)
+    bench_parser.add_argument("--dir", default=None)
+    args = parser.parse_args()
+
+    if args.command == "bench":
+        print(json.dumps(bench(args.tasks, args.iterations, args.dir), indent=2))
+        return 0
+    if args.command in ("migrate", "export"):
+        repo = SqliteTaskRepository(args.db or Path(args.json).with_name("tasks.db"), export_path=args.json)
+        if args.command == "migrate":
+            repo.import_json(args.json)
+            print(f"Imported {args.json} -> {repo.db_path} (version {repo.version()})")
+        else:
+            print(f"Exported {repo.db_path} -> {args.json} (version {repo.export_json()})")
+        repo.close()
+        return 0
+    if args.command == "stats":
+        repo = open_repository(args.backend, json_path=args.json, db_path=args.db)
+        board = repo.load_board()
+        lanes = {name: len(ids) for name, ids in board.get("lanes", {}).items()}
+        print(json.dumps({"backend": repo.backend, "version": board.get("version"),
+                          "tasks": len(board.get("tasks", {})), "lanes": lanes}, indent=2))
+        repo.close()
+        return 0
+    parser.print_help()
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
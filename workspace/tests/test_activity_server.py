@@ -0,0 +1,658 @@
+"""
+test_activity_server.py — Tests for Mission Control activity server internals
+
+Run with: python -m pytest tests/test_activity_server.py -v
+"""
+
+import importlib.util
+import json
+import socket
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+MISSION_CONTROL_DIR = Path(__file__).resolve().parent.parent / "mission-control"
+
+
+# ============== FIXTURES ==============
+
+@pytest.fixture(scope="module")
+def server():
+    """Import activity-server.py (hyphenated, so not importable by name)."""
+    sys.path.insert(0, str(MISSION_CONTROL_DIR))
+    spec = importlib.util.spec_from_file_location(
+        "activity_server", MISSION_CONTROL_DIR / "activity-server.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def tasks_file(tmp_path):
+    """Create a tasks.json with an empty bot_current lane and two queued tasks."""
+    tasks = {
+        "version": 10,
+        "lanes": {"bot_current": [], "bot_queue": ["T001", "T002"], "human": [], "done_today": []},
+        "tasks": {
+            "T001": {"title": "First queued task", "status": "pending"},
+            "T002": {"title": "Second queued task", "status": "pending"},
+        },
+    }
+    path = tmp_path / "memory" / "tasks.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps(tasks, indent=2))
+    return path
+
+
+# ============== TASK STORE ==============
+
+class TestTaskStore:
+    """Shared tasks.json cache with write-through transactions."""
+
+    def test_read_is_cached_until_file_changes(self, server, tasks_file):
+        """Repeated reads reuse the parsed board."""
+        store = server.TaskStore(tasks_file)
+        first = store.read()
+        generation = store.generation
+        assert store.read() is first
+        assert store.generation == generation
+
+    def test_external_write_invalidates_cache(self, server, tasks_file):
+        """A write by another process (size/mtime change) is picked up."""
+        store = server.TaskStore(tasks_file)
+        store.read()
+        generation = store.generation
+        data = json.loads(tasks_file.read_text())
+        data["tasks"]["T003"] = {"title": "Added elsewhere"}
+        tasks_file.write_text(json.dumps(data))
+        assert "T003" in store.read()["tasks"]
+        assert store.generation == generation + 1
+
+    def test_uncommitted_transaction_does_not_write(self, server, tasks_file):
+        """Leaving a transaction without commit() discards the working copy."""
+        store = server.TaskStore(tasks_file)
+        before = tasks_file.read_text()
+        with store.transaction() as txn:
+            txn.data["lanes"]["bot_queue"].clear()
+        assert tasks_file.read_text() == before
+        assert store.read()["lanes"]["bot_queue"] == ["T001", "T002"]
+
+    def test_commit_writes_through_without_reparse(self, server, tasks_file):
+        """Committed changes land on disk and in the cache."""
+        store = server.TaskStore(tasks_file)
+        with store.transaction() as txn:
+            server.promote_next_queued_task(txn.data)
+            txn.commit()
+        cached = store.read()
+        on_disk = json.loads(tasks_file.read_text())
+        assert cached["lanes"]["bot_current"] == ["T001"]
+        assert on_disk["lanes"]["bot_current"] == ["T001"]
+        assert on_disk["tasks"]["T001"]["status"] == "in_progress"
+        assert not list(tasks_file.parent.glob("*.tmp"))
+
+    def test_failed_transaction_keeps_original(self, server, tasks_file):
+        """An exception inside the transaction leaves tasks.json untouched."""
+        store = server.TaskStore(tasks_file)
+        before = tasks_file.read_text()
+        with pytest.raises(server.TaskRequestError):
+            with store.transaction() as txn:
+                txn.data["lanes"]["bot_queue"].clear()
+                txn.commit()
+                raise server.TaskRequestError(400, "rejected")
+        assert tasks_file.read_text() == before
+
+
+class TestRepositoryTaskStore:
+    """TaskStore over the SQLite task repository."""
+
+    @pytest.fixture
+    def store(self, server, tasks_file):
+        repository = server.open_repository("sqlite", json_path=tasks_file)
+        yield server.RepositoryTaskStore(repository)
+        repository.close()
+
+    def test_transaction_writes_rows_and_refreshes(self, server, store, tasks_file):
+        before = tasks_file.read_text()
+        generation = store.generation
+        with store.transaction() as txn:
+            txn.data["tasks"]["T002"]["title"] = "Renamed task"
+            txn.commit()
+        assert store.read()["tasks"]["T002"]["title"] == "Renamed task"
+        assert store.read()["version"] == 11
+        assert store.generation > generation
+        # tasks.json is only an export until the scheduler syncs it.
+        assert tasks_file.read_text() == before
+        assert store.sync_export() is True
+        assert json.loads(tasks_file.read_text())["tasks"]["T002"]["title"] == "Renamed task"
+
+    def test_uncommitted_transaction_rolls_back(self, server, store):
+        with store.transaction() as txn:
+            txn.data["lanes"]["bot_queue"].clear()
+        assert store.read()["lanes"]["bot_queue"] == ["T001", "T002"]
+        assert store.read()["version"] == 10
+
+    def test_lane_scheduler_promotes(self, server, store):
+        scheduler = server.LaneScheduler(store)
+        assert scheduler.run_once() == "T001"
+        assert store.repository.lane("bot_current") == ["T001"]
+        assert store.repository.find_tasks(lane="bot_current")[0][0] == "T001"
+
+
+class TestTaskBoardCache:
+    """Cached /api/tasks payload with ETags and deltas."""
+
+    def test_body_and_etag_reused_until_board_changes(self, server, tasks_file):
+        cache = server.TaskBoardCache(server.TaskStore(tasks_file))
+        body, etag = cache.get()
+        assert cache.get() == (body, etag)
+        assert json.loads(body)["tasks_in_lanes"] == 2
+
+        data = json.loads(tasks_file.read_text())
+        data["tasks"]["T002"]["title"] = "Renamed task"
+        tasks_file.write_text(json.dumps(data))
+        new_body, new_etag = cache.get()
+        assert new_etag != etag
+        assert json.loads(new_body)["tasks"]["T002"]["title"] == "Renamed task"
+
+    def test_delta_returns_only_changed_tasks(self, server, tasks_file):
+        store = server.TaskStore(tasks_file)
+        cache = server.TaskBoardCache(store)
+        revision = json.loads(cache.get()[0])["revision"]
+
+        with store.transaction() as txn:
+            txn.data["tasks"]["T002"]["title"] = "Renamed task"
+            txn.data["lanes"]["bot_queue"].remove("T001")
+            txn.commit()
+        delta = cache.delta(revision)
+        assert delta["delta"] is True
+        assert list(delta["tasks"]) == ["T002"]
+        assert delta["removed"] == ["T001"]
+        assert delta["revision"] > revision
+
+    def test_delta_from_unknown_revision_falls_back(self, server, tasks_file):
+        cache = server.TaskBoardCache(server.TaskStore(tasks_file))
+        revision = json.loads(cache.get()[0])["revision"]
+        assert cache.delta(revision - 1) is None
+        assert cache.delta(revision + 1) is None
+
+    @pytest.mark.parametrize("header,expected", [
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"zzz", "abc"', True),
+        ("*", True),
+        ('"zzz"', False),
+        (None, False),
+    ])
+    def test_etag_matching(self, server, header, expected):
+        assert server.etag_matches(header, '"abc"') is expected
+
+
+class TestLaneScheduler:
+    """Background promotion of queued bot tasks."""
+
+    def test_run_once_promotes_head_of_queue(self, server, tasks_file):
+        scheduler = server.LaneScheduler(server.TaskStore(tasks_file))
+        assert scheduler.run_once() == "T001"
+        data = json.loads(tasks_file.read_text())
+        assert data["lanes"]["bot_current"] == ["T001"]
+        assert data["lanes"]["bot_queue"] == ["T002"]
+        # bot_current is now busy, so nothing else moves.
+        assert scheduler.run_once() is None
+
+    def test_background_thread_reacts_to_file_change(self, server, tasks_file):
+        store = server.TaskStore(tasks_file)
+        data = json.loads(tasks_file.read_text())
+        data["lanes"]["bot_queue"] = []
+        tasks_file.write_text(json.dumps(data))
+
+        scheduler = server.LaneScheduler(store, interval=0.2)
+        scheduler.start()
+        try:
+            data["lanes"]["bot_queue"] = ["T002"]
+            tasks_file.write_text(json.dumps(data))
+            deadline = time.monotonic() + 3
+            while scheduler.promotions == 0 and time.monotonic() < deadline:
+                time.sleep(0.02)
+            assert scheduler.last_promoted == "T002"
+        finally:
+            scheduler.stop()
+
+
+# ============== LOG CLASSIFIER ==============
+
+def log_line(message, subsystem="agent/embedded", level="INFO"):
+    return json.dumps({
+        "0": json.dumps({"subsystem": subsystem}),
+        "1": message,
+        "_meta": {"name": json.dumps({"subsystem": subsystem}), "logLevelName": level},
+        "time": "2026-01-29T17:00:00.000Z",
+    })
+
+
+class TestLogClassifier:
+    """parse_log_entry() + categorize_event() over gateway log lines."""
+
+    @pytest.mark.parametrize("message,expected", [
+        ("embedded run tool start: runId=1 tool=exec", {"type": "tool_start", "tool": "exec", "friendly": "Running a terminal command"}),
+        ("embedded run tool end: runId=1 tool=mystery", {"type": "tool_end", "tool": "mystery", "friendly": "Done: finished mystery"}),
+        ("run start: model=gpt-5 provider=openai messageChannel=telegram", {"type": "run_start", "model": "gpt-5", "friendly": "Processing a new request from Telegram"}),
+        ("embedded run done: runId=1", {"type": "run_end"}),
+        ("session state: prev=processing new=idle", {"type": "session_state", "state": "idle", "icon": "💤"}),
+        ("tool start after run start tool=Read", {"type": "tool_start", "tool": "Read"}),
+        ("embedded run tool start: model=gpttool=Read", {"type": "tool_start", "tool": "Read"}),
+        ("run start: model=gptprovider=openai", {"type": "run_start", "model": "gptprovider=openai", "provider": "openai"}),
+        ("Unhandled promise rejection: fetch failed", {"type": "error", "friendly": "Network request failed — connection issue"}),
+        ("run startool start tool=Read", {"type": "tool_start", "tool": "Read"}),
+        ("x agent startool end tool=Read", {"type": "tool_end", "tool": "Read"}),
+        ("prompt startool done tool=exec", {"type": "tool_end", "tool": "exec"}),
+    ])
+    def test_classifies_events(self, server, message, expected):
+        event = server.categorize_event(server.parse_log_entry(log_line(message)))
+        assert event is not None
+        for key, value in expected.items():
+            assert event[key] == value
+
+    def test_error_level_with_tools_failure(self, server):
+        """ERROR lines without a lifecycle marker get a friendly tool failure message."""
+        line = log_line("\x1b[31m[tools] exec failed: exit 1\x1b[39m", level="ERROR")
+        event = server.categorize_event(server.parse_log_entry(line))
+        assert event == {"type": "error", "icon": "⚠️", "friendly": "Exec operation failed — retrying"}
+
+    def test_subsystem_plain_and_json(self, server):
+        """_meta.name may be a JSON object or a bare subsystem name."""
+        entry = server.parse_log_entry(log_line("ws connected client=webchat", subsystem="gateway/ws"))
+        assert entry["subsystem"] == "gateway/ws"
+        raw = json.dumps({"1": "hello", "_meta": {"name": "telegram"}})
+        assert server.parse_log_entry(raw)["subsystem"] == "telegram"
+
+    def test_noise_and_garbage(self, server):
+        """Unmatched lines classify to nothing; non-JSON lines do not parse."""
+        assert server.categorize_event(server.parse_log_entry(log_line("lane enqueue: queueSize=1"))) is None
+        assert server.parse_log_entry("not json at all") is None
+
+
+# ============== EVENT BUFFER ==============
+
+class TestEventBuffer:
+    """Ring buffer behind recentEvents and /api/activity/events."""
+
+    def test_recent_is_newest_first_and_bounded(self, server):
+        buffer = server.EventBuffer(capacity=5)
+        for i in range(8):
+            buffer.append({"n": i})
+        assert len(buffer) == 5
+        assert [e["n"] for e in buffer.recent(3)] == [7, 6, 5]
+        assert [e["seq"] for e in buffer.recent(50)] == [8, 7, 6, 5, 4]
+
+    def test_since_pages_forward(self, server):
+        buffer = server.EventBuffer(capacity=100)
+        for i in range(10):
+            buffer.append({"n": i})
+        page, truncated = buffer.since(0, limit=4)
+        assert [e["seq"] for e in page] == [1, 2, 3, 4] and not truncated
+        page, _ = buffer.since(page[-1]["seq"], limit=4)
+        assert [e["seq"] for e in page] == [5, 6, 7, 8]
+        assert buffer.since(10)[0] == []
+
+    def test_since_reports_evicted_events(self, server):
+        buffer = server.EventBuffer(capacity=3)
+        for i in range(6):
+            buffer.append({"n": i})
+        page, truncated = buffer.since(1)
+        assert truncated
+        assert [e["seq"] for e in page] == [4, 5, 6]
+        assert buffer.oldest_seq == 4
+
+
+# ============== ACTIVITY STREAM ==============
+
+def read_sse(sock, until, timeout=2.0):
+    """Read from sock until `until` appears in the buffered text."""
+    sock.settimeout(timeout)
+    buf = b""
+    while until.encode() not in buf:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        buf += chunk
+    return buf.decode("utf-8")
+
+
+class TestActivityStream:
+    """Server-Sent Events fan-out of activity deltas."""
+
+    def test_snapshot_then_deltas(self, server, monkeypatch):
+        """A client gets the snapshot first, then only new events and changed fields."""
+        stream = server.ActivityStream(heartbeat=60)
+        monkeypatch.setattr(server, "activity_stream", stream)
+        ours, theirs = socket.socketpair()
+        try:
+            with server.state_lock:
+                assert stream.attach(ours, {"status": "idle", "recentEvents": []})
+            text = read_sse(theirs, "event: snapshot")
+            assert "retry: 3000" in text
+
+            server.ingest_log_lines([log_line("embedded run tool start: runId=1 tool=Edit")])
+            text = read_sse(theirs, "event: activity")
+            payload = json.loads(text.split("data: ", 1)[1].split("\n", 1)[0])
+            assert [e["type"] for e in payload["events"]] == ["tool_start"]
+            assert payload["state"]["currentTool"] == "Edit"
+            assert "sessionInfo" not in payload["state"]
+        finally:
+            stream.close()
+            theirs.close()
+
+    def test_client_limit(self, server):
+        """attach() refuses clients beyond max_clients."""
+        stream = server.ActivityStream(max_clients=1, heartbeat=60)
+        first, first_peer = socket.socketpair()
+        second, second_peer = socket.socketpair()
+        try:
+            assert stream.attach(first, {})
+            assert not stream.attach(second, {})
+        finally:
+            stream.close()
+            for sock in (first_peer, second, second_peer):
+                sock.close()
+
+    def test_stalled_client_is_dropped_without_delaying_others(self, server):
+        """A client that stops reading overflows its buffer and is dropped; others keep streaming."""
+        stream = server.ActivityStream(heartbeat=60, buffer_bytes=64 * 1024)
+        stalled, stalled_peer = socket.socketpair()
+        reader, reader_peer = socket.socketpair()
+        stalled.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        try:
+            with server.state_lock:
+                assert stream.attach(stalled, {})
+                assert stream.attach(reader, {})
+            read_sse(reader_peer, "event: snapshot")
+            started = time.monotonic()
+            for n in range(60):
+                stream.publish({"n": n, "pad": "x" * 4000})
+            text = ""
+            while '"n":59' not in text:
+                text += read_sse(reader_peer, '"n":')
+            assert time.monotonic() - started < 2
+            deadline = time.monotonic() + 2
+            while stream.client_count != 1:
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+        finally:
+            stream.close()
+            for sock in (stalled_peer, reader_peer):
+                sock.close()
+
+    def test_full_stream_answers_503_before_any_200(self, server, monkeypatch):
+        stream = server.ActivityStream(max_clients=1, heartbeat=60)
+        monkeypatch.setattr(server, "activity_stream", stream)
+        httpd = server.PooledHTTPServer(("127.0.0.1", 0), server.ActivityHandler, workers=2)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        request = b"GET /api/activity/stream HTTP/1.1\r\nHost: localhost\r\n\r\n"
+        first = socket.create_connection(httpd.server_address, timeout=2)
+        second = socket.create_connection(httpd.server_address, timeout=2)
+        try:
+            first.sendall(request)
+            text = read_sse(first, "event: snapshot")
+            assert text.startswith("HTTP/1.0 200")
+            second.sendall(request)
+            text = read_sse(second, "Too many")
+            assert text.startswith("HTTP/1.0 503") and " 200 " not in text
+            assert stream.client_count == 1
+        finally:
+            first.close()
+            second.close()
+            httpd.shutdown()
+            httpd.server_close()
+
+    def test_publish_without_clients_is_noop(self, server):
+        stream = server.ActivityStream()
+        stream.publish({"events": []})
+        assert stream._queue.empty()
+
+
+# ============== METRICS ==============
+
+class TestMetricsCache:
+    """In-process /api/metrics and /metrics."""
+
+    @pytest.fixture
+    def metrics_db(self, server, tmp_path, monkeypatch):
+        monkeypatch.setattr(server.metrics, "DB_PATH", tmp_path / "learnings.db")
+        monkeypatch.setattr(server.metrics, "_recorder", None)
+        monkeypatch.setattr(server, "_metrics_cache", {})
+        yield server.metrics
+        server.metrics.get_recorder().close()
+
+    def test_status_is_cached_for_ttl(self, server, metrics_db):
+        metrics_db.record_metric("api_call", 1.0)
+        first = server.load_metrics_cached("status", ttl_seconds=60)
+        assert first["today"]["api_call"]["total_count"] == 1
+
+        metrics_db.record_metric("api_call", 0.0)
+        assert server.load_metrics_cached("status", ttl_seconds=60) is first
+        fresh = server.load_metrics_cached("status", ttl_seconds=0)
+        assert fresh["today"]["api_call"]["total_count"] == 2
+
+    def test_prometheus_text(self, server, metrics_db):
+        metrics_db.record_metric("circuit_open", 1.0)
+        text = server.load_metrics_cached("prometheus")
+        assert "clawdbot_circuit_open_total 1" in text
+        assert "clawdbot_alerts_active 1" in text
+
+
+# ============== REQUEST STATS ==============
+
+class TestRequestStats:
+    """Per-route timing behind /api/_perf."""
+
+    def test_routes_pool_static_files(self, server):
+        assert server.perf_route("GET", "/api/tasks?since=3") == "GET /api/tasks"
+        assert server.perf_route("GET", "/app.js") == "GET static"
+        assert server.perf_route("GET", "/metrics") == "GET /metrics"
+
+    def test_snapshot_orders_by_total_time(self, server):
+        stats = server.RequestStats(slow_ms=10_000)
+        for _ in range(3):
+            stats.record("GET /api/light", 200, 2.0, 100)
+        stats.record("GET /api/heavy", 500, 400.0, 10)
+        routes = stats.snapshot()["routes"]
+        assert [r["route"] for r in routes] == ["GET /api/heavy", "GET /api/light"]
+        assert routes[0]["errors"] == 1
+        assert routes[1] == {"route": "GET /api/light", "count": 3, "errors": 0, "bytes": 300,
+                             "totalMs": 6.0, "avgMs": 2.0, "maxMs": 2.0,
+                             "p50Ms": 1.75, "p95Ms": 2.42, "p99Ms": 2.49}
+
+    def test_route_cap(self, server):
+        stats = server.RequestStats(max_routes=2)
+        for n in range(5):
+            stats.record(f"GET /api/r{n}", 200, 1.0, 0)
+        assert {r["route"]: r["count"] for r in stats.snapshot()["routes"]} == {
+            "GET /api/r0": 1, "GET /api/r1": 1, "other": 3}
+
+    def test_slow_requests_are_logged(self, server, capsys):
+        stats = server.RequestStats(slow_ms=50)
+        stats.record("GET /api/fast", 200, 5.0, 0)
+        stats.record("GET /api/slow", 200, 75.0, 42)
+        assert capsys.readouterr().err == "Slow request: GET /api/slow -> 200 in 75ms (42 bytes)\n"
+
+    def test_prometheus_histogram(self, server):
+        stats = server.RequestStats()
+        stats.record("GET /api/tasks", 200, 3.0, 512)
+        text = stats.prometheus()
+        assert 'clawdbot_http_request_duration_ms_bucket{route="GET /api/tasks",le="5"} 1' in text
+        assert 'clawdbot_http_request_duration_ms_count{route="GET /api/tasks"} 1' in text
+        assert 'clawdbot_http_response_bytes_total{route="GET /api/tasks"} 512' in text
+
+    def test_handler_records_live_requests(self, server, monkeypatch):
+        stats = server.RequestStats(slow_ms=10_000)
+        monkeypatch.setattr(server, "REQUEST_STATS", stats)
+        httpd = server.PooledHTTPServer(("127.0.0.1", 0), server.ActivityHandler, workers=2)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        base = f"http://127.0.0.1:{httpd.server_address[1]}"
+        try:
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"{base}/api/no-such-route?x=1", timeout=5)
+            with urllib.request.urlopen(f"{base}/api/_perf", timeout=5) as response:
+                perf = json.loads(response.read())
+            # Stats are recorded after the response is flushed, so the 404
+            # may land a moment after the client has already read it.
+            deadline = time.monotonic() + 2
+            while True:
+                routes = {r["route"]: r for r in stats.snapshot()["routes"]}
+                if "GET /api/no-such-route" in routes or time.monotonic() > deadline:
+                    break
+                time.sleep(0.01)
+        finally:
+            httpd.shutdown()
+            httpd.socket.close()
+        assert "routes" in perf
+        assert routes["GET /api/no-such-route"]["count"] == 1
+        assert routes["GET /api/no-such-route"]["bytes"] > len(b'{"error": "Not found"}')
+
+
+# ============== ROUTE TIMEOUTS ==============
+
+class TestRouteTimeouts:
+    """MISSION_CONTROL_ROUTE_TIMEOUTS parsing, 504 on deadline, bounded executor."""
+
+    def test_parse_route_timeouts(self, server):
+        parsed = server._parse_route_timeouts(" /api/metrics=5, /api/model-select=90.5,bad,=3,/x=abc,/y=0,/z=-1")
+        assert parsed == {"/api/metrics": 5.0, "/api/model-select": 90.5}
+        assert server._parse_route_timeouts("") == {}
+        assert server._parse_route_timeouts(None) == {}
+
+    def test_slow_handler_answers_504(self, server, monkeypatch):
+        monkeypatch.setitem(server.ROUTE_TIMEOUTS, "/api/_slow", 0.05)
+        release = threading.Event()
+        route = server.Route("GET", "/api/_slow",
+                             lambda request: server.run_with_route_timeout(request.path, release.wait, 5))
+        try:
+            started = time.monotonic()
+            response = server.run_route(route, server.RouteRequest("GET", "/api/_slow", "", b"", None))
+            assert time.monotonic() - started < 2
+        finally:
+            release.set()
+        assert response.status == 504
+        assert response.json() == {"error": "/api/_slow timed out after 0.05s"}
+
+    def test_pending_route_calls_are_bounded(self, server, monkeypatch):
+        monkeypatch.setattr(server, "_route_slots", threading.BoundedSemaphore(1))
+        monkeypatch.setitem(server.ROUTE_TIMEOUTS, "/api/_slow", 0.05)
+        release = threading.Event()
+        try:
+            with pytest.raises(server.RouteTimeout):
+                server.run_with_route_timeout("/api/_slow", release.wait, 5)
+            with pytest.raises(server.RouteError) as busy:
+                server.run_with_route_timeout("/api/_slow", lambda: None)
+            assert busy.value.status == 503
+        finally:
+            release.set()
+        deadline = time.monotonic() + 2
+        while not server._route_slots.acquire(blocking=False):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        server._route_slots.release()
+        assert server.run_with_route_timeout("/api/_slow", lambda: "done") == "done"
+
+
+# ============== ROUTES ==============
+
+class TestRoutes:
+    """Route registry, in-process dispatch and the benchmark harness."""
+
+    @pytest.fixture
+    def task_store(self, server, tasks_file, monkeypatch):
+        store = server.TaskStore(tasks_file)
+        monkeypatch.setattr(server, "TASK_STORE", store)
+        return store
+
+    def test_registry_covers_get_and_post(self, server):
+        assert server.ROUTES[("GET", "/api/tasks")].func is server.get_tasks
+        assert server.ROUTES[("POST", "/api/delete-task")].func is server.post_delete_task
+        assert server.ROUTES[("GET", "/")].func is server.ROUTES[("GET", "/index.html")].func
+        assert ("GET", "/api/delete-task") not in server.ROUTES
+
+    def test_duplicate_route_rejected(self, server):
+        with pytest.raises(ValueError):
+            server.api_route("GET", "/api/health")(lambda request: {})
+
+    def test_json_route_with_default_headers(self, server):
+        response = server.call_route("GET", "/api/activity/events", query="since=0&limit=5")
+        assert response.status == 200
+        assert response.headers["Access-Control-Allow-Origin"] == "*"
+        assert set(response.json()) >= {"events", "next", "latest", "truncated"}
+
+    def test_route_error_status(self, server):
+        response = server.call_route("GET", "/api/activity/events", query="since=abc")
+        assert response.status == 400
+        assert response.json() == {"error": "since and limit must be integers"}
+
+    def test_post_validation_and_task_errors(self, server, task_store):
+        assert server.call_route("POST", "/api/delete-task", body=b"").status == 400
+        missing = server.call_route("POST", "/api/delete-task", body={"taskId": "T404"})
+        assert (missing.status, missing.json()) == (400, {"error": "T404 not found in any lane"})
+
+    def test_post_mutates_board(self, server, task_store, tasks_file):
+        response = server.call_route("POST", "/api/delete-task", body={"taskId": "T001"})
+        assert response.json()["success"] is True
+        board = json.loads(tasks_file.read_text())
+        assert board["lanes"]["trash"] == ["T001"]
+        assert board["tasks"]["T001"]["status"] == "trashed"
+
+    def test_tasks_etag_round_trip(self, server, task_store, monkeypatch):
+        monkeypatch.setattr(server, "TASK_BOARD_CACHE", server.TaskBoardCache(task_store))
+        first = server.call_route("GET", "/api/tasks")
+        etag = first.headers["ETag"]
+        assert first.json()["version"] == 10
+        again = server.call_route("GET", "/api/tasks", headers={"If-None-Match": etag})
+        assert (again.status, again.body) == (304, b"")
+
+    def test_unexpected_error_uses_route_status(self, server, monkeypatch):
+        def boom():
+            raise RuntimeError("queue unreadable")
+        monkeypatch.setattr(server, "_read_research_queue", boom)
+        response = server.call_route("GET", "/api/research-queue")
+        assert (response.status, response.json()) == (200, {"error": "queue unreadable"})
+        monkeypatch.setattr(server, "_update_research_queue", lambda data: boom())
+        assert server.call_route("POST", "/api/research-queue", body={}).status == 400
+
+    def test_bench_routes(self, server, monkeypatch):
+        routes = {key: server.ROUTES[key] for key in [
+            ("GET", "/api/health"), ("GET", "/api/_perf"), ("GET", "/api/activity/stream")]}
+        monkeypatch.setattr(server, "ROUTES", routes)
+        rows = server.bench_routes(iterations=3)
+        assert sorted(row["route"] for row in rows) == ["GET /api/_perf", "GET /api/health"]
+        assert all(row["status"] == 200 and row["p95Ms"] <= row["maxMs"] for row in rows)
+        assert [row["route"] for row in server.bench_routes(["/api/health"], iterations=1)] == ["GET /api/health"]
+
+    def test_live_post_dispatch(self, server, task_store):
+        httpd = server.PooledHTTPServer(("127.0.0.1", 0), server.ActivityHandler, workers=2)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        base = f"http://127.0.0.1:{httpd.server_address[1]}"
+        try:
+            request = urllib.request.Request(f"{base}/api/reorder-task", method="POST",
+                                             data=json.dumps({"taskId": "T002", "direction": "up"}).encode())
+            with urllib.request.urlopen(request, timeout=5) as response:
+                assert int(response.headers["Content-Length"]) > 0
+                moved = json.loads(response.read())
+            with pytest.raises(urllib.error.HTTPError) as missing:
+                urllib.request.urlopen(urllib.request.Request(f"{base}/api/nope", method="POST", data=b"{}"),
+                                       timeout=5)
+        finally:
+            httpd.shutdown()
+            httpd.socket.close()
+        assert moved["newOrder"] == ["T002", "T001"]
+        assert missing.value.code == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
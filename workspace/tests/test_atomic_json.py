@@ -0,0 +1,156 @@
+"""
+test_atomic_json.py — Tests for the shared atomic JSON writer
+
+Run with: python -m pytest tests/test_atomic_json.py -v
+"""
+
+import json
+import multiprocessing
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import atomic_json  # noqa: E402
+from atomic_json import file_lock, read_json, write_json_atomic  # noqa: E402
+
+
+# ============== FIXTURES ==============
+
+@pytest.fixture
+def board(tmp_path):
+    """Existing tasks.json the writer will replace."""
+    path = tmp_path / "memory" / "tasks.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps({"version": 1, "tasks": {"T001": {"title": "Old"}}}, indent=2))
+    return path
+
+
+# ============== ATOMIC WRITES ==============
+
+class TestAtomicWrite:
+    """Temp file + fsync + rename semantics."""
+
+    def test_replaces_content(self, board):
+        write_json_atomic(board, {"version": 2, "tasks": {}})
+        assert json.loads(board.read_text()) == {"version": 2, "tasks": {}}
+
+    def test_leaves_no_temp_files(self, board):
+        for version in range(5):
+            write_json_atomic(board, {"version": version})
+        assert [p.name for p in board.parent.iterdir()] == ["tasks.json"]
+
+    def test_unserializable_data_keeps_original(self, board):
+        """Encoding happens before the disk is touched."""
+        before = board.read_text()
+        with pytest.raises(TypeError):
+            write_json_atomic(board, {"bad": object()})
+        assert board.read_text() == before
+        assert [p.name for p in board.parent.iterdir()] == ["tasks.json"]
+
+    def test_failed_rename_keeps_original(self, board, monkeypatch):
+        """A crash between writing the temp file and renaming it leaves the old board readable."""
+        before = board.read_text()
+
+        def crash(src, dst):
+            raise OSError("simulated crash before rename")
+
+        monkeypatch.setattr(atomic_json.os, "replace", crash)
+        with pytest.raises(OSError):
+            write_json_atomic(board, {"version": 99})
+        assert board.read_text() == before
+        assert [p.name for p in board.parent.iterdir()] == ["tasks.json"]
+
+    def test_creates_parent_directories(self, tmp_path):
+        target = tmp_path / "a" / "b" / "state.json"
+        write_json_atomic(target, {"ok": True})
+        assert json.loads(target.read_text()) == {"ok": True}
+
+    @pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+    def test_preserves_file_mode(self, board):
+        os.chmod(board, 0o640)
+        write_json_atomic(board, {"version": 2})
+        assert (board.stat().st_mode & 0o777) == 0o640
+
+
+# ============== ENCODING OPTIONS ==============
+
+class TestEncoding:
+    """Pretty, compact and legacy-compatible output."""
+
+    def test_pretty_matches_json_dump(self, board):
+        data = {"version": 3, "title": "café"}
+        write_json_atomic(board, data, indent=2)
+        assert board.read_text(encoding="utf-8") == json.dumps(data, indent=2, ensure_ascii=False)
+
+    def test_compact(self, board):
+        write_json_atomic(board, {"a": [1, 2], "b": {"c": None}}, compact=True)
+        assert board.read_text() == '{"a":[1,2],"b":{"c":null}}'
+
+    def test_trailing_newline_and_default(self, board):
+        write_json_atomic(board, {"path": Path("x")}, default=str, trailing_newline=True)
+        assert board.read_text().endswith("\n")
+        assert json.loads(board.read_text()) == {"path": "x"}
+
+
+def _bump_counter(path):
+    with file_lock(path):
+        data = read_json(path)
+        data["counter"] = data.get("counter", 0) + 1
+        write_json_atomic(path, data)
+
+
+def _increment_counter(path, times):
+    """Child process body for the cross-process lock test (module-level so it pickles)."""
+    for _ in range(times):
+        _bump_counter(path)
+
+
+# ============== LOCKING ==============
+
+class TestFileLock:
+    """Exclusive lock file beside the document."""
+
+    def test_times_out_while_held(self, board):
+        with file_lock(board):
+            with pytest.raises(TimeoutError):
+                with file_lock(board, timeout=0.05):
+                    pass
+
+    def test_released_on_exit(self, board):
+        with file_lock(board):
+            pass
+        with file_lock(board, timeout=0.05):
+            pass
+        assert (board.parent / ".tasks.json.lock").exists()
+
+    def test_threads_lose_no_updates(self, board):
+        def worker():
+            for _ in range(20):
+                _bump_counter(board)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert json.loads(board.read_text())["counter"] == 80
+
+    @pytest.mark.skipif(os.name != "posix", reason="fork-based workers")
+    def test_processes_lose_no_updates(self, board):
+        ctx = multiprocessing.get_context("fork")
+        procs = [ctx.Process(target=_increment_counter, args=(str(board), 15)) for _ in range(3)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join(30)
+        assert all(p.exitcode == 0 for p in procs)
+        assert json.loads(board.read_text())["counter"] == 45
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
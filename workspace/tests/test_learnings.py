@@ -0,0 +1,428 @@
+"""
+test_learnings.py — Tests for the learnings database
+
+Run with: python -m pytest tests/test_learnings.py -v
+"""
+
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import learnings  # noqa: E402
+
+
+# ============== FIXTURES ==============
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Point learnings.py at a fresh database."""
+    path = tmp_path / "learnings.db"
+    monkeypatch.setattr(learnings, "DB_PATH", path)
+    return path
+
+
+def add(statement, kind="fact", **kwargs):
+    return learnings.add_learning(statement, kind, **kwargs)
+
+
+# ============== FULL-TEXT SEARCH ==============
+
+class TestSearch:
+    """FTS5 index, BM25 ranking and filters."""
+
+    def test_stemmed_match_with_snippet(self, db_path):
+        add("Shopify theme deploys need a backup first", kind="procedure")
+        add("Francisco prefers morning meetings", kind="preference")
+        rows = learnings.search_learnings("backups")
+        assert [row[0] for row in rows] == [1]
+        assert "[backup]" in rows[0][5]
+
+    def test_all_terms_must_match_and_rank_by_bm25(self, db_path):
+        add("Invoice emails go out on Monday")
+        add("Invoice invoice invoice reminders for overdue invoice emails")
+        add("Weekly newsletter emails")
+        rows = learnings.search_learnings("invoice emails")
+        assert [row[0] for row in rows] == [2, 1]
+        assert rows[0][6] <= rows[1][6]
+
+    def test_filters(self, db_path):
+        add("Cache the theme before deploy", kind="procedure", tags=["shopify", "deploy"], entity="DLM")
+        add("Cache warmup is slow", kind="fact", tags=["perf"])
+        assert [r[0] for r in learnings.search_learnings("cache", kind="fact")] == [2]
+        assert [r[0] for r in learnings.search_learnings("cache", tags=["deploy"])] == [1]
+        assert [r[0] for r in learnings.search_learnings("cache", entity="DLM")] == [1]
+        assert learnings.search_learnings("cache", tags=["deploy", "perf"]) == []
+
+    def test_query_syntax_is_not_interpreted(self, db_path):
+        add("Use OR between fallback gateways")
+        assert learnings.search_learnings('gateways OR "') != []
+        assert learnings.search_learnings("***") == []
+
+    def test_index_follows_updates_and_deletes(self, db_path):
+        add("Pinterest pins need alt text")
+        conn = learnings.get_db()
+        conn.execute("UPDATE learning SET statement = 'Pinterest boards need alt text' WHERE id = 1")
+        conn.commit()
+        assert learnings.search_learnings("pins") == []
+        assert len(learnings.search_learnings("boards")) == 1
+        conn.execute("DELETE FROM learning WHERE id = 1")
+        conn.commit()
+        conn.close()
+        assert learnings.search_learnings("boards") == []
+
+    def test_inactive_learnings_hidden(self, db_path):
+        add("Old webhook secret rotated")
+        conn = learnings.get_db()
+        conn.execute("UPDATE learning SET is_active = 0")
+        conn.commit()
+        conn.close()
+        assert learnings.search_learnings("webhook") == []
+
+    def test_existing_database_is_backfilled(self, db_path):
+        conn = sqlite3.connect(db_path)
+        conn.executescript(learnings.SCHEMA)
+        conn.execute("INSERT INTO learning (statement, kind, canonical_hash) VALUES ('Legacy gateway note', 'fact', 'h1')")
+        conn.commit()
+        conn.close()
+        assert [r[0] for r in learnings.search_learnings("gateway")] == [1]
+        assert learnings.rebuild_search_index() == 1
+
+
+# ============== SEMANTIC RECALL ==============
+
+class TestSemantic:
+    """Hashed n-gram vectors, cosine top-k and near-duplicate detection."""
+
+    def cosine(self, a, b):
+        return sum(x * y for x, y in zip(learnings.embed(a), learnings.embed(b)))
+
+    def test_embedding_is_normalized_and_stable(self):
+        vector = learnings.embed("Francisco prefers morning meetings")
+        assert len(vector) == learnings.EMBEDDING_DIM
+        assert sum(v * v for v in vector) == pytest.approx(1.0, abs=1e-5)
+        assert vector == learnings.embed("francisco  prefers morning meetings")
+        assert learnings.embed("the is a") == learnings.embed("")
+
+    def test_similar_statements_score_higher(self):
+        reworded = self.cosine("Francisco prefers morning meetings", "Francisco prefers meetings in the morning")
+        unrelated = self.cosine("Francisco prefers morning meetings", "Ghost Broker needs a landing page")
+        assert reworded > learnings.NEAR_DUPLICATE_SIMILARITY > unrelated
+
+    def test_semantic_search_ranks_by_similarity(self, db_path):
+        add("Back up the Shopify theme before deploying")
+        add("Pinterest pins need alt text")
+        add("Invoices go out every Monday")
+        rows = learnings.semantic_search("shopify theme backup", limit=2)
+        assert rows[0][0] == 1
+        assert rows[0][5] > rows[1][5]
+
+    def test_near_duplicate_is_added_by_default(self, db_path):
+        first = add("Francisco prefers morning meetings", confidence=0.5)
+        second = add("Francisco prefers meetings in the morning")
+        assert second != first
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT confidence FROM learning WHERE id = ?", (first,)).fetchone()[0] == 0.5
+        conn.close()
+
+    def test_merge_near_boosts_existing(self, db_path):
+        first = add("Francisco prefers morning meetings", confidence=0.5)
+        assert add("Francisco prefers meetings in the morning", merge_near=True) == first
+        assert add("Francisco prefers evening calls", merge_near=True) != first
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT confidence FROM learning WHERE id = ?", (first,)).fetchone()[0] == pytest.approx(0.6)
+        conn.close()
+        assert add("Francisco prefers meetings in the morning", near_duplicate=None, merge_near=True) != first
+
+    @pytest.mark.parametrize("stored, new", [
+        ("API rate limit is 100 requests per minute", "API rate limit is 1000 requests per minute"),
+        ("Server runs on port 8765", "Server runs on port 8766"),
+        ("Use tabs", "Do not use tabs"),
+        ("Deploys wait for review", "Deploys don't wait for review"),
+    ])
+    def test_merge_near_keeps_different_numbers_and_negations(self, db_path, stored, new):
+        first = add(stored)
+        assert add(new, near_duplicate=0.5, merge_near=True) != first
+        assert learnings.distinguishing_terms(stored) != learnings.distinguishing_terms(new)
+
+    def test_edited_statement_is_reembedded(self, db_path):
+        add("Pinterest pins need alt text")
+        conn = learnings.get_db()
+        conn.execute("UPDATE learning SET statement = 'Invoices go out every Monday' WHERE id = 1")
+        conn.commit()
+        assert conn.execute("SELECT embedding FROM learning WHERE id = 1").fetchone()[0] is None
+        conn.close()
+        assert learnings.semantic_search("Invoices go out every Monday")[0][5] == pytest.approx(1.0, abs=1e-5)
+
+    def test_partitioned_search_finds_close_matches(self, db_path):
+        for n in range(40):
+            add(f"Unrelated note number {n} about topic {n * 7}", near_duplicate=None)
+        target = add("Always rotate the webhook secret after a breach")
+        rows = learnings.semantic_search("always rotate webhook secrets after a breach", limit=1, exhaustive=False)
+        assert rows[0][0] == target
+
+    def test_database_without_vectors_is_migrated(self, db_path):
+        legacy = learnings.SCHEMA.replace("        supersedes_id INTEGER REFERENCES learning(id),\n"
+                                          "        embedding BLOB,\n        embedding_partition INTEGER\n",
+                                          "        supersedes_id INTEGER REFERENCES learning(id)\n")
+        assert "embedding" not in legacy
+        conn = sqlite3.connect(db_path)
+        conn.executescript(legacy)
+        conn.execute("INSERT INTO learning (statement, kind, canonical_hash) VALUES ('Legacy gateway note', 'fact', 'h1')")
+        conn.commit()
+        conn.close()
+        assert add("Legacy gateway note!", merge_near=True) == 1
+        assert learnings.semantic_search("legacy gateway")[0][0] == 1
+
+
+# ============== BULK OPERATIONS ==============
+
+def column(db_path, name):
+    conn = sqlite3.connect(db_path)
+    try:
+        return dict(conn.execute(f"SELECT id, {name} FROM learning ORDER BY id"))
+    finally:
+        conn.close()
+
+
+class TestBulk:
+    """import, tag, pin and prune over many ids."""
+
+    def test_import_dedupes_against_database_and_itself(self, db_path, monkeypatch):
+        monkeypatch.setattr(learnings, "CHUNK_SIZE", 2)
+        existing = add("Invoices go out every Monday", confidence=0.5)
+        counts = learnings.import_learnings([
+            {"statement": "Invoices go out every Monday", "kind": "fact"},
+            {"statement": "Pinterest pins need alt text", "kind": "procedure", "tags": ["pinterest"]},
+            {"statement": "Francisco prefers morning meetings", "kind": "preference", "confidence": 0.6},
+            {"statement": "the Francisco prefers morning meetings", "kind": "preference"},
+            {"statement": "Pinterest pins need alt text", "kind": "procedure"},
+        ], source="nightly")
+        assert counts == {"added": 2, "boosted": 3, "skipped": 0}
+        confidence = column(db_path, "confidence")
+        assert confidence[existing] == pytest.approx(0.6)
+        assert sorted(confidence.values()) == pytest.approx([0.6, 0.7, 0.9])
+        assert set(column(db_path, "source").values()) == {None, "nightly"}
+        assert [r[0] for r in learnings.search_learnings("pinterest", tags=["pinterest"])] != []
+
+    def test_import_skips_invalid_records(self, db_path):
+        counts = learnings.import_learnings([
+            None,
+            {"statement": "", "kind": "fact"},
+            {"statement": "Unknown kind", "kind": "rumor"},
+            {"statement": "Bad confidence", "kind": "fact", "confidence": "high"},
+            {"statement": "Good one", "kind": "fact"},
+        ])
+        assert counts == {"added": 1, "boosted": 0, "skipped": 4}
+
+    def test_tag_add_and_remove(self, db_path):
+        first = add("Cache the theme", tags=["shopify"])
+        second = add("Rotate webhook secrets", tags=["security", "shopify"])
+        assert learnings.tag_learnings([first, second], add=["ops"]) == 2
+        assert learnings.tag_learnings([first, second], add=["ops"]) == 0
+        assert learnings.tag_learnings([second], remove=["shopify"]) == 1
+        tags = column(db_path, "tags")
+        assert tags[first] == '["shopify", "ops"]'
+        assert tags[second] == '["security", "ops"]'
+        assert [r[0] for r in learnings.search_learnings("webhook", tags=["ops"])] == [second]
+
+    def test_pin_and_prune_ids(self, db_path):
+        ids = [add(f"Note {word}") for word in ("alpha", "bravo", "charlie")]
+        assert learnings.pin_learnings(ids[:1]) == 1
+        assert learnings.prune_learnings(dry_run=True, ids=ids) == 2
+        assert learnings.prune_learnings(dry_run=False, ids=ids) == 2
+        assert column(db_path, "is_active") == {ids[0]: 1, ids[1]: 0, ids[2]: 0}
+        assert learnings.pin_learnings(ids[:1], pinned=False) == 1
+
+
+# ============== ACCESS TRACKING ==============
+
+class TestAccessLog:
+    """Reads append to the access log; merges fold it into the table."""
+
+    def test_reads_do_not_write_the_database(self, db_path):
+        first = add("Invoices go out every Monday")
+        add("Pinterest pins need alt text")
+        before = db_path.stat().st_mtime_ns
+        learnings.search_learnings("invoices")
+        learnings.list_learnings()
+        learnings.semantic_search("pinterest pins", limit=1)
+        assert db_path.stat().st_mtime_ns == before
+        assert column(db_path, "last_accessed_at")[first] is None
+        assert len(learnings.access_log_path().read_text().splitlines()) == 3
+
+    def test_reads_proceed_while_a_writer_holds_the_lock(self, db_path, monkeypatch):
+        add("Legacy gateway note")
+        monkeypatch.setattr(learnings, "_schema_ready", set())  # as in a fresh process
+        writer = sqlite3.connect(db_path)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            assert len(learnings.search_learnings("gateway")) == 1
+            assert len(learnings.semantic_search("legacy gateway")) == 1
+            assert len(learnings.top_learnings()) == 1
+            assert len(learnings.list_learnings()) == 1
+        finally:
+            writer.rollback()
+            writer.close()
+
+    def test_merge_sets_last_access_and_counts(self, db_path):
+        first = add("Invoices go out every Monday")
+        second = add("Pinterest pins need alt text")
+        learnings.search_learnings("invoices")
+        learnings.list_learnings()
+        assert learnings.merge_access_log() == 2
+        assert not learnings.access_log_path().exists()
+        assert column(db_path, "access_count") == {first: 2, second: 1}
+        assert all(column(db_path, "last_accessed_at").values())
+        assert learnings.merge_access_log() == 0
+
+    def test_merge_keeps_latest_time_and_skips_garbage(self, db_path):
+        first = add("Invoices go out every Monday")
+        learnings.access_log_path().write_text(
+            f"2026-01-02 00:00:00\t{first}\n2026-01-01 00:00:00\t{first} 999 x\nnot a line\n")
+        assert learnings.merge_access_log() == 2
+        assert column(db_path, "last_accessed_at")[first] == "2026-01-02 00:00:00"
+        assert column(db_path, "access_count")[first] == 2
+
+    def test_interrupted_merge_is_applied_once(self, db_path):
+        first = add("Invoices go out every Monday")
+        log = learnings.access_log_path()
+        log.with_name(log.name + ".merging").write_text(f"2026-01-01 00:00:00\t{first}\n")
+        log.write_text(f"2026-01-02 00:00:00\t{first}\n")
+        assert learnings.merge_access_log() == 1
+        assert column(db_path, "access_count")[first] == 1
+        assert learnings.merge_access_log() == 1
+        assert column(db_path, "access_count")[first] == 2
+
+    def test_log_is_merged_once_due(self, db_path, monkeypatch):
+        first = add("Invoices go out every Monday")
+        monkeypatch.setattr(learnings, "ACCESS_LOG_FLUSH_BYTES", 40)
+        learnings.search_learnings("invoices")
+        assert column(db_path, "access_count")[first] == 0
+        learnings.search_learnings("invoices")
+        assert column(db_path, "access_count")[first] == 2
+        assert not learnings.access_log_path().exists()
+
+    def test_concurrent_appends_survive_merges(self, db_path, monkeypatch):
+        first = add("Invoices go out every Monday")
+        monkeypatch.setattr(learnings, "ACCESS_LOG_FLUSH_BYTES", 200)
+
+        def reader():
+            for _ in range(50):
+                learnings.record_access([first])
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        learnings.merge_access_log()
+        assert column(db_path, "access_count")[first] == 200
+
+    def test_recent_access_protects_from_prune(self, db_path):
+        stale = add("Old webhook secret rotated", confidence=0.2)
+        recalled = add("Legacy gateway note", confidence=0.2)
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE learning SET updated_at = datetime('now', '-90 days')")
+        conn.commit()
+        conn.close()
+        learnings.search_learnings("gateway")
+        assert learnings.prune_learnings(dry_run=False) == 1
+        assert column(db_path, "is_active") == {stale: 0, recalled: 1}
+
+
+# ============== RELEVANCE SCORING ==============
+
+def backdate(db_path, days, ids=None):
+    conn = sqlite3.connect(db_path)
+    conn.execute(f"UPDATE learning SET updated_at = datetime('now', '-{days} days')"
+                 + (f" WHERE id IN ({','.join(map(str, ids))})" if ids else ""))
+    conn.commit()
+    conn.close()
+
+
+class TestRelevance:
+    """Decayed scores kept in an indexed column for prune and top-N."""
+
+    def test_score_halves_every_half_life(self):
+        today = learnings.relevance_score(0.8, 0, 2461000.0)
+        earlier = learnings.relevance_score(0.8, 0, 2461000.0 - learnings.HALF_LIFE_DAYS)
+        assert learnings.decayed_score(today, 2461000.0) == pytest.approx(0.8)
+        assert learnings.decayed_score(earlier, 2461000.0) == pytest.approx(0.4)
+        assert learnings.relevance_score(0.8, 3, 2461000.0) > today
+        assert learnings.relevance_score(0.0, 0, 2461000.0) > float("-inf")
+
+    def test_writes_keep_scores_current(self, db_path):
+        first = add("Invoices go out every Monday", confidence=0.5)
+        scored = column(db_path, "relevance")[first]
+        assert scored is not None
+        add("Invoices go out every Monday")
+        assert column(db_path, "relevance")[first] > scored
+        scored = column(db_path, "relevance")[first]
+        learnings.search_learnings("invoices")
+        learnings.merge_access_log()
+        assert column(db_path, "relevance")[first] > scored
+
+    def test_top_orders_pinned_then_by_decayed_score(self, db_path):
+        old = add("Invoices go out every Monday", confidence=0.9)
+        fresh = add("Pinterest pins need alt text", confidence=0.6)
+        pinned = add("Never deploy on Fridays", confidence=0.3, pinned=True)
+        add("Webhook secrets rotate monthly", kind="procedure")
+        backdate(db_path, 60, [old, pinned])
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE learning SET is_active = 0 WHERE id = 4")
+        conn.commit()
+        conn.close()
+        rows = learnings.top_learnings(limit=3)
+        assert [row[0] for row in rows] == [pinned, fresh, old]
+        assert rows[2][5] == pytest.approx(0.9 * 0.5 ** (60 / learnings.HALF_LIFE_DAYS), rel=1e-3)
+        assert learnings.top_learnings(kind="procedure") == []
+
+    def test_prune_drops_decayed_and_expired(self, db_path):
+        keep = add("Invoices go out every Monday")
+        decayed = add("Pinterest pins need alt text", confidence=0.3)
+        pinned = add("Never deploy on Fridays", confidence=0.1, pinned=True)
+        expired = add("Promo code SPRING works", expires_days=1)
+        backdate(db_path, 60, [keep, decayed, pinned])
+        conn = sqlite3.connect(db_path)
+        conn.execute(f"UPDATE learning SET expires_at = datetime('now', '-1 day') WHERE id = {expired}")
+        conn.commit()
+        conn.close()
+        assert learnings.prune_learnings(dry_run=False) == 2
+        assert column(db_path, "is_active") == {keep: 1, decayed: 0, pinned: 1, expired: 0}
+
+    def test_prune_spares_fresh_and_confident_learnings(self, db_path):
+        fresh = add("Pinterest pins need alt text", confidence=0.05)
+        constraint = add("Never store card numbers", kind="constraint", confidence=1.0)
+        idle = add("Invoices go out every Monday", confidence=0.05)
+        backdate(db_path, 100, [constraint, idle])
+        assert learnings.prune_learnings(dry_run=False) == 1
+        assert column(db_path, "is_active") == {fresh: 1, constraint: 1, idle: 0}
+
+    def test_unscored_rows_are_scored_lazily(self, db_path):
+        add("Invoices go out every Monday")
+        conn = sqlite3.connect(db_path)
+        conn.execute("INSERT INTO learning (statement, kind, canonical_hash, confidence) VALUES ('Legacy gateway note', 'fact', 'h1', 0.5)")
+        conn.commit()
+        conn.close()
+        assert column(db_path, "relevance")[2] is None
+        assert [row[0] for row in learnings.top_learnings()] == [1, 2]
+        assert column(db_path, "relevance")[2] is not None
+        assert learnings.rescore_learnings() == 2
+
+    def test_plans_use_relevance_index(self, db_path):
+        conn = learnings.get_db()
+        plan = " ".join(row[3] for row in conn.execute("""
+            EXPLAIN QUERY PLAN SELECT id FROM learning WHERE is_active = 1
+            ORDER BY is_pinned DESC, relevance DESC LIMIT 20
+        """))
+        conn.close()
+        assert "idx_learning_relevance" in plan and "TEMP B-TREE" not in plan
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,208 @@
+"""
+test_log_tailer.py — Tests for the Mission Control incremental log tailer
+
+Run with: python -m pytest tests/test_log_tailer.py -v
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "mission-control"))
+
+from log_tailer import InotifyWatcher, LogTailer, PollWatcher  # noqa: E402
+
+
+# ============== FIXTURES ==============
+
+@pytest.fixture
+def log_dir(tmp_path):
+    """Create a log directory with a small existing log."""
+    directory = tmp_path / "openclaw"
+    directory.mkdir()
+    (directory / "openclaw-2026-01-29.log").write_text("old-1\nold-2\n")
+    return directory
+
+
+def make_tailer(log_dir, received, path_box, state_path=None, **kwargs):
+    return LogTailer(
+        lambda: path_box[0],
+        received.extend,
+        state_path=state_path,
+        watch_dirs=[log_dir],
+        watcher=kwargs.pop("watcher", PollWatcher(interval=0)),
+        **kwargs,
+    )
+
+
+# ============== INCREMENTAL READS ==============
+
+class TestIncrementalReads:
+    """Byte-offset reads only hand over complete, new lines."""
+
+    def test_initial_backfill_then_appends(self, log_dir):
+        """First cycle ingests the existing tail, later cycles only new lines."""
+        log = log_dir / "openclaw-2026-01-29.log"
+        received = []
+        tailer = make_tailer(log_dir, received, [str(log)])
+
+        tailer.poll_once()
+        assert received == ["old-1", "old-2"]
+
+        with open(log, "a") as f:
+            f.write("new-1\n")
+        tailer.poll_once()
+        assert received == ["old-1", "old-2", "new-1"]
+
+    def test_partial_line_is_buffered(self, log_dir):
+        """A line without its newline is held back until it is completed."""
+        log = log_dir / "openclaw-2026-01-29.log"
+        received = []
+        tailer = make_tailer(log_dir, received, [str(log)])
+        tailer.poll_once()
+
+        with open(log, "a") as f:
+            f.write('{"msg": "half')
+        tailer.poll_once()
+        assert received[-1] == "old-2"
+
+        with open(log, "a") as f:
+            f.write(' done"}\n')
+        tailer.poll_once()
+        assert received[-1] == '{"msg": "half done"}'
+
+    def test_truncation_restarts_from_zero(self, log_dir):
+        """A file truncated in place is re-read from the beginning."""
+        log = log_dir / "openclaw-2026-01-29.log"
+        received = []
+        tailer = make_tailer(log_dir, received, [str(log)])
+        tailer.poll_once()
+
+        log.write_text("fresh\n")
+        tailer.poll_once()
+        assert received[-1] == "fresh"
+
+    def test_rotation_drains_old_file_first(self, log_dir):
+        """Switching files delivers the old file's remainder, then the new file in full."""
+        old_log = log_dir / "openclaw-2026-01-29.log"
+        new_log = log_dir / "openclaw-2026-01-30.log"
+        received = []
+        path_box = [str(old_log)]
+        tailer = make_tailer(log_dir, received, path_box, rescan_interval=0)
+        tailer.poll_once()
+
+        with open(old_log, "a") as f:
+            f.write("old-3\n")
+        new_log.write_text("day-2\n")
+        path_box[0] = str(new_log)
+        tailer.poll_once()
+
+        assert received == ["old-1", "old-2", "old-3", "day-2"]
+        assert tailer.stats()["rotations"] == 1
+
+
+# ============== PERSISTED OFFSETS ==============
+
+class TestPersistedOffsets:
+    """Restarts resume from the saved offset instead of re-ingesting."""
+
+    def test_restart_resumes_from_offset(self, log_dir, tmp_path):
+        """A second tailer only sees lines appended after the first one stopped."""
+        log = log_dir / "openclaw-2026-01-29.log"
+        state = tmp_path / "tail-state.json"
+
+        first = []
+        tailer = make_tailer(log_dir, first, [str(log)], state_path=state)
+        tailer.poll_once()
+        tailer.close()
+
+        with open(log, "a") as f:
+            f.write("after-restart\n")
+
+        second = []
+        tailer = make_tailer(log_dir, second, [str(log)], state_path=state)
+        tailer.poll_once()
+        assert second == ["after-restart"]
+
+    def test_replaced_file_ignores_stale_offset(self, log_dir, tmp_path):
+        """A saved offset for a different inode is not reused."""
+        log = log_dir / "openclaw-2026-01-29.log"
+        state = tmp_path / "tail-state.json"
+
+        tailer = make_tailer(log_dir, [], [str(log)], state_path=state)
+        tailer.poll_once()
+        tailer.close()
+
+        log.unlink()
+        log.write_text("replacement-1\nreplacement-2\nreplacement-3\n")
+
+        received = []
+        tailer = make_tailer(log_dir, received, [str(log)], state_path=state)
+        tailer.poll_once()
+        assert received == ["replacement-1", "replacement-2", "replacement-3"]
+
+
+# ============== INGEST METRICS ==============
+
+class TestIngestStats:
+    """Lag and progress are exposed for the dashboard."""
+
+    def test_stats_report_offset_and_bytes_behind(self, log_dir):
+        log = log_dir / "openclaw-2026-01-29.log"
+        tailer = make_tailer(log_dir, [], [str(log)])
+        tailer.poll_once()
+
+        stats = tailer.stats()
+        assert stats["mode"] == "poll"
+        assert stats["offset"] == log.stat().st_size
+        assert stats["bytesBehind"] == 0
+        assert stats["linesIngested"] == 2
+
+        with open(log, "a") as f:
+            f.write("pending\n")
+        assert tailer.stats()["bytesBehind"] == len("pending\n")
+
+
+@pytest.mark.skipif(not InotifyWatcher.available(), reason="inotify is Linux-only")
+class TestInotifyWatcher:
+    """Event-driven wakeups."""
+
+    def test_append_wakes_watcher(self, log_dir):
+        log = log_dir / "openclaw-2026-01-29.log"
+        watcher = InotifyWatcher()
+        try:
+            watcher.watch([log_dir])
+            with open(log, "a") as f:
+                f.write("wake\n")
+            changed, structural = watcher.wait(timeout=2.0)
+            assert str(log) in changed
+            assert not structural
+        finally:
+            watcher.close()
+
+    def test_idle_wait_times_out_without_events(self, log_dir):
+        watcher = InotifyWatcher()
+        try:
+            watcher.watch([log_dir])
+            started = time.monotonic()
+            changed, structural = watcher.wait(timeout=0.05)
+            assert changed == set() and not structural
+            assert time.monotonic() - started < 1.0
+        finally:
+            watcher.close()
+
+    def test_new_file_is_structural(self, log_dir):
+        watcher = InotifyWatcher()
+        try:
+            watcher.watch([log_dir])
+            (log_dir / "openclaw-2026-01-30.log").write_text("")
+            _changed, structural = watcher.wait(timeout=2.0)
+            assert structural
+        finally:
+            watcher.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
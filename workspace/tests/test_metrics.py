@@ -0,0 +1,256 @@
+"""
+test_metrics.py — Tests for the metrics recorder
+
+Run with: python -m pytest tests/test_metrics.py -v
+"""
+
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import metrics  # noqa: E402
+from metrics import MetricsRecorder  # noqa: E402
+
+
+# ============== FIXTURES ==============
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "learnings.db"
+
+
+@pytest.fixture
+def recorder(db_path):
+    rec = MetricsRecorder(db_path, batch_size=10, flush_interval=60)
+    yield rec
+    rec.close()
+
+
+@pytest.fixture
+def default_recorder(db_path, monkeypatch):
+    """Route the module-level helpers to a temporary database."""
+    monkeypatch.setattr(metrics, "DB_PATH", db_path)
+    monkeypatch.setattr(metrics, "_recorder", None)
+    yield
+    if metrics._recorder is not None:
+        metrics._recorder.close()
+
+
+def stored(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM metrics").fetchone()[0]
+    except sqlite3.OperationalError:
+        return 0
+    finally:
+        conn.close()
+
+
+# ============== RECORDER ==============
+
+class TestMetricsRecorder:
+    """Buffered group commits over one connection."""
+
+    def test_buffers_until_batch_size(self, recorder, db_path):
+        for i in range(9):
+            recorder.record("api_call", 1.0, task_id=f"T{i}")
+        assert stored(db_path) == 0
+        recorder.record("api_call", 1.0)
+        assert stored(db_path) == 10
+        assert recorder.commits == 1
+
+    def test_flushes_after_interval(self, db_path):
+        rec = MetricsRecorder(db_path, batch_size=100, flush_interval=0.05)
+        rec.record("api_call", 1.0)
+        deadline = time.time() + 5
+        while stored(db_path) == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        assert stored(db_path) == 1
+        rec.close()
+
+    def test_close_flushes(self, recorder, db_path):
+        recorder.record("task_complete", 1.0, details={"retry_count": 0})
+        recorder.close()
+        assert stored(db_path) == 1
+
+    def test_reads_see_buffered_events(self, recorder):
+        recorder.record("preflight_pass", 1.0)
+        recorder.record("preflight_pass", 0.0)
+        rows = recorder.query("SELECT metric_name, COUNT(*), SUM(metric_value), recorded_date = date('now') "
+                              "FROM metrics GROUP BY metric_name")
+        assert rows == [("preflight_pass", 2, 1.0, 1)]
+
+    def test_keeps_one_connection(self, recorder):
+        conn = recorder.connection()
+        for _ in range(25):
+            recorder.record("api_call", 1.0)
+        recorder.flush()
+        assert recorder.connection() is conn
+
+    def test_concurrent_threads(self, recorder, db_path):
+        def worker():
+            for _ in range(50):
+                recorder.record("api_call", 1.0)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        recorder.flush()
+        assert stored(db_path) == 200
+
+
+# ============== ROLLUPS ==============
+
+class TestRollups:
+    """Hourly/daily rollups, backfill and retention."""
+
+    def test_rollups_match_raw_rows(self, recorder):
+        for value in (1.0, 0.0, 1.0):
+            recorder.record("api_call", value)
+        recorder.record("task_retry", 3.0)
+        raw = recorder.query("SELECT metric_name, recorded_date, COUNT(*), SUM(metric_value) "
+                             "FROM metrics GROUP BY 1, 2 ORDER BY 1")
+        daily = recorder.query("SELECT metric_name, day, total_count, value_sum FROM metrics_daily ORDER BY 1")
+        hourly = recorder.query("SELECT metric_name, SUM(total_count), SUM(value_sum) FROM metrics_hourly "
+                                "GROUP BY 1 ORDER BY 1")
+        assert daily == raw
+        assert hourly == [(name, count, total) for name, _, count, total in raw]
+
+    def test_backfills_existing_database(self, db_path):
+        conn = sqlite3.connect(db_path)
+        conn.executescript(metrics.SCHEMA)
+        conn.executemany("INSERT INTO metrics (metric_name, metric_value, recorded_at, recorded_date) "
+                         "VALUES (?, ?, ?, ?)",
+                         [("api_call", 1.0, "2026-01-01 10:15:00", "2026-01-01"),
+                          ("api_call", 0.0, "2026-01-01 10:45:00", "2026-01-01")])
+        conn.commit()
+        conn.close()
+
+        rec = MetricsRecorder(db_path)
+        assert rec.query("SELECT * FROM metrics_hourly") == [("api_call", "2026-01-01 10:00:00", 2, 1.0)]
+        rec.close()
+        rec = MetricsRecorder(db_path)
+        assert rec.query("SELECT total_count FROM metrics_daily") == [(2,)]
+        rec.close()
+
+    def test_prune_keeps_daily_rollups(self, recorder):
+        conn = recorder.connection()
+        with conn:
+            conn.execute("INSERT INTO metrics (metric_name, recorded_at, recorded_date) "
+                         "VALUES ('api_call', '2020-01-01 00:00:00', '2020-01-01')")
+            conn.execute("INSERT INTO metrics_hourly VALUES ('api_call', '2020-01-01 00:00:00', 1, 1.0)")
+            conn.execute("INSERT INTO metrics_daily VALUES ('api_call', '2020-01-01', 1, 1.0)")
+        recorder.record("api_call", 1.0)
+        recorder.flush()
+        assert recorder.query("SELECT COUNT(*) FROM metrics") == [(1,)]
+        assert recorder.query("SELECT COUNT(*) FROM metrics_hourly") == [(1,)]
+        assert recorder.query("SELECT COUNT(*) FROM metrics_daily") == [(2,)]
+
+
+# ============== HISTOGRAMS ==============
+
+class TestHistograms:
+    """Log-scale latency buckets, quantiles and Prometheus output."""
+
+    def test_bucket_boundaries_are_inclusive(self):
+        assert metrics.bucket_index(0.5) == 0
+        assert metrics.bucket_index(1) == 0
+        assert metrics.bucket_index(1.01) == 1
+        assert metrics.bucket_index(10 ** 9) == len(metrics.HISTOGRAM_BOUNDS)
+
+    def test_quantile_interpolates_within_bucket(self):
+        buckets = [0] * len(metrics.BUCKET_COLUMNS)
+        buckets[metrics.bucket_index(100)] = 100  # all in (50, 100]
+        assert metrics.histogram_quantile(0.5, buckets) == pytest.approx(75.0)
+        assert metrics.histogram_quantile(0.99, buckets) == pytest.approx(99.5)
+        assert metrics.histogram_quantile(0.5, [0] * len(buckets)) is None
+
+    def test_overflow_reports_largest_bound(self):
+        buckets = [0] * len(metrics.BUCKET_COLUMNS)
+        buckets[-1] = 3
+        assert metrics.histogram_quantile(0.99, buckets) == metrics.HISTOGRAM_BOUNDS[-1]
+
+    def test_observations_are_aggregated_not_stored_raw(self, recorder):
+        for latency in range(1, 10):
+            recorder.observe("api_latency_ms", latency, label="openai")
+        assert recorder.flush() == 9
+        assert recorder.query("SELECT COUNT(*) FROM metrics") == [(0,)]
+        assert recorder.query("SELECT COUNT(*), SUM(total_count), SUM(value_sum) FROM metrics_histogram") == [
+            (1, 9, 45.0)]
+
+    def test_backfills_latency_from_details(self, db_path):
+        conn = sqlite3.connect(db_path)
+        conn.executescript(metrics.SCHEMA)
+        conn.execute("INSERT INTO metrics (metric_name, details, recorded_at) "
+                     "VALUES ('api_call', '{\"api\": \"x\", \"latency_ms\": 40}', '2026-01-01 10:00:00')")
+        conn.execute("INSERT INTO metrics (metric_name, details) VALUES ('api_call', 'not json')")
+        conn.commit()
+        conn.close()
+        rec = MetricsRecorder(db_path)
+        assert rec.query("SELECT label, total_count, b5 FROM metrics_histogram") == [("x", 1, 1)]
+        rec.close()
+
+
+class TestModuleHelpers:
+    """record_* and the summaries share the process recorder."""
+
+    def test_summary_includes_unflushed(self, default_recorder):
+        metrics.record_checkpoint(True, task_id="T1")
+        metrics.record_checkpoint(False, task_id="T1")
+        metrics.record_task_complete("T1", retry_count=2)
+        summary = metrics.get_today_summary()
+        assert summary["checkpoint_success"] == {"total_count": 2, "success_count": 1.0, "success_rate": 50.0}
+        assert summary["task_retry"]["success_count"] == 2.0
+        assert metrics.get_recorder().commits == 1
+
+    def test_status_reads_rollups(self, default_recorder):
+        for passed in (True, False, False):
+            metrics.record_preflight(passed)
+        recorder = metrics.get_recorder()
+        recorder.flush()
+        with recorder.connection() as conn:
+            conn.execute("DELETE FROM metrics")  # summaries must not depend on raw rows
+        status = metrics.get_status()
+        assert status["today"]["preflight_pass"]["total_count"] == 3
+        assert status["alerts"] == ["⚠️ Preflight pass rate low: 33.3%"]
+        assert list(status["trends"]) == ["preflight_pass"]
+        assert metrics.get_hourly_trends()["preflight_pass"]["counts"] == [3]
+
+    def test_api_latency_percentiles(self, default_recorder):
+        for latency in [20] * 90 + [400] * 10:
+            metrics.record_api_call("anthropic", True, latency_ms=latency)
+        metrics.record_api_call("anthropic", False)
+        latency = metrics.get_latency_percentiles()["anthropic"]
+        assert latency["count"] == 100
+        assert latency["avg"] == 58.0
+        assert 10 < latency["p50"] <= 25
+        assert 250 < latency["p95"] <= 500
+        assert metrics.get_status()["latency"]["anthropic"] == latency
+
+    def test_prometheus_histogram(self, default_recorder):
+        for latency in (3, 30, 300):
+            metrics.record_api_call('a"b', True, latency_ms=latency)
+        text = metrics.get_prometheus_metrics()
+        assert "# TYPE clawdbot_api_latency_ms histogram" in text
+        assert 'clawdbot_api_latency_ms_bucket{api="a\\"b",le="5"} 1' in text
+        assert 'clawdbot_api_latency_ms_bucket{api="a\\"b",le="50"} 2' in text
+        assert 'clawdbot_api_latency_ms_bucket{api="a\\"b",le="+Inf"} 3' in text
+        assert 'clawdbot_api_latency_ms_sum{api="a\\"b"} 333.0' in text
+        assert 'clawdbot_api_latency_ms_count{api="a\\"b"} 3' in text
+
+    def test_benchmark_reports_both_paths(self):
+        result = metrics.benchmark(events=20)
+        assert result["events"] == 20
+        assert result["per_event"] > 0 and result["batched"] > 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
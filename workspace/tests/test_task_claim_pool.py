@@ -0,0 +1,340 @@
+"""
+test_task_claim_pool.py — Tests for the claim index, claim-next and priority scoring
+
+Run with: python -m pytest tests/test_task_claim_pool.py -v
+"""
+
+import importlib.util
+import json
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+NOW = 1_780_000_000.0
+
+
+# ============== FIXTURES ==============
+
+@pytest.fixture(scope="module")
+def pool():
+    """Import task-claim-pool.py (hyphenated, so not importable by name)."""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    spec = importlib.util.spec_from_file_location("task_claim_pool", SCRIPTS_DIR / "task-claim-pool.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def board_file(pool, tmp_path, monkeypatch):
+    """Point the claim pool at a temporary tasks.json."""
+    board = {
+        "version": 1,
+        "lanes": {"bot_queue": ["T1", "T2", "T3", "T4"], "bot_current": []},
+        "tasks": {
+            "T1": {"title": "Low", "status": "pending", "priority": {"total_score": 10}},
+            "T2": {"title": "Research", "status": "pending", "required_agent": "research",
+                   "priority": {"total_score": 60}},
+            "T3": {"title": "High", "status": "pending", "priority": {"total_score": 50}},
+            "T4": {"title": "Legacy", "status": "pending", "priority": "P1"},
+        },
+    }
+    path = tmp_path / "memory" / "tasks.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps(board, indent=2))
+    monkeypatch.setenv("TASKS_BACKEND", "json")
+    monkeypatch.setattr(pool, "TASKS_PATH", path)
+    monkeypatch.setattr(pool, "PARALLEL_LOG", tmp_path / "memory" / "parallel-execution.jsonl")
+    monkeypatch.setattr(pool, "_repository", None)
+    return path
+
+
+def queued(score, required="general", claimed_by=None, heartbeat=None):
+    task = {"priority": {"total_score": score}, "required_agent": required}
+    if claimed_by:
+        task["claimed_by"] = {"agent_id": claimed_by, "last_heartbeat": heartbeat}
+    return task
+
+
+def iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
+def edit_board(path, **tasks):
+    """Apply field updates to tasks in tasks.json, as another writer would."""
+    board = json.loads(path.read_text())
+    for task_id, fields in tasks.items():
+        board["tasks"][task_id].update(fields)
+    board["version"] += 1
+    path.write_text(json.dumps(board, indent=2))
+
+
+# ============== TIMER WHEEL ==============
+
+class TestTimerWheel:
+    """Claim expiry buckets."""
+
+    def test_fires_only_due_keys(self, pool):
+        wheel = pool.TimerWheel(tick=60, slots=8, now=NOW)
+        wheel.schedule("a", NOW + 30)
+        wheel.schedule("b", NOW + 600)
+        assert wheel.advance(NOW + 10) == []
+        assert wheel.advance(NOW + 31) == ["a"]
+        assert wheel.advance(NOW + 599) == []
+        assert wheel.advance(NOW + 600) == ["b"]
+        assert len(wheel) == 0
+
+    def test_deadline_beyond_one_rotation(self, pool):
+        wheel = pool.TimerWheel(tick=60, slots=4, now=NOW)
+        wheel.schedule("far", NOW + 60 * 10)
+        for minute in range(1, 10):
+            assert wheel.advance(NOW + 60 * minute) == []
+        assert wheel.advance(NOW + 60 * 10) == ["far"]
+
+    def test_reschedule_and_cancel(self, pool):
+        wheel = pool.TimerWheel(tick=60, slots=8, now=NOW)
+        wheel.schedule("a", NOW + 30)
+        wheel.schedule("a", NOW + 300)
+        assert wheel.advance(NOW + 60) == []
+        wheel.cancel("a")
+        assert wheel.advance(NOW + 400) == []
+
+
+# ============== CLAIM INDEX ==============
+
+class TestClaimIndex:
+    """Per-specialty heaps with heartbeat expiry."""
+
+    def test_next_claimable_respects_specialty(self, pool):
+        index = pool.ClaimIndex.build([
+            ("T1", queued(10)),
+            ("T2", queued(60, "research")),
+            ("T3", queued(50)),
+        ], now=NOW)
+        assert index.next_claimable("general", now=NOW) == "T2"
+        assert index.next_claimable("research", now=NOW) == "T2"
+        assert index.next_claimable("content", now=NOW) == "T3"
+
+    def test_ties_keep_queue_order(self, pool):
+        index = pool.ClaimIndex.build([("A", queued(20)), ("B", queued(20))], now=NOW)
+        assert index.available(now=NOW) == ["A", "B"]
+
+    def test_live_claim_is_skipped_until_it_expires(self, pool):
+        index = pool.ClaimIndex.build([
+            ("T1", queued(90, claimed_by="a1", heartbeat=iso(NOW - 60))),
+            ("T2", queued(10)),
+        ], timeout_minutes=30, now=NOW)
+        assert index.next_claimable(now=NOW) == "T2"
+        assert index.next_claimable(now=NOW + 28 * 60 + 59) == "T2"
+        assert index.next_claimable(now=NOW + 29 * 60) == "T1"
+
+    def test_claim_without_heartbeat_is_claimable(self, pool):
+        index = pool.ClaimIndex.build([("T1", queued(10, claimed_by="a1"))], now=NOW)
+        assert index.next_claimable(now=NOW) == "T1"
+
+    def test_claim_heartbeat_release(self, pool):
+        index = pool.ClaimIndex.build([("T1", queued(50)), ("T2", queued(10))], now=NOW)
+        index.claim("T1", "a1", now=NOW)
+        assert index.next_claimable(now=NOW) == "T2"
+        assert index.heartbeat("a1", now=NOW + 25 * 60) == ["T1"]
+        assert index.next_claimable(now=NOW + 40 * 60) == "T2"
+        index.release("T1")
+        assert index.next_claimable(now=NOW + 40 * 60) == "T1"
+
+    def test_remove_and_readd(self, pool):
+        index = pool.ClaimIndex.build([("T1", queued(50)), ("T2", queued(10))], now=NOW)
+        index.remove("T1")
+        assert index.available(now=NOW) == ["T2"]
+        index.add("T1", queued(5), now=NOW)
+        assert index.available(now=NOW) == ["T2", "T1"]
+
+
+# ============== COMMANDS ==============
+
+class TestClaimNext:
+    """Atomic pick-and-claim against tasks.json."""
+
+    def test_claims_best_task(self, pool, board_file):
+        assert pool.claim_next_task("a1", "Agent One", "general") == "T2"
+        task = json.loads(board_file.read_text())["tasks"]["T2"]
+        assert task["status"] == "in_progress"
+        assert task["claimed_by"]["agent_id"] == "a1"
+
+    def test_successive_claims_never_collide(self, pool, board_file):
+        claimed = [pool.claim_next_task(f"a{n}", f"Agent {n}", "content") for n in range(4)]
+        assert claimed == ["T3", "T1", "T4", None]
+
+    def test_available_handles_legacy_priority(self, pool, board_file):
+        available = pool.get_available_tasks("general")
+        assert [t["task_id"] for t in available] == ["T2", "T3", "T1", "T4"]
+        assert available[-1]["priority_level"] == "P4"
+
+    def test_export_conflict_does_not_fail_claim(self, pool, board_file, monkeypatch, capsys):
+        monkeypatch.setenv("TASKS_BACKEND", "sqlite")
+        repo = pool.get_repository()
+        with repo.edit() as txn:
+            txn.task("T1")["status"] = "blocked"
+        edit_board(board_file, T4={"status": "blocked"})
+        assert pool.claim_next_task("a1", "Agent One", "general") == "T2"
+        assert repo.get_task("T2")["claimed_by"]["agent_id"] == "a1"
+        assert "export not refreshed" in capsys.readouterr().err
+        assert json.loads(board_file.read_text())["tasks"]["T4"]["status"] == "blocked"
+        repo.close()
+
+
+# ============== PRIORITIES ==============
+
+class TestIncrementalPriorities:
+    """calculate-priorities only rescores and rewrites what moved."""
+
+    START = datetime.fromtimestamp(NOW, timezone.utc)
+
+    def test_next_urgency_boundary(self, pool):
+        due = self.START + timedelta(days=5)
+        assert pool.next_urgency_boundary(due.isoformat(), self.START) == due - timedelta(days=3)
+        assert pool.next_urgency_boundary(due.isoformat(), due) == due
+        assert pool.next_urgency_boundary(due.isoformat(), due + timedelta(seconds=1)) is None
+        assert pool.next_urgency_boundary(None, self.START) is None
+
+    def test_unchanged_board_is_not_rewritten(self, pool, board_file):
+        first = pool.calculate_priorities(now=self.START, quiet=True)
+        assert first["updated"] == first["scored"] == 4
+        version = json.loads(board_file.read_text())["version"]
+
+        again = pool.calculate_priorities(now=self.START + timedelta(hours=1), quiet=True)
+        assert (again["rescored"], again["updated"]) == (0, 0)
+        assert json.loads(board_file.read_text())["version"] == version
+
+    def test_rescores_when_boundary_passes(self, pool, board_file):
+        due = self.START + timedelta(days=5)
+        edit_board(board_file, T1={"due_date": due.isoformat()})
+        result = pool.calculate_priorities(now=self.START, quiet=True)
+        assert result["next_boundary"] == (due - timedelta(days=3)).isoformat()
+        assert json.loads(board_file.read_text())["tasks"]["T1"]["priority"]["urgency"] == 10
+
+        assert pool.calculate_priorities(now=due - timedelta(days=3), quiet=True)["rescored"] == 0
+        crossed = pool.calculate_priorities(now=due - timedelta(days=3, seconds=-1), quiet=True)
+        assert (crossed["rescored"], crossed["updated"]) == (1, 1)
+        priority = json.loads(board_file.read_text())["tasks"]["T1"]["priority"]
+        assert priority["urgency"] == 20
+        assert priority["next_boundary"] == (due - timedelta(days=1)).isoformat()
+
+    def test_blocked_by_edit_boosts_blocker(self, pool, board_file):
+        pool.calculate_priorities(now=self.START, quiet=True)
+        edit_board(board_file, T2={"blocked_by": ["T1"]}, T3={"blocked_by": ["T1"]})
+        pool.calculate_priorities(now=self.START, quiet=True)
+        assert json.loads(board_file.read_text())["tasks"]["T1"]["priority"]["dependency_boost"] == 10
+
+        edit_board(board_file, T4={"blocked_by": ["T1"]}, T1={"blocks": ["T2"]})
+        result = pool.calculate_priorities(now=self.START, quiet=True)
+        assert (result["rescored"], result["updated"]) == (1, 1)
+        priority = json.loads(board_file.read_text())["tasks"]["T1"]["priority"]
+        assert priority["dependency_boost"] == 20
+        assert priority["total_score"] == 40
+
+
+# ============== DAEMON ==============
+
+class TestBatchedPool:
+    """Long-lived pool used by the daemon."""
+
+    def test_heartbeats_wait_for_flush(self, pool, board_file):
+        claims = pool.ClaimPool(batch_heartbeats=True)
+        claims.claim("T3", "a1", "Agent One")
+        claimed_at = json.loads(board_file.read_text())["tasks"]["T3"]["claimed_by"]["last_heartbeat"]
+        version = json.loads(board_file.read_text())["version"]
+
+        for _ in range(5):
+            claims.heartbeat("a1")
+        board = json.loads(board_file.read_text())
+        assert board["version"] == version
+        assert claims.stats()["pending_heartbeats"] == 1
+        assert not (board_file.parent / "parallel-execution.jsonl").exists()
+
+        assert claims.flush() is True
+        board = json.loads(board_file.read_text())
+        assert board["version"] == version + 1
+        assert board["tasks"]["T3"]["claimed_by"]["last_heartbeat"] >= claimed_at
+        assert "claim" in (board_file.parent / "parallel-execution.jsonl").read_text()
+        assert claims.flush() is False
+
+    def test_reprioritize_only_when_due(self, pool, board_file):
+        claims = pool.ClaimPool(batch_heartbeats=True)
+        now = datetime.fromtimestamp(NOW, timezone.utc)
+        edit_board(board_file, T1={"due_date": (now + timedelta(hours=2)).isoformat()})
+        assert claims.reprioritize(now=now)["updated"] == 4
+        assert claims.reprioritize(now=now + timedelta(minutes=30)) is None
+        crossed = claims.reprioritize(now=now + timedelta(hours=2, seconds=1))
+        assert crossed["updated"] == 1
+        assert json.loads(board_file.read_text())["tasks"]["T1"]["priority"]["urgency"] == 40
+        assert claims.stats()["next_boundary"] is None
+
+    def test_index_rebuilds_after_external_write(self, pool, board_file):
+        claims = pool.ClaimPool(batch_heartbeats=True)
+        assert [t["task_id"] for t in claims.available()][0] == "T2"
+        board = json.loads(board_file.read_text())
+        board["lanes"]["bot_queue"].remove("T2")
+        board["version"] += 1
+        board_file.write_text(json.dumps(board))
+        assert [t["task_id"] for t in claims.available()][0] == "T3"
+        assert claims.claim_next("a1", "Agent One") == "T3"
+
+
+@pytest.mark.skipif(not hasattr(__import__("socket"), "AF_UNIX"), reason="Unix domain sockets")
+class TestDaemonSocket:
+    """Requests over the Unix socket."""
+
+    @pytest.fixture
+    def daemon(self, pool, board_file, tmp_path):
+        path = tmp_path / "pool.sock"
+        server = pool.ClaimPoolServer(path, pool.ClaimPool(batch_heartbeats=True))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield path, server
+        server.shutdown()
+        server.server_close()
+
+    def test_client_round_trip(self, pool, daemon, board_file):
+        path, server = daemon
+        client = pool.connect_daemon(path)
+        assert client.claim_next("a1", "Agent One", "content") == "T3"
+        assert client.heartbeat("a1") == "a1"
+        assert client.stats()["pending_heartbeats"] == 1
+        assert [t["task_id"] for t in client.available("content")] == ["T1", "T4"]
+        with pytest.raises(ValueError, match="not owned"):
+            client.release("T3", "someone-else")
+        assert client.release("T3", "a1") == "T3"
+        assert client.call("flush") is True
+        client.close()
+        assert json.loads(board_file.read_text())["tasks"]["T3"]["claimed_by"] is None
+
+    def test_late_heartbeat_keeps_lapsed_claim(self, pool, daemon, monkeypatch):
+        path, server = daemon
+        clock = [time.time()]
+        monkeypatch.setattr(pool.time, "time", lambda: clock[0])
+        client = pool.connect_daemon(path)
+        assert client.claim_next("a1", "Agent One", "content") == "T3"
+        clock[0] += (pool.CLAIM_TIMEOUT_MINUTES + 1) * 60
+        assert [t["task_id"] for t in client.available("content")] == ["T3", "T1", "T4"]
+        client.heartbeat("a1")
+        assert [t["task_id"] for t in client.available("content")] == ["T1", "T4"]
+        assert client.claim_next("b1", "Agent Two", "content") == "T1"
+        client.close()
+
+    def test_unknown_op(self, pool, daemon):
+        client = pool.connect_daemon(daemon[0])
+        with pytest.raises(ValueError, match="Unknown op"):
+            client.call("shutdown")
+        client.close()
+
+    def test_no_daemon_means_local(self, pool, tmp_path):
+        assert pool.connect_daemon(tmp_path / "missing.sock") is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
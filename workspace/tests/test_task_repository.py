@@ -0,0 +1,242 @@
+"""
+test_task_repository.py — Tests for the task board repository (JSON and SQLite engines)
+
+Run with: python -m pytest tests/test_task_repository.py -v
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from task_repository import (  # noqa: E402
+    ExportConflict,
+    JsonTaskRepository,
+    SqliteTaskRepository,
+    index_columns,
+    open_repository,
+)
+
+
+# ============== FIXTURES ==============
+
+BOARD = {
+    "version": 7,
+    "updated_at": "2026-01-29T17:00:00+00:00",
+    "notes": "keep me",
+    "lanes": {"bot_current": ["T1"], "bot_queue": ["T2", "T3"], "done_today": [], "trash": []},
+    "tasks": {
+        "T1": {"title": "Current", "status": "in_progress",
+               "claimed_by": {"agent_id": "a1", "agent_name": "A"}},
+        "T2": {"title": "Queued high", "status": "pending", "priority": {"total_score": 70}},
+        "T3": {"title": "Queued low", "status": "pending", "priority": {"total_score": 10}},
+    },
+}
+
+
+@pytest.fixture
+def tasks_file(tmp_path):
+    path = tmp_path / "memory" / "tasks.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps(BOARD, indent=2))
+    return path
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def repo(request, tasks_file):
+    if request.param == "json":
+        repository = JsonTaskRepository(tasks_file)
+    else:
+        repository = SqliteTaskRepository(tasks_file.with_name("tasks.db"), export_path=tasks_file)
+    yield repository
+    repository.close()
+
+
+# ============== BOTH ENGINES ==============
+
+class TestRepository:
+    """Behaviour shared by the JSON and SQLite engines."""
+
+    def test_load_board_round_trips(self, repo):
+        assert repo.load_board() == BOARD
+
+    def test_task_edit_bumps_version(self, repo):
+        with repo.edit(updated_by="test") as txn:
+            txn.task("T2")["status"] = "in_progress"
+        assert repo.version() == 8
+        assert repo.get_task("T2")["status"] == "in_progress"
+        assert repo.load_board()["updated_by"] == "test"
+
+    def test_transaction_reports_committed_version(self, repo):
+        with repo.edit() as txn:
+            assert txn.version == 7
+            txn.task("T3")["status"] = "done"
+        assert txn.version == 8
+
+    def test_unchanged_edit_does_not_write(self, repo):
+        with repo.edit(updated_by="test") as txn:
+            txn.task("T2")
+        assert repo.version() == 7
+
+    def test_rollback_discards(self, repo):
+        with repo.edit() as txn:
+            txn.task("T2")["status"] = "done"
+            txn.rollback()
+        assert repo.get_task("T2")["status"] == "pending"
+
+    def test_exception_discards(self, repo):
+        with pytest.raises(ValueError):
+            with repo.edit() as txn:
+                txn.task("T2")["status"] = "done"
+                raise ValueError("abort")
+        assert repo.get_task("T2")["status"] == "pending"
+        assert repo.version() == 7
+
+    def test_find_by_lane_status_and_claim(self, repo):
+        assert [tid for tid, _ in repo.find_tasks(lane="bot_queue")] == ["T2", "T3"]
+        assert [tid for tid, _ in repo.find_tasks(status="in_progress")] == ["T1"]
+        assert [tid for tid, _ in repo.find_tasks(claimed_by="a1")] == ["T1"]
+        assert [tid for tid, _ in repo.find_tasks(status=["pending", None], order_by_priority=True,
+                                                  limit=1)] == ["T2"]
+
+    def test_lane_moves(self, repo):
+        with repo.edit() as txn:
+            txn.lane("bot_queue").remove("T2")
+            txn.lane("bot_current").append("T2")
+        assert repo.lane("bot_current") == ["T1", "T2"]
+        assert repo.lane("bot_queue") == ["T3"]
+        assert [tid for tid, _ in repo.find_tasks(lane="bot_current")] == ["T1", "T2"]
+
+    def test_meta_and_new_task(self, repo):
+        with repo.edit() as txn:
+            txn.meta("parallel_execution", {"active_agents": []})["active_agents"].append("a1")
+            txn.put_task("T4", {"title": "New", "status": "pending"})
+            txn.lane("bot_queue").append("T4")
+        board = repo.load_board()
+        assert board["parallel_execution"] == {"active_agents": ["a1"]}
+        assert board["lanes"]["bot_queue"] == ["T2", "T3", "T4"]
+        assert board["tasks"]["T4"]["title"] == "New"
+
+    def test_board_edit(self, repo):
+        with repo.edit() as txn:
+            board = txn.board()
+            board["tasks"].pop("T3")
+            board["lanes"]["bot_queue"].remove("T3")
+            board["lanes"]["paused"] = ["T2"]
+            board["lanes"]["bot_queue"].remove("T2")
+            del board["notes"]
+        board = repo.load_board()
+        assert set(board["tasks"]) == {"T1", "T2"}
+        assert board["lanes"]["paused"] == ["T2"]
+        assert "notes" not in board
+        assert board["version"] == 8
+
+
+# ============== SQLITE ENGINE ==============
+
+class TestSqliteRepository:
+    """Row-level writes, indexes and the tasks.json export."""
+
+    @pytest.fixture
+    def db(self, tasks_file):
+        repository = SqliteTaskRepository(tasks_file.with_name("tasks.db"), export_path=tasks_file)
+        yield repository
+        repository.close()
+
+    def test_single_task_edit_writes_one_task_row(self, db):
+        before = db._conn.total_changes
+        with db.edit() as txn:
+            txn.task("T2")["status"] = "blocked"
+        # One task row plus the version meta row.
+        assert db._conn.total_changes - before == 2
+
+    def test_index_columns_follow_edits(self, db):
+        with db.edit() as txn:
+            txn.task("T3")["priority"]["total_score"] = 99
+            txn.lane("bot_queue").remove("T3")
+            txn.lane("done_today").append("T3")
+        row = db._conn.execute("SELECT status, lane, priority FROM tasks WHERE id = 'T3'").fetchone()
+        assert row == ("pending", "done_today", 99)
+        assert db._conn.execute("SELECT claimed_by FROM tasks WHERE id = 'T1'").fetchone() == ("a1",)
+
+    def test_export_only_when_behind(self, db, tasks_file):
+        assert db.sync_export() is False
+        with db.edit() as txn:
+            txn.task("T2")["status"] = "done"
+        assert db.sync_export() is True
+        exported = json.loads(tasks_file.read_text())
+        assert exported["version"] == 8
+        assert exported["tasks"]["T2"]["status"] == "done"
+        assert list(exported) == list(BOARD)
+        assert db.sync_export() is False
+
+    def test_reopen_keeps_database_over_json(self, db, tasks_file):
+        with db.edit() as txn:
+            txn.task("T2")["status"] = "done"
+        reopened = SqliteTaskRepository(tasks_file.with_name("tasks.db"), export_path=tasks_file)
+        assert reopened.get_task("T2")["status"] == "done"
+        reopened.close()
+
+    @staticmethod
+    def hand_edit(tasks_file, task_id, status):
+        board = json.loads(tasks_file.read_text())
+        board["tasks"][task_id]["status"] = status
+        tasks_file.write_text(json.dumps(board, indent=2))
+
+    def test_sync_imports_hand_edited_export(self, db, tasks_file):
+        self.hand_edit(tasks_file, "T3", "blocked")
+        assert db.sync_export() is True
+        assert db.get_task("T3")["status"] == "blocked"
+        exported = json.loads(tasks_file.read_text())
+        assert exported["tasks"]["T3"]["status"] == "blocked"
+        assert exported["version"] == db.version() == 8
+        assert db.sync_export() is False
+
+    def test_edit_lands_on_top_of_hand_edit(self, db, tasks_file):
+        self.hand_edit(tasks_file, "T3", "blocked")
+        with db.edit() as txn:
+            txn.task("T2")["status"] = "done"
+        assert db.sync_export() is True
+        exported = json.loads(tasks_file.read_text())
+        assert exported["tasks"]["T3"]["status"] == "blocked"
+        assert exported["tasks"]["T2"]["status"] == "done"
+
+    def test_sync_refuses_when_both_changed(self, db, tasks_file):
+        with db.edit() as txn:
+            txn.task("T2")["status"] = "done"
+        self.hand_edit(tasks_file, "T3", "blocked")
+        edited = tasks_file.read_text()
+        with pytest.raises(ExportConflict) as excinfo:
+            db.sync_export()
+        assert (excinfo.value.exported, excinfo.value.version) == (7, 8)
+        assert tasks_file.read_text() == edited
+        assert db.get_task("T2")["status"] == "done"
+
+
+class TestOpenRepository:
+    """Engine selection."""
+
+    def test_default_is_json(self, tasks_file, monkeypatch):
+        monkeypatch.delenv("TASKS_BACKEND", raising=False)
+        assert open_repository(json_path=tasks_file).backend == "json"
+
+    def test_sqlite_from_env(self, tasks_file, monkeypatch):
+        monkeypatch.setenv("TASKS_BACKEND", "sqlite")
+        repository = open_repository(json_path=tasks_file)
+        assert repository.backend == "sqlite"
+        assert repository.db_path == tasks_file.with_name("tasks.db")
+        repository.close()
+
+    def test_unknown_backend(self, tasks_file):
+        with pytest.raises(ValueError):
+            open_repository("yaml", json_path=tasks_file)
+
+    def test_index_columns_tolerate_legacy_values(self):
+        assert index_columns({"status": "done", "priority": "P1", "claimed_by": None}) == ("done", None, None)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])